@@ -25,9 +25,6 @@ from app.tasks.scheduler import init_scheduler
 from app.utils.filters import register_filters, register_template_functions
 from app.utils.firebase import firebase_setup
 from app.utils.context_processors import register_template_utilities
-from app.utils.setup_main_pipelines import setup_main_pipelines
-from app.utils.migrate_contacts_to_main_pipeline import migrate_contacts_to_main_pipeline
-from app.utils.ensure_church_pipeline import init_app as init_church_pipeline
 from app.cli import register_commands
 from app.utils.db_transaction_fix import init_app as init_db_transaction_fix
 from app.utils.blueprint_validator import safe_register_blueprint
@@ -315,6 +312,7 @@ def create_app(test_config=None):
     from app.routes.pipeline import pipeline_bp
     from app.routes.api.v1 import api_bp  # Import API blueprint from v1
     from app.routes.health import health_bp
+    from app.routes.jobs import jobs_bp
 
     app.register_blueprint(main_bp)
     # Register auth_bp with URL prefix to avoid conflicts
@@ -329,6 +327,7 @@ def create_app(test_config=None):
     app.register_blueprint(pipeline_bp, url_prefix='/pipeline')
     app.register_blueprint(api_bp, url_prefix='/api/v1')
     app.register_blueprint(health_bp, url_prefix='/api')
+    app.register_blueprint(jobs_bp, url_prefix='/jobs')
     
     # Register communications_simple_bp with its unique name
     # The name in the Blueprint constructor is now 'communications_simple_bp'
@@ -517,12 +516,8 @@ def create_app(test_config=None):
     def inject_pipeline_utilities():
         from app.extensions import db
         def get_pipeline_count(pipeline_id):
-            from sqlalchemy import text
-            result = db.session.execute(
-                text("SELECT COUNT(*) FROM pipeline_contacts WHERE pipeline_id = :pipeline_id"),
-                {"pipeline_id": pipeline_id}
-            )
-            return result.scalar() or 0
+            from app.services.pipeline_stats import get_pipeline_counts
+            return get_pipeline_counts([pipeline_id])[pipeline_id]
         return dict(get_pipeline_count=get_pipeline_count)
 
     # Session Configuration (Keep logic from development)
@@ -561,28 +556,55 @@ def create_app(test_config=None):
     optimize_database_queries(app)
     optimize_connection_pool(app, db)
     
-    # Setup pipelines and migrate contacts (Keep logic from development)
+    # Ensure test users don't appear in production
+    if app.config.get('FLASK_ENV') == 'production':
+        app.config['DISABLE_TEST_USERS'] = True
+        app.logger.info("Test users disabled in production environment")
+
+    # Tables and main pipelines are set up once per deploy by `flask bootstrap`;
+    # here we only check the recorded bootstrap version
+    try:
+        from app.services.bootstrap import init_app as init_bootstrap
+        init_bootstrap(app)
+    except Exception as e:
+        app.logger.error(f"Error bootstrapping database: {str(e)}")
+
+    # Keep the dashboard stats rollup maintained on every write
     with app.app_context():
         try:
-            # Ensure test users don't appear in production
-            if app.config.get('FLASK_ENV') == 'production':
-                app.config['DISABLE_TEST_USERS'] = True
-                app.logger.info("Test users disabled in production environment")
-                
-            # Ensure tables exist before pipeline setup
-            db.create_all()
-            setup_main_pipelines()
-            if not app.debug:
-                from sqlalchemy import inspect
-                inspector = inspect(db.engine)
-                if 'pipelines' in inspector.get_table_names() and 'pipeline_stages' in inspector.get_table_names():
-                    migrate_contacts_to_main_pipeline()
-                else:
-                    app.logger.warning("Skipping contact migration - required tables don't exist yet")
-            init_church_pipeline(app)
-            app.logger.info("Pipeline initialization complete")
+            from app.utils.caching import register_stats_rollup
+            register_stats_rollup(app)
         except Exception as e:
-            app.logger.error(f"Error initializing pipelines: {str(e)}")
+            app.logger.error(f"Error registering dashboard stats rollup: {str(e)}")
+
+    # Reload the cached main pipeline metadata when pipelines change
+    try:
+        from app.utils.caching import register_main_pipeline_cache
+        register_main_pipeline_cache(app)
+    except Exception as e:
+        app.logger.error(f"Error registering main pipeline cache: {str(e)}")
+
+    # Invalidate cached people/church/pipeline data when it changes
+    try:
+        from app.utils import caching
+        caching.register_pipeline_count_invalidation(app)
+        caching.init_app(app)
+    except Exception as e:
+        app.logger.error(f"Error initializing data caching: {str(e)}")
+
+    # Keep the contact search index in step with the contact tables
+    try:
+        from app.services.search_service import register_search_index
+        register_search_index(app)
+    except Exception as e:
+        app.logger.error(f"Error registering contact search index: {str(e)}")
+
+    # Keep each task's next reminder time up to date
+    try:
+        from app.services.task_reminders import register_reminder_schedule
+        register_reminder_schedule(app)
+    except Exception as e:
+        app.logger.error(f"Error registering task reminder schedule: {str(e)}")
 
     # Register template utilities
     register_template_utilities(app)
@@ -683,4 +705,11 @@ def create_app(test_config=None):
     init_monitoring(app)
     app.logger.info("Application monitoring initialized")
 
+    # Query budgets and N+1 warnings (development and testing)
+    try:
+        from app.monitoring.query_budget import init_app as init_query_budget
+        init_query_budget(app)
+    except Exception as e:
+        app.logger.error(f"Error initializing query budgets: {str(e)}")
+
     return app
@@ -46,12 +46,59 @@ def add_email_sync_column():
         if "duplicate column name" in str(e):
             click.echo("Column already exists - this is fine.")
 
+@click.command('reconcile-dashboard-stats')
+@with_appcontext
+def reconcile_dashboard_stats_command():
+    """Rebuild the dashboard stats rollup from the source tables."""
+    from app.services.dashboard_stats import reconcile_dashboard_stats
+    rows = reconcile_dashboard_stats()
+    click.echo(f"Dashboard stats reconciled ({rows} rollup rows).")
+
+@click.command('resume-job')
+@click.argument('job_id', type=int)
+@with_appcontext
+def resume_job_command(job_id):
+    """Resume a failed or interrupted background job from its last checkpoint."""
+    from app.services.job_service import resume_job
+    job = resume_job(job_id)
+    if job is None:
+        click.echo(f"Job {job_id} not found, or not failed or stalled.")
+        return
+    click.echo(f"Job {job.id} ({job.job_type}) is {job.status}.")
+
+@click.command('rebuild-search-index')
+@with_appcontext
+def rebuild_search_index_command():
+    """Create the contact search index if needed and rebuild every search document."""
+    from app.services.search_service import install_search_index
+    with db.engine.begin() as connection:
+        if not install_search_index(connection):
+            click.echo("This database has no search index; searches use ILIKE.")
+            return
+    click.echo("Contact search index rebuilt.")
+
+@click.command('bootstrap')
+@click.option('--force', is_flag=True, help='Run every step, even those already applied.')
+@with_appcontext
+def bootstrap_command(force):
+    """Create tables and set up the main pipelines; run once per deploy."""
+    from app.services.bootstrap import run_bootstrap
+    ran = run_bootstrap(force=force)
+    if not ran:
+        click.echo("Database is already bootstrapped.")
+        return
+    click.echo(f"Bootstrap complete: {', '.join(ran)}.")
+
 def register_commands(app):
     """Register custom Flask CLI commands."""
     app.cli.add_command(reset_db_command)
     app.cli.add_command(seed_db_command)
     app.cli.add_command(run_automations_command)
     app.cli.add_command(add_email_sync_column)
+    app.cli.add_command(reconcile_dashboard_stats_command)
+    app.cli.add_command(resume_job_command)
+    app.cli.add_command(rebuild_search_index_command)
+    app.cli.add_command(bootstrap_command)
 
 @click.command("reset-db")
 @with_appcontext
@@ -193,13 +240,19 @@ def run_automations_command(dry_run):
             # Just log what would happen
             click.echo("Would run pipeline automations:")
             from app.services.pipeline_automation import (
-                process_automatic_movements,
+                get_auto_move_plans,
+                report_due_movements,
                 process_automatic_reminders,
                 process_automatic_tasks
             )
             
             # Get counts without committing changes
-            contacts_to_move = process_automatic_movements()
+            contacts_to_move = 0
+            now = datetime.utcnow()
+            for plan in get_auto_move_plans():
+                for move in report_due_movements(plan, now):
+                    click.echo(f"   {move['count']} from {move['from_stage']} to {move['to_stage']} (pipeline {move['pipeline_id']})")
+                    contacts_to_move += move['count']
             click.echo(f" - Would move {contacts_to_move} contacts")
             
             reminders_to_send = process_automatic_reminders()
@@ -53,20 +53,74 @@ class Config:
     FIREBASE_CLIENT_ID = os.getenv('FIREBASE_CLIENT_ID')
     FIREBASE_CLIENT_CERT_URL = os.getenv('FIREBASE_CLIENT_CERT_URL')
     
+    # Dashboard stats rollup reconciliation interval
+    DASHBOARD_STATS_RECONCILE_MINUTES = int(os.getenv('DASHBOARD_STATS_RECONCILE_MINUTES', 60))
+    
+    # Background jobs: run in the request process instead of Celery when eager,
+    # and keep uploaded and generated files under JOBS_DIR. With Celery, JOBS_DIR
+    # is required and must be shared by every instance and worker (e.g. a mounted
+    # bucket or volume); the instance/jobs default only suits a single eager process
+    JOBS_EAGER = os.getenv('JOBS_EAGER', 'False').lower() == 'true'
+    JOBS_DIR = os.getenv('JOBS_DIR')
+    # A running job whose heartbeat is older than this is treated as interrupted and may be resumed
+    JOB_STALE_MINUTES = int(os.getenv('JOB_STALE_MINUTES', 30))
+    
+    # Run pending database bootstrap steps (tables, main pipelines) when the app starts.
+    # Production leaves this to `flask bootstrap` at deploy time.
+    BOOTSTRAP_ON_START = os.getenv('BOOTSTRAP_ON_START', 'True').lower() == 'true'
+
     # Logging
     LOG_LEVEL = os.getenv('LOG_LEVEL', 'INFO')
     LOG_TO_STDOUT = os.getenv('LOG_TO_STDOUT', 'False').lower() == 'true'
+    # Directory of the activity, security, email and database logs (defaults to instance/logs)
+    LOG_DIR = os.getenv('LOG_DIR')
+
+    # Database query log: slow queries are always written, others sampled
+    DB_LOG_SLOW_QUERY_MS = int(os.getenv('DB_LOG_SLOW_QUERY_MS', '1000'))
+    DB_LOG_SAMPLE_RATE = float(os.getenv('DB_LOG_SAMPLE_RATE', '0.01'))
+    DB_LOG_BUFFER_SIZE = int(os.getenv('DB_LOG_BUFFER_SIZE', '10000'))
+    DB_LOG_BATCH_SIZE = int(os.getenv('DB_LOG_BATCH_SIZE', '500'))
+    DB_LOG_FLUSH_INTERVAL = float(os.getenv('DB_LOG_FLUSH_INTERVAL', '2.0'))
+
+    # Activity, security, email and database logs rotate daily; rotated files older than this are deleted
+    LOG_RETENTION_DAYS = int(os.getenv('LOG_RETENTION_DAYS', '365'))
+
+    # Email open/click hits are queued in memory and applied in batches
+    TRACKING_BUFFER_SIZE = int(os.getenv('TRACKING_BUFFER_SIZE', '50000'))
+    TRACKING_BATCH_SIZE = int(os.getenv('TRACKING_BATCH_SIZE', '1000'))
+    TRACKING_FLUSH_INTERVAL = float(os.getenv('TRACKING_FLUSH_INTERVAL', '5.0'))
+
+    # Campaign sends: recipients per checkpointed chunk, concurrent sends and
+    # messages per second per mail server (0 disables throttling)
+    CAMPAIGN_SEND_CHUNK_SIZE = int(os.getenv('CAMPAIGN_SEND_CHUNK_SIZE', '200'))
+    CAMPAIGN_SEND_WORKERS = int(os.getenv('CAMPAIGN_SEND_WORKERS', '4'))
+    CAMPAIGN_SEND_RATE = float(os.getenv('CAMPAIGN_SEND_RATE', '10'))
+
+    # Bearer token required to scrape /api/metrics. When unset the endpoint
+    # is only served in debug, and returns 404 otherwise
+    METRICS_TOKEN = os.getenv('METRICS_TOKEN')
+
+    # Per-request query budgets and N+1 warnings (see app.monitoring.query_budget).
+    # QUERY_BUDGETS maps endpoint names or route rules to a maximum query count;
+    # strict mode raises instead of logging when a budget is exceeded
+    QUERY_BUDGET_ENABLED = os.getenv('QUERY_BUDGET_ENABLED', 'False').lower() == 'true'
+    QUERY_BUDGET_STRICT = os.getenv('QUERY_BUDGET_STRICT', 'False').lower() == 'true'
+    QUERY_BUDGET_DEFAULT = int(os.getenv('QUERY_BUDGET_DEFAULT')) if os.getenv('QUERY_BUDGET_DEFAULT') else None
+    QUERY_BUDGETS = {}
+    QUERY_N_PLUS_ONE_THRESHOLD = int(os.getenv('QUERY_N_PLUS_ONE_THRESHOLD', '5'))
 
 class DevelopmentConfig(Config):
     """Development configuration."""
     DEBUG = True
     TESTING = False
     DEVELOPMENT = True
+    QUERY_BUDGET_ENABLED = True
 
 class ProductionConfig(Config):
     """Production configuration."""
     DEBUG = False
     TESTING = False
+    BOOTSTRAP_ON_START = os.getenv('BOOTSTRAP_ON_START', 'False').lower() == 'true'
 
 class TestingConfig(Config):
     """Testing configuration."""
@@ -74,6 +128,11 @@ class TestingConfig(Config):
     DEBUG = True
     SQLALCHEMY_DATABASE_URI = f'sqlite:///{ROOT_DIR}/instance/test.db'
     SQLALCHEMY_TRACK_MODIFICATIONS = False
+    JOBS_EAGER = True
+    QUERY_BUDGET_ENABLED = True
+    QUERY_BUDGET_STRICT = True
+    # Query counts locked in for hot endpoints; going over fails the test
+    QUERY_BUDGETS = {'people.search': 7}
 
 # Configuration dictionary
 config = {
@@ -2,6 +2,7 @@ from flask import Blueprint, render_template, request, redirect, url_for, flash,
 from flask_login import login_required, current_user
 from app.models import Pipeline, PipelineStage, PipelineContact, PipelineStageHistory, Contact, Office, Person, Church
 from app.extensions import db
+from app.services.pipeline_stats import get_pipeline_counts
 from datetime import datetime
 import json
 from sqlalchemy import inspect
@@ -35,44 +36,15 @@ def index():
     if not church_main_pipeline:
         church_main_pipeline = Pipeline.query.filter_by(pipeline_type='church').first()
     
-    # Debug log the pipeline contact counts
-    if people_main_pipeline:
-        people_count = db.session.execute(
-            db.text("SELECT COUNT(*) FROM pipeline_contacts WHERE pipeline_id = :pipeline_id"),
-            {"pipeline_id": people_main_pipeline.id}
-        ).scalar() or 0
-        current_app.logger.info(f"People main pipeline ID: {people_main_pipeline.id}, Contact count (SQL): {people_count}")
-        model_count = people_main_pipeline.count_contacts()
-        current_app.logger.info(f"People main pipeline contact count (model method): {model_count}")
-        
-        # Force a refresh of count data
-        db.session.refresh(people_main_pipeline)
-    
-    if church_main_pipeline:
-        church_count = db.session.execute(
-            db.text("SELECT COUNT(*) FROM pipeline_contacts WHERE pipeline_id = :pipeline_id"),
-            {"pipeline_id": church_main_pipeline.id}
-        ).scalar() or 0
-        current_app.logger.info(f"Church main pipeline ID: {church_main_pipeline.id}, Contact count (SQL): {church_count}")
-        model_count = church_main_pipeline.count_contacts()
-        current_app.logger.info(f"Church main pipeline contact count (model method): {model_count}")
-        
-        # Force a refresh of count data
-        db.session.refresh(church_main_pipeline)
-    
-    # Log all pipelines with their counts
-    pipelines = Pipeline.query.all()
-    for p in pipelines:
-        count = db.session.execute(
-            db.text("SELECT COUNT(*) FROM pipeline_contacts WHERE pipeline_id = :pipeline_id"),
-            {"pipeline_id": p.id}
-        ).scalar() or 0
-        current_app.logger.info(f"Pipeline ID: {p.id}, Name: {p.name}, Count SQL: {count}, Count Method: {p.count_contacts()}")
+    # Count every listed pipeline in one grouped query
+    listed = custom_pipelines + [p for p in (people_main_pipeline, church_main_pipeline) if p]
+    pipeline_counts = get_pipeline_counts([p.id for p in listed])
     
     return render_template('pipeline/index.html', 
                           custom_pipelines=custom_pipelines,
                           people_main_pipeline=people_main_pipeline,
-                          church_main_pipeline=church_main_pipeline)
+                          church_main_pipeline=church_main_pipeline,
+                          pipeline_counts=pipeline_counts)
 
 @pipeline_bp.route('/create', methods=['GET', 'POST'])
 @login_required
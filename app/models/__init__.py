@@ -26,6 +26,9 @@ from .pipeline import Pipeline, PipelineStage, PipelineContact, PipelineStageHis
 from .email_template import EmailTemplate
 from .email_tracking import EmailTracking
 from .email_campaign import EmailCampaign
+from .dashboard_stats import DashboardStatBucket
+from .job import Job
+from .bootstrap import BootstrapStep
 
 # Make them available at the package level
 __all__ = [
@@ -52,5 +55,8 @@ __all__ = [
     'PipelineStageHistory',
     'EmailTemplate',
     'EmailTracking',
-    'EmailCampaign'
+    'EmailCampaign',
+    'DashboardStatBucket',
+    'Job',
+    'BootstrapStep'
 ] 
\ No newline at end of file
@@ -0,0 +1,18 @@
+from datetime import datetime
+from app.extensions import db
+
+
+class BootstrapStep(db.Model):
+    """Version of each one-shot database bootstrap step applied to this database.
+
+    See app.services.bootstrap: a step runs again only when its version in
+    the code is higher than the version recorded here.
+    """
+    __tablename__ = 'bootstrap_steps'
+
+    name = db.Column(db.String(100), primary_key=True)
+    version = db.Column(db.Integer, nullable=False)
+    completed_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
+
+    def __repr__(self):
+        return f'<BootstrapStep {self.name} v{self.version}>'
@@ -0,0 +1,30 @@
+from datetime import date, datetime
+from app.extensions import db
+
+# Bucket used for counters that are not grouped by day (people, churches,
+# tasks without a due date).
+UNDATED_BUCKET = date(9999, 12, 31)
+
+
+class DashboardStatBucket(db.Model):
+    """Rollup counter backing the dashboard statistics.
+
+    Each row holds a running count for one metric, scoped to an office
+    (people, churches, communications) or an assignee (pending tasks), and
+    bucketed by day so date-relative figures such as overdue tasks and
+    recent communications can be summed without scanning the source tables.
+    """
+    __tablename__ = 'dashboard_stat_buckets'
+    __table_args__ = (
+        db.UniqueConstraint('metric', 'scope_key', 'bucket', name='uq_dashboard_stat_bucket'),
+    )
+
+    id = db.Column(db.Integer, primary_key=True)
+    metric = db.Column(db.String(50), nullable=False)  # people, churches, pending_tasks, communications
+    scope_key = db.Column(db.String(100), nullable=False)  # office id or task assignee
+    bucket = db.Column(db.Date, nullable=False, default=UNDATED_BUCKET)
+    count = db.Column(db.Integer, nullable=False, default=0)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    def __repr__(self):
+        return f'<DashboardStatBucket {self.metric}:{self.scope_key}:{self.bucket} = {self.count}>'
@@ -62,14 +62,43 @@ class EmailCampaign(Base):
     
     def update_stats(self):
         """Update campaign statistics based on tracking data."""
+        stats = self.tracking_stats([self.id]).get(self.id, {})
+        self.sent_count = stats.get('sent_count', 0)
+        self.open_count = stats.get('open_count', 0)
+        self.click_count = stats.get('click_count', 0)
+        self.bounce_count = stats.get('bounce_count', 0)
+    
+    @classmethod
+    def tracking_stats(cls, campaign_ids):
+        """Aggregate tracking counters for several campaigns in one grouped query."""
+        from sqlalchemy import case, func
         from app.models.email_tracking import EmailTracking
         
-        tracking = EmailTracking.query.filter_by(bulk_send_id=str(self.id)).all()
+        rows = db.session.query(
+            EmailTracking.bulk_send_id,
+            func.count(EmailTracking.id),
+            func.sum(case((EmailTracking.open_count > 0, 1), else_=0)),
+            func.sum(case((EmailTracking.click_count > 0, 1), else_=0)),
+            func.sum(case((EmailTracking.status == 'bounced', 1), else_=0))
+        ).filter(
+            EmailTracking.bulk_send_id.in_([str(campaign_id) for campaign_id in campaign_ids])
+        ).group_by(EmailTracking.bulk_send_id).all()
         
-        self.sent_count = len(tracking)
-        self.open_count = sum(1 for t in tracking if t.open_count > 0)
-        self.click_count = sum(1 for t in tracking if t.click_count > 0)
-        self.bounce_count = sum(1 for t in tracking if t.status == 'bounced')
+        return {
+            int(bulk_send_id): {
+                'sent_count': sent or 0,
+                'open_count': opened or 0,
+                'click_count': clicked or 0,
+                'bounce_count': bounced or 0
+            }
+            for bulk_send_id, sent, opened, clicked, bounced in rows
+        }
+    
+    @classmethod
+    def refresh_stats(cls, campaign_ids):
+        """Recompute the stored counters of several campaigns without loading tracking rows."""
+        for campaign_id, stats in cls.tracking_stats(campaign_ids).items():
+            db.session.execute(db.update(cls).where(cls.id == campaign_id).values(**stats))
     
     def to_dict(self):
         """Convert email campaign to dictionary."""
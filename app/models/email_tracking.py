@@ -24,7 +24,7 @@ class EmailTracking(Base):
     
     # Technical data
     message_id = db.Column(db.String(255), nullable=True)  # Email message ID for tracking
-    tracking_pixel = db.Column(db.String(255), nullable=True)  # Unique identifier for the tracking pixel
+    tracking_pixel = db.Column(db.String(255), nullable=True, index=True)  # Unique identifier for the tracking pixel
     
     # Foreign keys
     template_id = db.Column(db.Integer, db.ForeignKey('email_templates.id'), nullable=True)  # Template used, if any
@@ -33,7 +33,7 @@ class EmailTracking(Base):
     office_id = db.Column(db.Integer, db.ForeignKey('offices.id'), nullable=False)  # Office the email belongs to
     
     # For bulk emails
-    bulk_send_id = db.Column(db.String(50), nullable=True)  # Group ID for tracking bulk sends
+    bulk_send_id = db.Column(db.String(50), nullable=True, index=True)  # Group ID for tracking bulk sends
     
     # Relationships
     template = db.relationship("EmailTemplate", backref="sent_emails")
@@ -17,6 +17,8 @@ class GoogleToken(Base):
     user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
     scopes = db.Column(db.Text, nullable=True)  # Store scopes as a JSON string
     email = db.Column(db.String, nullable=True)  # Store the user's Gmail address
+    gmail_history_id = db.Column(db.String, nullable=True)  # Gmail historyId of the last completed sync
+    contacts_sync_token = db.Column(db.String, nullable=True)  # People API nextSyncToken of the last contacts sync
 
     # Relationships
     user = db.relationship("User", back_populates="google_tokens")
@@ -0,0 +1,79 @@
+from datetime import datetime
+import json
+from app.extensions import db
+
+
+class Job(db.Model):
+    """Model for background jobs run outside the request cycle."""
+    __tablename__ = 'jobs'
+
+    id = db.Column(db.Integer, primary_key=True)
+    job_type = db.Column(db.String(50), nullable=False)  # people_import, export, campaign_send, contacts_sync
+    status = db.Column(db.String(20), nullable=False, default='queued')  # queued, running, completed, failed
+    user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=True)
+    office_id = db.Column(db.Integer, db.ForeignKey('offices.id'), nullable=True)
+
+    # JSON-encoded handler arguments, result and resume checkpoint
+    params = db.Column(db.Text, nullable=True)
+    result = db.Column(db.Text, nullable=True)
+    checkpoint = db.Column(db.Text, nullable=True)
+
+    # Progress counters
+    progress_current = db.Column(db.Integer, default=0)
+    progress_total = db.Column(db.Integer, nullable=True)
+
+    attempts = db.Column(db.Integer, default=0)
+    error_message = db.Column(db.Text, nullable=True)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    started_at = db.Column(db.DateTime, nullable=True)
+    # Refreshed as a running job reports progress; a stale heartbeat means its worker died
+    heartbeat_at = db.Column(db.DateTime, nullable=True)
+    completed_at = db.Column(db.DateTime, nullable=True)
+
+    # Relationships
+    user = db.relationship('User', backref=db.backref('jobs', lazy='dynamic'))
+
+    def __repr__(self):
+        return f'<Job {self.id}: {self.job_type} - {self.status}>'
+
+    def get_params(self):
+        """Get handler arguments as a dictionary."""
+        return json.loads(self.params) if self.params else {}
+
+    def get_result(self):
+        """Get the handler result as a dictionary."""
+        return json.loads(self.result) if self.result else None
+
+    def get_checkpoint(self):
+        """Get the last saved resume checkpoint."""
+        return json.loads(self.checkpoint) if self.checkpoint else None
+
+    @property
+    def is_finished(self):
+        return self.status in ('completed', 'failed')
+
+    @property
+    def percent_complete(self):
+        """Return progress as a percentage, or None if the total is unknown."""
+        if self.status == 'completed':
+            return 100
+        if not self.progress_total:
+            return None
+        return min(100, int(self.progress_current * 100 / self.progress_total))
+
+    def to_dict(self):
+        """Convert job to dictionary."""
+        return {
+            'id': self.id,
+            'job_type': self.job_type,
+            'status': self.status,
+            'progress_current': self.progress_current,
+            'progress_total': self.progress_total,
+            'percent_complete': self.percent_complete,
+            'result': self.get_result(),
+            'error_message': self.error_message,
+            'attempts': self.attempts,
+            'created_at': self.created_at.isoformat() if self.created_at else None,
+            'started_at': self.started_at.isoformat() if self.started_at else None,
+            'completed_at': self.completed_at.isoformat() if self.completed_at else None
+        }
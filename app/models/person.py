@@ -19,6 +19,10 @@ class Person(Contact):
     __mapper_args__ = {
         'polymorphic_identity': 'person'
     }
+    # Backs the keyset pagination of the people list
+    __table_args__ = (
+        db.Index('ix_people_name_order', 'last_name', 'first_name', 'id'),
+    )
 
     id: Mapped[int] = mapped_column(ForeignKey('contacts.id'), primary_key=True)
     first_name: Mapped[Optional[str]] = mapped_column(String(100), nullable=False)
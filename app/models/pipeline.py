@@ -42,20 +42,10 @@ class Pipeline(db.Model):
         
     def count_contacts(self):
         """Count contacts in this pipeline."""
-        # Use a direct SQL query to get an accurate count
-        from sqlalchemy import text
-        from app.extensions import db
+        from app.services.pipeline_stats import get_pipeline_counts
         
         try:
-            # Use direct SQL for most reliable results
-            result = db.session.execute(
-                text("SELECT COUNT(*) FROM pipeline_contacts WHERE pipeline_id = :pipeline_id"),
-                {"pipeline_id": self.id}
-            )
-            count = result.scalar() or 0
-            
-            # Return the count without logging to stderr which can cause BrokenPipeError
-            return count
+            return get_pipeline_counts([self.id])[self.id]
         except Exception:
             # Silently handle the error without writing to stderr
             # This prevents BrokenPipeError when the pipe is closed
@@ -127,6 +117,11 @@ class PipelineStage(db.Model):
     def __repr__(self):
         return f'<PipelineStage {self.name} (Pipeline: {self.pipeline_id})>'
         
+    def contact_count(self):
+        """Count contacts in this stage from the pipeline's cached stage counts."""
+        from app.services.pipeline_stats import get_stage_counts
+        return get_stage_counts(self.pipeline_id).get(self.id, 0)
+        
     def to_dict(self):
         """Convert object to dictionary."""
         return {
@@ -138,7 +133,7 @@ class PipelineStage(db.Model):
             'pipeline_id': self.pipeline_id,
             'created_at': self.created_at.isoformat() if self.created_at else None,
             'updated_at': self.updated_at.isoformat() if self.updated_at else None,
-            'contact_count': self.contacts_in_stage.count(),
+            'contact_count': self.contact_count(),
             'auto_move_days': self.auto_move_days,
             'auto_reminder': self.auto_reminder,
             'auto_task_template': self.auto_task_template
@@ -76,6 +76,8 @@ class Task(Base):
     # Reminder fields
     reminder_option: Mapped[Optional[str]] = mapped_column(String(50))
     reminder_sent: Mapped[bool] = mapped_column(Boolean, default=False)
+    # When the reminder is due; kept up to date by app.services.task_reminders
+    next_reminder_at: Mapped[Optional[datetime]] = mapped_column(DateTime, index=True)
     
     # Foreign keys
     person_id: Mapped[Optional[int]] = mapped_column(ForeignKey('people.id'))
@@ -9,6 +9,7 @@ import threading
 import requests
 from datetime import datetime
 from flask import Flask, request, current_app
+from app.monitoring.metrics import start_request_metrics, finish_request_metrics, register_query_metrics
 
 class ApplicationMonitor:
     """Monitor application health and performance."""
@@ -37,6 +38,14 @@ class ApplicationMonitor:
         # Register error handlers
         app.register_error_handler(500, self.handle_server_error)
         
+        # Count database queries and query time per request
+        try:
+            from app.extensions import db
+            with app.app_context():
+                register_query_metrics(db.engine)
+        except Exception as e:
+            app.logger.error(f"Error registering query metrics: {str(e)}")
+        
         # Configure alert endpoints from environment variables
         self.configure_alert_endpoints()
         
@@ -74,12 +83,12 @@ class ApplicationMonitor:
     def before_request(self):
         """Record the start time of the request."""
         request.start_time = time.time()
+        start_request_metrics()
     
     def after_request(self, response):
-        """Monitor response times and status codes."""
-        if hasattr(request, 'start_time'):
-            duration = time.time() - request.start_time
-            
+        """Record request metrics and monitor response times and status codes."""
+        duration = finish_request_metrics(request, response)
+        if duration is not None:
             # Log slow requests (more than 500ms)
             if duration > 0.5:
                 self.logger.warning(
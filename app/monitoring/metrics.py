@@ -0,0 +1,299 @@
+"""
+In-process request metrics.
+
+Every request is recorded under (endpoint, method, status) with its latency
+in a log-linear (HDR style) histogram, the number of database queries it ran
+and the time spent in them. Endpoints are route rules such as
+/people/<int:person_id>, so the number of series stays bounded.
+
+Recording takes no lock: each thread writes to its own shard of the
+registry and readers merge the shards when a snapshot is taken. The
+registry feeds the admin system performance page and the Prometheus text
+endpoint (/api/metrics).
+"""
+
+import threading
+import time
+import weakref
+from flask import g, has_request_context
+from sqlalchemy import event
+
+# Latency histograms record microseconds with 2**(SUB_BUCKET_BITS - 1)
+# linear sub-buckets per power of two, i.e. about 3% relative error
+SUB_BUCKET_BITS = 5
+SUB_BUCKET_HALF = 1 << (SUB_BUCKET_BITS - 1)
+
+QUANTILES = (0.5, 0.9, 0.95, 0.99)
+
+
+def bucket_index(value):
+    """Histogram bucket for a non-negative integer value."""
+    if value < 2 * SUB_BUCKET_HALF:
+        return value
+    shift = value.bit_length() - SUB_BUCKET_BITS
+    return shift * SUB_BUCKET_HALF + (value >> shift)
+
+
+def bucket_bounds(index):
+    """Lowest and highest value recorded in a bucket."""
+    if index < 2 * SUB_BUCKET_HALF:
+        return index, index
+    shift = index // SUB_BUCKET_HALF - 1
+    lowest = (index - shift * SUB_BUCKET_HALF) << shift
+    return lowest, lowest + (1 << shift) - 1
+
+
+class LatencyHistogram:
+    """Log-linear histogram of durations in microseconds."""
+
+    __slots__ = ('counts', 'count', 'total', 'max')
+
+    def __init__(self):
+        self.counts = {}
+        self.count = 0
+        self.total = 0
+        self.max = 0
+
+    def record(self, micros):
+        index = bucket_index(micros)
+        self.counts[index] = self.counts.get(index, 0) + 1
+        self.count += 1
+        self.total += micros
+        if micros > self.max:
+            self.max = micros
+
+    def merge(self, other):
+        for index, count in list(other.counts.items()):
+            self.counts[index] = self.counts.get(index, 0) + count
+        self.count += other.count
+        self.total += other.total
+        self.max = max(self.max, other.max)
+
+    def quantile(self, q):
+        """Value (microseconds) at or below which a fraction q of recordings fall."""
+        if not self.count:
+            return 0
+        rank = max(1, int(q * self.count + 0.5))
+        seen = 0
+        for index in sorted(self.counts):
+            seen += self.counts[index]
+            if seen >= rank:
+                return min(bucket_bounds(index)[1], self.max)
+        return self.max
+
+
+class RequestStats:
+    """Counters for one (endpoint, method, status) series."""
+
+    __slots__ = ('latency', 'db_queries', 'db_time')
+
+    def __init__(self):
+        self.latency = LatencyHistogram()
+        self.db_queries = 0
+        self.db_time = 0.0
+
+    def merge(self, other):
+        self.latency.merge(other.latency)
+        self.db_queries += other.db_queries
+        self.db_time += other.db_time
+
+
+class MetricsRegistry:
+    """Request metrics sharded per thread.
+
+    A thread only ever writes to its own shard; the lock is taken once per
+    thread to register the shard and when a snapshot is taken. Shards are
+    held with a weak reference to their thread, and those of threads that
+    have exited are folded into a merged base, so worker pools that recycle
+    threads do not grow the registry.
+    """
+
+    def __init__(self):
+        self.started_at = time.time()
+        self._local = threading.local()
+        self._shards = []
+        self._base = {}
+        self._lock = threading.Lock()
+
+    def _shard(self):
+        shard = getattr(self._local, 'shard', None)
+        if shard is None:
+            shard = {}
+            with self._lock:
+                self._fold_dead_shards()
+                self._shards.append((weakref.ref(threading.current_thread()), shard))
+            self._local.shard = shard
+        return shard
+
+    def _fold_dead_shards(self):
+        """Merge the shards of exited threads into the base. Called with the lock held."""
+        live = []
+        for thread_ref, shard in self._shards:
+            thread = thread_ref()
+            if thread is not None and thread.is_alive():
+                live.append((thread_ref, shard))
+                continue
+            for key, stats in shard.items():
+                self._base.setdefault(key, RequestStats()).merge(stats)
+        self._shards = live
+
+    def observe_request(self, endpoint, method, status, duration, db_queries=0, db_time=0.0):
+        """
+        Record a finished request.
+
+        Args:
+            endpoint: Route rule of the request
+            method: HTTP method
+            status: Response status code
+            duration: Request time in seconds
+            db_queries: Number of database queries the request ran
+            db_time: Seconds spent in those queries
+        """
+        shard = self._shard()
+        key = (endpoint, method, status)
+        stats = shard.get(key)
+        if stats is None:
+            stats = shard[key] = RequestStats()
+        stats.latency.record(int(duration * 1000000))
+        stats.db_queries += db_queries
+        stats.db_time += db_time
+
+    def snapshot(self):
+        """Return merged stats: {(endpoint, method, status): RequestStats}."""
+        merged = {}
+        with self._lock:
+            self._fold_dead_shards()
+            for key, stats in self._base.items():
+                merged.setdefault(key, RequestStats()).merge(stats)
+            shards = [shard for _, shard in self._shards]
+        for shard in shards:
+            for key, stats in list(shard.items()):
+                merged.setdefault(key, RequestStats()).merge(stats)
+        return merged
+
+    def reset(self):
+        """Drop everything recorded so far."""
+        with self._lock:
+            self._base.clear()
+            for _, shard in self._shards:
+                shard.clear()
+            self.started_at = time.time()
+
+    def endpoint_stats(self):
+        """
+        Summarise the snapshot per endpoint, busiest first.
+
+        Returns:
+            list: Dicts with path, count, requests_per_min, avg_response,
+            p95_response and p99_response (ms), error_rate (% of 5xx),
+            avg_db_queries and avg_db_time (ms)
+        """
+        endpoints = {}
+        errors = {}
+        for (endpoint, method, status), stats in self.snapshot().items():
+            endpoints.setdefault(endpoint, RequestStats()).merge(stats)
+            if status >= 500:
+                errors[endpoint] = errors.get(endpoint, 0) + stats.latency.count
+
+        minutes = max((time.time() - self.started_at) / 60, 1 / 60)
+        result = []
+        for endpoint, stats in endpoints.items():
+            count = stats.latency.count
+            result.append({
+                'path': endpoint,
+                'count': count,
+                'requests_per_min': round(count / minutes, 2),
+                'avg_response': round(stats.latency.total / count / 1000, 1),
+                'p95_response': round(stats.latency.quantile(0.95) / 1000, 1),
+                'p99_response': round(stats.latency.quantile(0.99) / 1000, 1),
+                'error_rate': round(errors.get(endpoint, 0) / count * 100, 1),
+                'avg_db_queries': round(stats.db_queries / count, 1),
+                'avg_db_time': round(stats.db_time * 1000 / count, 1)
+            })
+        result.sort(key=lambda item: item['count'], reverse=True)
+        return result
+
+    def render_prometheus(self, prefix='mobilize'):
+        """Render the snapshot in the Prometheus text exposition format."""
+        lines = [
+            f'# HELP {prefix}_request_duration_seconds Request latency',
+            f'# TYPE {prefix}_request_duration_seconds summary'
+        ]
+        series = sorted(self.snapshot().items())
+        for (endpoint, method, status), stats in series:
+            labels = _labels(endpoint=endpoint, method=method, status=status)
+            for q in QUANTILES:
+                quantile_labels = _labels(endpoint=endpoint, method=method, status=status, quantile=q)
+                lines.append(f'{prefix}_request_duration_seconds{{{quantile_labels}}} '
+                             f'{stats.latency.quantile(q) / 1000000:.6f}')
+            lines.append(f'{prefix}_request_duration_seconds_sum{{{labels}}} {stats.latency.total / 1000000:.6f}')
+            lines.append(f'{prefix}_request_duration_seconds_count{{{labels}}} {stats.latency.count}')
+
+        lines.append(f'# HELP {prefix}_request_db_queries_total Database queries run by requests')
+        lines.append(f'# TYPE {prefix}_request_db_queries_total counter')
+        for (endpoint, method, status), stats in series:
+            labels = _labels(endpoint=endpoint, method=method, status=status)
+            lines.append(f'{prefix}_request_db_queries_total{{{labels}}} {stats.db_queries}')
+
+        lines.append(f'# HELP {prefix}_request_db_seconds_total Time requests spent in database queries')
+        lines.append(f'# TYPE {prefix}_request_db_seconds_total counter')
+        for (endpoint, method, status), stats in series:
+            labels = _labels(endpoint=endpoint, method=method, status=status)
+            lines.append(f'{prefix}_request_db_seconds_total{{{labels}}} {stats.db_time:.6f}')
+
+        return '\n'.join(lines) + '\n'
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _labels(**labels):
+    return ','.join(f'{name}="{_escape(value)}"' for name, value in labels.items())
+
+
+# Process-wide registry
+metrics = MetricsRegistry()
+
+
+def start_request_metrics():
+    """Start timing the current request and counting its queries."""
+    g._metrics_start = time.perf_counter()
+    g._metrics_db_queries = 0
+    g._metrics_db_time = 0.0
+
+
+def finish_request_metrics(request, response):
+    """Record the current request in the registry."""
+    start = g.pop('_metrics_start', None)
+    if start is None:
+        return None
+    duration = time.perf_counter() - start
+    endpoint = request.url_rule.rule if request.url_rule is not None else '<unmatched>'
+    metrics.observe_request(
+        endpoint, request.method, response.status_code, duration,
+        db_queries=g.get('_metrics_db_queries', 0),
+        db_time=g.get('_metrics_db_time', 0.0)
+    )
+    return duration
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault('metrics_query_start', []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    start_times = conn.info.get('metrics_query_start')
+    if not start_times:
+        return
+    elapsed = time.perf_counter() - start_times.pop()
+    if has_request_context() and '_metrics_start' in g:
+        g._metrics_db_queries += 1
+        g._metrics_db_time += elapsed
+
+
+def register_query_metrics(engine):
+    """Count queries and query time per request on an engine."""
+    if not event.contains(engine, 'before_cursor_execute', _before_cursor_execute):
+        event.listen(engine, 'before_cursor_execute', _before_cursor_execute)
+        event.listen(engine, 'after_cursor_execute', _after_cursor_execute)
@@ -0,0 +1,122 @@
+"""
+Per-request SQL query budgets and N+1 detection (development and testing).
+
+When QUERY_BUDGET_ENABLED is set every statement a request executes is
+counted and reduced to its shape (literals, parameters and IN/VALUES lists
+collapsed). At the end of the request:
+
+- a shape executed QUERY_N_PLUS_ONE_THRESHOLD times or more is logged as a
+  likely N+1 (the same query run once per row of an earlier result),
+- the query count is compared with the endpoint's budget from QUERY_BUDGETS
+  (keyed by endpoint name or route rule) or QUERY_BUDGET_DEFAULT. Going over
+  budget is logged, and raises QueryBudgetExceeded when QUERY_BUDGET_STRICT
+  is set, so a test client request fails the test.
+
+Responses carry an X-Query-Count header while the budget check is enabled.
+"""
+
+from collections import Counter
+from functools import lru_cache
+import logging
+import re
+from flask import g, has_request_context, request
+from sqlalchemy import event
+
+logger = logging.getLogger(__name__)
+
+_PARAMETER = re.compile(r"%\(\w+\)s|%s|:\w+|\?|__\[POSTCOMPILE_\w+\]")
+_STRING = re.compile(r"'(?:[^']|'')*'")
+_NUMBER = re.compile(r"\b\d+(?:\.\d+)?\b")
+_IN_LIST = re.compile(r"\bIN\s*\(\s*\?(?:\s*,\s*\?)*\s*\)", re.IGNORECASE)
+_VALUES_LIST = re.compile(r"\bVALUES\s*(\([^()]*\))(?:\s*,\s*\([^()]*\))+", re.IGNORECASE)
+_WHITESPACE = re.compile(r"\s+")
+
+
+class QueryBudgetExceeded(AssertionError):
+    """A request ran more queries than its endpoint's budget allows."""
+
+
+@lru_cache(maxsize=4096)
+def normalize_statement(statement):
+    """Reduce a SQL statement to its shape so repeated queries compare equal."""
+    shape = _WHITESPACE.sub(' ', statement).strip()
+    shape = _STRING.sub('?', shape)
+    shape = _PARAMETER.sub('?', shape)
+    shape = _NUMBER.sub('?', shape)
+    shape = _IN_LIST.sub('IN (?)', shape)
+    shape = _VALUES_LIST.sub(r'VALUES \1', shape)
+    return shape
+
+
+def _record_statement(conn, cursor, statement, parameters, context, executemany):
+    if has_request_context():
+        shapes = g.get('_query_budget_shapes')
+        if shapes is not None:
+            shapes[normalize_statement(statement)] += 1
+
+
+def start_query_budget():
+    """Start counting the current request's queries."""
+    g._query_budget_shapes = Counter()
+
+
+def get_request_queries():
+    """Query shapes run so far by the current request, or None when not counting."""
+    return g.get('_query_budget_shapes') if has_request_context() else None
+
+
+def endpoint_budget(config, endpoint, rule):
+    """The query budget for an endpoint name or route rule, or None for no limit."""
+    budgets = config.get('QUERY_BUDGETS') or {}
+    for key in (endpoint, rule):
+        if key is not None and key in budgets:
+            return budgets[key]
+    return config.get('QUERY_BUDGET_DEFAULT')
+
+
+def likely_n_plus_one(shapes, threshold):
+    """Shapes executed at least threshold times, most repeated first."""
+    return [(shape, count) for shape, count in shapes.most_common() if count >= threshold]
+
+
+def check_query_budget(app, response):
+    """Report repeated query shapes and enforce the endpoint's budget."""
+    shapes = g.pop('_query_budget_shapes', None)
+    if shapes is None:
+        return response
+
+    total = sum(shapes.values())
+    rule = request.url_rule.rule if request.url_rule is not None else None
+    name = request.endpoint or request.path
+    response.headers['X-Query-Count'] = str(total)
+
+    for shape, count in likely_n_plus_one(shapes, app.config.get('QUERY_N_PLUS_ONE_THRESHOLD', 5)):
+        logger.warning(f"Likely N+1 in {name}: {count} x {shape[:300]}")
+
+    budget = endpoint_budget(app.config, request.endpoint, rule)
+    if budget is not None and total > budget:
+        repeated = ', '.join(f"{count} x {shape[:120]}" for shape, count in shapes.most_common(3))
+        message = f"{request.method} {request.path} ({name}) ran {total} queries, budget is {budget}. Most repeated: {repeated}"
+        if app.config.get('QUERY_BUDGET_STRICT'):
+            raise QueryBudgetExceeded(message)
+        logger.warning(message)
+
+    return response
+
+
+def init_app(app):
+    """Enable query budgets for an app when QUERY_BUDGET_ENABLED is set."""
+    if not app.config.get('QUERY_BUDGET_ENABLED'):
+        return
+
+    from app.extensions import db
+
+    with app.app_context():
+        engine = db.engine
+    if not event.contains(engine, 'before_cursor_execute', _record_statement):
+        event.listen(engine, 'before_cursor_execute', _record_statement)
+
+    # Run first so queries made by the app's other before_request hooks are counted
+    app.before_request_funcs.setdefault(None, []).insert(0, start_query_budget)
+    app.after_request(lambda response: check_query_budget(app, response))
+    app.logger.info("Query budgets enabled")
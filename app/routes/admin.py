@@ -653,9 +653,11 @@ def system_logs():
     level_filter = request.args.get('level')
     search_term = request.args.get('search')
     max_entries = int(request.args.get('max', 1000))
+    before = request.args.get('before', type=int)
     
-    # Get logs using the log_utils module
-    logs = get_system_logs(max_entries=max_entries, level_filter=level_filter, search_term=search_term)
+    # Get logs using the log_utils module (newest first, older pages start at 'before')
+    logs = get_system_logs(max_entries=max_entries, level_filter=level_filter, search_term=search_term, before=before)
+    older_cursor = logs[-1]['offset'] if len(logs) == max_entries and logs[-1]['offset'] > 0 else None
     
     # If no logs are found, create a sample log entry to avoid empty display
     if not logs:
@@ -666,7 +668,7 @@ def system_logs():
             'color': 'text-info'
         }]
     
-    return render_template('admin/logs/system_logs.html', logs=logs)
+    return render_template('admin/logs/system_logs.html', logs=logs, older_cursor=older_cursor)
 
 @admin_bp.route('/logs/user-activity')
 @login_required
@@ -1,10 +1,8 @@
 from flask import Blueprint, jsonify, request, current_app
 from flask_login import login_required, current_user
-from datetime import datetime
 from app.models.user import User
-from app.models.person import Person
-from app.models.church import Church
 from app.extensions import db
+from app.services import assignment_service
 from app.utils.decorators import admin_required
 
 assignments_api_bp = Blueprint('assignments_api', __name__)
@@ -33,12 +31,9 @@ def api_assign_people():
     if not person_ids:
         return jsonify({'error': 'At least one person must be selected'}), 400
     
-    # Create a new session for this operation to avoid connection pool issues
-    session = db.create_scoped_session()
-    
     try:
         # Get the user to assign to
-        user = session.query(User).get(user_id)
+        user = db.session.get(User, user_id)
         if not user:
             return jsonify({'error': 'Selected user not found'}), 404
         
@@ -46,21 +41,11 @@ def api_assign_people():
         if not current_user.is_super_admin() and user.office_id != current_user.office_id:
             return jsonify({'error': 'You can only assign to users in your office'}), 403
         
-        # Use a more efficient query approach with fewer connections
-        query = session.query(Person).filter(Person.id.in_(person_ids))
-        
         # Filter by office for non-super admins
-        if not current_user.is_super_admin():
-            query = query.filter_by(office_id=current_user.office_id)
-        
-        # Update all records in a single query to reduce database load
-        updated_count = query.update({
-            Person.assigned_to: user.username,
-            Person.updated_at: datetime.now()
-        }, synchronize_session=False)
+        office_id = None if current_user.is_super_admin() else current_user.office_id
+        updated_count = assignment_service.assign_people(person_ids, user.username, office_id)
         
         current_app.logger.info(f'Updated {updated_count} people assignments')
-        session.commit()
         
         return jsonify({
             'success': True,
@@ -68,17 +53,10 @@ def api_assign_people():
             'count': updated_count
         })
     except Exception as e:
-        session.rollback()
         current_app.logger.error(f'Error assigning people: {str(e)}')
         current_app.logger.error(f'Error details: {type(e).__name__}')
         current_app.logger.exception('Full traceback:')
         return jsonify({'error': f'Error assigning people: {str(e)}'}), 500
-    finally:
-        # Ensure the session is closed to return connection to pool
-        try:
-            session.close()
-        except Exception as e:
-            current_app.logger.error(f'Error closing session: {str(e)}')
 
 @assignments_api_bp.route('/api/assign-churches', methods=['POST'])
 @assignments_api_bp.route('/assign-churches', methods=['POST'])
@@ -104,12 +82,9 @@ def api_assign_churches():
     if not church_ids:
         return jsonify({'error': 'At least one church must be selected'}), 400
     
-    # Create a new session for this operation to avoid connection pool issues
-    session = db.create_scoped_session()
-    
     try:
         # Get the user to assign to
-        user = session.query(User).get(user_id)
+        user = db.session.get(User, user_id)
         if not user:
             return jsonify({'error': 'Selected user not found'}), 404
         
@@ -117,21 +92,11 @@ def api_assign_churches():
         if not current_user.is_super_admin() and user.office_id != current_user.office_id:
             return jsonify({'error': 'You can only assign to users in your office'}), 403
         
-        # Use a more efficient query approach with fewer connections
-        query = session.query(Church).filter(Church.id.in_(church_ids))
-        
         # Filter by office for non-super admins
-        if not current_user.is_super_admin():
-            query = query.filter_by(office_id=current_user.office_id)
-        
-        # Update all records in a single query to reduce database load
-        updated_count = query.update({
-            Church.assigned_to: user.username,
-            Church.updated_at: datetime.now()
-        }, synchronize_session=False)
+        office_id = None if current_user.is_super_admin() else current_user.office_id
+        updated_count = assignment_service.assign_churches(church_ids, user.username, office_id)
         
         current_app.logger.info(f'Updated {updated_count} church assignments')
-        session.commit()
         
         return jsonify({
             'success': True,
@@ -139,14 +104,7 @@ def api_assign_churches():
             'count': updated_count
         })
     except Exception as e:
-        session.rollback()
         current_app.logger.error(f'Error assigning churches: {str(e)}')
         current_app.logger.error(f'Error details: {type(e).__name__}')
         current_app.logger.exception('Full traceback:')
         return jsonify({'error': f'Error assigning churches: {str(e)}'}), 500
-    finally:
-        # Ensure the session is closed to return connection to pool
-        try:
-            session.close()
-        except Exception as e:
-            current_app.logger.error(f'Error closing session: {str(e)}')
@@ -9,6 +9,7 @@ from sqlalchemy import or_
 from app.tasks.sync import sync_user_contacts
 from app.models.user import User
 from app.services.contact_sync import ContactSyncService
+from app.services.search_service import apply_search
 from flask_login import current_user, login_required
 from flask_jwt_extended import jwt_required, get_jwt_identity
 from flask import current_app
@@ -203,17 +204,6 @@ def search_contacts():
         # Build filters
         filters = []
         
-        # Search query filter
-        if query:
-            filters.append(
-                or_(
-                    ContactModel.first_name.ilike(f'%{query}%'),
-                    ContactModel.last_name.ilike(f'%{query}%'),
-                    ContactModel.email.ilike(f'%{query}%'),
-                    ContactModel.phone.ilike(f'%{query}%')
-                )
-            )
-        
         # Contact type filter
         if contact_type == 'person':
             filters.append(ContactModel.type == 'person')
@@ -244,8 +234,8 @@ def search_contacts():
         if not current_user.is_super_admin():
             filters.append(ContactModel.office_id == current_user.office_id)
         
-        # Build query
-        query_obj = ContactModel.query
+        # Build query; the search term is matched through the ranked search index
+        query_obj = apply_search(ContactModel.query, ContactModel, query)
         if filters:
             for f in filters:
                 query_obj = query_obj.filter(f)
@@ -1,13 +1,14 @@
 """
 API endpoints for Google Sync operations
 """
-from flask import Blueprint, jsonify, request, current_app
+from flask import Blueprint, jsonify, request, current_app, url_for
 from flask_jwt_extended import jwt_required, get_jwt_identity
 
 from app.models.user import User
 from app.models.sync_history import SyncHistory
 from app.services.google_api import GoogleAPIService
 from app.services.contact_sync import ContactSyncService
+from app.services.job_service import enqueue_job
 
 google_api_sync_blueprint = Blueprint('google_api_sync', __name__)
 
@@ -101,16 +102,20 @@ def api_start_sync():
             return jsonify({"error": "User not found"}), 404
         
         # Check for Google token
-        if not user.google_token_info:
+        if not ContactSyncService._get_user_token(user.id):
             return jsonify({"error": "Google account not connected"}), 400
         
-        # Start the sync
-        success, stats, error = ContactSyncService.sync_contacts(current_user_id, user.google_token_info)
+        # Start the sync as a background job; poll status_url for progress
+        job = enqueue_job('contacts_sync', user_id=user.id, office_id=user.office_id)
         
-        if success:
-            return jsonify({"success": True, "stats": stats})
-        else:
-            return jsonify({"success": False, "error": error}), 500
+        if job.status == 'failed':
+            return jsonify({"success": False, "error": job.error_message, "job": job.to_dict()}), 500
+        return jsonify({
+            "success": True,
+            "stats": job.get_result(),
+            "job": job.to_dict(),
+            "status_url": url_for('jobs.status', job_id=job.id)
+        }), 202
     except Exception as e:
         current_app.logger.error(f"Error starting sync: {str(e)}")
         return jsonify({"success": False, "error": str(e)}), 500
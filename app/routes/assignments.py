@@ -5,7 +5,7 @@ from app.models.person import Person
 from app.models.church import Church
 from app.extensions import db
 from app.utils.decorators import admin_required
-from datetime import datetime
+from app.services import assignment_service
 
 assignments_bp = Blueprint('assignments', __name__, template_folder='../templates/assignments')
 
@@ -231,15 +231,8 @@ def assign_people():
             return redirect(url_for('assignments.people'))
         
         # Assign people
-        count = 0
-        for person_id in person_ids:
-            person = Person.query.get(person_id)
-            if person:
-                person.assigned_to = user.username
-                person.updated_at = datetime.now()
-                count += 1
-        
-        db.session.commit()
+        office_id = None if current_user.is_super_admin() else current_user.office_id
+        count = assignment_service.assign_people(person_ids, user.username, office_id)
         
         if request.headers.get('X-Requested-With') == 'XMLHttpRequest':
             return jsonify({
@@ -294,15 +287,8 @@ def assign_churches():
             return redirect(url_for('assignments.churches'))
         
         # Assign churches
-        count = 0
-        for church_id in church_ids:
-            church = Church.query.get(church_id)
-            if church:
-                church.assigned_to = user.username
-                church.updated_at = datetime.now()
-                count += 1
-        
-        db.session.commit()
+        office_id = None if current_user.is_super_admin() else current_user.office_id
+        count = assignment_service.assign_churches(church_ids, user.username, office_id)
         
         if request.headers.get('X-Requested-With') == 'XMLHttpRequest':
             return jsonify({
@@ -444,23 +430,11 @@ def unassign_people():
         return redirect(url_for('assignments.people'))
     
     try:
-        # Get the people to unassign
-        people_query = Person.query.filter(Person.id.in_(person_ids))
-        
         # Filter by office for non-super admins
-        if not current_user.is_super_admin():
-            people_query = people_query.filter_by(office_id=current_user.office_id)
-        
-        people = people_query.all()
-        
-        # Unassign people
-        for person in people:
-            person.assigned_to = None
-            person.updated_at = datetime.now()
+        office_id = None if current_user.is_super_admin() else current_user.office_id
+        count = assignment_service.unassign_people(person_ids, office_id)
         
-        db.session.commit()
-        
-        flash(f'{len(people)} people unassigned', 'success')
+        flash(f'{count} people unassigned', 'success')
     except Exception as e:
         db.session.rollback()
         current_app.logger.error(f'Error unassigning people: {str(e)}')
@@ -485,23 +459,11 @@ def unassign_churches():
         return redirect(url_for('assignments.churches'))
     
     try:
-        # Get the churches to unassign
-        churches_query = Church.query.filter(Church.id.in_(church_ids))
-        
         # Filter by office for non-super admins
-        if not current_user.is_super_admin():
-            churches_query = churches_query.filter_by(office_id=current_user.office_id)
-        
-        churches = churches_query.all()
-        
-        # Unassign churches
-        for church in churches:
-            church.assigned_to = None
-            church.updated_at = datetime.now()
-        
-        db.session.commit()
+        office_id = None if current_user.is_super_admin() else current_user.office_id
+        count = assignment_service.unassign_churches(church_ids, office_id)
         
-        flash(f'{len(churches)} churches unassigned', 'success')
+        flash(f'{count} churches unassigned', 'success')
     except Exception as e:
         db.session.rollback()
         current_app.logger.error(f'Error unassigning churches: {str(e)}')
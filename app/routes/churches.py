@@ -11,10 +11,11 @@ from app.models.pipeline import Pipeline, PipelineContact, PipelineStage
 from app.extensions import db
 from app.forms.church import ChurchForm
 from app.forms.import_form import ImportForm, FieldMappingForm
+from app.services.import_service import IMPORT_CHUNK_SIZE
+from app.services.search_service import apply_search
 # Import json for JSON responses
 import pandas as pd
 import uuid
-from sqlalchemy import or_
 
 churches_bp = Blueprint('churches', __name__, template_folder='../templates/churches')
 
@@ -26,7 +27,6 @@ def index():
     from sqlalchemy.orm import joinedload
     from app.models.pipeline import Pipeline, PipelineContact, PipelineStage
     from datetime import datetime
-    from sqlalchemy import or_
     import time
     
     # Generate a unique request ID for tracking performance
@@ -52,19 +52,9 @@ def index():
     
     # Apply search filter if provided - similar to people page
     if search_query:
-        search_term = f'%{search_query}%'
-        query = query.filter(
-            or_(
-                Church.name.ilike(search_term),
-                Church.city.ilike(search_term),
-                Church.state.ilike(search_term),
-                Church.denomination.ilike(search_term),
-                Church.email.ilike(search_term),
-                Church.phone.ilike(search_term)
-            )
-        )
+        query = apply_search(query, Church, search_query)
     
-    # Order by name for consistency
+    # Order by name for consistency (after relevance when searching)
     query = query.order_by(Church.name)
     
     # Execute the query with pagination
@@ -747,8 +737,21 @@ def process_church_import(df, import_data):
             'errors': 0
         }
         
+        # Resolve existing churches for the whole file up front instead of
+        # one lookup per row
+        existing_churches = {}
+        name_column = field_mapping.get('name')
+        if update_existing and name_column and name_column in df.columns:
+            names = [name for name in df[name_column].dropna().unique().tolist() if name]
+            for start in range(0, len(names), IMPORT_CHUNK_SIZE):
+                for church in Church.query.filter(
+                    Church.office_id == current_user.office_id,
+                    Church.name.in_(names[start:start + IMPORT_CHUNK_SIZE])
+                ):
+                    existing_churches.setdefault(church.name, church)
+        
         # Process each row
-        for _, row in df.iterrows():
+        for row in df.to_dict('records'):
             try:
                 # Map data from file to church fields
                 church_data = {}
@@ -768,11 +771,7 @@ def process_church_import(df, import_data):
                 # Check if church exists when updating
                 existing_church = None
                 if update_existing:
-                    # Try to find by name
-                    existing_church = Church.query.filter_by(
-                        name=church_data.get('name'),
-                        office_id=current_user.office_id
-                    ).first()
+                    existing_church = existing_churches.get(church_data.get('name'))
                 
                 if existing_church:
                     # Update existing church
@@ -789,6 +788,10 @@ def process_church_import(df, import_data):
                     )
                     db.session.add(new_church)
                     stats['created'] += 1
+                    
+                    # Later rows with the same name update this church
+                    if update_existing:
+                        existing_churches[new_church.name] = new_church
                 
             except Exception as e:
                 stats['errors'] += 1
@@ -852,16 +855,9 @@ def search():
                 denomination_match = True
                 break
         
-        # If no pipeline or denomination match, search other fields
+        # If no pipeline or denomination match, search other fields, best matches first
         if not pipeline_match and not denomination_match:
-            query = query.filter(
-                or_(
-                    Church.name.ilike(f'%{search_term}%'),
-                    Church.email.ilike(f'%{search_term}%'),
-                    Church.phone.ilike(f'%{search_term}%'),
-                    Church.location.ilike(f'%{search_term}%')
-                )
-            )
+            query = apply_search(query, Church, search_term)
     
     # Filter by office for non-super admins
     if not current_user.is_super_admin():
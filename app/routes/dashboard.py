@@ -4,12 +4,12 @@ from sqlalchemy import or_, and_, desc, func, text
 from app.extensions import db, cache
 from app.models.pipeline import Pipeline, PipelineStage, PipelineContact
 from app.models.task import Task
-from app.models.communication import Communication
 from app.models.church import Church
 from app.models.user import User
 from app.models.person import Person
 from app.utils.decorators import office_required
-from datetime import datetime, timedelta
+from app.services.dashboard_stats import get_rollup_stats, has_rollup
+from app.services.pipeline_stats import get_stage_counts
 from sqlalchemy.orm import joinedload
 
 dashboard_bp = Blueprint('dashboard', __name__)
@@ -205,18 +205,9 @@ def index():
         elif pipeline.pipeline_type == 'church':
             church_pipeline = pipeline
     
-    # Get pending tasks for the user
-    pending_tasks_count = Task.query.filter(
-        Task.assigned_to == user_id,
-        Task.status == 'pending'
-    ).count()
-    
-    # Get overdue tasks for the user
-    overdue_tasks_count = Task.query.filter(
-        Task.assigned_to == user_id,
-        Task.status == 'pending',
-        Task.due_date < datetime.now().date()
-    ).count()
+    # Task counters come from the dashboard stats rollup
+    pending_tasks_count = stats.get('pending_tasks', 0)
+    overdue_tasks_count = stats.get('overdue_tasks', 0)
     
     # Log pipeline information for debugging
     if people_pipeline:
@@ -431,41 +422,18 @@ def simple_pipeline_chart_data(pipeline_type=None):
                 'error': f"No stages found for {pipeline_type} pipeline"
             }), 404
             
-        # For each stage, get the count of contacts
+        # Count the contacts in every stage with one grouped query
+        stage_counts = get_stage_counts(pipeline.id, office_id=None if is_super_admin else office_id)
         for stage in stages:
-            try:
-                if pipeline_type == 'person':
-                    # Count people in this stage using the PipelineContact table
-                    count = db.session.query(PipelineContact).join(
-                        Person, Person.id == PipelineContact.contact_id
-                    ).filter(
-                        PipelineContact.pipeline_id == pipeline.id,
-                        PipelineContact.current_stage_id == stage.id
-                    ).count()
-                else:
-                    # Count churches in this stage using the PipelineContact table
-                    count = db.session.query(PipelineContact).join(
-                        Church, Church.id == PipelineContact.contact_id
-                    ).filter(
-                        PipelineContact.pipeline_id == pipeline.id,
-                        PipelineContact.current_stage_id == stage.id
-                    ).count()
-                
-                # Log the count for debugging
-                current_app.logger.info(f"Stage {stage.name} has {count} contacts")
-                    
-                stages_data.append({
-                    'id': stage.id,
-                    'name': stage.name,
-                    'position': stage.order,
-                    'color': stage.color or get_default_color(stage.name),
-                    'contact_count': count
-                })
-                
-                total_contacts += count
-            except Exception as stage_error:
-                current_app.logger.error(f"Error processing stage {stage.id}: {str(stage_error)}")
-                # Continue with other stages even if one fails
+            count = stage_counts.get(stage.id, 0)
+            stages_data.append({
+                'id': stage.id,
+                'name': stage.name,
+                'position': stage.order,
+                'color': stage.color or get_default_color(stage.name),
+                'contact_count': count
+            })
+            total_contacts += count
             
         # Calculate percentages
         for stage in stages_data:
@@ -714,60 +682,19 @@ def get_dashboard_stats():
             current_app.logger.error(f"Error getting user in dashboard stats: {str(e)}")
             return {}
             
-        stats = {}
-        
-        # Use SQLAlchemy Core for more optimized queries
-        from sqlalchemy import func, text
+        # Counters are read from the incrementally maintained rollup rather
+        # than COUNT queries over the people/churches/tasks/communications tables.
+        # It is populated by 'flask bootstrap'; until then the counters read as zero.
+        if not has_rollup():
+            current_app.logger.warning(
+                "Dashboard stats rollup is empty; run 'flask bootstrap' or 'flask reconcile-dashboard-stats'"
+            )
         
-        # For super admins, count all people and churches across all offices
-        if is_super_admin:
-            # Get counts in a single query using UNION
-            counts_query = """
-                SELECT 
-                    (SELECT COUNT(*) FROM people) AS people_count,
-                    (SELECT COUNT(*) FROM churches) AS church_count
-            """
-            result = db.session.execute(text(counts_query)).fetchone()
-            stats['people_count'] = result[0] if result else 0
-            stats['church_count'] = result[1] if result else 0
-        else:
-            # Get counts for specific office in a single query using UNION
-            counts_query = """
-                SELECT 
-                    (SELECT COUNT(*) FROM people JOIN contacts ON people.id = contacts.id WHERE contacts.office_id = :office_id) AS people_count,
-                    (SELECT COUNT(*) FROM churches JOIN contacts ON churches.id = contacts.id WHERE contacts.office_id = :office_id) AS church_count
-            """
-            result = db.session.execute(text(counts_query), {"office_id": office_id}).fetchone()
-            stats['people_count'] = result[0] if result else 0
-            stats['church_count'] = result[1] if result else 0
-            
-        # Get task counts in a single query
-        tasks_query = """
-            SELECT 
-                (SELECT COUNT(*) FROM tasks WHERE assigned_to = :user_id AND status = 'pending') AS pending_tasks,
-                (SELECT COUNT(*) FROM tasks WHERE assigned_to = :user_id AND status = 'pending' AND due_date < :today) AS overdue_tasks
-        """
-        task_result = db.session.execute(text(tasks_query), {
-            "user_id": user_id,
-            "today": datetime.now().date()
-        }).fetchone()
-        
-        stats['pending_tasks'] = task_result[0] if task_result else 0
-        stats['overdue_tasks'] = task_result[1] if task_result else 0
-        
-        # Count communications
-        thirty_days_ago = datetime.now() - timedelta(days=30)
-        if is_super_admin:
-            communications_count = db.session.query(func.count(Communication.id)).filter(
-                Communication.created_at >= thirty_days_ago
-            ).scalar() or 0
-        else:
-            communications_count = db.session.query(func.count(Communication.id)).filter(
-                Communication.office_id == office_id,
-                Communication.created_at >= thirty_days_ago
-            ).scalar() or 0
-            
-        stats['recent_communications'] = communications_count
+        stats = get_rollup_stats(
+            office_id=office_id,
+            assignee=user_id,
+            all_offices=is_super_admin
+        )
         
         return stats
         
@@ -4,7 +4,9 @@ from app.models.email_template import EmailTemplate
 from app.models.email_campaign import EmailCampaign
 from app.models.email_tracking import EmailTracking
 from app.models.person import Person
-from app.utils.email_service import send_bulk_email
+from app.services.job_service import enqueue_job
+from app.services.tracking_service import record_tracking_event
+from app.routes.jobs import job_response
 from app.extensions import db
 import datetime
 import json
@@ -380,13 +382,20 @@ def send_campaign(campaign_id):
         flash('This campaign has already been sent or cancelled', 'warning')
         return redirect(url_for('emails.campaigns'))
     
-    # Call the send_bulk_email function
-    success, message, sent_count = send_bulk_email(campaign.id)
-    
-    if success:
-        flash(f'Campaign is being sent to {sent_count} recipients', 'success')
+    # Send the campaign as a background job
+    job = enqueue_job(
+        'campaign_send',
+        params={'campaign_id': campaign.id},
+        user_id=current_user.id,
+        office_id=campaign.office_id
+    )
+    
+    if job.status == 'completed':
+        flash(f"Campaign is being sent to {job.get_result()['sent_count']} recipients", 'success')
+    elif job.status == 'failed':
+        flash(f'Error sending campaign: {job.error_message}', 'danger')
     else:
-        flash(f'Error sending campaign: {message}', 'danger')
+        return job_response(job, url_for('emails.campaigns'), 'Campaign send')
     
     return redirect(url_for('emails.campaigns'))
 
@@ -448,18 +457,8 @@ def campaign_analytics(campaign_id):
 @emails_bp.route('/track/open/<tracking_id>', methods=['GET'])
 def track_open(tracking_id):
     """Track email opens via a tracking pixel."""
-    tracking = EmailTracking.query.filter_by(tracking_pixel=tracking_id).first()
-    
-    if tracking:
-        tracking.mark_opened()
-        db.session.commit()
-        
-        # If this is part of a campaign, update campaign stats
-        if tracking.bulk_send_id:
-            campaign = EmailCampaign.query.get(int(tracking.bulk_send_id))
-            if campaign:
-                campaign.update_stats()
-                db.session.commit()
+    # Queued and applied in batches; the pixel is returned straight away
+    record_tracking_event(tracking_id, 'open')
     
     # Return a 1x1 transparent pixel
     return current_app.send_static_file('images/pixel.gif')
@@ -467,19 +466,10 @@ def track_open(tracking_id):
 @emails_bp.route('/track/click/<tracking_id>', methods=['GET'])
 def track_click(tracking_id):
     """Track email link clicks and redirect to the original URL."""
-    tracking = EmailTracking.query.filter_by(tracking_pixel=tracking_id).first()
     redirect_url = request.args.get('redirect_url', '/')
     
-    if tracking:
-        tracking.mark_clicked()
-        db.session.commit()
-        
-        # If this is part of a campaign, update campaign stats
-        if tracking.bulk_send_id:
-            campaign = EmailCampaign.query.get(int(tracking.bulk_send_id))
-            if campaign:
-                campaign.update_stats()
-                db.session.commit()
+    # Queued and applied in batches; the redirect is not held up by the database
+    record_tracking_event(tracking_id, 'click')
     
     return redirect(redirect_url)
 
@@ -8,6 +8,8 @@ from app.models.sync_history import SyncHistory
 from app.services.google.people import GooglePeopleService
 from app.services.contact_sync import ContactSyncService
 from app.services.google_api import GoogleAPIService
+from app.services.job_service import enqueue_job
+from app.routes.jobs import job_response
 from app.extensions import db
 import logging
 import os
@@ -398,42 +400,19 @@ def manual_sync():
         flash('You need to connect your Google account first.', 'warning')
         return redirect(url_for('auth.google_auth'))
     
-    # Get the token info dictionary for the API service
-    token_info = {
-        'token': google_token.access_token,
-        'refresh_token': google_token.refresh_token,
-        'token_uri': 'https://oauth2.googleapis.com/token',
-        'client_id': os.getenv('GOOGLE_CLIENT_ID'),
-        'client_secret': os.getenv('GOOGLE_CLIENT_SECRET'),
-        'scopes': json.loads(google_token.scopes) if google_token.scopes else [],
-        'expiry': google_token.expires_at.isoformat() if google_token.expires_at else None
-    }
-    
     try:
         if sync_type == 'contacts':
-            # Use the ContactSyncService
-            success, result, error_message = ContactSyncService.sync_contacts(current_user.id, token_info)
+            # Contact sync runs as a background job; ContactSyncService
+            # records its own sync history
+            job = enqueue_job('contacts_sync', user_id=current_user.id, office_id=current_user.office_id)
             
-            if success:
-                # Create sync history record
-                sync_record = SyncHistory(
-                    user_id=current_user.id,
-                    sync_type='contacts_sync',
-                    status='completed',
-                    items_processed=result.get('items_processed', 0),
-                    items_created=result.get('items_created', 0),
-                    items_updated=result.get('items_updated', 0),
-                    items_skipped=result.get('items_skipped', 0),
-                    items_failed=result.get('items_failed', 0),
-                    created_at=datetime.now(),
-                    completed_at=datetime.now()
-                )
-                db.session.add(sync_record)
-                db.session.commit()
-                
+            if job.status == 'completed':
+                result = job.get_result() or {}
                 flash(f"Successfully synced contacts. Created: {result.get('items_created', 0)}, Updated: {result.get('items_updated', 0)}, Failed: {result.get('items_failed', 0)}", 'success')
+            elif job.status == 'failed':
+                flash(f"Error syncing contacts: {job.error_message}", 'error')
             else:
-                flash(f"Error syncing contacts: {error_message}", 'error')
+                return job_response(job, url_for('google_sync.index'), 'Contact sync')
                 
         elif sync_type == 'calendar':
             try:
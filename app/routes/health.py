@@ -2,8 +2,9 @@
 Health check endpoints for monitoring application status.
 """
 
-from flask import Blueprint, jsonify, current_app
+from flask import Blueprint, Response, jsonify, current_app, request
 import datetime
+import hmac
 import os
 import platform
 import psutil
@@ -106,4 +107,24 @@ def readiness_check():
         'status': 'ready' if all_ready else 'not_ready',
         'time': datetime.datetime.now().isoformat(),
         'components': components
-    }), status_code
\ No newline at end of file
+    }), status_code
+
+@health_bp.route('/metrics', methods=['GET'])
+def prometheus_metrics():
+    """
+    Request metrics in the Prometheus text format.
+
+    Scrapers must send the bearer METRICS_TOKEN. Without a configured token
+    the endpoint is only served in debug (development and testing) and
+    returns 404 elsewhere, so metrics are never public by default.
+    """
+    from app.monitoring.metrics import metrics
+
+    token = current_app.config.get('METRICS_TOKEN')
+    if not token:
+        if not current_app.debug:
+            return jsonify({'status': 'error', 'message': 'Metrics are disabled; set METRICS_TOKEN'}), 404
+    elif not hmac.compare_digest(request.headers.get('Authorization', ''), f'Bearer {token}'):
+        return jsonify({'status': 'error', 'message': 'Unauthorized'}), 401
+
+    return Response(metrics.render_prometheus(), mimetype='text/plain; version=0.0.4')
@@ -0,0 +1,75 @@
+from flask import Blueprint, jsonify, request, flash, redirect, send_file, abort, url_for
+from flask_login import login_required, current_user
+from app.extensions import db
+from app.models.job import Job
+from app.services.job_service import export_file_path, resume_job
+import os
+
+jobs_bp = Blueprint('jobs', __name__)
+
+
+def _get_job_or_404(job_id):
+    """Get a job the current user is allowed to see."""
+    job = db.session.get(Job, job_id)
+    if job is None:
+        abort(404)
+    if job.user_id != current_user.id and not current_user.is_super_admin():
+        abort(403)
+    return job
+
+
+def job_response(job, redirect_url, message):
+    """
+    Respond to a request that enqueued a background job.
+
+    AJAX and JSON clients get 202 with the status URL to poll. Browser
+    requests are redirected with a flash message, including the outcome when
+    the job already finished (eager execution).
+    """
+    status_url = url_for('jobs.status', job_id=job.id)
+    if request.is_json or request.headers.get('X-Requested-With') == 'XMLHttpRequest':
+        return jsonify({'success': True, 'job': job.to_dict(), 'status_url': status_url}), 202
+
+    if job.status == 'failed':
+        flash(f'{message} failed: {job.error_message}', 'danger')
+    elif job.status == 'completed':
+        flash(f'{message} completed.', 'success')
+    else:
+        flash(f'{message} started in the background.', 'info')
+    return redirect(redirect_url)
+
+
+@jobs_bp.route('/<int:job_id>', methods=['GET'])
+@login_required
+def status(job_id):
+    """Return the status and progress of a background job."""
+    job = _get_job_or_404(job_id)
+    data = job.to_dict()
+    if job.job_type == 'export' and job.status == 'completed':
+        data['download_url'] = url_for('jobs.download', job_id=job.id)
+    return jsonify(data)
+
+
+@jobs_bp.route('/<int:job_id>/download', methods=['GET'])
+@login_required
+def download(job_id):
+    """Download the file produced by a completed export job."""
+    job = _get_job_or_404(job_id)
+    result = job.get_result() or {}
+    if job.job_type != 'export' or job.status != 'completed' or not result.get('filename'):
+        abort(404)
+    path = export_file_path(job.id, result['filename'])
+    if not os.path.exists(path):
+        abort(404)
+    return send_file(path, as_attachment=True, download_name=result['filename'])
+
+
+@jobs_bp.route('/<int:job_id>/resume', methods=['POST'])
+@login_required
+def resume(job_id):
+    """Resume a failed or interrupted job from its last checkpoint."""
+    job = _get_job_or_404(job_id)
+    job = resume_job(job.id)
+    if job is None:
+        return jsonify({'success': False, 'message': 'Only failed or stalled jobs can be resumed'}), 409
+    return jsonify({'success': True, 'job': job.to_dict()}), 202
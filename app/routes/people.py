@@ -1,20 +1,24 @@
-from flask import Blueprint, render_template, redirect, url_for, flash, request, jsonify, current_app, send_file, make_response
+from flask import Blueprint, render_template, redirect, url_for, flash, request, jsonify, current_app
 from flask_login import login_required, current_user
-from sqlalchemy import or_, text
+from sqlalchemy import text
 from sqlalchemy.orm import joinedload
 from datetime import datetime
 import os
-import pandas as pd
 import uuid
 import time
-import io
 
 from app.models.person import Person
 from app.models.church import Church
-from app.models.pipeline import Pipeline, PipelineStage, PipelineContact
 from app.forms.person import PersonForm
 from app.extensions import db
 from app.utils.decorators import office_required
+from app.utils.caching import PEOPLE_LIST_ORDER, PEOPLE_PER_PAGE, get_people_stage_names
+from app.utils.query_optimization import with_keyset_pagination
+from app.utils.export import iter_export_rows, stream_csv, stream_excel
+from app.services.export_service import people_export
+from app.services.search_service import apply_search
+from app.services.job_service import enqueue_job, get_jobs_dir
+from app.routes.jobs import job_response
 
 # Create blueprint
 people_bp = Blueprint('people', __name__)
@@ -23,7 +27,7 @@ people_bp = Blueprint('people', __name__)
 @login_required
 @office_required
 def index():
-    """List all people."""
+    """List people one page at a time in name order."""
     # Get the 'assigned' parameter from the request
     assigned_filter = request.args.get('assigned', '')
     show_assigned = assigned_filter == 'me'
@@ -48,41 +52,16 @@ def index():
             # Log the SQL query for debugging
             current_app.logger.info(f"SQL Query: {query}")
         
-        # Get the results ordered by name
-        people = query.order_by(Person.last_name, Person.first_name).all()
-        current_app.logger.info(f"Found {len(people)} people matching the criteria")
+        # Get one page ordered by name; the cursor marks where the page starts
+        per_page = max(1, min(request.args.get('per_page', PEOPLE_PER_PAGE, type=int), 500))
+        people, pagination = with_keyset_pagination(
+            query, PEOPLE_LIST_ORDER, request.args.get('cursor'), per_page
+        )
+        current_app.logger.info(f"Loaded {len(people)} people for this page")
         
-        # Preload pipeline data to avoid N+1 query problem
+        # Look up main pipeline stages for this page only
         try:
-            # First, get the main pipeline
-            main_pipeline = Pipeline.query.filter_by(pipeline_type="people", is_main_pipeline=True).first()
-            if main_pipeline:
-                # Get all pipeline contacts for these people in one query
-                person_ids = [person.id for person in people]
-                pipeline_contacts = PipelineContact.query.filter(
-                    PipelineContact.contact_id.in_(person_ids),
-                    PipelineContact.pipeline_id == main_pipeline.id
-                ).all()
-                
-                # Create a lookup dictionary for quick access
-                contact_stage_map = {}
-                stage_ids = set()
-                for pc in pipeline_contacts:
-                    contact_stage_map[pc.contact_id] = pc.current_stage_id
-                    if pc.current_stage_id:
-                        stage_ids.add(pc.current_stage_id)
-                
-                # Get all stages in one query
-                stages = PipelineStage.query.filter(PipelineStage.id.in_(stage_ids)).all()
-                stage_name_map = {stage.id: stage.name for stage in stages}
-                
-                # Create a dictionary to store pipeline stage data
-                pipeline_stages = {}
-                for person in people:
-                    if person.id in contact_stage_map and contact_stage_map[person.id] in stage_name_map:
-                        pipeline_stages[person.id] = stage_name_map[contact_stage_map[person.id]]
-                    else:
-                        pipeline_stages[person.id] = person.pipeline_stage or 'Not in Pipeline'
+            pipeline_stages = get_people_stage_names(people)
         except Exception as e:
             current_app.logger.error(f"Error preloading pipeline data: {str(e)}")
             # Fall back to using the stored pipeline_stage
@@ -93,6 +72,7 @@ def index():
         return render_template('people/list.html', 
                             people=people,
                             pipeline_stages=pipeline_stages,
+                            pagination=pagination,
                             show_assigned=show_assigned,
                             page_title='People')
     except Exception as e:
@@ -667,49 +647,23 @@ def import_people():
             flash('File must be a CSV', 'danger')
             return redirect(url_for('people.index'))
         
-        # Process CSV file
-        df = pd.read_csv(file)
-        
-        # Check if header row should be skipped
-        if 'header_row' not in request.form:
-            # No header row, add default column names
-            df.columns = ['first_name', 'last_name', 'email', 'phone', 'address', 'city', 'state', 'zip_code', 'country']
-        
-        # Process each row
-        success_count = 0
-        error_count = 0
-        
-        for index, row in df.iterrows():
-            try:
-                # Create a new person
-                person = Person(
-                    first_name=row.get('first_name', ''),
-                    last_name=row.get('last_name', ''),
-                    email=row.get('email', ''),
-                    phone=row.get('phone', ''),
-                    address=row.get('address', ''),
-                    city=row.get('city', ''),
-                    state=row.get('state', ''),
-                    zip_code=row.get('zip_code', ''),
-                    country=row.get('country', ''),
-                    type='person',
-                    office_id=current_user.office_id,
-                    user_id=current_user.id,
-                    created_at=datetime.now(),
-                    updated_at=datetime.now(),
-                    status='active'
-                )
-                
-                db.session.add(person)
-                success_count += 1
-            except Exception as e:
-                current_app.logger.error(f"Error importing person: {str(e)}")
-                error_count += 1
-        
-        db.session.commit()
-        
-        flash(f'Successfully imported {success_count} people. {error_count} errors.', 'success')
-        return redirect(url_for('people.index'))
+        # Save the upload and import it as a background job; rows are
+        # validated and inserted in bulk, one committed chunk at a time
+        path = os.path.join(get_jobs_dir('imports'), f"{uuid.uuid4().hex}.csv")
+        file.save(path)
+        job = enqueue_job(
+            'people_import',
+            params={'path': path, 'has_header': 'header_row' in request.form},
+            user_id=current_user.id,
+            office_id=current_user.office_id
+        )
+        
+        if job.status == 'completed':
+            stats = job.get_result()
+            flash(f"Successfully imported {stats['created']} people. "
+                  f"{stats['duplicates']} duplicates skipped. {stats['errors']} errors.", 'success')
+            return redirect(url_for('people.index'))
+        return job_response(job, url_for('people.index'), 'People import')
     except Exception as e:
         db.session.rollback()
         current_app.logger.error(f"Error importing people: {str(e)}")
@@ -729,72 +683,29 @@ def export_people():
         # include_tasks parameter is reserved for future implementation
         # when task export functionality is added
         
-        # Start with a base query
-        if current_user.is_super_admin():
-            query = Person.query
-        else:
-            query = Person.query.filter_by(office_id=current_user.office_id)
-            
-        # Get all people
-        people = query.order_by(Person.last_name, Person.first_name).all()
-        
-        # Create a DataFrame from the people data
-        data = []
-        for person in people:
-            person_data = {
-                'ID': person.id,
-                'First Name': person.first_name,
-                'Last Name': person.last_name,
-                'Email': person.email,
-                'Phone': person.phone,
-                'Address': person.address,
-                'City': person.city,
-                'State': person.state,
-                'Zip': person.zip_code,
-                'Country': person.country,
-                'Pipeline Stage': person.pipeline_stage,
-                'Priority': person.priority,
-                'Assigned To': person.assigned_to,
-                'Created': person.date_created.strftime('%Y-%m-%d') if person.date_created else '',
-                'Last Updated': person.date_modified.strftime('%Y-%m-%d') if person.date_modified else ''
-            }
-            
-            # Include notes if requested
-            if include_notes and person.notes:
-                person_data['Notes'] = person.notes
-                
-            data.append(person_data)
-            
-        # Create DataFrame
-        df = pd.DataFrame(data)
+        # Super admins export every office
+        office_id = None if current_user.is_super_admin() else current_user.office_id
+        
+        # Large exports can be written by a background job and downloaded later
+        if request.args.get('background'):
+            job = enqueue_job(
+                'export',
+                params={'export': 'people', 'format': export_format,
+                        'office_id': office_id, 'include_notes': include_notes},
+                user_id=current_user.id,
+                office_id=current_user.office_id
+            )
+            return job_response(job, url_for('people.index'), 'People export')
         
-        # Generate filename with timestamp
-        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+        # Stream people in batches rather than loading the whole office at once
+        spec = people_export(office_id, include_notes=include_notes)
+        rows = iter_export_rows(spec['query'], spec['to_row'])
         
         # Export based on requested format
         if export_format == 'excel':
-            # Create Excel file in memory
-            output = io.BytesIO()
-            with pd.ExcelWriter(output, engine='xlsxwriter') as writer:
-                df.to_excel(writer, sheet_name='People', index=False)
-                
-            output.seek(0)
-            
-            return send_file(
-                output,
-                mimetype='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet',
-                as_attachment=True,
-                download_name=f'people_export_{timestamp}.xlsx'
-            )
+            return stream_excel(rows, spec['columns'], spec['filename'], sheet_name=spec['sheet_name'])
         else:  # Default to CSV
-            # Create CSV in memory
-            output = io.StringIO()
-            df.to_csv(output, index=False)
-            
-            response = make_response(output.getvalue())
-            response.headers['Content-Disposition'] = f'attachment; filename=people_export_{timestamp}.csv'
-            response.headers['Content-Type'] = 'text/csv'
-            return response
+            return stream_csv(rows, spec['columns'], spec['filename'])
             
     except Exception as e:
         current_app.logger.error(f'Error exporting people: {str(e)}')
@@ -830,19 +741,9 @@ def search():
                 pipeline_match = True
                 break
         
-        # If no pipeline match, search other fields
+        # If no pipeline match, search other fields, best matches first
         if not pipeline_match:
-            query = query.filter(
-                or_(
-                    Person.first_name.ilike(f'%{search_term}%'),
-                    Person.last_name.ilike(f'%{search_term}%'),
-                    Person.email.ilike(f'%{search_term}%'),
-                    Person.phone.ilike(f'%{search_term}%'),
-                    Person.address.ilike(f'%{search_term}%'),
-                    Person.city.ilike(f'%{search_term}%'),
-                    Person.state.ilike(f'%{search_term}%')
-                )
-            )
+            query = apply_search(query, Person, search_term)
     
     # Apply pipeline filter if provided
     if pipeline_filter:
@@ -861,8 +762,16 @@ def search():
         query = query.filter(Person.office_id == current_user.office_id)
     
     try:
-        # Get results with increased limit
-        people = query.limit(50).all()
+        # Ranked search results are capped; plain listings are paged by name
+        # with a keyset cursor returned in the X-Next-Cursor header
+        pagination = None
+        if search_term:
+            people = query.limit(50).all()
+        else:
+            per_page = max(1, min(request.args.get('per_page', PEOPLE_PER_PAGE, type=int), 500))
+            people, pagination = with_keyset_pagination(
+                query, PEOPLE_LIST_ORDER, request.args.get('cursor'), per_page
+            )
         
         # Debug output
         current_app.logger.info(f"Search query: {search_term}")
@@ -896,7 +805,10 @@ def search():
         
         # Log the response we're about to send
         current_app.logger.info(f"Returning {len(people_dicts)} people in search results")
-        return jsonify(people_dicts)
+        response = jsonify(people_dicts)
+        if pagination and pagination['next_cursor']:
+            response.headers['X-Next-Cursor'] = pagination['next_cursor']
+        return response
     except Exception as e:
         current_app.logger.error(f"Search error: {str(e)}")
         return jsonify({"error": str(e)}), 500
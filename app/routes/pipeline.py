@@ -51,11 +51,7 @@ def view(pipeline_id):
             current_app.logger.info(f"Using database: {db_path}")
         
         # Add debug info
-        contact_count = db.session.execute(
-            db.text("SELECT COUNT(*) FROM pipeline_contacts WHERE pipeline_id = :pipeline_id"),
-            {"pipeline_id": pipeline_id}
-        ).scalar() or 0
-        current_app.logger.info(f"View pipeline {pipeline_id}, name={pipeline.name}, type={pipeline.pipeline_type}, SQL count: {contact_count}")
+        current_app.logger.info(f"View pipeline {pipeline_id}, name={pipeline.name}, type={pipeline.pipeline_type}, count: {pipeline.count_contacts()}")
         
         # Check if user has permission to view this pipeline
         if not current_user.is_super_admin() and pipeline.office_id != current_user.office_id:
@@ -12,7 +12,10 @@ from ..models.communication import Communication
 from ..models.office import Office
 from ..models.pipeline import Pipeline, PipelineStage, PipelineContact
 from ..auth.permissions import admin_required, office_member_required
-from ..utils.export import generate_csv, generate_excel
+from ..utils.export import generate_csv, generate_excel, iter_export_rows, stream_csv, stream_excel
+from ..services.export_service import entity_export, pipeline_export
+from ..services.job_service import enqueue_job
+from .jobs import job_response
 from ..extensions import db
 
 # Create Blueprint for reports
@@ -303,62 +306,30 @@ def export_data(entity_type):
             flash('You must be associated with an office to export data', 'error')
             return redirect(url_for('reports.reports_dashboard'))
         
-        # Configure export based on entity type
-        if entity_type == 'contacts':
-            query = db.session.query(Person).filter(Person.office_id == office_id)
-            columns = ['id', 'first_name', 'last_name', 'email', 'phone', 'address', 'status', 'created_at']
-            filename = f"contacts_export_{datetime.datetime.now().strftime('%Y%m%d')}"
-        
-        elif entity_type == 'churches':
-            query = db.session.query(Church).filter(Church.office_id == office_id)
-            columns = ['id', 'name', 'pastor_name', 'email', 'phone', 'address', 'created_at']
-            filename = f"churches_export_{datetime.datetime.now().strftime('%Y%m%d')}"
-        
-        elif entity_type == 'tasks':
-            query = db.session.query(Task).filter(Task.office_id == office_id)
-            columns = ['id', 'title', 'description', 'status', 'priority', 'due_date', 'assigned_to', 'created_at']
-            filename = f"tasks_export_{datetime.datetime.now().strftime('%Y%m%d')}"
-        
-        elif entity_type == 'communications':
-            query = db.session.query(Communication).filter(Communication.office_id == office_id)
-            columns = ['id', 'person_id', 'type', 'subject', 'content', 'created_at']
-            filename = f"communications_export_{datetime.datetime.now().strftime('%Y%m%d')}"
-            
-        # Execute query with exception handling
-        try:
-            data = query.all()
-            current_app.logger.info(f"Found {len(data)} records for {entity_type} export")
-        except Exception as db_error:
-            current_app.logger.error(f"Database error during export: {str(db_error)}")
-            import traceback
-            current_app.logger.error(f"DB Error details: {traceback.format_exc()}")
-            flash(f'Database error while fetching data: {str(db_error)}', 'error')
-            return redirect(url_for('reports.reports_dashboard'))
+        # Large exports can be written by a background job and downloaded later
+        if request.form.get('background'):
+            job = enqueue_job(
+                'export',
+                params={'export': 'entity', 'format': format_type,
+                        'entity_type': entity_type, 'office_id': office_id},
+                user_id=current_user.id,
+                office_id=office_id
+            )
+            return job_response(job, url_for('reports.reports_dashboard'), f'{entity_type.title()} export')
         
-        # Convert data to list of dicts
-        data_list = []
-        for item in data:
-            item_dict = {}
-            for col in columns:
-                # Handle AttributeError for any missing attributes
-                try:
-                    value = getattr(item, col)
-                    # Handle datetime objects
-                    if isinstance(value, (datetime.date, datetime.datetime)):
-                        value = value.isoformat()
-                    item_dict[col] = value
-                except AttributeError:
-                    item_dict[col] = None
-            data_list.append(item_dict)
+        spec = entity_export(entity_type, office_id)
+        columns, filename = spec['columns'], spec['filename']
         
-        current_app.logger.debug(f"Generating {format_type} export with {len(data_list)} rows")
+        # Rows are fetched in batches while the response is being written
+        rows = iter_export_rows(spec['query'], spec['to_row'])
+        current_app.logger.debug(f"Streaming {format_type} export for {entity_type}")
         
         # Generate and return the export file
         try:
             if format_type == 'csv':
-                return generate_csv(data_list, columns, filename)
+                return stream_csv(rows, columns, filename)
             elif format_type == 'excel':
-                return generate_excel(data_list, columns, filename)
+                return stream_excel(rows, columns, filename)
             else:
                 current_app.logger.warning(f"Invalid format type for export: {format_type}")
                 flash('Invalid format type', 'error')
@@ -395,70 +366,26 @@ def export_pipeline(pipeline_id):
         flash('You do not have permission to export this pipeline.', 'danger')
         return redirect(url_for('pipeline.index'))
     
-    # Get all contacts in this pipeline
-    pipeline_contacts = PipelineContact.query.filter_by(pipeline_id=pipeline_id).all()
-    
-    # Prepare data for export
-    data_list = []
-    for pc in pipeline_contacts:
-        contact = pc.contact
-        stage = pc.current_stage
-        
-        if not contact or not stage:
-            continue
-            
-        # Skip if contact type doesn't match pipeline type
-        if pipeline.pipeline_type not in ['both', contact.contact_type]:
-            continue
-            
-        contact_data = {
-            'pipeline_contact_id': pc.id,
-            'stage_name': stage.name,
-            'days_in_stage': (datetime.datetime.utcnow() - pc.last_updated).days if pc.last_updated else 0,
-            'entered_pipeline': pc.entered_at.strftime('%Y-%m-%d') if pc.entered_at else '',
-            'last_updated': pc.last_updated.strftime('%Y-%m-%d') if pc.last_updated else ''
-        }
-        
-        # Add contact-specific fields based on type
-        if contact.contact_type == 'person':
-            contact_data.update({
-                'contact_id': contact.id,
-                'contact_type': 'Person',
-                'first_name': getattr(contact, 'first_name', ''),
-                'last_name': getattr(contact, 'last_name', ''),
-                'email': getattr(contact, 'email', ''),
-                'phone': getattr(contact, 'phone', ''),
-                'status': getattr(contact, 'status', '')
-            })
-        else:  # church
-            contact_data.update({
-                'contact_id': contact.id,
-                'contact_type': 'Church',
-                'name': getattr(contact, 'name', ''),
-                'pastor_name': getattr(contact, 'pastor_name', ''),
-                'email': getattr(contact, 'email', ''),
-                'phone': getattr(contact, 'phone', '')
-            })
-            
-        data_list.append(contact_data)
-    
-    # Define columns based on pipeline type
-    if pipeline.pipeline_type == 'person':
-        columns = ['pipeline_contact_id', 'contact_id', 'first_name', 'last_name', 'email', 'phone', 
-                  'status', 'stage_name', 'days_in_stage', 'entered_pipeline', 'last_updated']
-    elif pipeline.pipeline_type == 'church':
-        columns = ['pipeline_contact_id', 'contact_id', 'name', 'pastor_name', 'email', 'phone',
-                  'stage_name', 'days_in_stage', 'entered_pipeline', 'last_updated']
-    else:  # both
-        columns = ['pipeline_contact_id', 'contact_id', 'contact_type', 'first_name', 'last_name', 'name', 
-                  'pastor_name', 'email', 'phone', 'stage_name', 'days_in_stage', 'entered_pipeline', 'last_updated']
+    # Large exports can be written by a background job and downloaded later
+    if request.form.get('background'):
+        job = enqueue_job(
+            'export',
+            params={'export': 'pipeline', 'format': format_type, 'pipeline_id': pipeline.id},
+            user_id=current_user.id,
+            office_id=office_id
+        )
+        return job_response(job, url_for('pipeline.index'), 'Pipeline export')
     
-    filename = f"{pipeline.name.replace(' ', '_')}_export_{datetime.datetime.now().strftime('%Y%m%d')}"
+    # Pipeline contacts are loaded together with their stage and contact in
+    # one query, fetched in batches while the export is written
+    spec = pipeline_export(pipeline)
+    columns, filename = spec['columns'], spec['filename']
+    rows = iter_export_rows(spec['query'], spec['to_row'])
     
     if format_type == 'csv':
-        return generate_csv(data_list, columns, filename)
+        return stream_csv(rows, columns, filename)
     elif format_type == 'excel':
-        return generate_excel(data_list, columns, filename)
+        return stream_excel(rows, columns, filename)
     else:
         return jsonify({'error': 'Invalid format type'}), 400
 
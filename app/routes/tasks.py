@@ -11,7 +11,9 @@ from flask import current_app
 from app.utils.decorators import office_required
 from app.forms.task import TaskForm
 from app.forms.task_batch_reminder import TaskBatchReminderForm
-from sqlalchemy import or_
+from app.services.task_service import (
+    user_tasks_query, filter_tasks, get_task_page, get_task_counts, get_upcoming_tasks
+)
 
 tasks_bp = Blueprint('tasks', __name__, template_folder='../templates/tasks')
 
@@ -24,84 +26,25 @@ def index():
     status_filter = request.args.get('status')
     priority_filter = request.args.get('priority')
     search_text = request.args.get('search', '').lower().strip()
+    page = request.args.get('page', 1, type=int)
+    current_date = datetime.now().date()
     
-    # Base query for tasks assigned to the current user
-    query = Task.query.filter(
-        (Task.assigned_to == str(current_user.id)) | 
-        (Task.created_by == current_user.id) |
-        (Task.owner_id == current_user.id)
-    )
-    
-    # Apply status filter
-    if status_filter and status_filter != 'all':
-        if status_filter == 'overdue':
-            # Special handling for overdue tasks
-            current_date = datetime.now().date()
-            query = query.filter(
-                Task.status != TaskStatus.COMPLETED,
-                Task.due_date < current_date
-            )
-        else:
-            # Convert string status to Enum
-            try:
-                status_enum = TaskStatus(status_filter)
-                query = query.filter(Task.status == status_enum)
-            except ValueError:
-                # If invalid status provided, log it and ignore the filter
-                current_app.logger.warning(f"Invalid status filter: {status_filter}")
-    else:
-        # Default behavior: exclude completed tasks
-        query = query.filter(Task.status != TaskStatus.COMPLETED)
-    
-    # Apply priority filter
-    if priority_filter and priority_filter != 'all':
-        try:
-            priority_enum = TaskPriority(priority_filter)
-            query = query.filter(Task.priority == priority_enum)
-        except ValueError:
-            # If invalid priority provided, log it and ignore the filter
-            current_app.logger.warning(f"Invalid priority filter: {priority_filter}")
-    
-    # Apply search filter
-    if search_text:
-        search = f"%{search_text}%"
-        query = query.filter(
-            or_(
-                Task.title.ilike(search),
-                Task.description.ilike(search),
-                Task.related_to.has(Person.name.ilike(search)),
-                Task.related_to.has(Church.name.ilike(search))
-            )
-        )
-    
-    # Execute query with ordering
-    filtered_tasks = query.order_by(Task.due_date.asc()).all()
-    
-    # Get all tasks for statistics (including completed)
-    all_tasks_query = Task.query.filter(
-        (Task.assigned_to == str(current_user.id)) | 
-        (Task.created_by == current_user.id) |
-        (Task.owner_id == current_user.id)
-    )
-    all_tasks = all_tasks_query.all()
+    # Tasks assigned to, created by or owned by the current user
+    user_tasks = user_tasks_query(current_user.id)
+    query = filter_tasks(user_tasks, status_filter, priority_filter, search_text, today=current_date)
     
-    # Calculate overdue tasks
-    overdue_count = 0
-    current_date = datetime.now().date()
-    for task in filtered_tasks:
-        if task.status != TaskStatus.COMPLETED and task.due_date:
-            # Compare dates to detect overdue tasks
-            if hasattr(task.due_date, 'date'):
-                due_date_val = task.due_date.date()
-            else:
-                due_date_val = task.due_date
-            if due_date_val < current_date:
-                overdue_count += 1
+    # One page of the filtered tasks; statistics over all of the user's
+    # tasks (including completed) come from a single grouped count
+    pagination = get_task_page(query, page=page)
+    task_counts = get_task_counts(user_tasks, today=current_date)
+    upcoming_tasks = get_upcoming_tasks(user_tasks)
             
     return render_template('tasks/index.html', 
-                          tasks=filtered_tasks, 
-                          all_tasks=all_tasks,
-                          overdue_count=overdue_count,
+                          tasks=pagination.items, 
+                          pagination=pagination,
+                          task_counts=task_counts,
+                          upcoming_tasks=upcoming_tasks,
+                          overdue_count=task_counts['overdue'],
                           current_date=current_date,
                           show_completed=(status_filter == 'completed' or status_filter == TaskStatus.COMPLETED.value),
                           page_title="My Tasks")
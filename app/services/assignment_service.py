@@ -0,0 +1,107 @@
+"""
+Assignment Service
+
+Assigns people and churches to a user, or clears their assignment, with
+set-based UPDATEs instead of loading and flushing each contact. Selected
+ids are processed in chunks; per chunk one UPDATE sets assigned_to on the
+people or churches table and one sets updated_at on the contacts table,
+both scoped to the office when one is given. The whole batch is committed
+once and the affected cache namespace is invalidated once afterwards,
+since Core statements do not fire the ORM cache hooks.
+"""
+
+import logging
+from datetime import datetime
+from sqlalchemy import select, update
+from app.extensions import db
+from app.models.base import Contact
+from app.models.church import Church
+from app.models.person import Person
+from app.utils.caching import invalidate_churches_cache, invalidate_people_cache
+
+logger = logging.getLogger(__name__)
+
+# Contact ids per UPDATE; keeps the IN list well under driver parameter limits
+ASSIGNMENT_CHUNK_SIZE = 1000
+
+_CACHE_INVALIDATORS = {
+    Person: invalidate_people_cache,
+    Church: invalidate_churches_cache
+}
+
+
+def _contact_ids(contact_ids):
+    """Return the selected ids as sorted, de-duplicated integers."""
+    return sorted({int(contact_id) for contact_id in contact_ids})
+
+
+def set_assignment(model, contact_ids, username, office_id=None, chunk_size=ASSIGNMENT_CHUNK_SIZE, now=None):
+    """
+    Set assigned_to on the given people or churches.
+
+    Args:
+        model: Person or Church
+        contact_ids: Ids of the contacts to update (ints or numeric strings)
+        username: Username to assign, or None to unassign
+        office_id: Only update contacts of this office (None for all offices)
+        chunk_size: Number of ids per UPDATE
+        now: Timestamp for updated_at
+
+    Returns:
+        int: Number of contacts updated
+    """
+    now = now or datetime.now()
+    ids = _contact_ids(contact_ids)
+    contacts = Contact.__table__
+    members = model.__table__
+
+    count = 0
+    try:
+        for start in range(0, len(ids), chunk_size):
+            chunk = ids[start:start + chunk_size]
+            in_scope = select(contacts.c.id).where(contacts.c.id.in_(chunk))
+            if office_id is not None:
+                in_scope = in_scope.where(contacts.c.office_id == office_id)
+
+            result = db.session.execute(
+                update(members)
+                .where(members.c.id.in_(chunk), members.c.id.in_(in_scope))
+                .values(assigned_to=username)
+            )
+            count += result.rowcount
+
+            touched = contacts.c.id.in_(select(members.c.id).where(members.c.id.in_(chunk)))
+            stamp = update(contacts).where(contacts.c.id.in_(chunk), touched)
+            if office_id is not None:
+                stamp = stamp.where(contacts.c.office_id == office_id)
+            db.session.execute(stamp.values(updated_at=now))
+
+        db.session.commit()
+    except Exception:
+        db.session.rollback()
+        raise
+
+    if count:
+        _CACHE_INVALIDATORS[model](office_id)
+    logger.info(f"Set assigned_to={username!r} on {count} {members.name}")
+    return count
+
+
+def assign_people(person_ids, username, office_id=None, **kwargs):
+    """Assign people to the user with this username; returns the number assigned."""
+    return set_assignment(Person, person_ids, username, office_id, **kwargs)
+
+
+def assign_churches(church_ids, username, office_id=None, **kwargs):
+    """Assign churches to the user with this username; returns the number assigned."""
+    return set_assignment(Church, church_ids, username, office_id, **kwargs)
+
+
+def unassign_people(person_ids, office_id=None, **kwargs):
+    """Clear the assignment of people; returns the number unassigned."""
+    return set_assignment(Person, person_ids, None, office_id, **kwargs)
+
+
+def unassign_churches(church_ids, office_id=None, **kwargs):
+    """Clear the assignment of churches; returns the number unassigned."""
+    return set_assignment(Church, church_ids, None, office_id, **kwargs)
@@ -0,0 +1,155 @@
+"""
+Database Bootstrap Service
+
+One-shot setup that used to run inside every create_app(): creating the
+tables, building the main people and church pipelines and putting existing
+contacts into them, along with data backfills for new columns. Each step
+has a version; the versions applied to a database are recorded in
+``bootstrap_steps`` and a step only runs again when its version below is
+raised.
+
+``flask bootstrap`` runs the pending steps once per deploy, holding an
+advisory lock so concurrent deploys or instances do not run them twice.
+On startup create_app() only reads the recorded versions (one small query)
+and, unless BOOTSTRAP_ON_START is set, logs a warning if steps are pending.
+"""
+
+from contextlib import contextmanager
+from datetime import datetime
+import logging
+from sqlalchemy import select, text
+from sqlalchemy.exc import OperationalError, ProgrammingError
+from app.extensions import db
+from app.models.bootstrap import BootstrapStep
+
+logger = logging.getLogger(__name__)
+
+# Key of the PostgreSQL advisory lock / name of the MySQL named lock
+BOOTSTRAP_LOCK_KEY = 7261001
+BOOTSTRAP_LOCK_NAME = 'mobilize_bootstrap'
+
+
+def _create_schema():
+    db.create_all()
+
+
+def _setup_main_pipelines():
+    from app.utils.setup_main_pipelines import setup_main_pipelines
+    setup_main_pipelines()
+
+
+def _migrate_contacts():
+    from app.utils.migrate_contacts_to_main_pipeline import migrate_contacts_to_main_pipeline
+    migrate_contacts_to_main_pipeline()
+
+
+def _ensure_church_pipeline():
+    from app.utils.ensure_church_pipeline import ensure_churches_in_pipeline
+    ensure_churches_in_pipeline()
+
+
+def _schedule_task_reminders():
+    from app.services.task_reminders import schedule_existing_reminders
+    schedule_existing_reminders()
+
+
+def _install_search_index():
+    from app.services.search_service import install_search_index
+    install_search_index(db.session.connection())
+
+
+def _reconcile_dashboard_stats():
+    from app.services.dashboard_stats import reconcile_dashboard_stats
+    reconcile_dashboard_stats()
+
+
+# (name, version, function) in the order they run. Raise a version to have
+# the step run again on the next bootstrap.
+BOOTSTRAP_STEPS = [
+    ('schema', 1, _create_schema),
+    ('main_pipelines', 1, _setup_main_pipelines),
+    ('contact_migration', 1, _migrate_contacts),
+    ('church_pipeline', 1, _ensure_church_pipeline),
+    ('task_reminders', 1, _schedule_task_reminders),
+    ('dashboard_stats', 1, _reconcile_dashboard_stats),
+    ('search_index', 2, _install_search_index)
+]
+
+
+def pending_steps():
+    """
+    Return the names of the bootstrap steps this database has not applied.
+
+    Reads the handful of rows of ``bootstrap_steps``; every step is pending
+    if the table does not exist yet.
+    """
+    try:
+        recorded = dict(db.session.execute(select(BootstrapStep.name, BootstrapStep.version)).all())
+    except (OperationalError, ProgrammingError):
+        db.session.rollback()
+        recorded = {}
+    return [name for name, version, _ in BOOTSTRAP_STEPS if recorded.get(name, 0) < version]
+
+
+@contextmanager
+def bootstrap_lock():
+    """Hold the database-wide bootstrap lock (a no-op on SQLite, which has one writer anyway)."""
+    dialect = db.engine.dialect.name
+    if dialect == 'postgresql':
+        lock_sql, unlock_sql = "SELECT pg_advisory_lock(:key)", "SELECT pg_advisory_unlock(:key)"
+        params = {'key': BOOTSTRAP_LOCK_KEY}
+    elif dialect in ('mysql', 'mariadb'):
+        lock_sql, unlock_sql = "SELECT GET_LOCK(:key, -1)", "SELECT RELEASE_LOCK(:key)"
+        params = {'key': BOOTSTRAP_LOCK_NAME}
+    else:
+        yield
+        return
+
+    with db.engine.connect().execution_options(isolation_level='AUTOCOMMIT') as connection:
+        connection.execute(text(lock_sql), params)
+        try:
+            yield
+        finally:
+            connection.execute(text(unlock_sql), params)
+
+
+def run_bootstrap(force=False):
+    """
+    Run the pending bootstrap steps under the bootstrap lock.
+
+    Args:
+        force: Run every step, even those already applied
+
+    Returns:
+        list: Names of the steps that ran
+    """
+    with bootstrap_lock():
+        # Another process may have bootstrapped while we waited for the lock
+        pending = [name for name, _, _ in BOOTSTRAP_STEPS] if force else pending_steps()
+
+        for name, version, step in BOOTSTRAP_STEPS:
+            if name not in pending:
+                continue
+            logger.info(f"Running bootstrap step {name} (version {version})")
+            try:
+                step()
+                db.session.merge(BootstrapStep(name=name, version=version, completed_at=datetime.utcnow()))
+                db.session.commit()
+            except Exception:
+                db.session.rollback()
+                logger.exception(f"Bootstrap step {name} failed")
+                raise
+        return pending
+
+
+def init_app(app):
+    """Check the bootstrap version on startup, bootstrapping only if BOOTSTRAP_ON_START is set."""
+    with app.app_context():
+        pending = pending_steps()
+        if not pending:
+            return
+        if app.config.get('BOOTSTRAP_ON_START'):
+            ran = run_bootstrap()
+            app.logger.info(f"Bootstrapped database: {', '.join(ran) or 'nothing left to do'}")
+        else:
+            app.logger.warning(f"Database bootstrap pending ({', '.join(pending)}); run 'flask bootstrap'")
@@ -0,0 +1,264 @@
+"""
+Campaign Delivery Service
+
+Sends bulk email campaigns without loading every recipient or holding a
+request open for the whole send:
+
+- recipients are streamed in id-ordered chunks (keyset on Person.id),
+- subject and body are compiled once (app.utils.personalization) and
+  rendered per recipient,
+- messages are sent by a bounded thread pool, throttled by a token bucket
+  shared by every send to the same mail provider,
+- after each chunk the tracking rows are committed together with a
+  checkpoint (the last person id), so a failed send can be resumed.
+
+A recipient whose tracking row is already marked sent for the campaign is
+never sent to again, so resuming after a crash in the middle of a chunk
+only retries the messages that were not confirmed.
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+import logging
+import threading
+import time
+from flask import current_app
+from flask_mail import Message
+from sqlalchemy import bindparam, update
+from app.extensions import db, mail
+from app.models.email_campaign import EmailCampaign
+from app.models.email_tracking import EmailTracking
+from app.models.person import Person
+from app.utils.personalization import compile_template, merge_values
+
+logger = logging.getLogger(__name__)
+
+CAMPAIGN_SEND_CHUNK_SIZE = 200
+
+
+class RateLimiter:
+    """Thread-safe token bucket allowing `rate` acquisitions per second on average.
+
+    A rate of 0 (or less) disables throttling.
+    """
+
+    def __init__(self, rate, burst=None):
+        self.rate = float(rate or 0)
+        self.capacity = float(burst or max(self.rate, 1))
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """Block until a token is available and take it."""
+        if self.rate <= 0:
+            return
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = (1 - self.tokens) / self.rate
+            time.sleep(wait)
+
+
+_rate_limiters = {}
+_rate_limiters_lock = threading.Lock()
+
+
+def get_rate_limiter(provider, rate):
+    """Return the process-wide rate limiter for a mail provider."""
+    with _rate_limiters_lock:
+        limiter = _rate_limiters.get(provider)
+        if limiter is None or limiter.rate != float(rate or 0):
+            limiter = RateLimiter(rate)
+            _rate_limiters[provider] = limiter
+        return limiter
+
+
+def get_recipients_query(campaign):
+    """Build the query for a campaign's recipients from its filter criteria."""
+    recipient_filter = campaign.get_recipient_filter()
+    query = Person.query.filter(Person.office_id == campaign.office_id)
+
+    if recipient_filter.get('status'):
+        query = query.filter(Person.status.in_(recipient_filter['status']))
+
+    if recipient_filter.get('has_email'):
+        query = query.filter(Person.email.isnot(None), Person.email != '')
+
+    for tag in recipient_filter.get('tags') or []:
+        query = query.filter(Person.tags.contains(tag))
+
+    if recipient_filter.get('exclude_previous_recipients'):
+        previous_recipients = db.session.query(EmailTracking.person_id).filter(
+            EmailTracking.person_id.isnot(None),
+            # Earlier attempts of this campaign are handled by the sent check on resume
+            EmailTracking.bulk_send_id != str(campaign.id)
+        ).distinct()
+        query = query.filter(~Person.id.in_(previous_recipients))
+
+    return query
+
+
+def _send_message(app, mailer, limiter, message):
+    """Send one message from a worker thread; returns None or the error message."""
+    limiter.acquire()
+    try:
+        with app.app_context():
+            mailer.send(message)
+        return None
+    except Exception as e:
+        return str(e)
+
+
+def deliver_campaign(campaign_id, checkpoint=None, on_start=None, on_chunk=None):
+    """
+    Send a campaign to its recipients, resuming from a checkpoint if given.
+
+    Args:
+        campaign_id: ID of the campaign to send
+        checkpoint: Checkpoint from an interrupted send ({'last_person_id', 'sent', 'failed'});
+            a failed or interrupted send without one restarts from the first
+            recipient, skipping those already sent
+        on_start: Called with the number of recipients before sending
+        on_chunk: Called with (recipients processed, checkpoint) before each chunk is committed
+
+    Returns:
+        dict: {'sent': messages sent, 'failed': messages that could not be sent}
+
+    Raises:
+        ValueError: If the campaign does not exist or cannot be sent
+    """
+    from app.utils.email_service import generate_tracking_id
+
+    app = current_app._get_current_object()
+    campaign = db.session.get(EmailCampaign, campaign_id)
+    if campaign is None:
+        raise ValueError("Campaign not found")
+
+    campaign_key = str(campaign.id)
+    checkpoint = checkpoint or {}
+    # Whether a send can resume depends on the campaign, not on the checkpoint:
+    # a send that fails in its first chunk has attempt rows but no checkpoint yet.
+    # A failed send is always resumable; one still marked sending only when an
+    # earlier attempt left a checkpoint or tracking rows
+    attempted = bool(checkpoint) or db.session.query(
+        EmailTracking.query.filter(EmailTracking.bulk_send_id == campaign_key).exists()
+    ).scalar()
+    resuming = campaign.status == 'failed' or (campaign.status == 'sending' and attempted)
+    if not resuming and campaign.status not in ('draft', 'scheduled'):
+        raise ValueError(f"Campaign is in {campaign.status} status and cannot be sent")
+
+    recipients_query = get_recipients_query(campaign)
+    campaign.status = 'sending'
+    if not resuming:
+        campaign.recipient_count = recipients_query.order_by(None).count()
+    db.session.commit()
+    if on_start:
+        on_start(campaign.recipient_count)
+
+    chunk_size = app.config.get('CAMPAIGN_SEND_CHUNK_SIZE', CAMPAIGN_SEND_CHUNK_SIZE)
+    provider = app.config.get('MAIL_SERVER') or 'localhost'
+    limiter = get_rate_limiter(provider, app.config.get('CAMPAIGN_SEND_RATE', 0))
+    mailer = getattr(app, 'mail', None) or mail
+    sender = app.config.get('MAIL_DEFAULT_SENDER')
+
+    subject_template = compile_template(campaign.subject)
+    content_template = compile_template(campaign.content, base_url=app.config.get('BASE_URL', 'http://localhost'))
+    sender_id, office_id, template_id = campaign.created_by, campaign.office_id, campaign.template_id
+
+    last_person_id = checkpoint.get('last_person_id', 0)
+    totals = {'sent': checkpoint.get('sent', 0), 'failed': checkpoint.get('failed', 0)}
+    if resuming and not checkpoint:
+        # Starting over from the first recipient: those already sent are skipped, so count them here
+        totals['sent'] = EmailTracking.query.filter_by(bulk_send_id=campaign_key, status='sent').count()
+
+    with ThreadPoolExecutor(max_workers=app.config.get('CAMPAIGN_SEND_WORKERS', 4)) as pool:
+        while True:
+            chunk = recipients_query.filter(Person.id > last_person_id).order_by(Person.id).limit(chunk_size).all()
+            if not chunk:
+                break
+
+            # Rows left by an interrupted attempt are reused, and recipients already sent are skipped
+            existing = {
+                row.person_id: row for row in EmailTracking.query.filter(
+                    EmailTracking.bulk_send_id == campaign_key,
+                    EmailTracking.person_id.in_([person.id for person in chunk])
+                )
+            }
+
+            trackings, messages = [], []
+            for person in chunk:
+                if not person.email:
+                    continue
+                tracking = existing.get(person.id)
+                if tracking is not None and tracking.status not in ('sending', 'failed'):
+                    continue
+
+                values = merge_values(person)
+                subject = subject_template.render(values)
+                tracking_id = tracking.tracking_pixel if tracking is not None else generate_tracking_id()
+                content = content_template.render(values, tracking_id)
+                message_id = f"<{tracking_id}@{provider}>"
+
+                if tracking is None:
+                    tracking = EmailTracking(
+                        email_subject=subject,
+                        recipient_email=person.email,
+                        tracking_pixel=tracking_id,
+                        template_id=template_id,
+                        sender_id=sender_id,
+                        person_id=person.id,
+                        office_id=office_id,
+                        bulk_send_id=campaign_key
+                    )
+                    db.session.add(tracking)
+                tracking.status = 'sending'
+                tracking.message_id = message_id
+
+                message = Message(subject=subject, recipients=[person.email], html=content, sender=sender)
+                message.extra_headers = {"Message-ID": message_id}
+                trackings.append(tracking)
+                messages.append(message)
+
+            # Record the attempt before sending so a crash leaves the rows as 'sending'
+            db.session.commit()
+
+            errors = list(pool.map(lambda message: _send_message(app, mailer, limiter, message), messages))
+
+            now = datetime.utcnow()
+            statuses = []
+            for tracking, error in zip(trackings, errors):
+                if error is None:
+                    totals['sent'] += 1
+                else:
+                    totals['failed'] += 1
+                    logger.error(f"Error sending campaign {campaign_key} to {tracking.recipient_email}: {error}")
+                statuses.append({'row_id': tracking.id, 'new_status': 'sent' if error is None else 'failed',
+                                 'sent_at': now})
+            if statuses:
+                table = EmailTracking.__table__
+                db.session.execute(
+                    update(table).where(table.c.id == bindparam('row_id')).values(
+                        status=bindparam('new_status'), sent_at=bindparam('sent_at')
+                    ),
+                    statuses
+                )
+
+            last_person_id = chunk[-1].id
+            if on_chunk:
+                on_chunk(len(chunk), {'last_person_id': last_person_id, **totals})
+            db.session.commit()
+
+    campaign = db.session.get(EmailCampaign, campaign_id)
+    campaign.status = 'completed'
+    campaign.sent_at = datetime.utcnow()
+    campaign.update_stats()
+    db.session.commit()
+
+    logger.info(f"Campaign {campaign_key} sent to {totals['sent']} recipients ({totals['failed']} failed)")
+    return totals
@@ -6,6 +6,7 @@ from app.models.contact import Contact
 from app.models.sync_history import SyncHistory
 from app.services.google.people import GooglePeopleService
 from app.extensions import db
+from app.utils.caching import invalidate_people_cache
 import logging
 import re
 from flask import current_app
@@ -13,6 +14,22 @@ from app.services.google_api import GoogleAPIService
 
 logger = logging.getLogger(__name__)
 
+# Google contacts applied per bulk upsert batch
+CONTACT_SYNC_BATCH_SIZE = 500
+
+# Local contact fields and the formatted Google contact fields they sync with
+SYNC_FIELDS = [
+    ('first_name', 'first_name'),
+    ('last_name', 'last_name'),
+    ('email', 'email'),
+    ('phone', 'phone'),
+    ('address', 'street'),
+    ('city', 'city'),
+    ('state', 'state'),
+    ('zip_code', 'zip_code'),
+    ('country', 'country')
+]
+
 class ContactSyncService:
     """Service for synchronizing contacts between CRM and Google Contacts."""
     
@@ -569,6 +586,11 @@ class ContactSyncService:
         """
         Synchronize contacts between Google and the application.
         
+        Only the connections changed since the People API sync token stored on
+        the user's GoogleToken are fetched; the first sync, or one whose token
+        has expired, fetches every connection. Changes are applied in batches
+        with bulk inserts and updates keyed on google_contact_id.
+        
         Args:
             user_id: User ID
             token_info: Google token information
@@ -579,6 +601,8 @@ class ContactSyncService:
         if not token_info:
             return False, None, "Invalid token information"
         
+        from app.models.google_token import GoogleToken
+        
         # Initialize sync history record
         sync_history = SyncHistory(
             user_id=user_id,
@@ -590,92 +614,67 @@ class ContactSyncService:
         db.session.commit()
         
         try:
-            # Fetch all Google contacts
-            all_google_contacts = []
-            page_token = None
+            google_token = GoogleToken.query.filter_by(user_id=user_id).first()
+            sync_token = google_token.contacts_sync_token if google_token else None
+            user = User.query.get(user_id)
+            office_id = user.office_id if user else None
             
-            while True:
-                contacts, page_token = GoogleAPIService.fetch_contacts(token_info, page_token)
-                all_google_contacts.extend(contacts)
-                if not page_token:
-                    break
+            google_contacts, next_sync_token = None, None
+            if sync_token:
+                google_contacts, next_sync_token = GoogleAPIService.fetch_contact_changes(token_info, sync_token)
+            if google_contacts is None:
+                google_contacts, next_sync_token = GoogleAPIService.fetch_contact_changes(token_info)
             
-            # Format Google contacts
+            # Deleted connections only carry their resource name; local records are kept
+            deleted_count = sum(1 for contact in google_contacts if contact.get('metadata', {}).get('deleted'))
             formatted_google_contacts = [
                 GoogleAPIService.format_google_contact(contact)
-                for contact in all_google_contacts
+                for contact in google_contacts
+                if not contact.get('metadata', {}).get('deleted')
             ]
             
-            # Process contacts
-            created_count = 0
-            updated_count = 0
-            conflict_count = 0
-            skipped_count = 0
-            
-            # Get existing contacts with Google IDs
-            google_contact_ids = [contact.get('google_id') for contact in formatted_google_contacts]
-            existing_contacts = Contact.query.filter_by(user_id=user_id).filter(
-                Contact.google_contact_id.in_(google_contact_ids)
-            ).all()
-            
-            # Map existing contacts by Google ID
-            existing_contacts_map = {
-                contact.google_contact_id: contact
-                for contact in existing_contacts
+            sync_stats = {
+                "items_processed": len(google_contacts),
+                "items_created": 0,
+                "items_updated": 0,
+                "items_skipped": deleted_count,
+                "items_failed": 0  # Conflicts are counted as failed items
             }
             
-            # Process each Google contact
-            for formatted_contact in formatted_google_contacts:
-                google_id = formatted_contact.get('google_id')
-                
-                if google_id in existing_contacts_map:
-                    # Contact exists - check for conflicts
-                    existing_contact = existing_contacts_map[google_id]
-                    
-                    if cls._check_for_conflicts(existing_contact, formatted_contact):
-                        # Mark as having a conflict
-                        existing_contact.has_conflict = True
-                        existing_contact.google_data = formatted_contact
-                        db.session.commit()
-                        conflict_count += 1
-                    else:
-                        # Update without conflicts
-                        updated = cls._update_contact_with_mapping(existing_contact, formatted_contact)
-                        if updated:
-                            updated_count += 1
-                        else:
-                            skipped_count += 1
-                else:
-                    # Create new contact
-                    created = cls._create_contact_with_mapping(user_id, formatted_contact)
-                    if created:
-                        created_count += 1
-                    else:
-                        skipped_count += 1
+            try:
+                for start in range(0, len(formatted_google_contacts), CONTACT_SYNC_BATCH_SIZE):
+                    batch = formatted_google_contacts[start:start + CONTACT_SYNC_BATCH_SIZE]
+                    created, updated, conflicts, skipped = cls._upsert_google_contacts(user_id, batch)
+                    db.session.commit()
+                    sync_stats["items_created"] += created
+                    sync_stats["items_updated"] += updated
+                    sync_stats["items_failed"] += conflicts
+                    sync_stats["items_skipped"] += skipped
+            finally:
+                # Bulk writes bypass the ORM cache hooks, so invalidate once for
+                # every batch committed, including those before a failure
+                if sync_stats["items_created"] or sync_stats["items_updated"] or sync_stats["items_failed"]:
+                    invalidate_people_cache(office_id)
+            
+            # Only advance the sync token once every change has been stored
+            if google_token and next_sync_token:
+                google_token.contacts_sync_token = next_sync_token
             
             # Update sync history
             sync_history.completed_at = datetime.now()
             sync_history.status = "completed"
-            sync_history.items_processed = len(formatted_google_contacts)
-            sync_history.items_created = created_count
-            sync_history.items_updated = updated_count
-            sync_history.items_skipped = skipped_count
-            sync_history.items_failed = conflict_count  # Conflicts are counted as failed items
+            sync_history.items_processed = sync_stats["items_processed"]
+            sync_history.items_created = sync_stats["items_created"]
+            sync_history.items_updated = sync_stats["items_updated"]
+            sync_history.items_skipped = sync_stats["items_skipped"]
+            sync_history.items_failed = sync_stats["items_failed"]
             
             db.session.commit()
             
-            # Use the field names expected by the manual_sync route
-            sync_stats = {
-                "items_processed": len(formatted_google_contacts),
-                "items_created": created_count,
-                "items_updated": updated_count,
-                "items_skipped": skipped_count,
-                "items_failed": conflict_count
-            }
-            
             return True, sync_stats, None
             
         except Exception as e:
+            db.session.rollback()
             current_app.logger.error(f"Error syncing contacts: {str(e)}")
             
             # Update sync history with error
@@ -686,6 +685,135 @@ class ContactSyncService:
             
             return False, None, str(e)
     
+    @classmethod
+    def _upsert_google_contacts(cls, user_id, formatted_contacts):
+        """
+        Apply a batch of formatted Google contacts to the user's contacts.
+        
+        Existing contacts are loaded with one query and compared with the
+        Google data column by column: a field that is set on both sides with
+        different values is a conflict, a field only set in Google is an
+        update. New contacts become people.
+        
+        Args:
+            user_id: User ID
+            formatted_contacts: Google contacts from GoogleAPIService.format_google_contact
+            
+        Returns:
+            tuple: (created, updated, conflicts, skipped) counts
+        """
+        import numpy as np
+        import pandas as pd
+        
+        # The last change for a contact wins
+        contacts_by_id = {contact.get('google_id'): contact for contact in formatted_contacts if contact.get('google_id')}
+        if not contacts_by_id:
+            return 0, 0, 0, 0
+        google_ids = list(contacts_by_id)
+        
+        local_fields = [local_field for local_field, _ in SYNC_FIELDS]
+        google = pd.DataFrame(
+            [[contact.get(google_field) or '' for _, google_field in SYNC_FIELDS] for contact in contacts_by_id.values()],
+            columns=local_fields,
+            index=google_ids
+        )
+        
+        # Contacts synced by ContactsService store the full resource name
+        lookup_ids = google_ids + [f"people/{google_id}" for google_id in google_ids]
+        rows = db.session.query(
+            Contact.id, Contact.type, Contact.google_contact_id, *[getattr(Contact, field) for field in local_fields]
+        ).filter(
+            Contact.user_id == user_id,
+            Contact.google_contact_id.in_(lookup_ids)
+        ).all()
+        local = pd.DataFrame(rows, columns=['id', 'type', 'google_contact_id'] + local_fields)
+        local.index = local['google_contact_id'].str.split('/').str[-1]
+        local = local[~local.index.duplicated()].reindex(google.index)
+        
+        google_values = google.to_numpy(dtype=object)
+        local_values = local[local_fields].fillna('').astype(str).to_numpy(dtype=object)
+        exists = local['id'].notna().to_numpy()
+        
+        differs = (google_values != '') & (google_values != local_values)
+        conflict = exists & (differs & (local_values != '')).any(axis=1)
+        update = exists & ~conflict & differs.any(axis=1)
+        create = ~exists & (google_values != '').any(axis=1)
+        
+        now = datetime.now()
+        conflict_mappings = []
+        update_mappings = {'person': [], 'other': []}
+        for position in np.flatnonzero(conflict | update):
+            contact_id = int(local['id'].iloc[position])
+            google_id = google_ids[position]
+            if conflict[position]:
+                conflict_mappings.append({
+                    'id': contact_id,
+                    'has_conflict': True,
+                    'conflict_data': contacts_by_id[google_id],
+                    'last_synced_at': now
+                })
+                continue
+            mapping = {'id': contact_id, 'last_synced_at': now, 'updated_at': now}
+            for column in np.flatnonzero(differs[position]):
+                mapping[local_fields[column]] = google_values[position, column]
+            update_mappings['person' if local['type'].iloc[position] == 'person' else 'other'].append(mapping)
+        
+        if conflict_mappings:
+            db.session.bulk_update_mappings(Contact, conflict_mappings)
+        if update_mappings['person']:
+            # Person keeps its own copy of the name columns
+            db.session.bulk_update_mappings(Person, update_mappings['person'])
+        if update_mappings['other']:
+            db.session.bulk_update_mappings(Contact, update_mappings['other'])
+        
+        created = cls._insert_google_people(user_id, [contacts_by_id[google_ids[position]] for position in np.flatnonzero(create)], now)
+        skipped = int((~(conflict | update | create)).sum())
+        return created, int(update.sum()), int(conflict.sum()), skipped
+    
+    @classmethod
+    def _insert_google_people(cls, user_id, formatted_contacts, now):
+        """
+        Insert people for new Google contacts with one executemany per table.
+        
+        Bulk inserts bypass ORM events, so the dashboard stats rollup is
+        adjusted here for the rows added.
+        
+        Returns:
+            int: Number of people inserted
+        """
+        user = User.query.get(user_id)
+        if not formatted_contacts or not user:
+            return 0
+        
+        mappings = []
+        for contact in formatted_contacts:
+            mapping = {
+                local_field: contact.get(google_field) or None
+                for local_field, google_field in SYNC_FIELDS
+            }
+            mapping.update({
+                'type': 'person',
+                'first_name': mapping['first_name'] or '',
+                'last_name': mapping['last_name'] or '',
+                'google_contact_id': contact.get('google_id'),
+                'source': 'google_import',
+                'status': 'active',
+                'office_id': user.office_id,
+                'user_id': user_id,
+                'created_at': now,
+                'updated_at': now,
+                'last_synced_at': now
+            })
+            mappings.append(mapping)
+        
+        db.session.bulk_insert_mappings(Person, mappings, return_defaults=True)
+        
+        from app.models.dashboard_stats import UNDATED_BUCKET
+        from app.services.dashboard_stats import apply_delta
+        apply_delta(db.session.connection(), ('people', str(user.office_id), UNDATED_BUCKET), len(mappings))
+        
+        return len(mappings)
+    
     @classmethod
     def _check_for_conflicts(cls, local_contact, google_contact):
         """
@@ -155,47 +155,20 @@ class ContactsService:
             raise Exception(f"Failed to get Google contact: {str(e)}")
 
     def sync_contacts(self):
-        """Sync Google contacts with local database."""
-        try:
-            # Get all Google contacts
-            results = self.service.people().connections().list(
-                resourceName='people/me',
-                pageSize=1000,
-                personFields='names,emailAddresses,phoneNumbers,addresses'
-            ).execute()
+        """Sync Google contacts with local database.
 
-            connections = results.get('connections', [])
-
-            for contact in connections:
-                # Check if contact already exists in database
-                google_contact_id = contact['resourceName']
-                person = Person.query.filter_by(
-                    google_contact_id=google_contact_id
-                ).first()
-
-                if not person and 'names' in contact:
-                    # Create new person from contact
-                    name = contact['names'][0]
-                    email = contact.get('emailAddresses', [{}])[0].get('value', '')
-                    phone = contact.get('phoneNumbers', [{}])[0].get('value', '')
-                    address = contact.get('addresses', [{}])[0]
-
-                    person = Person(
-                        first_name=name.get('givenName', ''),
-                        last_name=name.get('familyName', ''),
-                        email=email,
-                        phone=phone,
-                        address=address.get('streetAddress', ''),
-                        city=address.get('city', ''),
-                        state=address.get('region', ''),
-                        zip_code=address.get('postalCode', ''),
-                        google_contact_id=google_contact_id
-                    )
-                    db.session.add(person)
+        Uses ContactSyncService so only contacts changed since the last sync
+        are fetched and applied.
+        """
+        from app.services.contact_sync import ContactSyncService
 
-            db.session.commit()
-            return len(connections)
+        try:
+            token_info = ContactSyncService._get_user_token(self.user_id)
+            success, stats, error = ContactSyncService.sync_contacts(self.user_id, token_info)
+            if not success:
+                raise Exception(error)
+            return stats['items_processed']
 
         except Exception as e:
             db.session.rollback()
-            raise Exception(f"Failed to sync Google contacts: {str(e)}") 
\ No newline at end of file
+            raise Exception(f"Failed to sync Google contacts: {str(e)}")
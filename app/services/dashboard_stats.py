@@ -0,0 +1,261 @@
+"""
+Dashboard Stats Service
+
+Maintains the ``dashboard_stat_buckets`` rollup that backs the dashboard
+counters. ORM hooks (registered in app.utils.caching) apply +1/-1 deltas as
+people, churches, tasks and communications are written, and a periodic
+reconciliation job recomputes the rollup from the source tables to correct
+any drift (e.g. writes made with raw SQL that bypass the ORM).
+"""
+
+from datetime import date, datetime, time, timedelta, timezone
+import logging
+from sqlalchemy import and_, case, func, true
+from app.extensions import db
+from app.models.dashboard_stats import DashboardStatBucket, UNDATED_BUCKET
+
+logger = logging.getLogger(__name__)
+
+# Window used for the "recent communications" counter
+RECENT_COMMUNICATION_DAYS = 30
+
+# Scope key for people and churches without an office, which only count
+# towards the all-office totals
+NO_OFFICE = ''
+
+
+def rollup_key(target, get=getattr):
+    """
+    Return the (metric, scope_key, bucket) a model instance counts towards.
+
+    Args:
+        target: Person, Church, Task or Communication instance
+        get: Attribute accessor, used by the update/delete hooks to read
+            the values the row had before the flush
+
+    Returns:
+        tuple or None: The rollup key, or None if the instance is not counted
+    """
+    from app.models.person import Person
+    from app.models.church import Church
+    from app.models.task import Task
+    from app.models.communication import Communication
+
+    if isinstance(target, (Person, Church)):
+        office_id = get(target, 'office_id')
+        metric = 'people' if isinstance(target, Person) else 'churches'
+        return (metric, _office_scope(office_id), UNDATED_BUCKET)
+
+    if isinstance(target, Task):
+        status = get(target, 'status')
+        status = getattr(status, 'value', status)
+        assigned_to = get(target, 'assigned_to')
+        if status != 'pending' or not assigned_to:
+            return None
+        return ('pending_tasks', str(assigned_to), _to_bucket(get(target, 'due_date')))
+
+    if isinstance(target, Communication):
+        office_id = get(target, 'office_id')
+        if office_id is None:
+            return None
+        created_at = get(target, 'created_at') or datetime.now(timezone.utc)
+        return ('communications', str(office_id), _to_bucket(created_at))
+
+    return None
+
+
+def apply_delta(connection, key, delta):
+    """
+    Add ``delta`` to the rollup counter identified by ``key``.
+
+    Runs on the connection of the current flush so the counter change
+    commits or rolls back together with the row that caused it.
+    Communication buckets older than the recent window are not kept, and a
+    negative delta only adjusts an existing counter: a missing bucket means
+    the row was never counted, so nothing is subtracted from it.
+    """
+    if key is None or not delta:
+        return
+
+    metric, scope_key, bucket = key
+    if metric == 'communications' and bucket < communication_window_start():
+        return
+
+    table = DashboardStatBucket.__table__
+    values = {
+        'metric': metric,
+        'scope_key': scope_key,
+        'bucket': bucket,
+        'count': delta,
+        'updated_at': datetime.utcnow()
+    }
+    match = and_(table.c.metric == metric, table.c.scope_key == scope_key, table.c.bucket == bucket)
+
+    if delta < 0:
+        connection.execute(
+            table.update()
+            .where(match)
+            .values(count=table.c.count + delta, updated_at=values['updated_at'])
+        )
+        return
+
+    dialect = connection.dialect.name
+    if dialect in ('postgresql', 'sqlite'):
+        if dialect == 'postgresql':
+            from sqlalchemy.dialects.postgresql import insert
+        else:
+            from sqlalchemy.dialects.sqlite import insert
+        stmt = insert(table).values(**values)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=['metric', 'scope_key', 'bucket'],
+            set_={
+                'count': table.c.count + stmt.excluded.count,
+                'updated_at': stmt.excluded.updated_at
+            }
+        )
+        connection.execute(stmt)
+        return
+
+    # Generic fallback for dialects without an upsert construct
+    result = connection.execute(
+        table.update()
+        .where(match)
+        .values(count=table.c.count + delta, updated_at=values['updated_at'])
+    )
+    if result.rowcount == 0:
+        connection.execute(table.insert().values(**values))
+
+
+def get_rollup_stats(office_id=None, assignee=None, all_offices=False):
+    """
+    Read the dashboard counters from the rollup in a single query.
+
+    Args:
+        office_id: Office to scope people/church/communication counts to
+        assignee: Value of ``tasks.assigned_to`` to count tasks for
+        all_offices: Count across every office (super admins)
+
+    Returns:
+        dict: people_count, church_count, pending_tasks, overdue_tasks
+            and recent_communications
+    """
+    t = DashboardStatBucket
+    today = date.today()
+    window_start = communication_window_start()
+
+    office_match = true() if all_offices else t.scope_key == str(office_id)
+    assignee_match = t.scope_key == str(assignee)
+
+    def total(*conditions):
+        return func.coalesce(func.sum(case((and_(*conditions), t.count), else_=0)), 0)
+
+    result = db.session.query(
+        total(t.metric == 'people', office_match),
+        total(t.metric == 'churches', office_match),
+        total(t.metric == 'pending_tasks', assignee_match),
+        total(t.metric == 'pending_tasks', assignee_match, t.bucket < today),
+        total(t.metric == 'communications', office_match, t.bucket >= window_start)
+    ).one()
+
+    return {
+        'people_count': int(result[0]),
+        'church_count': int(result[1]),
+        'pending_tasks': int(result[2]),
+        'overdue_tasks': int(result[3]),
+        'recent_communications': int(result[4])
+    }
+
+
+def communication_window_start():
+    """
+    Return the first day bucket of the recent communications window.
+
+    Communication buckets are keyed by the UTC day of ``created_at``, so
+    the window is computed on the same clock.
+    """
+    return datetime.now(timezone.utc).date() - timedelta(days=RECENT_COMMUNICATION_DAYS)
+
+
+def has_rollup():
+    """Return True if the rollup has been populated."""
+    return db.session.query(DashboardStatBucket.id).first() is not None
+
+
+def reconcile_dashboard_stats():
+    """
+    Rebuild the rollup from the source tables.
+
+    Recomputes every counter with one GROUP BY query per metric and
+    replaces the rollup contents in a single transaction. Communication
+    buckets older than the recent window are dropped.
+
+    Returns:
+        int: Number of rollup rows written
+    """
+    from app.models.person import Person
+    from app.models.church import Church
+    from app.models.task import Task, TaskStatus
+    from app.models.communication import Communication
+
+    counts = {}
+
+    def add(metric, scope_key, bucket, count):
+        if scope_key is None or not count:
+            return
+        key = (metric, str(scope_key), bucket)
+        counts[key] = counts.get(key, 0) + count
+
+    try:
+        for metric, model in (('people', Person), ('churches', Church)):
+            rows = db.session.query(model.office_id, func.count(model.id)).group_by(model.office_id).all()
+            for office_id, count in rows:
+                add(metric, _office_scope(office_id), UNDATED_BUCKET, count)
+
+        due_day = func.date(Task.due_date)
+        rows = db.session.query(Task.assigned_to, due_day, func.count(Task.id)).filter(
+            Task.status == TaskStatus.PENDING,
+            Task.assigned_to.isnot(None),
+            Task.assigned_to != ''
+        ).group_by(Task.assigned_to, due_day).all()
+        for assigned_to, day, count in rows:
+            add('pending_tasks', assigned_to, _to_bucket(day), count)
+
+        window_start = datetime.combine(communication_window_start(), time.min)
+        created_day = func.date(Communication.created_at)
+        rows = db.session.query(Communication.office_id, created_day, func.count(Communication.id)).filter(
+            Communication.created_at >= window_start
+        ).group_by(Communication.office_id, created_day).all()
+        for office_id, day, count in rows:
+            add('communications', office_id, _to_bucket(day), count)
+
+        now = datetime.utcnow()
+        db.session.query(DashboardStatBucket).delete(synchronize_session=False)
+        if counts:
+            db.session.execute(DashboardStatBucket.__table__.insert(), [
+                {'metric': metric, 'scope_key': scope_key, 'bucket': bucket, 'count': count, 'updated_at': now}
+                for (metric, scope_key, bucket), count in counts.items()
+            ])
+        db.session.commit()
+
+        logger.info(f"Dashboard stats reconciled: {len(counts)} rollup rows")
+        return len(counts)
+    except Exception as e:
+        db.session.rollback()
+        logger.error(f"Error reconciling dashboard stats: {str(e)}")
+        raise
+
+
+def _office_scope(office_id):
+    """Return the scope key for counters kept per office."""
+    return NO_OFFICE if office_id is None else str(office_id)
+
+
+def _to_bucket(value):
+    """Convert a date, datetime or ISO date string to a day bucket."""
+    if value is None:
+        return UNDATED_BUCKET
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date):
+        return value
+    return date.fromisoformat(str(value)[:10])
@@ -0,0 +1,215 @@
+"""
+Export Service
+
+Builds the query, columns and row conversion for each export so the same
+definition can be streamed directly from a route or written to a file by a
+background job.
+"""
+
+import datetime
+from sqlalchemy.orm import with_polymorphic
+from app.extensions import db
+from app.models.base import Contact
+from app.models.person import Person
+from app.models.church import Church
+from app.models.task import Task
+from app.models.communication import Communication
+from app.models.pipeline import Pipeline, PipelineStage, PipelineContact
+
+# Columns exported for each entity type by the reports export
+ENTITY_EXPORTS = {
+    'contacts': (Person, ['id', 'first_name', 'last_name', 'email', 'phone', 'address', 'status', 'created_at']),
+    'churches': (Church, ['id', 'name', 'pastor_name', 'email', 'phone', 'address', 'created_at']),
+    'tasks': (Task, ['id', 'title', 'description', 'status', 'priority', 'due_date', 'assigned_to', 'created_at']),
+    'communications': (Communication, ['id', 'person_id', 'type', 'subject', 'content', 'created_at'])
+}
+
+
+def people_export(office_id=None, include_notes=False):
+    """
+    Build the people export.
+
+    Args:
+        office_id: Office to export, or None for every office (super admins)
+        include_notes: Whether to add a Notes column
+
+    Returns:
+        dict: query, columns, to_row, filename and sheet_name
+    """
+    query = Person.query
+    if office_id is not None:
+        query = query.filter_by(office_id=office_id)
+
+    columns = ['ID', 'First Name', 'Last Name', 'Email', 'Phone', 'Address', 'City', 'State',
+               'Zip', 'Country', 'Pipeline Stage', 'Priority', 'Assigned To', 'Created', 'Last Updated']
+    if include_notes:
+        columns.append('Notes')
+
+    def person_row(person):
+        return {
+            'ID': person.id,
+            'First Name': person.first_name,
+            'Last Name': person.last_name,
+            'Email': person.email,
+            'Phone': person.phone,
+            'Address': person.address,
+            'City': person.city,
+            'State': person.state,
+            'Zip': person.zip_code,
+            'Country': person.country,
+            'Pipeline Stage': person.pipeline_stage,
+            'Priority': person.priority,
+            'Assigned To': person.assigned_to,
+            'Created': person.date_created.strftime('%Y-%m-%d') if person.date_created else '',
+            'Last Updated': person.date_modified.strftime('%Y-%m-%d') if person.date_modified else '',
+            'Notes': person.notes if include_notes else None
+        }
+
+    return {
+        'query': query.order_by(Person.last_name, Person.first_name, Person.id),
+        'columns': columns,
+        'to_row': person_row,
+        'filename': f"people_export_{datetime.datetime.now().strftime('%Y%m%d_%H%M%S')}",
+        'sheet_name': 'People'
+    }
+
+
+def entity_export(entity_type, office_id):
+    """
+    Build the reports export for one entity type.
+
+    Args:
+        entity_type: One of the ENTITY_EXPORTS keys
+        office_id: Office to export
+
+    Returns:
+        dict: query, columns, to_row, filename and sheet_name
+    """
+    model, columns = ENTITY_EXPORTS[entity_type]
+    query = db.session.query(model).filter(model.office_id == office_id).order_by(model.id)
+
+    def item_row(item):
+        item_dict = {}
+        for col in columns:
+            # Handle AttributeError for any missing attributes
+            try:
+                value = getattr(item, col)
+                # Handle datetime and enum values
+                if isinstance(value, (datetime.date, datetime.datetime)):
+                    value = value.isoformat()
+                elif hasattr(value, 'value'):
+                    value = value.value
+                item_dict[col] = value
+            except AttributeError:
+                item_dict[col] = None
+        return item_dict
+
+    return {
+        'query': query,
+        'columns': columns,
+        'to_row': item_row,
+        'filename': f"{entity_type}_export_{datetime.datetime.now().strftime('%Y%m%d')}",
+        'sheet_name': None
+    }
+
+
+def pipeline_export(pipeline):
+    """
+    Build the export of a pipeline's contacts with their stages.
+
+    Contacts, stages and the polymorphic contact data are loaded in one
+    joined query.
+
+    Args:
+        pipeline: Pipeline to export
+
+    Returns:
+        dict: query, columns, to_row, filename and sheet_name
+    """
+    contact_entity = with_polymorphic(Contact, [Person, Church])
+    query = db.session.query(PipelineContact, PipelineStage, contact_entity).join(
+        PipelineStage, PipelineStage.id == PipelineContact.current_stage_id
+    ).join(
+        contact_entity, contact_entity.id == PipelineContact.contact_id
+    ).filter(
+        PipelineContact.pipeline_id == pipeline.id
+    ).order_by(PipelineContact.id)
+
+    pipeline_type = pipeline.pipeline_type
+    now = datetime.datetime.utcnow()
+
+    def pipeline_contact_row(result):
+        pc, stage, contact = result
+
+        # Skip if contact type doesn't match pipeline type
+        if pipeline_type not in ['both', contact.contact_type]:
+            return None
+
+        contact_data = {
+            'pipeline_contact_id': pc.id,
+            'stage_name': stage.name,
+            'days_in_stage': (now - pc.last_updated).days if pc.last_updated else 0,
+            'entered_pipeline': pc.entered_at.strftime('%Y-%m-%d') if pc.entered_at else '',
+            'last_updated': pc.last_updated.strftime('%Y-%m-%d') if pc.last_updated else ''
+        }
+
+        # Add contact-specific fields based on type
+        if contact.contact_type == 'person':
+            contact_data.update({
+                'contact_id': contact.id,
+                'contact_type': 'Person',
+                'first_name': getattr(contact, 'first_name', ''),
+                'last_name': getattr(contact, 'last_name', ''),
+                'email': getattr(contact, 'email', ''),
+                'phone': getattr(contact, 'phone', ''),
+                'status': getattr(contact, 'status', '')
+            })
+        else:  # church
+            contact_data.update({
+                'contact_id': contact.id,
+                'contact_type': 'Church',
+                'name': getattr(contact, 'name', ''),
+                'pastor_name': getattr(contact, 'pastor_name', ''),
+                'email': getattr(contact, 'email', ''),
+                'phone': getattr(contact, 'phone', '')
+            })
+
+        return contact_data
+
+    # Define columns based on pipeline type
+    if pipeline_type == 'person':
+        columns = ['pipeline_contact_id', 'contact_id', 'first_name', 'last_name', 'email', 'phone',
+                   'status', 'stage_name', 'days_in_stage', 'entered_pipeline', 'last_updated']
+    elif pipeline_type == 'church':
+        columns = ['pipeline_contact_id', 'contact_id', 'name', 'pastor_name', 'email', 'phone',
+                   'stage_name', 'days_in_stage', 'entered_pipeline', 'last_updated']
+    else:  # both
+        columns = ['pipeline_contact_id', 'contact_id', 'contact_type', 'first_name', 'last_name', 'name',
+                   'pastor_name', 'email', 'phone', 'stage_name', 'days_in_stage', 'entered_pipeline', 'last_updated']
+
+    return {
+        'query': query,
+        'columns': columns,
+        'to_row': pipeline_contact_row,
+        'filename': f"{pipeline.name.replace(' ', '_')}_export_{datetime.datetime.now().strftime('%Y%m%d')}",
+        'sheet_name': None
+    }
+
+
+def build_export(export, office_id=None, entity_type=None, pipeline_id=None, include_notes=False):
+    """
+    Build an export from serialisable parameters (used by background jobs).
+
+    Args:
+        export: 'people', 'entity' or 'pipeline'
+
+    Returns:
+        dict: query, columns, to_row, filename and sheet_name
+    """
+    if export == 'people':
+        return people_export(office_id, include_notes=include_notes)
+    if export == 'entity':
+        return entity_export(entity_type, office_id)
+    if export == 'pipeline':
+        return pipeline_export(Pipeline.query.get_or_404(pipeline_id))
+    raise ValueError(f"Unknown export: {export}")
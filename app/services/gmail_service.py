@@ -1,6 +1,7 @@
 from google.oauth2.credentials import Credentials
 from google.auth.transport.requests import Request
 from googleapiclient.discovery import build
+from googleapiclient.errors import HttpError
 from app.models.communication import Communication
 from app.models.google_token import GoogleToken
 from app.extensions import db
@@ -13,6 +14,13 @@ import os
 import time
 import random
 
+# Messages fetched per batched HTTP request and committed together (Gmail allows up to 100)
+GMAIL_SYNC_BATCH_SIZE = 50
+# Upper bound on messages pulled by a full (non-incremental) sync
+GMAIL_SYNC_MAX_MESSAGES = 2000
+# Seconds to wait before refetching messages whose fetch failed (rate limits, server errors)
+GMAIL_SYNC_RETRY_DELAY = 2
+
 class GmailService:
     """Service class for Gmail API operations."""
     
@@ -197,129 +205,68 @@ class GmailService:
             raise
 
     def sync_emails(self, days_back=7):
-        """Sync emails from Gmail to local database."""
+        """Sync emails from Gmail to local database.
+
+        The first sync (or one whose stored historyId has expired) lists the
+        last ``days_back`` days of messages; later syncs only ask Gmail for the
+        messages added since the historyId saved on the user's GoogleToken.
+        Messages already stored are skipped with a single lookup, new ones are
+        fetched as metadata in batched HTTP requests and committed in batches.
+
+        Args:
+            days_back: Number of days to list when no usable historyId exists
+
+        Returns:
+            Number of emails synced
+        """
         try:
             logger = logging.getLogger(__name__)
             logger.info(f"Starting email sync for user {self.user_id}")
-            
-            # Calculate date range for query
-            end_date = datetime.now()
-            start_date = end_date - timedelta(days=days_back)
-            
-            # Format dates for Gmail API query
-            start_date_str = start_date.strftime('%Y/%m/%d')
-            end_date_str = end_date.strftime('%Y/%m/%d')
-            
-            # Query for emails in the date range
-            query = f"after:{start_date_str} before:{end_date_str}"
-            
-            # Get messages matching the query
-            response = self.service.users().messages().list(
-                userId='me',
-                q=query,
-                maxResults=100  # Limit to 100 messages for performance
-            ).execute()
-            
-            messages = response.get('messages', [])
-            synced_count = 0
-            
-            # Define a function to check if a message already exists in the database
-            def check_message_exists_with_retry(message_id, max_retries=3):
-                for attempt in range(max_retries):
-                    try:
-                        existing = Communication.query.filter_by(
-                            gmail_message_id=message_id
-                        ).first()
-                        return existing is not None
-                    except Exception as e:
-                        logger.error(f"Error checking message existence (attempt {attempt+1}): {str(e)}")
-                        if attempt < max_retries - 1:
-                            time.sleep(0.5)  # Wait before retrying
-                        else:
-                            raise
-                return False
-            
-            # Process each message
-            for message_data in messages:
-                message_id = message_data['id']
-                
-                # Skip if message already exists in database
-                if check_message_exists_with_retry(message_id):
-                    logger.info(f"Skipping already synced message {message_id}")
-                    continue
-                
-                try:
-                    # Get full message details
-                    message = self.service.users().messages().get(
-                        userId='me',
-                        id=message_id,
-                        format='full'
-                    ).execute()
-                    
-                    # Extract message details
-                    headers = message['payload']['headers']
-                    subject = next((h['value'] for h in headers if h['name'].lower() == 'subject'), 'No Subject')
-                    from_header = next((h['value'] for h in headers if h['name'].lower() == 'from'), 'Unknown')
-                    to_header = next((h['value'] for h in headers if h['name'].lower() == 'to'), 'Unknown')
-                    date_header = next((h['value'] for h in headers if h['name'].lower() == 'date'), None)
-                    
-                    # Extract sender email
-                    sender_email = self._extract_email_address(from_header)
-                    recipient_email = self._extract_email_address(to_header)
-                    
-                    # Determine direction (inbound/outbound)
-                    token = GoogleToken.query.filter_by(user_id=self.user_id).first()
-                    user_email = token.email if token else None
-                    
-                    direction = 'inbound'
-                    if user_email and recipient_email and user_email != recipient_email:
-                        direction = 'outbound'
-                    
-                    # Extract message body
-                    body = 'No content'
-                    if 'parts' in message['payload']:
-                        parts = message['payload']['parts']
-                        for part in parts:
-                            if part['mimeType'] == 'text/plain' and 'data' in part['body']:
-                                body = base64.urlsafe_b64decode(part['body']['data']).decode()
-                                break
-                    elif 'body' in message['payload'] and 'data' in message['payload']['body']:
-                        body = base64.urlsafe_b64decode(message['payload']['body']['data']).decode()
-                    
-                    # Parse date
-                    date_sent = datetime.now()
-                    if 'internalDate' in message:
-                        date_sent = datetime.fromtimestamp(int(message['internalDate'])/1000)
-                    elif date_header:
-                        try:
-                            from email.utils import parsedate_to_datetime
-                            date_sent = parsedate_to_datetime(date_header)
-                        except Exception:
-                            pass
-                    
-                    # Create Communication record
-                    communication = Communication(
-                        user_id=self.user_id,
-                        contact_email=sender_email if direction == 'inbound' else recipient_email,
-                        subject=subject,
-                        content=body,
-                        direction=direction,
-                        date_sent=date_sent,
-                        email_status='received' if direction == 'inbound' else 'sent',
-                        gmail_message_id=message_id,
-                        gmail_thread_id=message.get('threadId')
-                    )
-                    
-                    db.session.add(communication)
-                    db.session.commit()
-                    synced_count += 1
-                    
-                    # Log success
-                    logger.info(f"Synced message {message_id} from {sender_email}")
-                    
-                except Exception as message_error:
-                    logger.error(f"Error processing message {message_id}: {str(message_error)}")
-                    # Continue with next message
+
+            # Communications must belong to an office; without one every batch
+            # would fail on flush, so skip the sync before fetching anything
+            from app.models.user import User
+            user = db.session.get(User, self.user_id)
+            office_id = user.office_id if user else None
+            if office_id is None:
+                logger.warning(f"Skipping Gmail sync for user {self.user_id}: user has no office")
+                return 0
+
+            token = GoogleToken.query.filter_by(user_id=self.user_id).first()
+            user_email = token.email.lower() if token and token.email else None
+
+            message_ids, history_id = None, None
+            if token and token.gmail_history_id:
+                message_ids, history_id = self._list_history_message_ids(token.gmail_history_id)
+            if message_ids is None:
+                message_ids, history_id = self._list_recent_message_ids(days_back)
+
+            # One lookup for the messages we already have instead of one per message
+            known_ids = set()
+            for start in range(0, len(message_ids), 500):
+                chunk = message_ids[start:start + 500]
+                known_ids.update(row[0] for row in db.session.query(Communication.gmail_message_id).filter(
+                    Communication.gmail_message_id.in_(chunk)
+                ))
+            new_ids = [message_id for message_id in message_ids if message_id not in known_ids]
+            logger.info(f"Gmail sync for user {self.user_id}: {len(message_ids)} messages listed, "
+                        f"{len(new_ids)} new")
+
+            synced_count, failed_ids = self._store_messages(new_ids, user_email, office_id)
+            if failed_ids:
+                # Retry what failed once, after a pause for rate limits to clear
+                time.sleep(GMAIL_SYNC_RETRY_DELAY)
+                retried_count, failed_ids = self._store_messages(failed_ids, user_email, office_id)
+                synced_count += retried_count
+
+            # Only move the sync point forward once everything before it is stored;
+            # otherwise the next sync lists the same messages again and skips those stored
+            if failed_ids:
+                logger.warning(f"Gmail sync for user {self.user_id}: {len(failed_ids)} messages could not be "
+                               f"fetched, keeping history id {token.gmail_history_id if token else None}")
+            elif token and history_id:
+                token.gmail_history_id = str(history_id)
+                db.session.commit()
 
             logger.info(f"Successfully synced {synced_count} emails from Gmail")
             return synced_count
@@ -331,7 +278,185 @@ class GmailService:
             import traceback
             logger.error(f"Traceback: {traceback.format_exc()}")
             raise Exception(f"Failed to sync emails: {str(e)}")
-            
+
+    def _store_messages(self, message_ids, user_email, office_id):
+        """Fetch and store messages in batches, committing each batch.
+
+        Returns:
+            Tuple of (number of messages stored, ids whose fetch failed)
+        """
+        stored, failed_ids = 0, []
+        for start in range(0, len(message_ids), GMAIL_SYNC_BATCH_SIZE):
+            messages, failed = self._fetch_message_metadata(message_ids[start:start + GMAIL_SYNC_BATCH_SIZE])
+            failed_ids.extend(failed)
+            communications = self._build_communications(messages, user_email, office_id)
+            db.session.add_all(communications)
+            db.session.commit()
+            stored += len(communications)
+        return stored, failed_ids
+
+    def _list_history_message_ids(self, start_history_id):
+        """List messages added since start_history_id.
+
+        Returns:
+            Tuple of (message ids, latest history id), or (None, None) when Gmail
+            no longer has history that far back and a full sync is needed
+        """
+        message_ids = []
+        seen = set()
+        history_id = start_history_id
+        page_token = None
+        try:
+            while True:
+                params = {'userId': 'me', 'startHistoryId': start_history_id, 'historyTypes': ['messageAdded']}
+                if page_token:
+                    params['pageToken'] = page_token
+                response = self.service.users().history().list(**params).execute()
+
+                for record in response.get('history', []):
+                    for added in record.get('messagesAdded', []):
+                        message = added.get('message', {})
+                        if 'DRAFT' in message.get('labelIds', []) or message.get('id') in seen:
+                            continue
+                        seen.add(message['id'])
+                        message_ids.append(message['id'])
+
+                history_id = response.get('historyId', history_id)
+                page_token = response.get('nextPageToken')
+                if not page_token:
+                    return message_ids, history_id
+        except HttpError as e:
+            if e.resp.status == 404:
+                logging.getLogger(__name__).info(
+                    f"Gmail history {start_history_id} expired for user {self.user_id}, running a full sync")
+                return None, None
+            raise
+
+    def _list_recent_message_ids(self, days_back):
+        """List the ids of messages from the last days_back days.
+
+        Returns:
+            Tuple of (message ids, mailbox history id to resume from)
+        """
+        # Read the history id first so nothing added while listing is missed
+        history_id = self.service.users().getProfile(userId='me').execute().get('historyId')
+
+        start_date = datetime.now() - timedelta(days=days_back)
+        query = f"after:{start_date.strftime('%Y/%m/%d')} -in:drafts"
+
+        message_ids = []
+        page_token = None
+        while len(message_ids) < GMAIL_SYNC_MAX_MESSAGES:
+            params = {'userId': 'me', 'q': query, 'maxResults': 500}
+            if page_token:
+                params['pageToken'] = page_token
+            response = self.service.users().messages().list(**params).execute()
+            message_ids.extend(message['id'] for message in response.get('messages', []))
+            page_token = response.get('nextPageToken')
+            if not page_token:
+                break
+        return message_ids[:GMAIL_SYNC_MAX_MESSAGES], history_id
+
+    def _fetch_message_metadata(self, message_ids):
+        """Fetch message headers for message_ids in one batched HTTP request.
+
+        Returns:
+            Tuple of (messages in listing order, ids whose fetch failed and
+            should be retried); deleted messages are in neither
+        """
+        logger = logging.getLogger(__name__)
+        messages = {}
+        failed = []
+
+        def on_response(request_id, response, exception):
+            if exception is not None:
+                if isinstance(exception, HttpError) and exception.resp.status == 404:
+                    # Messages can be deleted between listing and fetching
+                    logger.info(f"Message {request_id} was deleted before it was fetched")
+                else:
+                    logger.error(f"Error fetching message {request_id}: {str(exception)}")
+                    failed.append(request_id)
+                return
+            messages[request_id] = response
+
+        batch = self.service.new_batch_http_request(callback=on_response)
+        for message_id in message_ids:
+            batch.add(
+                self.service.users().messages().get(
+                    userId='me',
+                    id=message_id,
+                    format='metadata',
+                    metadataHeaders=['From', 'To', 'Subject', 'Date']
+                ),
+                request_id=message_id
+            )
+        batch.execute()
+
+        # Keep the listing order
+        return [messages[message_id] for message_id in message_ids if message_id in messages], failed
+
+    def _build_communications(self, messages, user_email, office_id):
+        """Turn fetched Gmail messages into Communication records linked to known people.
+
+        Messages are fetched as metadata only, so ``message`` holds Gmail's
+        snippet (the first line or so of the email) rather than the full body;
+        this is the text the Communications view shows for synced emails.
+        """
+        from app.models.person import Person
+
+        parsed = []
+        for message in messages:
+            headers = {h['name'].lower(): h['value'] for h in message.get('payload', {}).get('headers', [])}
+            sender_email = self._extract_email_address(headers.get('from'))
+            recipient_email = self._extract_email_address(headers.get('to'))
+
+            direction = 'inbound'
+            if 'SENT' in message.get('labelIds', []) or (user_email and sender_email and sender_email.lower() == user_email):
+                direction = 'outbound'
+            contact_email = sender_email if direction == 'inbound' else recipient_email
+
+            date_sent = datetime.now()
+            if 'internalDate' in message:
+                date_sent = datetime.fromtimestamp(int(message['internalDate']) / 1000)
+            elif headers.get('date'):
+                try:
+                    from email.utils import parsedate_to_datetime
+                    date_sent = parsedate_to_datetime(headers['date'])
+                except Exception:
+                    pass
+
+            parsed.append((message, headers, sender_email, direction, contact_email, date_sent))
+
+        # Resolve the people these messages are with in one query
+        contact_emails = {p[4].lower() for p in parsed if p[4]}
+        people = {}
+        if contact_emails:
+            query = db.session.query(Person.email, Person.id).filter(db.func.lower(Person.email).in_(contact_emails))
+            if office_id:
+                query = query.filter(Person.office_id == office_id)
+            people = {email.lower(): person_id for email, person_id in query}
+
+        communications = []
+        for message, headers, sender_email, direction, contact_email, date_sent in parsed:
+            communications.append(Communication(
+                type='Email',
+                message=message.get('snippet') or 'No content',
+                subject=headers.get('subject', 'No Subject'),
+                sender=sender_email,
+                person_id=people.get(contact_email.lower()) if contact_email else None,
+                user_id=self.user_id,
+                owner_id=self.user_id,
+                office_id=office_id,
+                direction=direction,
+                date_sent=date_sent,
+                date=date_sent,
+                email_status='received' if direction == 'inbound' else 'sent',
+                gmail_message_id=message['id'],
+                gmail_thread_id=message.get('threadId'),
+                last_synced_at=datetime.now()
+            ))
+        return communications
+
     def _extract_email_address(self, email_string):
         """Extract email address from a string like 'Name <email@example.com>' or just 'email@example.com'"""
         if not email_string:
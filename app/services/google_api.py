@@ -355,6 +355,54 @@ class GoogleAPIService:
             current_app.logger.error(f"Error fetching contacts: {str(error)}")
             return [], None
     
+    @classmethod
+    def fetch_contact_changes(cls, token_info, sync_token=None, page_size=1000):
+        """
+        Fetch the contacts changed since sync_token, or every contact when no
+        sync token is given, following pagination.
+        
+        Args:
+            token_info: Dict containing token information
+            sync_token: nextSyncToken returned by the previous sync
+            page_size: Number of contacts to fetch per page
+            
+        Returns:
+            tuple: (list of contacts, next sync token), or (None, None) when
+                Google has expired the sync token and a full sync is needed
+        """
+        service = cls.get_people_service(token_info)
+        
+        if not service:
+            raise ValueError("Could not create Google People API service")
+        
+        contacts = []
+        page_token = None
+        
+        while True:
+            params = {
+                'resourceName': 'people/me',
+                'pageSize': page_size,
+                'personFields': 'names,emailAddresses,phoneNumbers,addresses,organizations,metadata',
+                'requestSyncToken': True
+            }
+            if sync_token:
+                params['syncToken'] = sync_token
+            if page_token:
+                params['pageToken'] = page_token
+            
+            try:
+                results = service.people().connections().list(**params).execute()
+            except HttpError as error:
+                if sync_token and error.resp.status == 410:
+                    current_app.logger.info("Contacts sync token expired, running a full sync")
+                    return None, None
+                raise
+            
+            contacts.extend(results.get('connections', []))
+            page_token = results.get('nextPageToken')
+            if not page_token:
+                return contacts, results.get('nextSyncToken')
+    
     @classmethod
     def format_google_contact(cls, google_contact):
         """
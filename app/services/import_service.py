@@ -0,0 +1,226 @@
+"""
+Import Service
+
+Bulk import engine for contact CSV files. Files are read in chunks with
+pandas, validated column-wise, de-duplicated against the database with one
+keyed lookup per chunk and inserted with a single executemany per chunk
+instead of one ORM object and flush per row.
+"""
+
+import logging
+import re
+from datetime import datetime
+import pandas as pd
+from sqlalchemy import func
+from app.extensions import db
+from app.models.base import Contact
+from app.models.person import Person
+from app.utils.caching import invalidate_people_cache
+from app.utils.validation import validate_email
+
+logger = logging.getLogger(__name__)
+
+# Rows read, validated and inserted per round trip
+IMPORT_CHUNK_SIZE = 5000
+
+# Column order assumed when the file has no header row
+PERSON_IMPORT_COLUMNS = ['first_name', 'last_name', 'email', 'phone', 'address', 'city', 'state', 'zip_code', 'country']
+
+# Plain ASCII addresses matching this pattern are accepted without a
+# per-row call; anything else that looks like an email (IDN domains, quoted
+# local parts, special-use TLDs) goes through validate_email
+SIMPLE_EMAIL_PATTERN = (
+    r"^[a-z0-9!#$%&'*+/=?^_`{|}~-]+(?:\.[a-z0-9!#$%&'*+/=?^_`{|}~-]+)*"
+    r"@(?:[a-z0-9](?:[a-z0-9-]{0,61}[a-z0-9])?\.)+[a-z]{2,63}$"
+)
+LOOSE_EMAIL_PATTERN = r'^[^@\s]+@[^@\s]+\.[^@\s]+$'
+SPECIAL_USE_TLDS = ['arpa', 'invalid', 'local', 'localhost', 'onion', 'test']
+
+
+def import_people_csv(file, office_id, user_id, has_header=True, chunk_size=IMPORT_CHUNK_SIZE,
+                      start_chunk=0, on_chunk=None):
+    """
+    Import people from a CSV file in chunks.
+
+    Rows without a name, with an invalid email or with an invalid phone
+    number are counted as errors. Rows whose email already exists in the
+    office (or earlier in the file) are counted as duplicates and skipped.
+    Each chunk is committed on its own so a failure part way through keeps
+    the chunks already imported. The office's people cache is invalidated
+    once at the end.
+
+    Args:
+        file: Path or file-like object containing the CSV data
+        office_id: Office the people are imported into
+        user_id: User performing the import
+        has_header: Whether the first row holds column names
+        chunk_size: Number of rows processed per chunk
+        start_chunk: Index of the first chunk to import; earlier chunks are
+            skipped when resuming an interrupted import
+        on_chunk: Optional callback ``on_chunk(next_chunk, stats, rows)``
+            called before each chunk is committed, so progress saved by the
+            callback is committed together with the chunk
+
+    Returns:
+        dict: Counts of created, duplicates and errors, plus chunks processed
+    """
+    stats = {'created': 0, 'duplicates': 0, 'errors': 0, 'chunks': 0}
+    seen_emails = set()
+
+    reader = pd.read_csv(
+        file,
+        chunksize=chunk_size,
+        dtype=str,
+        keep_default_na=False,
+        header=0 if has_header else None,
+        names=None if has_header else PERSON_IMPORT_COLUMNS,
+        skipinitialspace=True
+    )
+
+    for index, chunk in enumerate(reader):
+        if index < start_chunk:
+            continue
+
+        rows = len(chunk)
+        chunk = normalize_people_chunk(chunk)
+        valid, error_count = validate_people_chunk(chunk)
+        stats['errors'] += error_count
+
+        new_rows, duplicate_count = drop_duplicate_people(valid, office_id, seen_emails)
+        stats['duplicates'] += duplicate_count
+
+        try:
+            stats['created'] += insert_people(new_rows, office_id, user_id)
+            stats['chunks'] += 1
+            if on_chunk:
+                on_chunk(index + 1, stats, rows)
+            db.session.commit()
+        except Exception as e:
+            db.session.rollback()
+            logger.error(f"Error inserting import chunk {index}: {str(e)}")
+            # Chunks committed before the failure are already visible
+            if stats['created']:
+                invalidate_people_cache(office_id)
+            raise
+
+    # Bulk inserts bypass the ORM cache hooks, so invalidate once for the whole import
+    if stats['created']:
+        invalidate_people_cache(office_id)
+
+    logger.info(
+        f"People import for office {office_id}: {stats['created']} created, "
+        f"{stats['duplicates']} duplicates, {stats['errors']} errors in {stats['chunks']} chunks"
+    )
+    return stats
+
+
+def normalize_people_chunk(df):
+    """Normalize column names and cell values of a chunk of people rows."""
+    df = df.rename(columns=lambda c: re.sub(r'\s+', '_', str(c).strip().lower()))
+    df = df.reindex(columns=PERSON_IMPORT_COLUMNS, fill_value='')
+
+    for column in PERSON_IMPORT_COLUMNS:
+        df[column] = df[column].astype(str).str.strip()
+    df['email'] = df['email'].str.lower()
+
+    # Clip values to the width of the contacts columns they are stored in
+    for column in PERSON_IMPORT_COLUMNS:
+        length = getattr(Contact.__table__.c[column].type, 'length', None)
+        if length:
+            df[column] = df[column].str.slice(0, length)
+
+    return df
+
+
+def validate_people_chunk(df):
+    """
+    Validate a normalized chunk of people rows.
+
+    Returns:
+        tuple: (DataFrame of valid rows, number of invalid rows)
+    """
+    has_name = (df['first_name'] != '') | (df['last_name'] != '')
+
+    emails = df['email']
+    simple = (
+        emails.str.match(SIMPLE_EMAIL_PATTERN)
+        & (emails.str.len() <= 254)
+        & (emails.str.split('@').str[0].str.len() <= 64)
+        & ~emails.str.rsplit('.', n=1).str[-1].isin(SPECIAL_USE_TLDS)
+    )
+    email_ok = (emails == '') | simple
+    candidates = emails[~email_ok & emails.str.match(LOOSE_EMAIL_PATTERN)].unique()
+    if len(candidates):
+        verdicts = {email: validate_email(email, check_deliverability=False)[0] for email in candidates}
+        email_ok |= emails.map(verdicts).fillna(False).astype(bool)
+
+    # Same rule as validate_phone: 7-15 digits once formatting is removed
+    digit_count = df['phone'].str.replace(r'\D', '', regex=True).str.len()
+    phone_ok = (df['phone'] == '') | digit_count.between(7, 15)
+
+    valid = has_name & email_ok & phone_ok
+    return df[valid], int((~valid).sum())
+
+
+def drop_duplicate_people(df, office_id, seen_emails):
+    """
+    Drop rows whose email already exists in the office or earlier in the file.
+
+    Existing emails are resolved with one query for the whole chunk.
+    ``seen_emails`` carries the emails imported so far across chunks.
+
+    Returns:
+        tuple: (DataFrame of new rows, number of duplicates dropped)
+    """
+    emails = df['email']
+    candidates = set(emails[emails != '']) - seen_emails
+    existing = set()
+    if candidates:
+        existing = {
+            email for (email,) in db.session.query(func.lower(Contact.email)).filter(
+                Contact.office_id == office_id,
+                func.lower(Contact.email).in_(candidates)
+            )
+        }
+
+    blocked = seen_emails | existing
+    duplicate = (emails != '') & (emails.isin(blocked) | emails.duplicated())
+    new_rows = df[~duplicate]
+    seen_emails.update(new_rows['email'][new_rows['email'] != ''])
+    return new_rows, int(duplicate.sum())
+
+
+def insert_people(df, office_id, user_id):
+    """
+    Insert a chunk of validated people with one executemany per table.
+
+    Bulk inserts bypass ORM events, so the dashboard stats rollup is
+    adjusted here for the rows added.
+
+    Returns:
+        int: Number of people inserted
+    """
+    if df.empty:
+        return 0
+
+    now = datetime.now()
+    mappings = df.to_dict('records')
+    for mapping in mappings:
+        mapping.update({
+            'type': 'person',
+            'office_id': office_id,
+            'user_id': user_id,
+            'created_at': now,
+            'updated_at': now,
+            'status': 'active'
+        })
+        if not mapping['email']:
+            mapping['email'] = None
+
+    db.session.bulk_insert_mappings(Person, mappings, return_defaults=True)
+
+    from app.models.dashboard_stats import UNDATED_BUCKET
+    from app.services.dashboard_stats import apply_delta
+    apply_delta(db.session.connection(), ('people', str(office_id), UNDATED_BUCKET), len(mappings))
+
+    return len(mappings)
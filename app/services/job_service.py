@@ -0,0 +1,228 @@
+"""
+Job Service
+
+Runs long operations (imports, exports, bulk sends, contact syncs) outside
+the request cycle. Work is recorded in the jobs table with progress counters
+and a checkpoint so clients can poll its status and interrupted jobs can be
+resumed from the last completed chunk.
+
+Jobs are dispatched to Celery, or executed in the current process when
+JOBS_EAGER is set (tests and single process deployments).
+"""
+
+import json
+import logging
+import os
+from datetime import datetime, timedelta
+from flask import current_app
+from sqlalchemy import and_, func, or_, update
+from app.extensions import db
+from app.models.job import Job
+
+logger = logging.getLogger(__name__)
+
+# Minutes without a heartbeat after which a running job counts as interrupted
+JOB_STALE_MINUTES = 30
+
+# Registered handlers keyed by job type
+JOB_HANDLERS = {}
+
+
+def job_handler(job_type):
+    """
+    Register a function as the handler for a job type.
+
+    The handler is called with a JobContext and returns a JSON serialisable
+    result stored on the job.
+    """
+    def decorator(func):
+        JOB_HANDLERS[job_type] = func
+        return func
+    return decorator
+
+
+class JobContext:
+    """Handle passed to job handlers for reading parameters and reporting progress."""
+
+    def __init__(self, job):
+        self.job = job
+        self.params = job.get_params()
+        self.checkpoint = job.get_checkpoint()
+
+    def set_total(self, total, commit=True):
+        """Set the number of units of work the job will process."""
+        self.job.progress_total = total
+        self.job.heartbeat_at = datetime.utcnow()
+        if commit:
+            db.session.commit()
+
+    def advance(self, count=1, checkpoint=None, commit=True):
+        """
+        Record completed work and optionally a checkpoint to resume from.
+
+        Pass commit=False to save the progress together with the handler's
+        own commit, so the checkpoint never runs ahead of committed work.
+        """
+        self.job.progress_current = (self.job.progress_current or 0) + count
+        self.job.heartbeat_at = datetime.utcnow()
+        if checkpoint is not None:
+            self.checkpoint = checkpoint
+            self.job.checkpoint = json.dumps(checkpoint)
+        if commit:
+            db.session.commit()
+
+
+def get_jobs_dir(*parts):
+    """
+    Return (and create) the directory used for job files.
+
+    Uploads are read by whichever worker runs the job and exports are
+    downloaded from whichever instance serves the request, so unless jobs
+    run eagerly in the request process JOBS_DIR must be set to storage
+    shared by every web instance and worker (e.g. a mounted volume).
+    instance/jobs is only used for eager, single process deployments.
+
+    Raises:
+        RuntimeError: If jobs are dispatched to Celery and JOBS_DIR is unset
+    """
+    jobs_dir = current_app.config.get('JOBS_DIR')
+    if not jobs_dir:
+        if not current_app.config.get('JOBS_EAGER'):
+            raise RuntimeError(
+                "JOBS_DIR must be set to a directory shared by all instances and workers "
+                "when background jobs run on Celery"
+            )
+        jobs_dir = os.path.join(current_app.instance_path, 'jobs')
+    path = os.path.join(jobs_dir, *parts)
+    os.makedirs(path, exist_ok=True)
+    return path
+
+
+def export_file_path(job_id, filename):
+    """Return where an export job writes its file; only the filename is kept in the job result."""
+    return os.path.join(get_jobs_dir('exports'), f"{job_id}_{filename}")
+
+
+def enqueue_job(job_type, params=None, user_id=None, office_id=None):
+    """
+    Create a job and dispatch it for execution.
+
+    Args:
+        job_type: Registered job type
+        params: JSON serialisable handler arguments
+        user_id: User the job runs for
+        office_id: Office the job runs for
+
+    Returns:
+        Job: The job record (already finished when running eagerly)
+    """
+    job = Job(
+        job_type=job_type,
+        params=json.dumps(params or {}),
+        user_id=user_id,
+        office_id=office_id,
+        status='queued'
+    )
+    db.session.add(job)
+    db.session.commit()
+
+    logger.info(f"Enqueued job {job.id} ({job_type}) for user {user_id}")
+    dispatch_job(job.id)
+    return db.session.get(Job, job.id)
+
+
+def dispatch_job(job_id):
+    """Run a job inline when JOBS_EAGER is set, otherwise hand it to Celery."""
+    if current_app.config.get('JOBS_EAGER'):
+        execute_job(job_id)
+    else:
+        from app.tasks.jobs import run_job
+        run_job.delay(job_id)
+
+
+def execute_job(job_id):
+    """
+    Execute a job with its registered handler.
+
+    Failures are recorded on the job rather than raised, and the checkpoint
+    is kept so the job can be resumed.
+
+    Returns:
+        Job: The finished job, or None if it does not exist
+    """
+    # Importing the task module registers the built-in handlers
+    import app.tasks.jobs  # noqa: F401
+
+    job = db.session.get(Job, job_id)
+    if job is None:
+        logger.error(f"Job {job_id} not found")
+        return None
+
+    handler = JOB_HANDLERS.get(job.job_type)
+    if handler is None:
+        job.status = 'failed'
+        job.error_message = f"No handler registered for job type {job.job_type}"
+        job.completed_at = datetime.utcnow()
+        db.session.commit()
+        return job
+
+    job.status = 'running'
+    job.started_at = datetime.utcnow()
+    job.heartbeat_at = job.started_at
+    job.completed_at = None
+    job.error_message = None
+    job.attempts = (job.attempts or 0) + 1
+    db.session.commit()
+
+    try:
+        result = handler(JobContext(job))
+        job.result = json.dumps(result) if result is not None else None
+        job.status = 'completed'
+        job.completed_at = datetime.utcnow()
+        db.session.commit()
+        logger.info(f"Job {job.id} ({job.job_type}) completed")
+    except Exception as e:
+        db.session.rollback()
+        logger.error(f"Job {job_id} ({job.job_type}) failed: {str(e)}")
+        job = db.session.get(Job, job_id)
+        job.status = 'failed'
+        job.error_message = str(e)
+        job.completed_at = datetime.utcnow()
+        db.session.commit()
+
+    return job
+
+
+def resume_job(job_id):
+    """
+    Re-dispatch a failed or interrupted job from its last checkpoint.
+
+    Only failed jobs, and running jobs whose heartbeat is older than
+    JOB_STALE_MINUTES (their worker died), can be resumed. The job is moved
+    back to queued with a conditional UPDATE, so of two concurrent resume
+    calls only one dispatches it.
+
+    Returns:
+        Job: The job, or None if it does not exist or cannot be resumed
+    """
+    stale_minutes = current_app.config.get('JOB_STALE_MINUTES', JOB_STALE_MINUTES)
+    stale_before = datetime.utcnow() - timedelta(minutes=stale_minutes)
+    claimed = db.session.execute(
+        update(Job).where(
+            Job.id == job_id,
+            or_(
+                Job.status == 'failed',
+                and_(
+                    Job.status == 'running',
+                    func.coalesce(Job.heartbeat_at, Job.started_at, Job.created_at) < stale_before
+                )
+            )
+        ).values(status='queued'),
+        execution_options={'synchronize_session': False}
+    ).rowcount
+    db.session.commit()
+    if not claimed:
+        return None
+
+    dispatch_job(job_id)
+    return db.session.get(Job, job_id)
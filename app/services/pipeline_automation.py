@@ -6,6 +6,7 @@ and creating tasks based on pipeline stage settings.
 
 from datetime import datetime, timedelta
 from app.extensions import db
+from sqlalchemy import and_, case, func, insert, literal, select, update, DateTime
 from app.models import Pipeline, PipelineStage, PipelineContact, PipelineStageHistory, Task, User, Contact, Office
 from flask import current_app, render_template
 import json
@@ -49,65 +50,159 @@ def run_pipeline_automations():
         current_app.logger.error(f"Error running pipeline automations: {str(e)}")
         raise
 
-def process_automatic_movements():
+def process_automatic_movements(dry_run=False):
     """
     Process automatic movement of contacts between pipeline stages.
-    Returns the number of contacts moved.
+
+    Contacts that have been in a stage for longer than its auto_move_days are
+    moved to the stage with the next order. Each pipeline is handled with a
+    few set-based statements (see move_due_contacts) and all pipelines are
+    committed in one transaction.
+
+    Args:
+        dry_run: Report the moves without making any changes
+
+    Returns:
+        The number of contacts moved (or that would be moved).
     """
+    now = datetime.utcnow()
     moved_count = 0
-    
-    # Find stages with auto-move configured
-    auto_move_stages = PipelineStage.query.filter(
-        PipelineStage.auto_move_days.isnot(None),
-        PipelineStage.auto_move_days > 0,
-        PipelineStage.is_active == True
+    plans = get_auto_move_plans()
+
+    current_app.logger.info(f"Processing automatic movements for {len(plans)} pipelines")
+
+    try:
+        for plan in plans:
+            if dry_run:
+                for move in report_due_movements(plan, now):
+                    current_app.logger.info(
+                        f"Would auto-move {move['count']} contacts from {move['from_stage']} to {move['to_stage']}"
+                    )
+                    moved_count += move['count']
+            else:
+                moved_count += move_due_contacts(plan, now)
+
+        if moved_count and not dry_run:
+            db.session.commit()
+
+            from app.utils.caching import invalidate_pipeline_cache, invalidate_people_cache
+            invalidate_pipeline_cache()
+            invalidate_people_cache()
+    except Exception:
+        db.session.rollback()
+        raise
+
+    current_app.logger.info(f"{'Would move' if dry_run else 'Moved'} {moved_count} contacts automatically")
+    return moved_count
+
+def get_auto_move_plans():
+    """
+    Work out which stages move contacts automatically, and where to.
+
+    Returns:
+        A list with one dict per pipeline that has auto-move stages:
+        pipeline_id, next_stage (stage id -> next stage id), days (stage id ->
+        auto_move_days) and names (stage id -> name).
+    """
+    stages = db.session.query(
+        PipelineStage.id, PipelineStage.pipeline_id, PipelineStage.order,
+        PipelineStage.name, PipelineStage.auto_move_days
     ).all()
-    
-    current_app.logger.info(f"Processing automatic movements for {len(auto_move_stages)} stages")
-    
-    for stage in auto_move_stages:
-        # Check if there's a next stage to move to
-        next_stage = PipelineStage.query.filter_by(
-            pipeline_id=stage.pipeline_id,
-            order=stage.order + 1,
-            is_active=True
-        ).first()
-        
+
+    by_position = {(stage.pipeline_id, stage.order): stage for stage in stages}
+    plans = {}
+    for stage in stages:
+        if not stage.auto_move_days or stage.auto_move_days <= 0:
+            continue
+        next_stage = by_position.get((stage.pipeline_id, stage.order + 1))
         if not next_stage:
             continue  # No next stage to move to
-        
-        # Find contacts that have been in this stage for too long
-        cutoff_date = datetime.utcnow() - timedelta(days=stage.auto_move_days)
-        
-        pipeline_contacts = PipelineContact.query.filter_by(
-            current_stage_id=stage.id
-        ).filter(
-            PipelineContact.last_updated <= cutoff_date
-        ).all()
-        
-        for pipeline_contact in pipeline_contacts:
-            try:
-                # Move the contact to the next stage
-                pipeline_contact.move_to_stage(
-                    next_stage.id,
-                    user_id=None,  # Automated move
-                    notes=f"Automatically moved after {stage.auto_move_days} days in stage"
-                )
-                moved_count += 1
-                
-                current_app.logger.info(
-                    f"Auto-moved contact {pipeline_contact.contact_id} from {stage.name} to {next_stage.name}"
-                )
-            except Exception as e:
-                current_app.logger.error(
-                    f"Error auto-moving contact {pipeline_contact.contact_id}: {str(e)}"
-                )
-    
-    # Commit all changes
-    if moved_count > 0:
-        db.session.commit()
-    
-    return moved_count
+
+        plan = plans.setdefault(stage.pipeline_id, {
+            'pipeline_id': stage.pipeline_id, 'next_stage': {}, 'days': {}, 'names': {}
+        })
+        plan['next_stage'][stage.id] = next_stage.id
+        plan['days'][stage.id] = stage.auto_move_days
+        plan['names'][stage.id] = stage.name
+        plan['names'][next_stage.id] = next_stage.name
+
+    return list(plans.values())
+
+def _due_condition(plan, now):
+    """SQL condition matching the pipeline contacts in plan that are due to move."""
+    cutoffs = {stage_id: now - timedelta(days=days) for stage_id, days in plan['days'].items()}
+    return and_(
+        PipelineContact.pipeline_id == plan['pipeline_id'],
+        PipelineContact.current_stage_id.in_(list(plan['next_stage'])),
+        PipelineContact.last_updated <= case(cutoffs, value=PipelineContact.current_stage_id)
+    )
+
+def report_due_movements(plan, now):
+    """
+    Count the contacts of a pipeline that are due to move, grouped by stage.
+
+    Returns:
+        A list of dicts with from_stage, to_stage and count.
+    """
+    rows = db.session.query(
+        PipelineContact.current_stage_id, func.count(PipelineContact.id)
+    ).filter(
+        _due_condition(plan, now)
+    ).group_by(PipelineContact.current_stage_id).all()
+
+    return [{
+        'pipeline_id': plan['pipeline_id'],
+        'from_stage': plan['names'][stage_id],
+        'to_stage': plan['names'][plan['next_stage'][stage_id]],
+        'count': count
+    } for stage_id, count in rows]
+
+def move_due_contacts(plan, now):
+    """
+    Move every due contact of one pipeline to its next stage.
+
+    Writes the stage history with one INSERT ... SELECT, updates the
+    people's pipeline_stage and then the pipeline contacts with one UPDATE
+    each. Nothing is committed here.
+
+    Returns:
+        The number of contacts moved.
+    """
+    due = _due_condition(plan, now)
+    pc = PipelineContact.__table__
+    next_stage = case(plan['next_stage'], value=pc.c.current_stage_id)
+
+    notes = case(
+        {stage_id: f"Automatically moved after {days} days in stage" for stage_id, days in plan['days'].items()},
+        value=pc.c.current_stage_id
+    )
+    db.session.execute(
+        insert(PipelineStageHistory.__table__).from_select(
+            ['pipeline_contact_id', 'from_stage_id', 'to_stage_id', 'notes', 'created_at'],
+            select(pc.c.id, pc.c.current_stage_id, next_stage, notes, literal(now, DateTime)).where(due)
+        )
+    )
+
+    # Keep the stage name stored on people in step, as move_to_stage does
+    from app.models.person import Person
+    next_stage_name = case(
+        {stage_id: plan['names'][next_id] for stage_id, next_id in plan['next_stage'].items()},
+        value=pc.c.current_stage_id
+    )
+    db.session.execute(
+        update(Person.__table__).where(
+            Person.__table__.c.id.in_(select(pc.c.contact_id).where(due))
+        ).values(
+            pipeline_stage=select(next_stage_name).where(
+                pc.c.contact_id == Person.__table__.c.id, due
+            ).limit(1).scalar_subquery()
+        )
+    )
+
+    result = db.session.execute(
+        update(pc).where(due).values(current_stage_id=next_stage, last_updated=now)
+    )
+    return result.rowcount
 
 def process_automatic_reminders():
     """
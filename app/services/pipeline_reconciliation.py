@@ -0,0 +1,131 @@
+"""
+Pipeline Reconciliation Service
+
+Puts contacts that are missing from a pipeline into it. For each pipeline
+and contact type one INSERT ... SELECT ... WHERE NOT EXISTS adds every
+missing (contact, pipeline, stage) row, with the stage picked in SQL:
+the stage named by the person's people_pipeline value when the pipeline
+has one, otherwise the default stage. Nothing is committed here, so a
+caller can reconcile several pipelines in one transaction.
+"""
+
+from datetime import datetime
+import logging
+from sqlalchemy import DateTime, Integer, exists, func, insert, literal, select
+from app.extensions import db
+from app.models.base import Contact
+from app.models.church import Church
+from app.models.person import Person
+from app.models.pipeline import PipelineContact, PipelineStage
+
+logger = logging.getLogger(__name__)
+
+# Stage used when a contact's pipeline value names no stage of the pipeline
+DEFAULT_STAGE_NAME = 'INFORMATION'
+
+
+def default_stage_id(pipeline_id, name=DEFAULT_STAGE_NAME, first_stage_fallback=False):
+    """
+    Return the id of the pipeline's stage called name (case-insensitive).
+
+    Args:
+        pipeline_id: Pipeline to look in
+        name: Stage name
+        first_stage_fallback: Use the pipeline's first stage when there is no such stage
+
+    Returns:
+        int or None: The stage id
+    """
+    stage_id = db.session.execute(
+        select(func.min(PipelineStage.id)).where(
+            PipelineStage.pipeline_id == pipeline_id,
+            func.upper(PipelineStage.name) == name.upper()
+        )
+    ).scalar()
+    if stage_id is None and first_stage_fallback:
+        stage_id = db.session.execute(
+            select(PipelineStage.id).where(PipelineStage.pipeline_id == pipeline_id)
+            .order_by(PipelineStage.order, PipelineStage.id).limit(1)
+        ).scalar()
+    return stage_id
+
+
+def missing_members_insert(pipeline_id, model, stage_id, office_id=None, stage_name_column=None, now=None):
+    """
+    Build the INSERT ... SELECT adding contacts of one type missing from a pipeline.
+
+    Args:
+        pipeline_id: Pipeline to add contacts to
+        model: Person or Church
+        stage_id: Stage for contacts without a matching stage (None skips them)
+        office_id: Only add contacts of this office
+        stage_name_column: Column holding a stage name to place each contact in
+            (e.g. the people_pipeline column of the people table)
+        now: Timestamp for entered_at and last_updated
+
+    Returns:
+        Insert: The statement
+    """
+    now = now or datetime.now()
+    contacts = Contact.__table__
+    members = model.__table__
+    pc = PipelineContact.__table__
+
+    stage = literal(stage_id, Integer)
+    if stage_name_column is not None:
+        named_stage = select(func.min(PipelineStage.id)).where(
+            PipelineStage.pipeline_id == pipeline_id,
+            func.upper(PipelineStage.name) == func.upper(stage_name_column)
+        ).scalar_subquery()
+        stage = func.coalesce(named_stage, stage) if stage_id is not None else named_stage
+
+    query = select(
+        members.c.id,
+        literal(pipeline_id, Integer),
+        stage,
+        literal(now, DateTime),
+        literal(now, DateTime)
+    ).select_from(
+        members.join(contacts, contacts.c.id == members.c.id)
+    ).where(
+        ~exists().where(pc.c.pipeline_id == pipeline_id, pc.c.contact_id == members.c.id)
+    )
+    if office_id is not None:
+        query = query.where(contacts.c.office_id == office_id)
+    if stage_id is None:
+        query = query.where(stage.isnot(None))
+
+    return insert(pc).from_select(
+        ['contact_id', 'pipeline_id', 'current_stage_id', 'entered_at', 'last_updated'], query
+    )
+
+
+def reconcile_pipeline_members(pipeline_id, model, stage_id, office_id=None, stage_name_column=None, now=None):
+    """
+    Add the contacts of one type missing from a pipeline; see missing_members_insert.
+
+    Returns:
+        int: Number of contacts added
+    """
+    if stage_id is None and stage_name_column is None:
+        return 0
+    result = db.session.execute(
+        missing_members_insert(pipeline_id, model, stage_id, office_id, stage_name_column, now)
+    )
+    return result.rowcount
+
+
+def reconcile_people(pipeline_id, office_id=None, now=None):
+    """Add missing people to a pipeline, in the stage named by their people_pipeline value."""
+    return reconcile_pipeline_members(
+        pipeline_id, Person, default_stage_id(pipeline_id), office_id,
+        stage_name_column=Person.__table__.c.people_pipeline, now=now
+    )
+
+
+def reconcile_churches(pipeline_id, office_id=None, stage_id=None, now=None):
+    """Add missing churches to a pipeline, in stage_id or the pipeline's default stage."""
+    if stage_id is None:
+        stage_id = default_stage_id(pipeline_id)
+    return reconcile_pipeline_members(pipeline_id, Church, stage_id, office_id, now=now)
+
@@ -0,0 +1,94 @@
+"""
+Pipeline Stats Service
+
+Counts the contacts in pipelines and pipeline stages with one grouped query
+per pipeline (or per list of pipelines) instead of a COUNT per stage. Results
+are cached under the pipeline cache namespace, which is invalidated whenever
+pipeline memberships are written (see app.utils.caching).
+"""
+
+import logging
+from sqlalchemy import func, or_
+from app.extensions import cache, db
+from app.models.base import Contact
+from app.models.person import Person
+from app.models.church import Church
+from app.models.pipeline import PipelineContact
+from app.utils.caching import PIPELINE_NAMESPACE, LONG_TIMEOUT, namespaced_key
+
+logger = logging.getLogger(__name__)
+
+
+def _filtered(query, office_id=None, assigned_to=None):
+    """Restrict a PipelineContact query to contacts of an office and/or assignee."""
+    if office_id is not None:
+        query = query.join(Contact, Contact.id == PipelineContact.contact_id).filter(
+            Contact.office_id == office_id
+        )
+    if assigned_to:
+        people, churches = Person.__table__, Church.__table__
+        query = query.outerjoin(people, people.c.id == PipelineContact.contact_id).outerjoin(
+            churches, churches.c.id == PipelineContact.contact_id
+        ).filter(or_(people.c.assigned_to == assigned_to, churches.c.assigned_to == assigned_to))
+    return query
+
+
+def get_stage_counts(pipeline_id, office_id=None, assigned_to=None):
+    """
+    Count the contacts in each stage of a pipeline.
+
+    Args:
+        pipeline_id: Pipeline to count
+        office_id: Only count contacts of this office
+        assigned_to: Only count contacts assigned to this username
+
+    Returns:
+        dict: stage_id -> number of contacts (stages without contacts are absent)
+    """
+    cache_key = namespaced_key(PIPELINE_NAMESPACE, f"stage_counts_{pipeline_id}_{office_id}_{assigned_to}")
+    counts = cache.get(cache_key)
+    if counts is not None:
+        return counts
+
+    query = db.session.query(PipelineContact.current_stage_id, func.count(PipelineContact.id)).filter(
+        PipelineContact.pipeline_id == pipeline_id
+    )
+    query = _filtered(query, office_id, assigned_to)
+    counts = dict(query.group_by(PipelineContact.current_stage_id).all())
+
+    cache.set(cache_key, counts, timeout=LONG_TIMEOUT)
+    return counts
+
+
+def get_pipeline_counts(pipeline_ids, office_id=None, assigned_to=None):
+    """
+    Count the contacts in each of several pipelines.
+
+    Args:
+        pipeline_ids: Pipelines to count
+        office_id: Only count contacts of this office
+        assigned_to: Only count contacts assigned to this username
+
+    Returns:
+        dict: pipeline_id -> number of contacts, including pipelines with none
+    """
+    pipeline_ids = sorted(set(pipeline_ids))
+    if not pipeline_ids:
+        return {}
+
+    cache_key = namespaced_key(
+        PIPELINE_NAMESPACE, f"pipeline_counts_{','.join(map(str, pipeline_ids))}_{office_id}_{assigned_to}"
+    )
+    counts = cache.get(cache_key)
+    if counts is not None:
+        return counts
+
+    query = db.session.query(PipelineContact.pipeline_id, func.count(PipelineContact.id)).filter(
+        PipelineContact.pipeline_id.in_(pipeline_ids)
+    )
+    query = _filtered(query, office_id, assigned_to)
+    counts = dict.fromkeys(pipeline_ids, 0)
+    counts.update(query.group_by(PipelineContact.pipeline_id).all())
+
+    cache.set(cache_key, counts, timeout=LONG_TIMEOUT)
+    return counts
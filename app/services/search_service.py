@@ -0,0 +1,357 @@
+"""
+Search Service
+
+Ranked contact search shared by the people, church and contact API
+endpoints.
+
+Each contact has one search document (names, church name, email, phone,
+address and church details) kept in a dedicated index by database
+triggers, so ORM writes, bulk inserts and raw SQL updates are all indexed:
+
+* PostgreSQL: ``contact_search`` table with a ``pg_trgm`` GIN index for
+  substring matches and a ``tsvector`` GIN index for word matches, ranked
+  by trigram word similarity and ``ts_rank``.
+* SQLite (local development and tests): ``contacts_fts`` FTS5 table with
+  the trigram tokenizer, ranked by ``bm25``.
+
+Other databases, or databases where the index has not been created yet,
+fall back to ``ILIKE`` matching on the contact columns.
+"""
+
+import logging
+from sqlalchemy import event, inspect, or_, and_, func, literal, literal_column, select, table, column, text, Float, Integer
+from app.extensions import db
+from app.models.base import Contact
+from app.models.church import Church
+
+logger = logging.getLogger(__name__)
+
+# Search terms shorter than this cannot use the trigram indexes. On their
+# own they are matched as word prefixes ("jo" finds "John" and "Jones");
+# next to longer terms they filter the rows those terms matched
+MIN_TRIGRAM_LENGTH = 3
+
+contact_search = table('contact_search', column('contact_id', Integer), column('document'), column('document_tsv'))
+contacts_fts = table('contacts_fts', column('rowid', Integer), column('document'))
+contacts_prefix_fts = table('contacts_prefix_fts', column('rowid', Integer), column('document'))
+
+# Fields combined into each contact's search document
+_DOCUMENT_FIELDS = [
+    'c.first_name', 'c.last_name', 'ch.name', 'c.email', 'c.phone', 'c.address',
+    'c.city', 'c.state', 'ch.denomination', 'ch.location'
+]
+
+# Columns of each table the document is built from; updates that change
+# none of them leave the index alone
+_CONTACT_COLUMNS = [field[2:] for field in _DOCUMENT_FIELDS if field.startswith('c.')]
+_CHURCH_COLUMNS = [field[3:] for field in _DOCUMENT_FIELDS if field.startswith('ch.')]
+
+_SQLITE_DOCUMENT = " || ' ' || ".join(f"coalesce({field}, '')" for field in _DOCUMENT_FIELDS)
+_POSTGRES_DOCUMENT = "concat_ws(' ', " + ", ".join(_DOCUMENT_FIELDS) + ")"
+
+_SQLITE_SELECT = (
+    f"SELECT c.id, {_SQLITE_DOCUMENT} FROM contacts c LEFT JOIN churches ch ON ch.id = c.id"
+)
+
+# SQLite keeps two FTS5 tables over the same document: a trigram table for
+# substring matches and a word table with 1 and 2 character prefix indexes
+# for short type-ahead terms
+SQLITE_FTS_TABLES = {
+    'contacts_fts': "tokenize='trigram'",
+    'contacts_prefix_fts': "prefix='1 2'"
+}
+
+
+def _update_of(columns, distinct='IS NOT'):
+    """Return the ``UPDATE OF ...`` column list and ``WHEN`` condition of an update trigger."""
+    changed = ' OR '.join(f"old.{name} {distinct} new.{name}" for name in columns)
+    return ', '.join(columns), changed
+
+
+def _sqlite_refresh(contact_id, delete_id=None):
+    statements = []
+    for name in SQLITE_FTS_TABLES:
+        if delete_id:
+            statements.append(f"DELETE FROM {name} WHERE rowid = {delete_id};")
+        if contact_id:
+            statements.append(f"INSERT INTO {name}(rowid, document) {_SQLITE_SELECT} WHERE c.id = {contact_id};")
+    return '\n        '.join(statements)
+
+
+SQLITE_INDEX_DDL = [
+    f"CREATE VIRTUAL TABLE IF NOT EXISTS {name} USING fts5(document, {options})"
+    for name, options in SQLITE_FTS_TABLES.items()
+] + [
+    f"""CREATE TRIGGER IF NOT EXISTS contacts_search_ai AFTER INSERT ON contacts BEGIN
+        {_sqlite_refresh('new.id')}
+    END""",
+    "DROP TRIGGER IF EXISTS contacts_search_au",
+    """CREATE TRIGGER contacts_search_au AFTER UPDATE OF {} ON contacts WHEN {} BEGIN
+        {}
+    END""".format(*_update_of(_CONTACT_COLUMNS), _sqlite_refresh('new.id', delete_id='old.id')),
+    f"""CREATE TRIGGER IF NOT EXISTS contacts_search_ad AFTER DELETE ON contacts BEGIN
+        {_sqlite_refresh(None, delete_id='old.id')}
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS churches_search_ai AFTER INSERT ON churches BEGIN
+        {_sqlite_refresh('new.id', delete_id='new.id')}
+    END""",
+    "DROP TRIGGER IF EXISTS churches_search_au",
+    """CREATE TRIGGER churches_search_au AFTER UPDATE OF {} ON churches WHEN {} BEGIN
+        {}
+    END""".format(*_update_of(_CHURCH_COLUMNS), _sqlite_refresh('new.id', delete_id='new.id'))
+]
+
+POSTGRES_INDEX_DDL = [
+    "CREATE EXTENSION IF NOT EXISTS pg_trgm",
+    """CREATE TABLE IF NOT EXISTS contact_search (
+        contact_id INTEGER PRIMARY KEY REFERENCES contacts(id) ON DELETE CASCADE,
+        document TEXT NOT NULL DEFAULT '',
+        document_tsv TSVECTOR GENERATED ALWAYS AS (to_tsvector('simple', document)) STORED
+    )""",
+    "CREATE INDEX IF NOT EXISTS ix_contact_search_document_trgm ON contact_search USING gin (document gin_trgm_ops)",
+    "CREATE INDEX IF NOT EXISTS ix_contact_search_document_tsv ON contact_search USING gin (document_tsv)",
+    f"""CREATE OR REPLACE FUNCTION refresh_contact_search() RETURNS trigger AS $$
+    BEGIN
+        INSERT INTO contact_search (contact_id, document)
+        SELECT c.id, lower({_POSTGRES_DOCUMENT}) FROM contacts c LEFT JOIN churches ch ON ch.id = c.id
+        WHERE c.id = NEW.id
+        ON CONFLICT (contact_id) DO UPDATE SET document = EXCLUDED.document;
+        RETURN NULL;
+    END;
+    $$ LANGUAGE plpgsql""",
+    "DROP TRIGGER IF EXISTS contacts_search_refresh ON contacts",
+    """CREATE TRIGGER contacts_search_refresh AFTER INSERT ON contacts
+        FOR EACH ROW EXECUTE FUNCTION refresh_contact_search()""",
+    "DROP TRIGGER IF EXISTS contacts_search_update ON contacts",
+    """CREATE TRIGGER contacts_search_update AFTER UPDATE OF {} ON contacts
+        FOR EACH ROW WHEN ({}) EXECUTE FUNCTION refresh_contact_search()""".format(
+        *_update_of(_CONTACT_COLUMNS, distinct='IS DISTINCT FROM')
+    ),
+    "DROP TRIGGER IF EXISTS churches_search_refresh ON churches",
+    """CREATE TRIGGER churches_search_refresh AFTER INSERT ON churches
+        FOR EACH ROW EXECUTE FUNCTION refresh_contact_search()""",
+    "DROP TRIGGER IF EXISTS churches_search_update ON churches",
+    """CREATE TRIGGER churches_search_update AFTER UPDATE OF {} ON churches
+        FOR EACH ROW WHEN ({}) EXECUTE FUNCTION refresh_contact_search()""".format(
+        *_update_of(_CHURCH_COLUMNS, distinct='IS DISTINCT FROM')
+    )
+]
+
+# Whether the search index exists, cached per engine
+_index_available = {}
+
+
+def install_search_index(connection):
+    """
+    Create the search index and its triggers if needed, and fill it.
+
+    Args:
+        connection: SQLAlchemy connection to run the DDL on
+
+    Returns:
+        bool: True if the dialect supports an index and it was installed
+    """
+    dialect = connection.dialect.name
+    if dialect == 'sqlite':
+        statements = SQLITE_INDEX_DDL
+    elif dialect == 'postgresql':
+        statements = POSTGRES_INDEX_DDL
+    else:
+        logger.info(f"No search index for dialect {dialect}; using ILIKE search")
+        return False
+
+    for statement in statements:
+        connection.execute(text(statement))
+    rebuild_search_index(connection)
+    _index_available[connection.engine] = True
+    return True
+
+
+def drop_search_index(connection):
+    """Drop the search index table (its triggers are dropped with the contact tables)."""
+    dialect = connection.dialect.name
+    if dialect == 'sqlite':
+        for name in SQLITE_FTS_TABLES:
+            connection.execute(text(f"DROP TABLE IF EXISTS {name}"))
+    elif dialect == 'postgresql':
+        connection.execute(text("DROP TABLE IF EXISTS contact_search"))
+    _index_available.pop(connection.engine, None)
+
+
+def rebuild_search_index(connection=None):
+    """
+    Rebuild every search document from the contact tables.
+
+    Returns:
+        int: Number of documents indexed
+    """
+    connection = connection or db.session.connection()
+    dialect = connection.dialect.name
+    if dialect == 'sqlite':
+        for name in SQLITE_FTS_TABLES:
+            connection.execute(text(f"DELETE FROM {name}"))
+            result = connection.execute(text(f"INSERT INTO {name}(rowid, document) {_SQLITE_SELECT}"))
+    elif dialect == 'postgresql':
+        result = connection.execute(text(
+            f"""INSERT INTO contact_search (contact_id, document)
+            SELECT c.id, lower({_POSTGRES_DOCUMENT}) FROM contacts c LEFT JOIN churches ch ON ch.id = c.id
+            ON CONFLICT (contact_id) DO UPDATE SET document = EXCLUDED.document"""
+        ))
+    else:
+        return 0
+    return result.rowcount
+
+
+def has_search_index(connection=None):
+    """Check (once per engine) whether the search index exists."""
+    connection = connection or db.session.connection()
+    engine = connection.engine
+    if engine not in _index_available:
+        table_name = {'sqlite': 'contacts_fts', 'postgresql': 'contact_search'}.get(connection.dialect.name)
+        _index_available[engine] = bool(table_name) and inspect(connection).has_table(table_name)
+    return _index_available[engine]
+
+
+def register_search_index(app):
+    """
+    Keep the search index in step with ``db.create_all``/``db.drop_all``.
+
+    Existing databases get the index from the migration or the
+    ``search_index`` bootstrap step, so nothing is queried here.
+    """
+    if not event.contains(db.metadata, 'after_create', _create_search_index):
+        event.listen(db.metadata, 'after_create', _create_search_index)
+        event.listen(db.metadata, 'before_drop', _drop_search_index)
+
+
+def _create_search_index(target, connection, **kw):
+    tables = inspect(connection).get_table_names()
+    if 'contacts' in tables and 'churches' in tables:
+        install_search_index(connection)
+
+
+def _drop_search_index(target, connection, **kw):
+    drop_search_index(connection)
+
+
+def _search_terms(term):
+    return [token for token in (term or '').lower().split() if token]
+
+
+def search_matches(term):
+    """
+    Build a subquery of contacts matching a search term with their rank.
+
+    Every whitespace separated token must appear in the contact's search
+    document. Higher ranks are better matches.
+
+    Args:
+        term: Search text entered by the user
+
+    Returns:
+        Subquery with ``contact_id`` and ``rank`` columns, or None if the
+        term is blank
+    """
+    tokens = _search_terms(term)
+    if not tokens:
+        return None
+
+    connection = db.session.connection()
+    dialect = connection.dialect.name
+    if not has_search_index(connection):
+        return _fallback_matches(tokens)
+
+    long_tokens = [token for token in tokens if len(token) >= MIN_TRIGRAM_LENGTH]
+    short_tokens = [token for token in tokens if len(token) < MIN_TRIGRAM_LENGTH]
+
+    if dialect == 'sqlite':
+        if not long_tokens:
+            prefix_match = ' '.join(_fts_phrase(token) + '*' for token in short_tokens)
+            return select(
+                contacts_prefix_fts.c.rowid.label('contact_id'),
+                literal(0.0).cast(Float).label('rank')
+            ).where(
+                text('contacts_prefix_fts MATCH :prefix_match').bindparams(prefix_match=prefix_match)
+            ).subquery('search_matches')
+
+        # Short terms alongside longer ones only filter the rows the trigram
+        # match already found
+        match = ' '.join(_fts_phrase(token) for token in long_tokens)
+        conditions = [text('contacts_fts MATCH :search_match').bindparams(search_match=match)]
+        conditions += [contacts_fts.c.document.like(f'%{_escape_like(token)}%', escape='\\') for token in short_tokens]
+        return select(
+            contacts_fts.c.rowid.label('contact_id'),
+            (-func.bm25(literal_column('contacts_fts'))).cast(Float).label('rank')
+        ).where(and_(*conditions)).subquery('search_matches')
+
+    # PostgreSQL: the trigram index serves the substring filters, the
+    # tsvector index the short word prefixes and both feed the rank
+    phrase = ' '.join(tokens)
+    ts_query = func.plainto_tsquery('simple', phrase)
+    rank = func.greatest(
+        func.word_similarity(phrase, contact_search.c.document),
+        func.ts_rank(contact_search.c.document_tsv, ts_query)
+    )
+    conditions = [contact_search.c.document.like(f'%{_escape_like(token)}%', escape='\\') for token in long_tokens]
+    if short_tokens:
+        prefix_query = ' & '.join(_ts_lexeme(token) + ':*' for token in short_tokens)
+        conditions.append(contact_search.c.document_tsv.op('@@')(func.to_tsquery('simple', prefix_query)))
+    return select(
+        contact_search.c.contact_id,
+        rank.cast(Float).label('rank')
+    ).where(and_(*conditions)).subquery('search_matches')
+
+
+def apply_search(query, model, term, order_by_rank=True):
+    """
+    Restrict a query to contacts matching a search term, best matches first.
+
+    Args:
+        query: Query over Person, Church or another Contact model
+        model: Model whose ``id`` is the contact id
+        term: Search text entered by the user
+        order_by_rank: Whether to order results by relevance; call this
+            before adding other ordering so the rank is the primary sort key
+
+    Returns:
+        The filtered query (unchanged if the term is blank)
+    """
+    matches = search_matches(term)
+    if matches is None:
+        return query
+
+    query = query.join(matches, matches.c.contact_id == model.id)
+    if order_by_rank:
+        query = query.order_by(matches.c.rank.desc())
+    return query
+
+
+def _fallback_matches(tokens):
+    """ILIKE matching on the contact columns for databases without the index."""
+    fields = [
+        Contact.first_name, Contact.last_name, Contact.email, Contact.phone,
+        Contact.address, Contact.city, Contact.state,
+        Church.__table__.c.name, Church.__table__.c.denomination, Church.__table__.c.location
+    ]
+    conditions = [
+        or_(*[field.ilike(f'%{_escape_like(token)}%', escape='\\') for field in fields])
+        for token in tokens
+    ]
+    return select(
+        Contact.id.label('contact_id'),
+        literal(0.0).cast(Float).label('rank')
+    ).select_from(
+        Contact.__table__.outerjoin(Church.__table__, Church.__table__.c.id == Contact.id)
+    ).where(and_(*conditions)).subquery('search_matches')
+
+
+def _fts_phrase(token):
+    return '"' + token.replace('"', '""') + '"'
+
+
+def _ts_lexeme(token):
+    return "'" + token.replace("'", "''").replace('\\', '\\\\') + "'"
+
+
+def _escape_like(value):
+    return value.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
@@ -0,0 +1,223 @@
+"""
+Task Reminder Service
+
+Schedules and sends task reminders. Each task stores when its reminder is
+due in the indexed ``next_reminder_at`` column, computed from its due
+date, due time and reminder option whenever the task is written, and
+cleared once the reminder has been sent or the task is completed. An
+hourly run then only reads the tasks whose reminder falls in the current
+window, in batches: the owners and assignees of a batch are loaded with
+one query and the batch is marked sent with one UPDATE.
+"""
+
+import logging
+from datetime import datetime, timedelta
+from sqlalchemy import bindparam, event, inspect, select, update
+from app.extensions import db
+from app.models.task import Task, TaskStatus
+from app.models.user import User
+
+logger = logging.getLogger(__name__)
+
+# How long before the due date each reminder option fires
+REMINDER_OFFSETS = {
+    '15_min': timedelta(minutes=15),
+    '30_min': timedelta(minutes=30),
+    '1_hour': timedelta(hours=1),
+    '2_hours': timedelta(hours=2),
+    '1_day': timedelta(days=1),
+    '3_days': timedelta(days=3),
+    '1_week': timedelta(days=7)
+}
+
+# Reminders more than this overdue when a run starts (e.g. because the job
+# was down) are dropped rather than sent late
+REMINDER_WINDOW = timedelta(hours=2)
+
+# Tasks sent and marked per round trip
+REMINDER_BATCH_SIZE = 200
+
+# Task attributes the reminder time depends on
+_SCHEDULE_ATTRIBUTES = ('status', 'reminder_option', 'due_date', 'due_time', 'last_synced_at')
+
+
+def reminder_time(due_date, due_time, reminder_option):
+    """
+    Return when a reminder with this option fires for a task due at due_date/due_time.
+
+    Args:
+        due_date: Due date (date or datetime; only the date is used)
+        due_time: Due time as 'HH:MM', or None for the start of the day
+        reminder_option: One of REMINDER_OFFSETS
+
+    Returns:
+        datetime or None: None when there is no due date or no known option
+    """
+    offset = REMINDER_OFFSETS.get(reminder_option)
+    if not offset or not due_date:
+        return None
+
+    at = datetime.min.time()
+    if due_time:
+        try:
+            hour, minute = due_time.split(':')[:2]
+            at = at.replace(hour=int(hour), minute=int(minute))
+        except ValueError:
+            # If due_time can't be parsed, use start of day
+            pass
+    return datetime.combine(due_date, at) - offset
+
+
+def next_reminder_at(task):
+    """
+    Return when the task's reminder should next be sent, or None if it has none pending.
+
+    Works on Task instances and on rows with the same attribute names. A
+    reminder is pending until it is sent (``last_synced_at`` records the
+    last send) or the task is completed.
+    """
+    status = getattr(task.status, 'value', task.status)
+    if status == TaskStatus.COMPLETED.value:
+        return None
+    at = reminder_time(task.due_date, task.due_time, task.reminder_option)
+    if at is None or (task.last_synced_at and task.last_synced_at > at):
+        return None
+    return at
+
+
+def _schedule_on_insert(mapper, connection, target):
+    target.next_reminder_at = next_reminder_at(target)
+
+
+def _schedule_on_update(mapper, connection, target):
+    state = inspect(target)
+    if any(state.attrs[name].history.has_changes() for name in _SCHEDULE_ATTRIBUTES):
+        target.next_reminder_at = next_reminder_at(target)
+
+
+def register_reminder_schedule(app):
+    """Keep ``next_reminder_at`` up to date as tasks are created and updated through the ORM."""
+    if not event.contains(Task, 'before_insert', _schedule_on_insert):
+        event.listen(Task, 'before_insert', _schedule_on_insert)
+    if not event.contains(Task, 'before_update', _schedule_on_update):
+        event.listen(Task, 'before_update', _schedule_on_update)
+
+
+def schedule_existing_reminders(batch_size=REMINDER_BATCH_SIZE):
+    """
+    Compute ``next_reminder_at`` for every open task with a reminder option.
+
+    Used to backfill tasks written before the column existed. Reads only the
+    columns the schedule depends on and writes each batch with one
+    executemany. Nothing is committed here.
+
+    Returns:
+        int: Number of tasks with a reminder scheduled
+    """
+    tasks = Task.__table__
+    columns = [tasks.c.id] + [tasks.c[name] for name in _SCHEDULE_ATTRIBUTES]
+    schedule = update(tasks).where(tasks.c.id == bindparam('task_id')).values(
+        next_reminder_at=bindparam('reminder_at')
+    )
+
+    scheduled = 0
+    last_id = 0
+    while True:
+        rows = db.session.execute(
+            select(*columns).where(
+                tasks.c.id > last_id,
+                tasks.c.status != TaskStatus.COMPLETED,
+                tasks.c.reminder_option.isnot(None),
+                tasks.c.reminder_option != 'none',
+                tasks.c.due_date.isnot(None)
+            ).order_by(tasks.c.id).limit(batch_size)
+        ).all()
+        if not rows:
+            break
+        params = [{'task_id': row.id, 'reminder_at': next_reminder_at(row)} for row in rows]
+        db.session.execute(schedule, params)
+        scheduled += sum(1 for param in params if param['reminder_at'])
+        last_id = rows[-1].id
+    return scheduled
+
+
+def _recipients(task, users):
+    """Return the users to remind about a task: its owner and a different assignee."""
+    recipients = []
+    owner = users.get(task.owner_id)
+    if owner:
+        recipients.append(owner)
+    if task.assigned_to and task.assigned_to != str(task.owner_id) and task.assigned_to.isdigit():
+        assignee = users.get(int(task.assigned_to))
+        if assignee:
+            recipients.append(assignee)
+    return [
+        user for user in recipients
+        if user.notification_settings and user.notification_settings.get('notify_tasks', True)
+    ]
+
+
+def send_due_reminders(now=None, batch_size=REMINDER_BATCH_SIZE, notify=None):
+    """
+    Send the reminders due in the current window and mark them sent.
+
+    Reminders older than REMINDER_WINDOW are dropped first. Then, a batch
+    at a time: the due tasks are read through the next_reminder_at index,
+    their owners and assignees are loaded in one query, each recipient is
+    notified, and the batch is marked sent (last_synced_at set,
+    next_reminder_at cleared) with one UPDATE and committed.
+
+    Args:
+        now: Current time
+        batch_size: Tasks per batch
+        notify: Called with (task, user) for each reminder; defaults to
+            app.tasks.task_automation.send_task_notification
+
+    Returns:
+        int: Number of tasks reminded about
+    """
+    if notify is None:
+        from app.tasks.task_automation import send_task_notification as notify
+    now = now or datetime.now()
+    window_start = now - REMINDER_WINDOW
+    tasks = Task.__table__
+
+    try:
+        dropped = db.session.execute(
+            update(tasks).where(tasks.c.next_reminder_at < window_start).values(next_reminder_at=None)
+        ).rowcount
+        db.session.commit()
+        if dropped:
+            logger.warning(f"Dropped {dropped} task reminders missed by more than {REMINDER_WINDOW}")
+
+        reminded = 0
+        while True:
+            batch = Task.query.filter(
+                Task.next_reminder_at >= window_start,
+                Task.next_reminder_at <= now
+            ).order_by(Task.next_reminder_at, Task.id).limit(batch_size).all()
+            if not batch:
+                break
+
+            user_ids = {task.owner_id for task in batch if task.owner_id}
+            user_ids.update(
+                int(task.assigned_to) for task in batch
+                if task.assigned_to and task.assigned_to.isdigit()
+            )
+            users = {user.id: user for user in User.query.filter(User.id.in_(user_ids))} if user_ids else {}
+
+            for task in batch:
+                for user in _recipients(task, users):
+                    notify(task, user)
+
+            db.session.execute(
+                update(tasks).where(tasks.c.id.in_([task.id for task in batch])).values(
+                    last_synced_at=now, next_reminder_at=None
+                )
+            )
+            db.session.commit()
+            reminded += len(batch)
+        return reminded
+    except Exception:
+        db.session.rollback()
+        raise
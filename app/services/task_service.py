@@ -0,0 +1,129 @@
+"""
+Task Service
+
+Builds the task list for a user: one page of their tasks with the filters
+applied, plus the counts shown in the task overview (by status, by
+priority and overdue) from a single GROUP BY over their tasks. Neither
+depends on how many tasks the user has accumulated.
+"""
+
+import logging
+from datetime import datetime, time
+from sqlalchemy import and_, case, func, or_
+from app.models.church import Church
+from app.models.person import Person
+from app.models.task import Task, TaskPriority, TaskStatus
+
+logger = logging.getLogger(__name__)
+
+TASKS_PER_PAGE = 25
+
+# Order of the task list; id keeps pages stable for tasks due at the same time
+TASK_LIST_ORDER = (Task.due_date.asc(), Task.id.asc())
+
+
+def user_tasks_query(user_id):
+    """Tasks assigned to, created by or owned by a user."""
+    return Task.query.filter(
+        (Task.assigned_to == str(user_id)) |
+        (Task.created_by == user_id) |
+        (Task.owner_id == user_id)
+    )
+
+
+def _overdue_condition(today=None):
+    start_of_today = datetime.combine(today or datetime.now().date(), time.min)
+    return and_(Task.status != TaskStatus.COMPLETED, Task.due_date < start_of_today)
+
+
+def filter_tasks(query, status=None, priority=None, search_text=None, today=None):
+    """
+    Apply the task list filters to a query.
+
+    Args:
+        query: Task query to filter
+        status: A TaskStatus value, 'overdue', or 'all'; by default
+            completed tasks are left out
+        priority: A TaskPriority value or 'all'
+        search_text: Text matched against title, description and the
+            related contact's name
+        today: Date used for the overdue filter
+
+    Returns:
+        Query: The filtered query
+    """
+    if status and status != 'all':
+        if status == 'overdue':
+            query = query.filter(_overdue_condition(today))
+        else:
+            try:
+                query = query.filter(Task.status == TaskStatus(status))
+            except ValueError:
+                logger.warning(f"Invalid status filter: {status}")
+    else:
+        query = query.filter(Task.status != TaskStatus.COMPLETED)
+
+    if priority and priority != 'all':
+        try:
+            query = query.filter(Task.priority == TaskPriority(priority))
+        except ValueError:
+            logger.warning(f"Invalid priority filter: {priority}")
+
+    if search_text:
+        search = f"%{search_text}%"
+        query = query.filter(
+            or_(
+                Task.title.ilike(search),
+                Task.description.ilike(search),
+                Task.person.has(or_(Person.first_name.ilike(search), Person.last_name.ilike(search))),
+                Task.church.has(Church.name.ilike(search))
+            )
+        )
+    return query
+
+
+def get_task_page(query, page=1, per_page=TASKS_PER_PAGE):
+    """Return one page of a task query as a Flask-SQLAlchemy pagination."""
+    return query.order_by(*TASK_LIST_ORDER).paginate(page=page, per_page=per_page, error_out=False)
+
+
+def get_upcoming_tasks(query, limit=5):
+    """Return the next open tasks with a due date, soonest first."""
+    return query.filter(
+        Task.status != TaskStatus.COMPLETED,
+        Task.due_date.isnot(None)
+    ).order_by(*TASK_LIST_ORDER).limit(limit).all()
+
+
+def get_task_counts(query, today=None):
+    """
+    Count a task query by status, priority and overdue in one grouped query.
+
+    Args:
+        query: Task query to count (e.g. user_tasks_query)
+        today: Date tasks due before are overdue
+
+    Returns:
+        dict: total, overdue, by_status and by_priority (keyed by enum
+            value, with every value present)
+    """
+    overdue = case((_overdue_condition(today), 1), else_=0)
+    rows = query.with_entities(
+        Task.status, Task.priority, overdue, func.count(Task.id)
+    ).group_by(Task.status, Task.priority, overdue).order_by(None).all()
+
+    counts = {
+        'total': 0,
+        'overdue': 0,
+        'by_status': {status.value: 0 for status in TaskStatus},
+        'by_priority': {priority.value: 0 for priority in TaskPriority}
+    }
+    for status, priority, is_overdue, count in rows:
+        counts['total'] += count
+        if is_overdue:
+            counts['overdue'] += count
+        if status is not None:
+            counts['by_status'][status.value] += count
+        if priority is not None:
+            counts['by_priority'][priority.value] += count
+    return counts
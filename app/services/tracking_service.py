@@ -0,0 +1,175 @@
+"""
+Email Tracking Service
+
+Open and click hits from the tracking pixel and redirect routes are queued
+in memory and applied in batches by a background flusher, so a hit costs a
+deque append instead of a lookup, two commits and a campaign recount.
+
+Each flush turns many hits into one UPDATE statement for the tracking rows
+(counts are added in SQL, so flushes from several workers do not overwrite
+each other) and one grouped aggregate to refresh the affected campaigns.
+Hits still queued when a worker dies are lost, which is acceptable for
+engagement statistics.
+"""
+
+from collections import deque
+from datetime import datetime
+import atexit
+import logging
+import threading
+from sqlalchemy import bindparam, func, update
+from app.extensions import db
+from app.models.email_tracking import EmailTracking
+from app.models.email_campaign import EmailCampaign
+
+logger = logging.getLogger(__name__)
+
+TRACKING_EVENT_KINDS = ('open', 'click')
+
+
+class TrackingEventBuffer:
+    """Bounded in-memory queue of (tracking_pixel, kind, timestamp) hits drained by a flusher thread.
+
+    When the buffer is full the oldest hits are dropped and counted.
+    """
+
+    def __init__(self, app, max_size=50000, batch_size=1000, flush_interval=5.0):
+        self.app = app
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.events = deque(maxlen=max_size)
+        self.dropped = 0
+        self._wakeup = threading.Event()
+        self._lock = threading.Lock()
+        self._thread = threading.Thread(target=self._run, name='email-tracking-flusher', daemon=True)
+        self._thread.start()
+
+    def record(self, tracking_pixel, kind, timestamp=None):
+        """Queue one open or click hit."""
+        if len(self.events) == self.events.maxlen:
+            self.dropped += 1
+        self.events.append((tracking_pixel, kind, timestamp or datetime.utcnow()))
+        if len(self.events) >= self.batch_size:
+            self._wakeup.set()
+
+    def _run(self):
+        while True:
+            self._wakeup.wait(self.flush_interval)
+            self._wakeup.clear()
+            self.flush()
+
+    def flush(self):
+        """Apply every queued hit to the database, one batch at a time."""
+        with self._lock:
+            while self.events:
+                batch = []
+                while self.events and len(batch) < self.batch_size:
+                    try:
+                        batch.append(self.events.popleft())
+                    except IndexError:
+                        break
+                with self.app.app_context():
+                    try:
+                        apply_tracking_events(batch)
+                    except Exception as e:
+                        db.session.rollback()
+                        logger.error(f"Error applying {len(batch)} email tracking events: {str(e)}")
+
+
+_buffer_lock = threading.Lock()
+
+
+def get_tracking_buffer(app):
+    """Return the app's tracking buffer, starting its flusher on first use."""
+    buffer = app.extensions.get('email_tracking_buffer')
+    if buffer is None:
+        with _buffer_lock:
+            buffer = app.extensions.get('email_tracking_buffer')
+            if buffer is None:
+                buffer = TrackingEventBuffer(
+                    app,
+                    max_size=app.config.get('TRACKING_BUFFER_SIZE', 50000),
+                    batch_size=app.config.get('TRACKING_BATCH_SIZE', 1000),
+                    flush_interval=app.config.get('TRACKING_FLUSH_INTERVAL', 5.0)
+                )
+                app.extensions['email_tracking_buffer'] = buffer
+                atexit.register(buffer.flush)
+    return buffer
+
+
+def record_tracking_event(tracking_pixel, kind):
+    """Queue an open or click hit for the current app; returns immediately."""
+    from flask import current_app
+
+    if kind not in TRACKING_EVENT_KINDS or not tracking_pixel:
+        return
+    get_tracking_buffer(current_app._get_current_object()).record(tracking_pixel, kind)
+
+
+def apply_tracking_events(events):
+    """
+    Apply a batch of tracking hits and refresh the affected campaigns.
+
+    Args:
+        events: Iterable of (tracking_pixel, kind, timestamp) tuples
+
+    Returns:
+        int: Number of tracking rows updated (hits for unknown pixels are ignored)
+    """
+    totals = {}
+    for tracking_pixel, kind, timestamp in events:
+        entry = totals.setdefault(tracking_pixel, {
+            'opens': 0, 'clicks': 0, 'first_open': None, 'last_open': None,
+            'first_click': None, 'last_click': None, 'last_kind': kind, 'last_at': timestamp
+        })
+        if kind == 'open':
+            entry['opens'] += 1
+            entry['first_open'] = min(entry['first_open'] or timestamp, timestamp)
+            entry['last_open'] = max(entry['last_open'] or timestamp, timestamp)
+        else:
+            entry['clicks'] += 1
+            entry['first_click'] = min(entry['first_click'] or timestamp, timestamp)
+            entry['last_click'] = max(entry['last_click'] or timestamp, timestamp)
+        if timestamp >= entry['last_at']:
+            entry['last_kind'], entry['last_at'] = kind, timestamp
+    if not totals:
+        return 0
+
+    rows = db.session.query(EmailTracking.id, EmailTracking.tracking_pixel, EmailTracking.bulk_send_id).filter(
+        EmailTracking.tracking_pixel.in_(list(totals))
+    ).all()
+    if not rows:
+        return 0
+
+    params = []
+    for row_id, tracking_pixel, bulk_send_id in rows:
+        entry = totals[tracking_pixel]
+        params.append({
+            'row_id': row_id,
+            'opens': entry['opens'],
+            'clicks': entry['clicks'],
+            'first_open': entry['first_open'],
+            'last_open': entry['last_open'],
+            'first_click': entry['first_click'],
+            'last_click': entry['last_click'],
+            'new_status': 'clicked' if entry['last_kind'] == 'click' else 'opened'
+        })
+
+    table = EmailTracking.__table__
+    statement = update(table).where(table.c.id == bindparam('row_id')).values(
+        open_count=func.coalesce(table.c.open_count, 0) + bindparam('opens'),
+        opened_at=func.coalesce(table.c.opened_at, bindparam('first_open')),
+        last_opened_at=func.coalesce(bindparam('last_open'), table.c.last_opened_at),
+        click_count=func.coalesce(table.c.click_count, 0) + bindparam('clicks'),
+        clicked_at=func.coalesce(table.c.clicked_at, bindparam('first_click')),
+        last_clicked_at=func.coalesce(bindparam('last_click'), table.c.last_clicked_at),
+        status=bindparam('new_status')
+    )
+    db.session.execute(statement, params)
+
+    campaign_ids = {int(bulk_send_id) for _, _, bulk_send_id in rows if bulk_send_id and bulk_send_id.isdigit()}
+    if campaign_ids:
+        EmailCampaign.refresh_stats(campaign_ids)
+
+    db.session.commit()
+    return len(params)
@@ -0,0 +1,108 @@
+from app.extensions import celery
+from app.services.job_service import job_handler, execute_job, export_file_path
+import logging
+import os
+
+logger = logging.getLogger(__name__)
+
+@celery.task
+def run_job(job_id):
+    """Execute a queued background job."""
+    job = execute_job(job_id)
+    return job.status if job else None
+
+
+@job_handler('people_import')
+def people_import_job(ctx):
+    """Import a people CSV file saved at params['path'], resuming from the last committed chunk."""
+    from app.services.import_service import import_people_csv, IMPORT_CHUNK_SIZE
+
+    params = ctx.params
+    checkpoint = ctx.checkpoint or {}
+    previous = checkpoint.get('stats', {})
+
+    def on_chunk(next_chunk, stats, rows):
+        totals = {key: previous.get(key, 0) + value for key, value in stats.items()}
+        ctx.advance(rows, checkpoint={'chunk': next_chunk, 'stats': totals}, commit=False)
+
+    stats = import_people_csv(
+        params['path'],
+        ctx.job.office_id,
+        ctx.job.user_id,
+        has_header=params.get('has_header', True),
+        chunk_size=params.get('chunk_size', IMPORT_CHUNK_SIZE),
+        start_chunk=checkpoint.get('chunk', 0),
+        on_chunk=on_chunk
+    )
+    result = {key: previous.get(key, 0) + value for key, value in stats.items()}
+
+    try:
+        os.remove(params['path'])
+    except OSError:
+        logger.warning(f"Could not remove import file {params['path']}")
+
+    return result
+
+
+@job_handler('export')
+def export_job(ctx):
+    """Write an export (see export_service.build_export) to a file that can be downloaded later."""
+    from app.services.export_service import build_export
+    from app.utils.export import iter_export_rows, write_csv, write_excel
+
+    params = dict(ctx.params)
+    export_format = params.pop('format', 'csv')
+    spec = build_export(**params)
+
+    ctx.set_total(spec['query'].order_by(None).count())
+
+    extension = 'xlsx' if export_format == 'excel' else 'csv'
+    filename = f"{spec['filename']}.{extension}"
+    path = export_file_path(ctx.job.id, filename)
+
+    rows = iter_export_rows(spec['query'], spec['to_row'])
+    if export_format == 'excel':
+        count = write_excel(rows, spec['columns'], path, sheet_name=spec['sheet_name'])
+    else:
+        with open(path, 'w', newline='', encoding='utf-8') as output:
+            count = write_csv(rows, spec['columns'], output)
+
+    ctx.job.progress_current = ctx.job.progress_total
+    return {'filename': filename, 'rows': count}
+
+
+@job_handler('campaign_send')
+def campaign_send_job(ctx):
+    """Send a bulk email campaign, resuming from the last committed chunk."""
+    from app.utils.email_service import send_bulk_email
+
+    def on_start(total):
+        ctx.set_total(total, commit=False)
+
+    def on_chunk(recipients, checkpoint):
+        ctx.advance(recipients, checkpoint=checkpoint, commit=False)
+
+    success, message, sent_count = send_bulk_email(
+        ctx.params['campaign_id'],
+        checkpoint=ctx.checkpoint,
+        on_start=on_start,
+        on_chunk=on_chunk
+    )
+    if not success:
+        raise RuntimeError(message)
+    return {'message': message, 'sent_count': sent_count}
+
+
+@job_handler('contacts_sync')
+def contacts_sync_job(ctx):
+    """Synchronize a user's contacts with Google."""
+    from app.services.contact_sync import ContactSyncService
+
+    token_info = ContactSyncService._get_user_token(ctx.job.user_id)
+    if not token_info:
+        raise RuntimeError("No Google token found for user")
+
+    success, stats, error = ContactSyncService.sync_contacts(ctx.job.user_id, token_info)
+    if not success:
+        raise RuntimeError(error or "Contact sync failed")
+    return stats
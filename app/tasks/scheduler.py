@@ -38,5 +38,19 @@ def init_scheduler(app):
     #     replace_existing=True
     # )
 
+    # Periodically rebuild the dashboard stats rollup to correct any drift
+    def reconcile_dashboard_stats_with_context():
+        with app.app_context():
+            from app.services.dashboard_stats import reconcile_dashboard_stats
+            reconcile_dashboard_stats()
+    
+    scheduler.add_job(
+        id='reconcile_dashboard_stats',
+        func=reconcile_dashboard_stats_with_context,
+        trigger='interval',
+        minutes=app.config.get('DASHBOARD_STATS_RECONCILE_MINUTES', 60),
+        replace_existing=True
+    )
+
     # Add more scheduled jobs here as needed
     return scheduler 
\ No newline at end of file
@@ -11,6 +11,7 @@ from app.models.church import Church
 from app.models.pipeline import Pipeline, PipelineStage, PipelineContact
 from sqlalchemy import text
 import time
+import uuid
 import logging
 
 logger = logging.getLogger(__name__)
@@ -38,63 +39,405 @@ def init_app(app):
 
 
 def register_cache_invalidation(app):
-    """Register hooks to invalidate cache when data changes."""
+    """Register hooks to invalidate cache when data changes.
+
+    Writes are noted on the session at flush time and each affected
+    namespace generation is bumped once after commit.
+    """
     from sqlalchemy import event
-    from app.models.person import Person
-    from app.models.church import Church
-    from app.models.pipeline import Pipeline, PipelineStage, PipelineContact
-    
-    # Invalidate people cache when a person is added/modified/deleted
-    for operation in ('after_insert', 'after_update', 'after_delete'):
-        event.listen(Person, operation, lambda mapper, connection, target: invalidate_people_cache())
-    
-    # Invalidate churches cache when a church is added/modified/deleted
-    for operation in ('after_insert', 'after_update', 'after_delete'):
-        event.listen(Church, operation, lambda mapper, connection, target: invalidate_churches_cache())
+    from sqlalchemy.orm import Session
     
-    # Invalidate pipeline cache when pipeline data changes
-    for model in (Pipeline, PipelineStage, PipelineContact):
+    for model in (Person, Church, Pipeline, PipelineStage, PipelineContact):
         for operation in ('after_insert', 'after_update', 'after_delete'):
-            event.listen(model, operation, lambda mapper, connection, target: invalidate_pipeline_cache())
+            if not event.contains(model, operation, _note_cache_change):
+                event.listen(model, operation, _note_cache_change)
+    if not event.contains(Session, 'after_commit', _cache_after_commit):
+        event.listen(Session, 'after_commit', _cache_after_commit)
+    if not event.contains(Session, 'after_rollback', _cache_after_rollback):
+        event.listen(Session, 'after_rollback', _cache_after_rollback)
     
     app.logger.info("Cache invalidation hooks registered")
 
 
-# Cache invalidation functions
-def invalidate_people_cache():
-    """Invalidate all people-related cache entries."""
+def register_pipeline_count_invalidation(app):
+    """Register hooks that invalidate cached pipeline counts when memberships change.
+
+    Unlike the other cache invalidation hooks these are always registered,
+    since stage counts are cached in every environment. The listeners are
+    the same functions register_cache_invalidation uses, so registering both
+    does not invalidate twice.
+    """
+    from sqlalchemy import event
+    from sqlalchemy.orm import Session
+    
+    for operation in ('after_insert', 'after_update', 'after_delete'):
+        if not event.contains(PipelineContact, operation, _note_cache_change):
+            event.listen(PipelineContact, operation, _note_cache_change)
+    if not event.contains(Session, 'after_commit', _cache_after_commit):
+        event.listen(Session, 'after_commit', _cache_after_commit)
+    if not event.contains(Session, 'after_rollback', _cache_after_rollback):
+        event.listen(Session, 'after_rollback', _cache_after_rollback)
+
+
+def _changed_namespaces(target):
+    """Return the (namespace, office_id) pairs a write to target makes stale."""
+    if isinstance(target, (Person, Church)):
+        from sqlalchemy import inspect as sa_inspect
+        namespace = PEOPLE_NAMESPACE if isinstance(target, Person) else CHURCHES_NAMESPACE
+        # A contact moving office makes both offices stale
+        history = sa_inspect(target).attrs.office_id.history
+        office_ids = set(history.deleted or ()) | {target.office_id}
+        return {(namespace, office_id) for office_id in office_ids}
+    return {(PIPELINE_NAMESPACE, None)}
+
+
+def _note_cache_change(mapper, connection, target):
+    from sqlalchemy.orm import object_session
+    session = object_session(target)
+    changes = _changed_namespaces(target)
+    if session is None:
+        for namespace, office_id in changes:
+            invalidate_namespace(namespace, office_id)
+        return
+    session.info.setdefault('cache_invalidations', set()).update(changes)
+
+
+def _cache_after_commit(session):
+    for namespace, office_id in session.info.pop('cache_invalidations', ()):
+        invalidate_namespace(namespace, office_id)
+
+
+def _cache_after_rollback(session):
+    session.info.pop('cache_invalidations', None)
+
+
+def register_stats_rollup(app):
+    """Register hooks that keep the dashboard stats rollup in step with writes.
+
+    Unlike the cache invalidation hooks these are always registered, since the
+    dashboard reads its counters from the rollup in every environment.
+    """
+    from sqlalchemy import event, inspect as sa_inspect
+    from app.models.task import Task
+    from app.models.communication import Communication
+    from app.models.dashboard_stats import DashboardStatBucket
+
+    if not sa_inspect(db.engine).has_table(DashboardStatBucket.__tablename__):
+        app.logger.warning("Dashboard stats rollup table missing; rollup hooks not registered")
+        return
+
+    hooks = {
+        'after_insert': _rollup_after_insert,
+        'after_update': _rollup_after_update,
+        'after_delete': _rollup_after_delete
+    }
+    tracked_attributes = {
+        Person: ('office_id',),
+        Church: ('office_id',),
+        Task: ('status', 'assigned_to', 'due_date'),
+        Communication: ('office_id', 'created_at')
+    }
+    for model, attributes in tracked_attributes.items():
+        for operation, handler in hooks.items():
+            # create_app may run several times per process (tests, CLI)
+            if not event.contains(model, operation, handler):
+                event.listen(model, operation, handler)
+        # Load the old value of expired attributes on set so the update hook
+        # can tell which counter a row is leaving
+        for name in attributes:
+            attribute = getattr(model, name)
+            if not event.contains(attribute, 'set', _track_previous_value):
+                event.listen(attribute, 'set', _track_previous_value, active_history=True)
+
+    app.logger.info("Dashboard stats rollup hooks registered")
+
+
+def _track_previous_value(target, value, oldvalue, initiator):
+    """No-op listener; registered with active_history=True for its side effect."""
+
+
+def _previous_value(target, key):
+    """Return the value an attribute had before the current flush."""
+    from sqlalchemy import inspect as sa_inspect
+    history = sa_inspect(target).attrs[key].history
+    if history.deleted:
+        return history.deleted[0]
+    return getattr(target, key)
+
+
+def _rollup_after_insert(mapper, connection, target):
+    from app.services.dashboard_stats import rollup_key, apply_delta
+    apply_delta(connection, rollup_key(target), 1)
+
+
+def _rollup_after_update(mapper, connection, target):
+    from app.services.dashboard_stats import rollup_key, apply_delta
+    old_key = rollup_key(target, get=_previous_value)
+    new_key = rollup_key(target)
+    if old_key != new_key:
+        apply_delta(connection, old_key, -1)
+        apply_delta(connection, new_key, 1)
+
+
+def _rollup_after_delete(mapper, connection, target):
+    from app.services.dashboard_stats import rollup_key, apply_delta
+    apply_delta(connection, rollup_key(target, get=_previous_value), -1)
+
+
+# Main pipeline metadata
+#
+# Every rendered template gets the main pipelines through a context processor,
+# so their metadata is kept in a process-level snapshot. The snapshot is
+# stamped with a local generation (bumped in this process) and a version held
+# in the shared cache (bumped by whichever worker commits the change), and is
+# reloaded when either differs.
+MAIN_PIPELINES_VERSION_KEY = 'main_pipelines_version'
+_main_pipelines = {'generation': 0, 'stamp': None, 'pipelines': {}}
+
+
+class MainPipeline:
+    """Read-only snapshot of a main pipeline and its stages."""
+
+    def __init__(self, id, name, pipeline_type, office_id, stages):
+        self.id = id
+        self.name = name
+        self.pipeline_type = pipeline_type
+        self.office_id = office_id
+        self.is_main_pipeline = True
+        self.stages = stages
+
+    def __repr__(self):
+        return f'<MainPipeline {self.name}>'
+
+    def get_active_stages(self):
+        """Stages as dicts with id, name, order and color, ordered by position."""
+        return self.stages
+
+    def count_contacts(self):
+        """Count contacts in this pipeline (not cached)."""
+        try:
+            return db.session.execute(
+                text("SELECT COUNT(*) FROM pipeline_contacts WHERE pipeline_id = :pipeline_id"),
+                {"pipeline_id": self.id}
+            ).scalar() or 0
+        except Exception:
+            return 0
+
+    def contact_count(self):
+        """Alias for count_contacts() method."""
+        return self.count_contacts()
+
+
+def _load_main_pipelines():
+    """Load main pipeline and stage metadata with two queries."""
+    pipelines = {}
+    rows = db.session.query(
+        Pipeline.id, Pipeline.name, Pipeline.pipeline_type, Pipeline.office_id
+    ).filter(Pipeline.is_main_pipeline == True).order_by(Pipeline.id).all()
+    for row in rows:
+        pipelines.setdefault(row.pipeline_type, MainPipeline(row.id, row.name, row.pipeline_type, row.office_id, []))
+
+    by_id = {pipeline.id: pipeline for pipeline in pipelines.values()}
+    if by_id:
+        stages = db.session.query(
+            PipelineStage.id, PipelineStage.pipeline_id, PipelineStage.name,
+            PipelineStage.order, PipelineStage.color
+        ).filter(PipelineStage.pipeline_id.in_(list(by_id))).order_by(PipelineStage.order).all()
+        for stage in stages:
+            by_id[stage.pipeline_id].stages.append({
+                'id': stage.id, 'name': stage.name, 'order': stage.order, 'color': stage.color
+            })
+    return pipelines
+
+
+def get_main_pipelines():
+    """Return the main pipelines keyed by pipeline type, reloading them only after a change."""
+    version = cache.get(MAIN_PIPELINES_VERSION_KEY)
+    if version is None:
+        # No shared version yet (or a cache without storage): start one
+        version = uuid.uuid4().hex
+        cache.add(MAIN_PIPELINES_VERSION_KEY, version, timeout=0)
+
+    stamp = (_main_pipelines['generation'], version)
+    if _main_pipelines['stamp'] != stamp:
+        _main_pipelines['pipelines'] = _load_main_pipelines()
+        _main_pipelines['stamp'] = stamp
+    return _main_pipelines['pipelines']
+
+
+def get_main_pipeline(pipeline_type):
+    """Return the cached MainPipeline for pipeline_type ('people' or 'church'), or None."""
+    return get_main_pipelines().get(pipeline_type)
+
+
+def invalidate_main_pipelines():
+    """Make every process reload the main pipeline metadata on next access."""
+    _main_pipelines['generation'] += 1
+    try:
+        cache.set(MAIN_PIPELINES_VERSION_KEY, uuid.uuid4().hex, timeout=0)
+    except Exception as e:
+        logger.warning(f"Could not bump main pipelines version: {str(e)}")
+
+
+def register_main_pipeline_cache(app):
+    """Register hooks that invalidate the main pipeline snapshot when pipelines or stages change.
+
+    Changes are noted on the session at flush time and the version is bumped
+    after commit, so other workers never reload data that is not yet visible.
+    """
+    from sqlalchemy import event
+    from sqlalchemy.orm import Session
+
+    for model in (Pipeline, PipelineStage):
+        for operation in ('after_insert', 'after_update', 'after_delete'):
+            if not event.contains(model, operation, _note_pipeline_change):
+                event.listen(model, operation, _note_pipeline_change)
+    if not event.contains(Session, 'after_commit', _main_pipelines_after_commit):
+        event.listen(Session, 'after_commit', _main_pipelines_after_commit)
+    if not event.contains(Session, 'after_rollback', _main_pipelines_after_rollback):
+        event.listen(Session, 'after_rollback', _main_pipelines_after_rollback)
+
+    app.logger.info("Main pipeline cache hooks registered")
+
+
+def _note_pipeline_change(mapper, connection, target):
+    from sqlalchemy.orm import object_session
+    session = object_session(target)
+    if session is not None:
+        session.info['main_pipelines_changed'] = True
+    else:
+        invalidate_main_pipelines()
+
+
+def _main_pipelines_after_commit(session):
+    if session.info.pop('main_pipelines_changed', False):
+        invalidate_main_pipelines()
+
+
+def _main_pipelines_after_rollback(session):
+    session.info.pop('main_pipelines_changed', None)
+
+
+# Cache namespaces
+#
+# Cached entries live under a namespace and embed its current generation in
+# their keys. Invalidating bumps the generation with one atomic increment;
+# entries under the old generation are never read again and age out through
+# the cache's TTL/eviction. Pattern deletes are not an option since
+# Flask-Caching treats 'people_*' as a literal key.
+PEOPLE_NAMESPACE = 'people'
+CHURCHES_NAMESPACE = 'churches'
+PIPELINE_NAMESPACE = 'pipeline'
+GENERATION_KEY_PREFIX = 'cache_gen'
+
+
+def _generation_keys(namespace, office_id=None):
+    scope = 'all' if office_id is None else office_id
+    return f"{GENERATION_KEY_PREFIX}:{namespace}", f"{GENERATION_KEY_PREFIX}:{namespace}:{scope}"
+
+
+def _new_generation():
+    # Seeded from the nanosecond clock so a counter that expired or was
+    # evicted never comes back with a value older entries were stored under
+    return time.time_ns()
+
+
+def namespaced_key(namespace, key, office_id=None):
+    """Build a cache key that embeds the current generation of a namespace.
+
+    Keys scoped to an office go stale when that office or the whole
+    namespace is invalidated; unscoped keys (office_id None) go stale on
+    any invalidation in the namespace.
+    """
+    generation_keys = _generation_keys(namespace, office_id)
+    generations = cache.get_many(*generation_keys)
+    for index, generation in enumerate(generations):
+        if generation is None:
+            cache.add(generation_keys[index], _new_generation(), timeout=0)
+            generations[index] = cache.get(generation_keys[index]) or 0
+    scope = 'all' if office_id is None else office_id
+    return f"{namespace}:{scope}:{generations[0]}.{generations[1]}:{key}"
+
+
+def _bump_generation(generation_key):
+    # add() is a no-op for a live counter, so this stays a single INCR there.
+    # Flask-Caching does not wrap inc(), so go to the backend directly
+    cache.add(generation_key, _new_generation(), timeout=0)
+    cache.cache.inc(generation_key)
+
+
+def invalidate_namespace(namespace, office_id=None):
+    """Invalidate a cache namespace for one office, or entirely when office_id is None."""
+    namespace_key, scope_key = _generation_keys(namespace, office_id)
+    try:
+        if office_id is None:
+            _bump_generation(namespace_key)
+        else:
+            _bump_generation(scope_key)
+            # Unscoped (all offices) entries include this office's data
+            _bump_generation(_generation_keys(namespace)[1])
+    except Exception as e:
+        logger.warning(f"Could not invalidate {namespace} cache: {str(e)}")
+
+
+def invalidate_people_cache(office_id=None):
+    """Invalidate people-related cache entries for an office, or all of them."""
     logger.info("Invalidating people cache")
-    cache.delete_many('people_*')
+    invalidate_namespace(PEOPLE_NAMESPACE, office_id)
 
 
-def invalidate_churches_cache():
-    """Invalidate all churches-related cache entries."""
+def invalidate_churches_cache(office_id=None):
+    """Invalidate churches-related cache entries for an office, or all of them."""
     logger.info("Invalidating churches cache")
-    cache.delete_many('churches_*')
-    cache.delete_many('church_*')
-    cache.delete_many('churches_search_*')
+    invalidate_namespace(CHURCHES_NAMESPACE, office_id)
     logger.info("Churches cache invalidated")
 
 
 def invalidate_pipeline_cache():
     """Invalidate all pipeline-related caches."""
-    cache.delete_many('pipeline_*')
-    cache.delete_many('person_pipeline_*')
-    cache.delete_many('church_pipeline_*')
+    invalidate_namespace(PIPELINE_NAMESPACE)
     logger.info("Pipeline cache invalidated")
 
 
 # People caching functions
-def get_cached_people(office_id=None, page=1, per_page=20, search_query=None):
-    """Get a cached list of people with pagination."""
+PEOPLE_LIST_ORDER = (Person.last_name, Person.first_name, Person.id)
+PEOPLE_PER_PAGE = 50
+
+
+def get_people_stage_names(people):
+    """Map each person on a page to their main pipeline stage name.
+
+    Only the given people are looked up, so the cost follows the page size
+    rather than the size of the office.
+    """
+    stage_names = {}
+    person_ids = [person.id for person in people]
+    main_pipeline = get_main_pipeline('people')
+    if person_ids and main_pipeline:
+        rows = db.session.query(PipelineContact.contact_id, PipelineStage.name).join(
+            PipelineStage, PipelineStage.id == PipelineContact.current_stage_id
+        ).filter(
+            PipelineContact.contact_id.in_(person_ids),
+            PipelineContact.pipeline_id == main_pipeline.id
+        ).all()
+        stage_names = dict(rows)
+
+    return {
+        person.id: stage_names.get(person.id) or person.pipeline_stage or 'Not in Pipeline'
+        for person in people
+    }
+
+
+def get_cached_people(office_id=None, cursor=None, per_page=PEOPLE_PER_PAGE, search_query=None):
+    """Get a cached page of people, ordered by name and paged with a keyset cursor."""
     from flask import current_app
     
     # Skip caching in development
     if current_app.config.get('ENV') == 'development' and not current_app.config.get('FORCE_CACHING'):
-        return _get_people_data(office_id, page, per_page, search_query)
+        return _get_people_data(office_id, cursor, per_page, search_query)
     
     # Create a cache key based on parameters
-    cache_key = f"people_list_{office_id}_{page}_{per_page}_{search_query}"
+    cache_key = namespaced_key(PEOPLE_NAMESPACE, f"list_{cursor}_{per_page}_{search_query}", office_id)
     
     # Try to get from cache first
     cached_data = cache.get(cache_key)
@@ -105,11 +448,11 @@ def get_cached_people(office_id=None, page=1, per_page=20, search_query=None):
     # If not in cache, fetch from database
     logger.info(f"Cache miss for {cache_key}, fetching from database")
     start_time = time.time()
-    result = _get_people_data(office_id, page, per_page, search_query)
+    result = _get_people_data(office_id, cursor, per_page, search_query)
     
     # Cache the result, but handle serialization errors
     try:
-        cache.set(cache_key, result, timeout=MEDIUM_TIMEOUT)
+        cache.set(cache_key, result, timeout=LONG_TIMEOUT)
         logger.info(f"Cached {len(result.get('people', []))} people in {time.time() - start_time:.2f}s")
     except Exception as e:
         logger.error(f"Failed to cache people data: {str(e)}")
@@ -118,8 +461,10 @@ def get_cached_people(office_id=None, page=1, per_page=20, search_query=None):
     return result
 
 
-def _get_people_data(office_id=None, page=1, per_page=20, search_query=None):
-    """Get list of people with pagination and optional filtering."""
+def _get_people_data(office_id=None, cursor=None, per_page=PEOPLE_PER_PAGE, search_query=None):
+    """Get a page of people after the given cursor with optional filtering."""
+    from app.utils.query_optimization import with_keyset_pagination
+
     # Create base query
     query = Person.query
     
@@ -127,75 +472,18 @@ def _get_people_data(office_id=None, page=1, per_page=20, search_query=None):
     if office_id:
         query = query.filter_by(office_id=office_id)
     
-    # Apply search filter if provided
+    # Restrict to search matches; pages stay in name order so the cursor holds
     if search_query:
-        search_term = f'%{search_query}%'
-        query = query.filter(
-            db.or_(
-                Person.first_name.ilike(search_term),
-                Person.last_name.ilike(search_term),
-                Person.email.ilike(search_term),
-                Person.phone.ilike(search_term)
-            )
-        )
-    
-    # Using pagination to limit the number of records fetched
-    pagination = query.order_by(Person.last_name, Person.first_name).paginate(
-        page=page, per_page=per_page, error_out=False
-    )
-    
-    people = pagination.items
-    
-    # Get pipeline stages for all people in the current page using a single query
-    person_ids = [p.id for p in people]
+        from app.services.search_service import apply_search
+        query = apply_search(query, Person, search_query, order_by_rank=False)
     
-    # Use optimized query to get pipeline stages
-    pipeline_stages = {}
-    if person_ids:
-        # Get the main pipeline for proper pipeline stages
-        main_pipeline = Pipeline.query.filter(
-            Pipeline.is_main_pipeline,
-            Pipeline.pipeline_type.in_(['person', 'people'])
-        ).first()
-        
-        if main_pipeline:
-            # Use a single query to get all pipeline stages
-            pipeline_contacts = db.session.execute(
-                text("""
-                    SELECT pc.contact_id, ps.name 
-                    FROM pipeline_contacts pc
-                    JOIN pipeline_stages ps ON pc.current_stage_id = ps.id
-                    WHERE pc.contact_id IN :person_ids
-                    AND pc.pipeline_id = :pipeline_id
-                """),
-                {"person_ids": tuple(person_ids) if len(person_ids) > 1 else (person_ids[0],), 
-                 "pipeline_id": main_pipeline.id}
-            ).fetchall()
-            
-            # Create a mapping of person_id to pipeline stage
-            for pc in pipeline_contacts:
-                pipeline_stages[pc[0]] = pc[1]
+    people, pagination = with_keyset_pagination(query, PEOPLE_LIST_ORDER, cursor, per_page)
     
-    # Attach pipeline stage to each person object
-    for person in people:
-        person.current_pipeline_stage = pipeline_stages.get(person.id, 'Not in Pipeline')
-    
-    # Create result dictionary
-    result = {
+    return {
         'people': people,
-        'pagination': pagination,
-        'total': pagination.total
+        'pipeline_stages': get_people_stage_names(people),
+        'pagination': pagination
     }
-    
-    # Cache the result, but handle serialization errors
-    try:
-        cache.set(cache_key, result, timeout=MEDIUM_TIMEOUT)
-        logger.info(f"Cached {len(result.get('people', []))} people in {time.time() - start_time:.2f}s")
-    except Exception as e:
-        logger.error(f"Failed to cache people data: {str(e)}")
-        # Continue without caching
-    
-    return result
 
 
 def get_cached_person(person_id):
@@ -206,7 +494,7 @@ def get_cached_person(person_id):
     if current_app.config.get('ENV') == 'development' and not current_app.config.get('FORCE_CACHING'):
         return _get_person_data(person_id)
         
-    cache_key = f"person_{person_id}"
+    cache_key = namespaced_key(PEOPLE_NAMESPACE, f"person_{person_id}")
     
     # Try to get from cache first
     cached_data = cache.get(cache_key)
@@ -221,7 +509,7 @@ def get_cached_person(person_id):
     
     # Cache the result, but handle serialization errors
     try:
-        cache.set(cache_key, result, timeout=MEDIUM_TIMEOUT)
+        cache.set(cache_key, result, timeout=LONG_TIMEOUT)
         logger.info(f"Cached person data in {time.time() - start_time:.2f}s")
     except Exception as e:
         logger.error(f"Failed to cache person data: {str(e)}")
@@ -283,12 +571,12 @@ def _get_person_data(person_id):
 def get_cached_churches(office_id=None, page=1, per_page=20, search_query=None):
     """Get cached list of churches with pagination and optional filtering."""
     # Create a cache key based on parameters
-    cache_key = f"churches_list_{office_id}_{page}_{per_page}"
+    cache_key = namespaced_key(CHURCHES_NAMESPACE, f"list_{page}_{per_page}", office_id)
     if search_query:
         # Include search in cache key but hash it to avoid invalid characters
         import hashlib
         search_hash = hashlib.md5(search_query.encode()).hexdigest()
-        cache_key = f"churches_search_{search_hash}_{office_id}_{page}_{per_page}"
+        cache_key = namespaced_key(CHURCHES_NAMESPACE, f"search_{search_hash}_{page}_{per_page}", office_id)
     
     # Try to get from cache first
     cached_data = cache.get(cache_key)
@@ -306,18 +594,10 @@ def get_cached_churches(office_id=None, page=1, per_page=20, search_query=None):
     if office_id:
         query = query.filter_by(office_id=office_id)
     
-    # Apply search filter if provided
+    # Apply search filter if provided; matches are ranked before the name ordering
     if search_query:
-        search_term = f'%{search_query}%'
-        query = query.filter(
-            db.or_(
-                Church.name.ilike(search_term),
-                Church.email.ilike(search_term),
-                Church.phone.ilike(search_term),
-                Church.address.ilike(search_term),
-                Church.city.ilike(search_term)
-            )
-        )
+        from app.services.search_service import apply_search
+        query = apply_search(query, Church, search_query)
     
     # Using pagination to limit the number of records fetched
     pagination = query.order_by(Church.name).paginate(
@@ -368,7 +648,7 @@ def get_cached_churches(office_id=None, page=1, per_page=20, search_query=None):
     }
     
     # Cache the result
-    cache.set(cache_key, result, timeout=MEDIUM_TIMEOUT)
+    cache.set(cache_key, result, timeout=LONG_TIMEOUT)
     
     logger.info(f"Cached {len(churches)} churches in {time.time() - start_time:.2f}s")
     return result
@@ -376,7 +656,7 @@ def get_cached_churches(office_id=None, page=1, per_page=20, search_query=None):
 
 def get_cached_church(church_id):
     """Get a cached church by ID with related data."""
-    cache_key = f"church_{church_id}"
+    cache_key = namespaced_key(CHURCHES_NAMESPACE, f"church_{church_id}")
     
     # Try to get from cache first
     cached_data = cache.get(cache_key)
@@ -433,7 +713,7 @@ def get_cached_church(church_id):
     }
     
     # Cache the result
-    cache.set(cache_key, result, timeout=MEDIUM_TIMEOUT)
+    cache.set(cache_key, result, timeout=LONG_TIMEOUT)
     
     logger.info(f"Cached church {church_id} in {time.time() - start_time:.2f}s")
     return result
@@ -444,9 +724,9 @@ def get_cached_pipeline(pipeline_id=None, pipeline_type=None):
     """Get cached pipeline data by ID or type."""
     # Determine cache key based on provided parameters
     if pipeline_id:
-        cache_key = f"pipeline_{pipeline_id}"
+        cache_key = namespaced_key(PIPELINE_NAMESPACE, f"pipeline_{pipeline_id}")
     elif pipeline_type:
-        cache_key = f"pipeline_type_{pipeline_type}"
+        cache_key = namespaced_key(PIPELINE_NAMESPACE, f"type_{pipeline_type}")
     else:
         return None
     
@@ -522,7 +802,7 @@ def get_cached_pipeline(pipeline_id=None, pipeline_type=None):
     }
     
     # Cache the result
-    cache.set(cache_key, result, timeout=MEDIUM_TIMEOUT)
+    cache.set(cache_key, result, timeout=LONG_TIMEOUT)
     
     total_contacts = sum(len(contacts) for contacts in contacts_by_stage.values())
     logger.info(f"Cached pipeline {pipeline.id} with {len(stages)} stages and {total_contacts} contacts in {time.time() - start_time:.2f}s")
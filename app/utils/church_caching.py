@@ -6,6 +6,8 @@ to improve page load times in production.
 
 from app.extensions import cache
 from app.models.church import Church
+from app.services.search_service import apply_search
+from app.utils.caching import CHURCHES_NAMESPACE, namespaced_key
 import time
 import logging
 
@@ -26,7 +28,7 @@ def get_cached_churches(office_id=None, page=1, per_page=50, search_query=None):
         return _get_churches_data(office_id, page, per_page, search_query)
     
     # Create a cache key based on parameters
-    cache_key = f"churches_list_{office_id}_{page}_{per_page}_{search_query}"
+    cache_key = namespaced_key(CHURCHES_NAMESPACE, f"list_{page}_{per_page}_{search_query}", office_id)
     
     # Try to get from cache first
     cached_data = cache.get(cache_key)
@@ -41,7 +43,7 @@ def get_cached_churches(office_id=None, page=1, per_page=50, search_query=None):
     
     # Cache the result, but handle serialization errors
     try:
-        cache.set(cache_key, result, timeout=MEDIUM_TIMEOUT)
+        cache.set(cache_key, result, timeout=LONG_TIMEOUT)
         logger.info(f"Cached {len(result.get('churches', []))} churches in {time.time() - start_time:.2f}s")
     except Exception as e:
         logger.error(f"Failed to cache churches data: {str(e)}")
@@ -59,20 +61,8 @@ def _get_churches_data(office_id=None, page=1, per_page=50, search_query=None):
     if office_id:
         query = query.filter(Church.office_id == office_id)
     
-    # Apply search filter if specified
-    if search_query:
-        search_terms = search_query.split()
-        for term in search_terms:
-            search_filter = (
-                Church.name.ilike(f'%{term}%') |
-                Church.address.ilike(f'%{term}%') |
-                Church.city.ilike(f'%{term}%') |
-                Church.state.ilike(f'%{term}%') |
-                Church.zip_code.ilike(f'%{term}%')
-            )
-            query = query.filter(search_filter)
-    
-    # Order by name
+    # Search through the shared contact search index, best matches first
+    query = apply_search(query, Church, search_query)
     query = query.order_by(Church.name)
     
     # Paginate the results
@@ -1,15 +1,29 @@
 """Template context processors."""
-from app.models.pipeline import Pipeline
+from flask import g, has_request_context
+from werkzeug.local import LocalProxy
+from app.utils.caching import get_main_pipelines
+
+def _main_pipeline(pipeline_type):
+    """Main pipeline snapshot, looked up once per request."""
+    if not has_request_context():
+        return get_main_pipelines().get(pipeline_type)
+    if '_main_pipelines' not in g:
+        g._main_pipelines = get_main_pipelines()
+    return g._main_pipelines.get(pipeline_type)
 
 def register_template_utilities(app):
     """Register template context processors."""
     
     @app.context_processor
     def inject_main_pipelines():
-        """Inject main pipelines into all templates."""
+        """Inject main pipelines into all templates.
+        
+        The values are lazy proxies over the cached main pipeline metadata,
+        so templates that never use them cost nothing.
+        """
         return {
-            'people_main_pipeline': Pipeline.get_main_pipeline('people'),
-            'church_main_pipeline': Pipeline.get_main_pipeline('church')
+            'people_main_pipeline': LocalProxy(lambda: _main_pipeline('people')),
+            'church_main_pipeline': LocalProxy(lambda: _main_pipeline('church'))
         }
         
     @app.context_processor
@@ -1,11 +1,19 @@
 """Database logging utilities for SQLAlchemy."""
 
-from flask import current_app, g
+from flask import g, has_app_context
 from sqlalchemy import event
-from sqlalchemy.engine import Engine
+from collections import deque
+from datetime import datetime
+import atexit
+import logging
+import os
+import random
+import threading
 import time
 import re
-from app.utils.log_utils import log_database_event
+from app.utils.log_utils import format_database_log_entry, open_log_store
+
+logger = logging.getLogger(__name__)
 
 
 def extract_table_name(query):
@@ -80,70 +88,163 @@ def determine_operation(query):
     return operations.get(first_word, 'OTHER')
 
 
+class QueryLogBuffer:
+    """Bounded in-memory buffer of query log records drained by a writer thread.
+    
+    The request thread only appends a small tuple to a deque; formatting and
+    writes to the indexed database log happen on the writer thread, one
+    append per batch. When the buffer is full the oldest records are dropped
+    and counted.
+    """
+    
+    def __init__(self, path, max_size=10000, batch_size=500, flush_interval=2.0, retention_days=None):
+        self.path = path
+        self.retention_days = retention_days
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.records = deque(maxlen=max_size)
+        self.dropped = 0
+        self._wakeup = threading.Event()
+        self._lock = threading.Lock()
+        self._thread = threading.Thread(target=self._run, name='db-query-log-writer', daemon=True)
+        self._thread.start()
+    
+    def append(self, record):
+        """Queue a record: (timestamp, statement, status, duration, user, rowcount)."""
+        if len(self.records) == self.records.maxlen:
+            self.dropped += 1
+        self.records.append(record)
+        if len(self.records) >= self.batch_size:
+            self._wakeup.set()
+    
+    def _run(self):
+        while True:
+            self._wakeup.wait(self.flush_interval)
+            self._wakeup.clear()
+            self.flush()
+    
+    def flush(self):
+        """Write every queued record to the log file."""
+        with self._lock:
+            lines = []
+            while self.records:
+                try:
+                    record = self.records.popleft()
+                except IndexError:
+                    break
+                lines.append(self._format(record))
+                if len(lines) >= self.batch_size:
+                    self._write(lines)
+                    lines = []
+            if lines:
+                self._write(lines)
+    
+    def _format(self, record):
+        timestamp, statement, status, duration, user, rowcount = record
+        return format_database_log_entry(
+            operation=determine_operation(statement),
+            table=extract_table_name(statement),
+            status=status,
+            duration=duration,
+            user=user,
+            records_affected=rowcount,
+            query=statement,
+            timestamp=timestamp
+        )
+    
+    def _write(self, lines):
+        try:
+            open_log_store('database', self.path, self.retention_days).append_many(lines)
+        except Exception as e:
+            logger.error(f"Error writing database query log: {str(e)}")
+
+
+# One buffer (and writer thread) per log file, shared by every app in the process
+_buffers = {}
+_buffers_lock = threading.Lock()
+
+
+def get_query_log_buffer(path, **options):
+    """Return the buffer writing to path, starting it on first use."""
+    with _buffers_lock:
+        if path not in _buffers:
+            _buffers[path] = QueryLogBuffer(path, **options)
+            atexit.register(_buffers[path].flush)
+        return _buffers[path]
+
+
+def _current_user_email():
+    """Email of the user running the current request, if any."""
+    if not has_app_context():
+        return None
+    if getattr(g, 'user', None):
+        return g.user.email
+    current_user = getattr(g, 'current_user', None)
+    if current_user and hasattr(current_user, 'email'):
+        return current_user.email
+    return None
+
+
 def setup_db_logger(app, engine):
     """Set up database query logging.
     
+    Statements slower than DB_LOG_SLOW_QUERY_MS are always logged, and a
+    DB_LOG_SAMPLE_RATE fraction of the rest; everything else is dropped
+    after timing. Logged statements go through a QueryLogBuffer.
+    
     Args:
         app: Flask application instance
         engine: SQLAlchemy engine instance
     """
+    from app.utils.log_utils import get_log_directory
+    
+    slow_threshold = app.config.get('DB_LOG_SLOW_QUERY_MS', 1000)
+    sample_rate = app.config.get('DB_LOG_SAMPLE_RATE', 0.01)
+    with app.app_context():
+        path = os.path.join(get_log_directory(), 'database.log')
+    buffer = get_query_log_buffer(
+        path,
+        max_size=app.config.get('DB_LOG_BUFFER_SIZE', 10000),
+        batch_size=app.config.get('DB_LOG_BATCH_SIZE', 500),
+        flush_interval=app.config.get('DB_LOG_FLUSH_INTERVAL', 2.0),
+        retention_days=app.config.get('LOG_RETENTION_DAYS')
+    )
+    
     @event.listens_for(engine, 'before_cursor_execute')
     def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
         # Store the start time in the connection info
-        conn.info.setdefault('query_start_time', [])
-        conn.info['query_start_time'].append(time.time())
-        
-        # Store the statement for later use
-        conn.info.setdefault('statements', [])
-        conn.info['statements'].append(statement)
+        conn.info.setdefault('query_start_time', []).append(time.perf_counter())
     
     @event.listens_for(engine, 'after_cursor_execute')
     def after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
-        # Calculate query execution time
-        if 'query_start_time' in conn.info and conn.info['query_start_time']:
-            start_time = conn.info['query_start_time'].pop()
-            
-            # Get the statement
-            if 'statements' in conn.info and conn.info['statements']:
-                statement = conn.info['statements'].pop()
-            
-            # Calculate execution time in milliseconds
-            execution_time = int((time.time() - start_time) * 1000)
-            
-            # Determine operation type and table name
-            operation = determine_operation(statement)
-            table = extract_table_name(statement)
-            
-            # Determine status based on execution time
+        start_times = conn.info.get('query_start_time')
+        if not start_times:
+            return
+        
+        # Calculate execution time in milliseconds
+        execution_time = int((time.perf_counter() - start_times.pop()) * 1000)
+        
+        # More than the threshold is considered slow; other queries are sampled
+        if execution_time >= slow_threshold:
+            status = 'slow'
+        elif sample_rate and random.random() < sample_rate:
             status = 'success'
-            if execution_time > 1000:  # More than 1 second is considered slow
-                status = 'slow'
-            
-            # Get user information if available
-            user = None
-            if hasattr(g, 'user') and g.user:
-                user = g.user.email
-            elif hasattr(g, 'current_user') and g.current_user and hasattr(g.current_user, 'email'):
-                user = g.current_user.email
-            
-            # Get records affected
-            records_affected = 0
-            if hasattr(cursor, 'rowcount'):
-                records_affected = cursor.rowcount
-            
-            # Log the database event
-            try:
-                log_database_event(
-                    operation=operation,
-                    table=table,
-                    status=status,
-                    duration=execution_time,
-                    user=user,
-                    records_affected=records_affected,
-                    query=statement
-                )
-            except Exception as e:
-                current_app.logger.error(f"Error logging database event: {str(e)}")
+        else:
+            return
+        
+        try:
+            buffer.append((
+                datetime.now(),
+                statement,
+                status,
+                execution_time,
+                _current_user_email(),
+                getattr(cursor, 'rowcount', 0)
+            ))
+        except Exception as e:
+            logger.error(f"Error logging database event: {str(e)}")
+    
+    return buffer
 
 
 def init_app(app):
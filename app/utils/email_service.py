@@ -1,16 +1,15 @@
 import os
 import uuid
 import re
-from datetime import datetime
-from urllib.parse import urljoin
-from flask import current_app, render_template, url_for
+from urllib.parse import urljoin, urlencode
+from flask import current_app, render_template
 from flask_mail import Message
 from functools import wraps
 from app.extensions import db, mail
 from app.models.email_template import EmailTemplate
 from app.models.email_tracking import EmailTracking
 from app.models.email_campaign import EmailCampaign
-from app.models.person import Person
+from app.utils.personalization import TRACKING_PATHS
 
 
 def ensure_mail_configured(f):
@@ -61,16 +60,25 @@ def replace_template_variables(content, recipient):
     return content
 
 
+def tracking_url(kind, tracking_id, **params):
+    """
+    Build the external URL of the open or click tracking route.
+    
+    Built from BASE_URL rather than url_for so it works outside a request
+    (background sends) and whatever name the emails blueprint is registered under.
+    """
+    url = urljoin(current_app.config.get('BASE_URL', 'http://localhost'), TRACKING_PATHS[kind]) + tracking_id
+    if params:
+        url = f"{url}?{urlencode(params)}"
+    return url
+
+
 def insert_tracking_pixel(content, tracking_id):
     """Insert a tracking pixel into the email content."""
     if not tracking_id:
         return content
         
-    tracking_url = url_for('api.v1.email_tracking.track_open', 
-                          tracking_id=tracking_id, 
-                          _external=True)
-    
-    tracking_pixel = f'<img src="{tracking_url}" width="1" height="1" alt="" />'
+    tracking_pixel = f'<img src="{tracking_url("open", tracking_id)}" width="1" height="1" alt="" />'
     
     # Insert before the closing body tag or at the end if no body tag
     if '</body>' in content:
@@ -88,11 +96,7 @@ def add_tracking_to_links(content, tracking_id):
         
     def replace_link(match):
         original_url = match.group(1)
-        tracking_url = url_for('api.v1.email_tracking.track_click', 
-                              tracking_id=tracking_id,
-                              redirect_url=original_url,
-                              _external=True)
-        return f'href="{tracking_url}"'
+        return f'href="{tracking_url("click", tracking_id, redirect_url=original_url)}"'
         
     # Replace href attributes in anchor tags
     pattern = r'href="([^"]+)"'
@@ -246,92 +250,37 @@ def send_pipeline_reminder_email(user, contacts, stage, pipeline_name, days_in_s
 
 
 @ensure_mail_configured
-def send_bulk_email(campaign_id):
+def send_bulk_email(campaign_id, checkpoint=None, on_start=None, on_chunk=None):
     """
     Send emails for a bulk campaign.
     
+    Recipients are streamed and sent by the campaign delivery engine
+    (app.services.campaign_delivery); pass the checkpoint reported through
+    on_chunk to resume an interrupted send.
+    
     Args:
         campaign_id: ID of the campaign to send
+        checkpoint: Checkpoint to resume from (optional)
+        on_start: Called with the number of recipients (optional)
+        on_chunk: Called with (recipients processed, checkpoint) after each chunk (optional)
         
     Returns:
         tuple: (success, message, sent_count)
     """
+    from app.services.campaign_delivery import deliver_campaign
+    
     try:
-        campaign = EmailCampaign.query.get(campaign_id)
-        if not campaign:
-            return False, "Campaign not found", 0
-        
-        # Check if campaign is in a sendable state
-        if campaign.status not in ['draft', 'scheduled']:
-            return False, f"Campaign is in {campaign.status} status and cannot be sent", 0
-        
-        # Mark campaign as sending
-        campaign.status = 'sending'
-        db.session.commit()
-        
-        # Get recipients based on filter criteria
-        recipient_filter = campaign.get_recipient_filter()
-        recipients_query = Person.query.filter_by(office_id=campaign.office_id)
-        
-        # Apply filters
-        if 'status' in recipient_filter and recipient_filter['status']:
-            recipients_query = recipients_query.filter(Person.status.in_(recipient_filter['status']))
-        
-        # Apply other filter criteria
-        if 'has_email' in recipient_filter and recipient_filter['has_email']:
-            recipients_query = recipients_query.filter(Person.email.isnot(None), Person.email != '')
-            
-        if 'tags' in recipient_filter and recipient_filter['tags']:
-            for tag in recipient_filter['tags']:
-                recipients_query = recipients_query.filter(Person.tags.contains(tag))
-        
-        if 'exclude_previous_recipients' in recipient_filter and recipient_filter['exclude_previous_recipients']:
-            previous_recipients = db.session.query(EmailTracking.person_id).distinct()
-            recipients_query = recipients_query.filter(~Person.id.in_(previous_recipients))
-        
-        recipients = recipients_query.all()
-        
-        # Update recipient count
-        campaign.recipient_count = len(recipients)
-        db.session.commit()
-        
-        # Send to each recipient
-        sent_count = 0
-        for recipient in recipients:
-            if not recipient.email:
-                continue  # Skip recipients without email
-            
-            # Personalize content for this recipient
-            personalized_subject = replace_template_variables(campaign.subject, recipient)
-            personalized_content = replace_template_variables(campaign.content, recipient)
-            
-            # Send the email
-            success, message, tracking_id = send_email(
-                subject=personalized_subject,
-                content=personalized_content,
-                to_email=recipient.email,
-                sender_id=campaign.created_by,
-                office_id=campaign.office_id,
-                template_id=campaign.template_id,
-                person_id=recipient.id,
-                bulk_send_id=str(campaign.id),
-                use_tracking=True
-            )
-            
-            if success:
-                sent_count += 1
-        
-        # Update campaign status and tracking stats
-        campaign.status = 'completed'
-        campaign.sent_at = datetime.utcnow()
-        campaign.update_stats()
-        db.session.commit()
+        totals = deliver_campaign(campaign_id, checkpoint=checkpoint, on_start=on_start, on_chunk=on_chunk)
+        return True, f"Campaign sent successfully to {totals['sent']} recipients", totals['sent']
         
-        return True, f"Campaign sent successfully to {sent_count} recipients", sent_count
+    except ValueError as e:
+        return False, str(e), 0
         
     except Exception as e:
         current_app.logger.error(f"Error sending bulk email: {str(e)}")
-        if 'campaign' in locals():
+        db.session.rollback()
+        campaign = db.session.get(EmailCampaign, campaign_id)
+        if campaign:
             campaign.status = 'failed'
             db.session.commit()
-        return False, f"Failed to send bulk email: {str(e)}", 0 
\ No newline at end of file
+        return False, f"Failed to send bulk email: {str(e)}", 0
@@ -1,8 +1,18 @@
 import io
+import os
 import csv
 import datetime
+import tempfile
 import xlsxwriter
-from flask import send_file, current_app
+from flask import send_file, current_app, Response, stream_with_context
+
+# Rows fetched per round trip when streaming query results
+EXPORT_BATCH_SIZE = 1000
+
+# Bytes per chunk sent to the client when streaming export files
+EXPORT_CHUNK_SIZE = 64 * 1024
+
+EXCEL_MIMETYPE = 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
 
 
 def generate_csv(data, columns, filename):
@@ -126,4 +136,211 @@ def generate_excel(data, columns, filename):
     except Exception as e:
         current_app.logger.error(f"Error generating Excel: {str(e)}")
         # Re-raise to let the calling function handle it
-        raise 
\ No newline at end of file
+        raise 
+
+def iter_export_rows(query, to_row, batch_size=EXPORT_BATCH_SIZE):
+    """
+    Iterate over a query in batches and convert each result to an export row
+    
+    Results are fetched with ``yield_per`` so only one batch of ORM objects
+    is held in memory at a time.
+    
+    Args:
+        query: SQLAlchemy query to export
+        to_row: Callable converting one query result to a dictionary
+        batch_size: Number of rows fetched per round trip
+    
+    Yields:
+        Dictionaries of column name to value
+    """
+    for item in query.yield_per(batch_size):
+        row = to_row(item)
+        if row is not None:
+            yield row
+
+
+def stream_csv(rows, columns, filename):
+    """
+    Stream a CSV file from an iterable of rows as a chunked Flask response
+    
+    Args:
+        rows: Iterable of dictionaries containing the data
+        columns: List of column names to include
+        filename: Base filename without extension
+    
+    Returns:
+        Flask streaming response with CSV data
+    """
+    def generate():
+        output = io.StringIO()
+        writer = csv.DictWriter(output, fieldnames=columns, extrasaction='ignore')
+        writer.writeheader()
+        row_count = 0
+        
+        try:
+            for row in rows:
+                writer.writerow({col: _csv_value(row.get(col, '')) for col in columns})
+                row_count += 1
+                
+                # Flush the buffer to the client once it holds a chunk
+                if output.tell() >= EXPORT_CHUNK_SIZE:
+                    yield output.getvalue().encode('utf-8')
+                    output.seek(0)
+                    output.truncate(0)
+            
+            yield output.getvalue().encode('utf-8')
+            current_app.logger.info(f"CSV file '{filename}.csv' streamed successfully with {row_count} rows")
+        except Exception as e:
+            current_app.logger.error(f"Error streaming CSV after {row_count} rows: {str(e)}")
+            raise
+        finally:
+            output.close()
+    
+    return Response(
+        stream_with_context(generate()),
+        mimetype='text/csv',
+        headers={'Content-Disposition': f'attachment; filename={filename}.csv'}
+    )
+
+
+def stream_excel(rows, columns, filename, sheet_name=None):
+    """
+    Build an Excel file from an iterable of rows in bounded memory and stream it
+    
+    The workbook is written to a temporary file with ``write_excel`` and
+    then sent to the client in chunks and removed.
+    
+    Args:
+        rows: Iterable of dictionaries containing the data
+        columns: List of column names to include
+        filename: Base filename without extension
+        sheet_name: Optional worksheet name
+    
+    Returns:
+        Flask streaming response with Excel data
+    """
+    fd, path = tempfile.mkstemp(suffix='.xlsx')
+    os.close(fd)
+    
+    try:
+        row_count = write_excel(rows, columns, path, sheet_name)
+        current_app.logger.info(f"Excel file '{filename}.xlsx' generated successfully with {row_count} rows")
+    except Exception as e:
+        os.remove(path)
+        current_app.logger.error(f"Error generating Excel: {str(e)}")
+        raise
+    
+    def generate():
+        try:
+            with open(path, 'rb') as f:
+                while True:
+                    chunk = f.read(EXPORT_CHUNK_SIZE)
+                    if not chunk:
+                        break
+                    yield chunk
+        finally:
+            os.remove(path)
+    
+    return Response(
+        generate(),
+        mimetype=EXCEL_MIMETYPE,
+        headers={
+            'Content-Disposition': f'attachment; filename={filename}.xlsx',
+            'Content-Length': str(os.path.getsize(path))
+        }
+    )
+
+
+def write_csv(rows, columns, output):
+    """
+    Write rows to a CSV file object one row at a time
+    
+    Args:
+        rows: Iterable of dictionaries containing the data
+        columns: List of column names to include
+        output: Text file object to write to
+    
+    Returns:
+        Number of rows written
+    """
+    writer = csv.DictWriter(output, fieldnames=columns, extrasaction='ignore')
+    writer.writeheader()
+    row_count = 0
+    for row in rows:
+        writer.writerow({col: _csv_value(row.get(col, '')) for col in columns})
+        row_count += 1
+    return row_count
+
+
+def write_excel(rows, columns, path, sheet_name=None):
+    """
+    Write rows to an Excel file in bounded memory
+    
+    Uses xlsxwriter's ``constant_memory`` mode, which flushes each row to a
+    temporary file as soon as the next row starts, so memory use does not
+    grow with the number of rows.
+    
+    Args:
+        rows: Iterable of dictionaries containing the data
+        columns: List of column names to include
+        path: Destination file path
+        sheet_name: Optional worksheet name
+    
+    Returns:
+        Number of rows written
+    """
+    workbook = xlsxwriter.Workbook(path, {'constant_memory': True})
+    try:
+        worksheet = workbook.add_worksheet(sheet_name)
+        
+        # Add header formatting
+        header_format = workbook.add_format({
+            'bold': True,
+            'bg_color': '#D3D3D3',
+            'border': 1
+        })
+        
+        # Write headers
+        for col_idx, column in enumerate(columns):
+            worksheet.write(0, col_idx, column, header_format)
+        
+        # Track column widths while writing, since rows can't be revisited
+        widths = [len(column) + 2 for column in columns]
+        row_count = 0
+        
+        for row_idx, row in enumerate(rows, 1):
+            for col_idx, column in enumerate(columns):
+                value = _excel_value(row.get(column, ''))
+                worksheet.write(row_idx, col_idx, value)
+                if value:
+                    widths[col_idx] = min(max(widths[col_idx], len(str(value)) + 2), 50)  # Cap width at 50
+            row_count = row_idx
+        
+        for col_idx, width in enumerate(widths):
+            worksheet.set_column(col_idx, col_idx, width)
+    finally:
+        workbook.close()
+    
+    return row_count
+
+
+def _csv_value(value):
+    """Format a value for CSV output."""
+    if value is None:
+        return ''
+    if isinstance(value, (datetime.date, datetime.datetime)):
+        return value.isoformat()
+    return value
+
+
+def _excel_value(value):
+    """Format a value for Excel compatibility."""
+    if value is None:
+        return ''
+    if isinstance(value, datetime.datetime):
+        return value.strftime('%Y-%m-%d %H:%M:%S')
+    if isinstance(value, datetime.date):
+        return value.strftime('%Y-%m-%d')
+    if not isinstance(value, (str, int, float, bool)):
+        return str(value)
+    return value
@@ -0,0 +1,365 @@
+"""
+Indexed, daily rotated store for the pipe-delimited application logs
+(activity, security, email and database).
+
+Each log keeps its familiar file (e.g. logs/activity.log) as the active
+segment for the current day. On the first write of a new day it is renamed
+to activity.log.YYYY-MM-DD and a new active segment is started; rotated
+segments older than LOG_RETENTION_DAYS are deleted.
+
+Next to the segments, activity.log.idx is a SQLite index holding only
+what the log viewers filter on. Consecutive lines with the same level and
+subsystem are indexed together as one block (up to BLOCK_SIZE bytes): its
+segment, byte offset and length, newest timestamp (as integer seconds),
+level and subsystem. Segment names live in their own table, so rotating a
+day renames one row instead of rewriting the day's index. Reads query the
+blocks newest first with the indexed filters applied, then read and parse
+only those blocks, stopping as soon as max_entries entries have passed any
+remaining filter (search terms, users, operations).
+
+Writes hold the SQLite write lock while appending to the active segment,
+so processes sharing a log directory do not interleave offsets. Log files
+written before the index existed, or indexed in an older index format,
+are indexed once when the store is opened.
+"""
+
+import datetime
+import glob
+import logging
+import os
+import sqlite3
+import threading
+
+logger = logging.getLogger(__name__)
+
+ACTIVE_SEGMENT = ''
+EPOCH = datetime.datetime(1970, 1, 1)
+READ_BATCH_SIZE = 200
+
+# Largest run of lines indexed as one block, in bytes
+BLOCK_SIZE = 64 * 1024
+
+# Raised whenever the layout of the index changes; an index written in
+# another version is dropped and rebuilt from the log files
+INDEX_VERSION = '2'
+
+SCHEMA = [
+    """CREATE TABLE IF NOT EXISTS segments (
+        id INTEGER PRIMARY KEY,
+        name TEXT NOT NULL UNIQUE
+    )""",
+    """CREATE TABLE IF NOT EXISTS blocks (
+        id INTEGER PRIMARY KEY,
+        segment INTEGER NOT NULL,
+        offset INTEGER NOT NULL,
+        length INTEGER NOT NULL,
+        ts INTEGER NOT NULL,
+        level TEXT,
+        subsystem TEXT
+    )""",
+    "CREATE INDEX IF NOT EXISTS ix_blocks_ts ON blocks (ts)",
+    "CREATE INDEX IF NOT EXISTS ix_blocks_level_ts ON blocks (level, ts)",
+    "CREATE INDEX IF NOT EXISTS ix_blocks_subsystem_ts ON blocks (subsystem, ts)",
+    "CREATE INDEX IF NOT EXISTS ix_blocks_segment ON blocks (segment)"
+]
+
+
+def _seconds(timestamp):
+    """Whole seconds since 1970 of a naive timestamp, as stored in the index."""
+    return int((timestamp - EPOCH).total_seconds())
+
+
+class LogStore:
+    """One log: the active segment, its rotated segments and their index.
+
+    Args:
+        path: Path of the active segment (e.g. logs/activity.log)
+        parse_line: Function turning a line into an entry dict (or None if unparseable)
+        index_fields: Function returning (timestamp, level, subsystem) for an entry
+        retention_days: Days of rotated segments to keep (None keeps everything)
+    """
+
+    def __init__(self, path, parse_line, index_fields, retention_days=None):
+        self.path = path
+        self.index_path = f"{path}.idx"
+        self.parse_line = parse_line
+        self.index_fields = index_fields
+        self.retention_days = retention_days
+        self._local = threading.local()
+        self._initialized = False
+        self._init_lock = threading.Lock()
+
+    def _connection(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+            conn = sqlite3.connect(self.index_path, timeout=30, isolation_level=None)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            self._local.conn = conn
+        if not self._initialized:
+            with self._init_lock:
+                if not self._initialized:
+                    self._initialize(conn)
+                    self._initialized = True
+        return conn
+
+    def _initialize(self, conn):
+        conn.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)")
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            if self._get_meta(conn, 'version') != INDEX_VERSION:
+                # Index logs written before the store existed or in an older index format
+                conn.execute("DROP TABLE IF EXISTS entries")
+                conn.execute("DROP TABLE IF EXISTS blocks")
+                conn.execute("DROP TABLE IF EXISTS segments")
+                for statement in SCHEMA:
+                    conn.execute(statement)
+                self._index_existing(conn)
+                self._set_meta(conn, 'version', INDEX_VERSION)
+                if self._get_meta(conn, 'active_day') is None:
+                    self._set_meta(conn, 'active_day', datetime.date.today().isoformat())
+            conn.execute('COMMIT')
+        except Exception:
+            conn.execute('ROLLBACK')
+            raise
+
+    def _index_existing(self, conn):
+        segment_paths = sorted(glob.glob(f"{glob.escape(self.path)}.????-??-??*")) + [self.path]
+        count = 0
+        for segment_path in segment_paths:
+            if not os.path.exists(segment_path):
+                continue
+            segment = self._segment_id(conn, segment_path[len(self.path) + 1:])
+            with open(segment_path, 'rb') as f:
+                blocks = self._build_blocks(f, segment, 0)
+            self._write_blocks(conn, blocks)
+            count += len(blocks)
+        if count:
+            logger.info(f"Indexed {count} blocks of existing entries of {self.path}")
+
+    @staticmethod
+    def _segment_id(conn, segment):
+        conn.execute("INSERT OR IGNORE INTO segments (name) VALUES (?)", (segment,))
+        return conn.execute("SELECT id FROM segments WHERE name = ?", (segment,)).fetchone()[0]
+
+    def _index_key(self, raw):
+        """Return (seconds, level, subsystem) for a raw line, or None if it is not an entry."""
+        try:
+            entry = self.parse_line(raw.decode('utf-8', errors='ignore').rstrip('\r\n'))
+        except Exception:
+            entry = None
+        if not entry:
+            return None
+        timestamp, level, subsystem = self.index_fields(entry)
+        return (
+            _seconds(timestamp),
+            level.upper() if level else None,
+            subsystem.lower() if subsystem else None
+        )
+
+    def _build_blocks(self, lines, segment, offset, last=None):
+        """
+        Group raw lines starting at offset into blocks of lines with the same level and subsystem.
+
+        Args:
+            lines: Raw lines including their newlines
+            segment: Segment id the lines belong to
+            offset: Byte offset of the first line
+            last: The segment's last block as [id, segment, offset, length, ts, level, subsystem],
+                extended when the first lines share its level and subsystem
+
+        Returns:
+            list: Blocks in the same form; new ones have no id
+        """
+        blocks = [last] if last else []
+        for raw in lines:
+            key = self._index_key(raw)
+            end = offset + len(raw)
+            if key:
+                ts, level, subsystem = key
+                block = blocks[-1] if blocks else None
+                if block and block[5:] == [level, subsystem] and end - block[2] <= BLOCK_SIZE:
+                    block[3] = end - block[2]
+                    block[4] = max(block[4], ts)
+                else:
+                    blocks.append([None, segment, offset, len(raw), ts, level, subsystem])
+            offset = end
+        return blocks
+
+    @staticmethod
+    def _last_block(conn, segment):
+        row = conn.execute(
+            "SELECT id, segment, offset, length, ts, level, subsystem FROM blocks "
+            "WHERE segment = ? ORDER BY id DESC LIMIT 1",
+            (segment,)
+        ).fetchone()
+        return list(row) if row else None
+
+    @staticmethod
+    def _write_blocks(conn, blocks):
+        for block in blocks:
+            if block[0] is not None:
+                conn.execute("UPDATE blocks SET length = ?, ts = ? WHERE id = ?", (block[3], block[4], block[0]))
+        conn.executemany(
+            "INSERT INTO blocks (segment, offset, length, ts, level, subsystem) VALUES (?, ?, ?, ?, ?, ?)",
+            [block[1:] for block in blocks if block[0] is None]
+        )
+
+    @staticmethod
+    def _get_meta(conn, key):
+        row = conn.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+
+    @staticmethod
+    def _set_meta(conn, key, value):
+        conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)", (key, value))
+
+    def _segment_path(self, segment):
+        return f"{self.path}.{segment}" if segment else self.path
+
+    def _rotate(self, conn, today):
+        """Rename the active segment if it belongs to an earlier day; call inside a write transaction."""
+        active_day = self._get_meta(conn, 'active_day')
+        if active_day == today:
+            return
+        if active_day and os.path.exists(self.path) and os.path.getsize(self.path):
+            segment = active_day
+            suffix = 1
+            while os.path.exists(self._segment_path(segment)):
+                segment = f"{active_day}.{suffix}"
+                suffix += 1
+            os.replace(self.path, self._segment_path(segment))
+            conn.execute("UPDATE segments SET name = ? WHERE name = ?", (segment, ACTIVE_SEGMENT))
+        self._set_meta(conn, 'active_day', today)
+        self._prune(conn)
+
+    def _prune(self, conn):
+        if not self.retention_days:
+            return
+        cutoff = (datetime.date.today() - datetime.timedelta(days=self.retention_days)).isoformat()
+        for segment_path in glob.glob(f"{glob.escape(self.path)}.????-??-??*"):
+            segment = segment_path[len(self.path) + 1:]
+            if segment[:10] < cutoff:
+                conn.execute(
+                    "DELETE FROM blocks WHERE segment IN (SELECT id FROM segments WHERE name = ?)", (segment,)
+                )
+                conn.execute("DELETE FROM segments WHERE name = ?", (segment,))
+                try:
+                    os.remove(segment_path)
+                except OSError as e:
+                    logger.warning(f"Could not remove log segment {segment_path}: {str(e)}")
+
+    def append(self, line):
+        """Append one line to the log and index it."""
+        self.append_many([line])
+
+    def append_many(self, lines):
+        """Append lines (without trailing newlines) to the active segment and index them."""
+        if not lines:
+            return
+        conn = self._connection()
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            self._rotate(conn, datetime.date.today().isoformat())
+            segment = self._segment_id(conn, ACTIVE_SEGMENT)
+            data = [(line + '\n').encode('utf-8') for line in lines]
+            with open(self.path, 'ab') as f:
+                offset = f.seek(0, os.SEEK_END)
+                blocks = self._build_blocks(data, segment, offset, self._last_block(conn, segment))
+                f.write(b''.join(data))
+            self._write_blocks(conn, blocks)
+            conn.execute('COMMIT')
+        except Exception:
+            conn.execute('ROLLBACK')
+            raise
+
+    def query(self, max_entries=100, since=None, level=None, subsystem=None, predicate=None):
+        """
+        Return parsed entries newest first.
+
+        Args:
+            max_entries: Stop after this many entries
+            since: Only entries at or after this datetime
+            level: Only entries with this level (case-insensitive)
+            subsystem: Only entries with this subsystem (case-insensitive)
+            predicate: Further filter applied to parsed entries
+
+        Returns:
+            list: Entries as returned by parse_line
+        """
+        conn = self._connection()
+        conditions, params = [], []
+        if since is not None:
+            conditions.append("ts >= ?")
+            params.append(_seconds(since))
+        for column, value in (('level', level and level.upper()),
+                              ('subsystem', subsystem and subsystem.lower())):
+            if value:
+                conditions.append(f"{column} = ?")
+                params.append(value)
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ''
+        segments = dict(conn.execute("SELECT id, name FROM segments"))
+        cursor = conn.execute(
+            f"SELECT segment, offset, length FROM blocks {where} ORDER BY ts DESC, id DESC", params
+        )
+
+        entries = []
+        files = {}
+        try:
+            while len(entries) < max_entries:
+                rows = cursor.fetchmany(READ_BATCH_SIZE)
+                if not rows:
+                    break
+                for segment, offset, length in rows:
+                    f = files.get(segment)
+                    if f is None:
+                        try:
+                            f = files[segment] = open(self._segment_path(segments[segment]), 'rb')
+                        except (KeyError, OSError):
+                            continue
+                    f.seek(offset)
+                    for entry in self._read_block(f.read(length), since):
+                        if predicate and not predicate(entry):
+                            continue
+                        entries.append(entry)
+                        if len(entries) >= max_entries:
+                            break
+                    if len(entries) >= max_entries:
+                        break
+        finally:
+            cursor.close()
+            for f in files.values():
+                f.close()
+        return entries
+
+    def _read_block(self, data, since=None):
+        """Parse the entries of a block at or after since, newest first."""
+        entries = []
+        for raw in reversed(data.split(b'\n')):
+            try:
+                entry = self.parse_line(raw.decode('utf-8', errors='ignore').rstrip('\r'))
+            except Exception:
+                entry = None
+            if entry and (since is None or self.index_fields(entry)[0] >= since):
+                entries.append(entry)
+        # Stable, so entries logged in the same second stay newest first
+        entries.sort(key=lambda entry: self.index_fields(entry)[0], reverse=True)
+        return entries
+
+    def exists(self):
+        """Whether the log has been written or indexed before."""
+        return os.path.exists(self.path) or os.path.exists(self.index_path)
+
+
+_stores = {}
+_stores_lock = threading.Lock()
+
+
+def get_log_store(path, parse_line, index_fields, retention_days=None):
+    """Return the process-wide store for a log path."""
+    with _stores_lock:
+        store = _stores.get(path)
+        if store is None:
+            store = _stores[path] = LogStore(path, parse_line, index_fields, retention_days)
+        return store
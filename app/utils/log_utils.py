@@ -2,11 +2,13 @@
 
 import os
 import datetime
+import mmap
 import uuid
 import random
 import re
 from collections import defaultdict
-from flask import current_app
+from flask import current_app, has_app_context
+from app.utils.log_store import get_log_store
 
 # Define log levels and their priorities
 LOG_LEVELS = {
@@ -33,6 +35,12 @@ LOG_PATTERNS = {
     'gunicorn': re.compile(r'\[(\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2} [+-]\d{4})\] \[(\w+)\] \[.+\] (.+)')
 }
 
+# All LOG_PATTERNS in one alternation, so each line is matched once. Every
+# pattern is wrapped in a named group; its timestamp, level and message are
+# the three groups that follow it.
+LOG_LINE_PATTERN = re.compile('|'.join(f'(?P<{name}>{pattern.pattern})' for name, pattern in LOG_PATTERNS.items()))
+LOG_PATTERN_GROUPS = {name: LOG_LINE_PATTERN.groupindex[name] for name in LOG_PATTERNS}
+
 def get_log_files():
     """Get a list of all log files in the application log directory."""
     try:
@@ -84,72 +92,92 @@ def format_file_size(size_bytes):
             return f"{size_bytes:.1f} {unit}"
         size_bytes /= 1024.0
 
-def parse_log_file(file_path, max_entries=1000, level_filter=None, search_term=None):
-    """Parse a log file and return structured log entries."""
+def reverse_lines(data, end=None):
+    """Yield (offset, line) for the lines of data before end, last line first."""
+    position = len(data) if end is None else end
+    while position > 0:
+        start = data.rfind(b'\n', 0, position - 1) + 1
+        yield start, data[start:position].rstrip(b'\r\n')
+        position = start
+
+def parse_log_file(file_path, max_entries=1000, level_filter=None, search_term=None, before=None):
+    """Parse the end of a log file and return structured log entries, newest first.
+    
+    The file is memory-mapped and read backwards from the end (or from the
+    before offset), so only the tail that is returned gets read. Lines that
+    match none of LOG_PATTERNS are continuations of the entry above them.
+    
+    Args:
+        file_path (str): Path of the log file
+        max_entries (int): Maximum number of log entries to return
+        level_filter (str): Only return entries with this level
+        search_term (str): Only return entries whose message contains this
+        before (int): Only return entries starting before this byte offset;
+            pass the 'offset' of the last entry of a page to get the next, older page
+        
+    Returns:
+        list: Log entries with timestamp, level, message, color and offset
+    """
     try:
-        if not os.path.exists(file_path):
+        if not os.path.exists(file_path) or os.path.getsize(file_path) == 0:
             return []
         
         log_entries = []
-        line_count = 0
+        continuation = []
         
-        with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
-            for line in f:
-                line_count += 1
-                if line_count > max_entries:
-                    break
+        with open(file_path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            for offset, raw_line in reverse_lines(data, before):
+                line = raw_line.decode('utf-8', errors='ignore').strip()
                 
                 # Skip empty lines
-                if not line.strip():
+                if not line:
                     continue
                 
-                # Try to parse the line using different patterns
-                entry = None
-                for pattern_name, pattern in LOG_PATTERNS.items():
-                    match = pattern.match(line.strip())
-                    if match:
-                        timestamp_str, level, message = match.groups()
-                        
-                        # Apply level filter if specified
-                        if level_filter and level != level_filter:
-                            continue
-                        
-                        # Apply search filter if specified
-                        if search_term and search_term.lower() not in message.lower():
-                            continue
-                        
-                        # Parse timestamp
-                        try:
-                            if pattern_name == 'gunicorn':
-                                timestamp = datetime.datetime.strptime(timestamp_str, '%Y-%m-%d %H:%M:%S %z')
-                            else:
-                                timestamp = datetime.datetime.strptime(timestamp_str, '%Y-%m-%d %H:%M:%S,%f')
-                        except ValueError:
-                            timestamp = datetime.datetime.now()  # Fallback if parsing fails
-                        
-                        entry = {
-                            'timestamp': timestamp,
-                            'level': level,
-                            'message': message,
-                            'color': LOG_COLORS.get(level, 'text-secondary')
-                        }
-                        break
+                match = LOG_LINE_PATTERN.match(line)
+                if not match:
+                    continuation.append(line)
+                    continue
+                
+                group = LOG_PATTERN_GROUPS[match.lastgroup]
+                timestamp_str, level, message = match.group(group + 1, group + 2, group + 3)
+                if continuation:
+                    message += '\n' + '\n'.join(reversed(continuation))
+                    continuation = []
+                
+                # Apply level filter if specified
+                if level_filter and level != level_filter:
+                    continue
+                
+                # Apply search filter if specified
+                if search_term and search_term.lower() not in message.lower():
+                    continue
                 
-                # If no pattern matched, treat as continuation of previous message
-                if not entry and log_entries:
-                    log_entries[-1]['message'] += '\n' + line.strip()
-                elif entry:
-                    log_entries.append(entry)
-        
-        # Sort by timestamp (newest first)
-        log_entries.sort(key=lambda x: x['timestamp'], reverse=True)
+                # Parse timestamp
+                try:
+                    if match.lastgroup == 'gunicorn':
+                        timestamp = datetime.datetime.strptime(timestamp_str, '%Y-%m-%d %H:%M:%S %z')
+                    else:
+                        timestamp = datetime.datetime.strptime(timestamp_str, '%Y-%m-%d %H:%M:%S,%f')
+                except ValueError:
+                    timestamp = datetime.datetime.now()  # Fallback if parsing fails
+                
+                log_entries.append({
+                    'timestamp': timestamp,
+                    'level': level,
+                    'message': message,
+                    'color': LOG_COLORS.get(level, 'text-secondary'),
+                    'offset': offset
+                })
+                if len(log_entries) >= max_entries:
+                    break
+        
         return log_entries
     except Exception as e:
         current_app.logger.error(f"Error parsing log file {file_path}: {str(e)}")
         return []
 
-def get_system_logs(max_entries=1000, level_filter=None, search_term=None):
-    """Get system logs from the application log files."""
+def get_system_logs(max_entries=1000, level_filter=None, search_term=None, before=None):
+    """Get system logs from the application log files, newest first."""
     try:
         log_files = get_log_files()
         if not log_files:
@@ -157,7 +185,7 @@ def get_system_logs(max_entries=1000, level_filter=None, search_term=None):
         
         # Use the most recent log file by default
         most_recent_log = log_files[0]['path']
-        return parse_log_file(most_recent_log, max_entries, level_filter, search_term)
+        return parse_log_file(most_recent_log, max_entries, level_filter, search_term, before)
     except Exception as e:
         current_app.logger.error(f"Error getting system logs: {str(e)}")
         return []
@@ -204,6 +232,138 @@ def get_log_statistics(logs=None):
     
     return stats
 
+def _split_user_info(user_info):
+    """Split 'name <email>' into (name, email)."""
+    if '<' in user_info and '>' in user_info:
+        user_name, email = user_info.split('<', 1)
+        return user_name.strip(), email.split('>', 1)[0].strip()
+    return user_info, None
+
+def parse_activity_line(line):
+    """Parse a line of the activity log, or return None if it is not an entry.
+    
+    Format: timestamp|status|subsystem|operation|user|ip|description|impact|resource_id|duration
+    """
+    parts = line.strip().split('|')
+    if len(parts) < 7:
+        return None
+    
+    user_name, email = _split_user_info(parts[4].strip())
+    ip_address = parts[5].strip()
+    resource_id = parts[8].strip() if len(parts) > 8 else None
+    
+    return {
+        'timestamp': datetime.datetime.strptime(parts[0].strip(), '%Y-%m-%d %H:%M:%S'),
+        'subsystem': parts[2].strip(),
+        'operation': parts[3].strip(),
+        'description': parts[6].strip(),
+        'status': parts[1].strip(),
+        'impact': parts[7].strip() if len(parts) > 7 else 'MEDIUM',
+        'user': user_name,
+        'email': email,
+        'ip_address': ip_address if ip_address != 'None' else None,
+        'duration': int(parts[9]) if len(parts) > 9 and parts[9].strip().isdigit() else None,
+        'resource_id': resource_id if resource_id != 'None' else None
+    }
+
+def parse_security_line(line):
+    """Parse a line of the security log, or return None if it is not an entry.
+    
+    Format: timestamp|level|event_type|user|ip_address|description
+    """
+    parts = line.strip().split('|')
+    if len(parts) < 6:
+        return None
+    
+    timestamp_str = parts[0].strip()
+    event_type = parts[2].strip()
+    user = parts[3].strip()
+    ip_address = parts[4].strip()
+    
+    return {
+        'id': f"{hash(timestamp_str + event_type + user) & 0xFFFFFFFF:08x}",  # Generate a consistent ID
+        'timestamp': datetime.datetime.strptime(timestamp_str, '%Y-%m-%d %H:%M:%S'),
+        'level': parts[1].strip(),
+        'event_type': event_type,
+        'user': user,
+        'ip_address': ip_address if ip_address != 'None' else None,
+        'description': parts[5].strip()
+    }
+
+def parse_email_line(line):
+    """Parse a line of the email log, or return None if it is not an entry.
+    
+    Format: timestamp|message_id|status|user|sender|recipients|subject|open_count|click_count|bounce_reason
+    """
+    parts = line.strip().split('|')
+    if len(parts) != 10:
+        return None
+    
+    timestamp_str, message_id, status, user, sender_email, recipients, subject, open_count, click_count, bounce_reason = parts
+    
+    return {
+        'id': message_id,
+        'timestamp': datetime.datetime.strptime(timestamp_str, '%Y-%m-%d %H:%M:%S'),
+        'status': status,
+        'user': user,
+        'sender': sender_email,
+        'recipients': recipients,
+        'subject': subject,
+        'open_count': int(open_count) if open_count.isdigit() else 0,
+        'click_count': int(click_count) if click_count.isdigit() else 0,
+        'bounce_reason': None if bounce_reason == 'None' else bounce_reason
+    }
+
+def parse_database_line(line):
+    """Parse a line of the database log, or return None if it is not an entry.
+    
+    Format: timestamp|operation_id|operation|table|status|user|duration|records_affected|query
+    """
+    parts = line.strip().split('|')
+    if len(parts) != 9:
+        return None
+    
+    timestamp_str, operation_id, operation, table, status, user, duration, records_affected, query = parts
+    
+    return {
+        'id': operation_id,
+        'timestamp': datetime.datetime.strptime(timestamp_str, '%Y-%m-%d %H:%M:%S'),
+        'operation': operation,
+        'table': table,
+        'status': status,
+        'user': user,
+        'duration': int(duration) if duration.isdigit() else 0,
+        'records_affected': int(records_affected) if records_affected.isdigit() else 0,
+        'query': None if query == 'None' else query
+    }
+
+# Parser and indexed fields (timestamp, level, subsystem) of each log kept in a LogStore.
+# Only what the log viewers filter on is indexed; other filters are applied to parsed lines
+LOG_FORMATS = {
+    'activity': (parse_activity_line, lambda e: (e['timestamp'], e['status'], e['subsystem'])),
+    'security': (parse_security_line, lambda e: (e['timestamp'], e['level'], e['event_type'])),
+    'email': (parse_email_line, lambda e: (e['timestamp'], e['status'], None)),
+    'database': (parse_database_line, lambda e: (e['timestamp'], e['status'], e['table']))
+}
+
+def open_log_store(name, path=None, retention_days=None):
+    """Get the indexed store of the activity, security, email or database log.
+    
+    Args:
+        name (str): Key of LOG_FORMATS
+        path (str): Path of the active log file (defaults to <log directory>/<name>.log)
+        retention_days (int): Days of rotated files to keep (defaults to LOG_RETENTION_DAYS)
+        
+    Returns:
+        LogStore: The store, shared by every caller in the process
+    """
+    if path is None:
+        path = os.path.join(get_log_directory(), f'{name}.log')
+    if retention_days is None and has_app_context():
+        retention_days = current_app.config.get('LOG_RETENTION_DAYS')
+    parse_line, index_fields = LOG_FORMATS[name]
+    return get_log_store(path, parse_line, index_fields, retention_days)
+
 def get_activity_logs(max_entries=100, level_filter=None, search_term=None, days=30):
     """Get user activity logs from the activity log file.
     
@@ -214,96 +374,35 @@ def get_activity_logs(max_entries=100, level_filter=None, search_term=None, days
         days (int): Number of days to look back for logs
         
     Returns:
-        list: List of activity log entries
+        list: List of activity log entries, newest first
     """
     try:
-        log_dir = get_log_directory()
-        activity_log_path = os.path.join(log_dir, 'activity.log')
-        
-        # If the activity log file doesn't exist, create an empty file
-        if not os.path.exists(activity_log_path):
-            os.makedirs(os.path.dirname(activity_log_path), exist_ok=True)
-            with open(activity_log_path, 'w') as f:
-                pass
-        
-        # Read the activity log file
-        activities = []
-        with open(activity_log_path, 'r') as f:
-            for line in f:
-                try:
-                    # Parse the log entry
-                    # Format: [timestamp] [status] [subsystem] [operation] [user] [ip] [description]
-                    parts = line.strip().split('|')
-                    if len(parts) >= 7:
-                        timestamp_str = parts[0].strip()
-                        status = parts[1].strip()
-                        subsystem = parts[2].strip()
-                        operation = parts[3].strip()
-                        user_info = parts[4].strip()
-                        ip_address = parts[5].strip()
-                        description = parts[6].strip()
-                        
-                        # Parse additional fields if available
-                        impact = parts[7].strip() if len(parts) > 7 else 'MEDIUM'
-                        resource_id = parts[8].strip() if len(parts) > 8 else None
-                        duration = int(parts[9]) if len(parts) > 9 and parts[9].strip().isdigit() else None
-                        
-                        # Parse timestamp
-                        timestamp = datetime.datetime.strptime(timestamp_str, '%Y-%m-%d %H:%M:%S')
-                        
-                        # Parse user info (format: name <email>)
-                        email = None
-                        if '<' in user_info and '>' in user_info:
-                            user_name, email = user_info.split('<', 1)
-                            user_name = user_name.strip()
-                            email = email.split('>', 1)[0].strip()
-                        else:
-                            user_name = user_info
-                        
-                        # Apply filters
-                        # Filter by days
-                        if (datetime.datetime.now() - timestamp).days > days:
-                            continue
-                            
-                        # Filter by level
-                        if level_filter and status != level_filter:
-                            continue
-                            
-                        # Filter by search term
-                        if search_term and search_term.lower() not in (
-                            description.lower() + 
-                            subsystem.lower() + 
-                            operation.lower() + 
-                            user_name.lower() + 
-                            (email.lower() if email else '')
-                        ):
-                            continue
-                        
-                        # Add the activity to the list
-                        activities.append({
-                            'timestamp': timestamp,
-                            'subsystem': subsystem,
-                            'operation': operation,
-                            'description': description,
-                            'status': status,
-                            'impact': impact,
-                            'user': user_name,
-                            'email': email,
-                            'ip_address': ip_address if ip_address != 'None' else None,
-                            'duration': duration,
-                            'resource_id': resource_id if resource_id != 'None' else None
-                        })
-                except Exception as e:
-                    current_app.logger.error(f"Error parsing activity log line: {str(e)}")
-                    continue
-        
-        # Sort activities by timestamp in descending order
-        activities.sort(key=lambda x: x['timestamp'], reverse=True)
-        
-        # Limit the number of entries
-        activities = activities[:max_entries]
+        store = open_log_store('activity')
+        now = datetime.datetime.now()
         
-        return activities
+        def matches(activity):
+            # Filter by days
+            if (now - activity['timestamp']).days > days:
+                return False
+            
+            # Filter by search term
+            if search_term and search_term.lower() not in (
+                activity['description'].lower() + 
+                activity['subsystem'].lower() + 
+                activity['operation'].lower() + 
+                activity['user'].lower() + 
+                (activity['email'].lower() if activity['email'] else '')
+            ):
+                return False
+            return True
+        
+        # Status and age are answered by the index; the rest by matches()
+        return store.query(
+            max_entries,
+            since=now - datetime.timedelta(days=days + 1),
+            level=level_filter,
+            predicate=matches
+        )
     except Exception as e:
         current_app.logger.error(f"Error getting activity logs: {str(e)}")
         return []
@@ -421,12 +520,6 @@ def log_activity(subsystem, operation, description, status='SUCCESS', impact='ME
         duration (int): The duration of the operation in milliseconds
     """
     try:
-        log_dir = get_log_directory()
-        activity_log_path = os.path.join(log_dir, 'activity.log')
-        
-        # Create the log directory if it doesn't exist
-        os.makedirs(log_dir, exist_ok=True)
-        
         # Format the timestamp
         timestamp = datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S')
         
@@ -442,8 +535,7 @@ def log_activity(subsystem, operation, description, status='SUCCESS', impact='ME
         log_entry = f"{timestamp}|{status}|{subsystem}|{operation}|{user_info}|{ip_address or 'None'}|{description}|{impact}|{resource_id or 'None'}|{duration or 'None'}"
         
         # Write to the log file
-        with open(activity_log_path, 'a') as f:
-            f.write(log_entry + '\n')
+        open_log_store('activity').append(log_entry)
     except Exception as e:
         current_app.logger.error(f"Error logging activity: {str(e)}")
 
@@ -458,74 +550,38 @@ def get_security_logs(max_entries=100, level_filter=None, search_term=None, days
         days (int): Number of days to look back for logs
         
     Returns:
-        list: List of security log entries
+        list: List of security log entries, newest first
     """
     try:
-        log_dir = get_log_directory()
-        security_log_path = os.path.join(log_dir, 'security.log')
+        store = open_log_store('security')
         
-        # If the security log file doesn't exist, create it with some initial entries
-        if not os.path.exists(security_log_path):
-            create_sample_security_logs(security_log_path)
+        # If the security log has never been written, create it with some initial entries
+        if not store.exists():
+            create_sample_security_logs(store.path)
         
-        # Read the security log file
-        security_logs = []
-        with open(security_log_path, 'r') as f:
-            for line in f:
-                try:
-                    # Parse the log entry
-                    # Format: timestamp|level|event_type|user|ip_address|description
-                    parts = line.strip().split('|')
-                    if len(parts) >= 6:
-                        timestamp_str = parts[0].strip()
-                        level = parts[1].strip()
-                        event_type = parts[2].strip()
-                        user = parts[3].strip()
-                        ip_address = parts[4].strip()
-                        description = parts[5].strip()
-                        
-                        # Parse timestamp
-                        timestamp = datetime.datetime.strptime(timestamp_str, '%Y-%m-%d %H:%M:%S')
-                        
-                        # Apply filters
-                        # Filter by days
-                        if (datetime.datetime.now() - timestamp).days > days:
-                            continue
-                            
-                        # Filter by level
-                        if level_filter and level != level_filter:
-                            continue
-                            
-                        # Filter by search term
-                        if search_term and search_term.lower() not in (
-                            description.lower() + 
-                            event_type.lower() + 
-                            user.lower() + 
-                            ip_address.lower()
-                        ):
-                            continue
-                        
-                        # Add the security log to the list
-                        security_logs.append({
-                            'id': f"{hash(timestamp_str + event_type + user) & 0xFFFFFFFF:08x}",  # Generate a consistent ID
-                            'timestamp': timestamp,
-                            'level': level,
-                            'event_type': event_type,
-                            'user': user,
-                            'ip_address': ip_address if ip_address != 'None' else None,
-                            'description': description
-                        })
-                except Exception as e:
-                    current_app.logger.error(f"Error parsing security log line: {str(e)}")
-                    continue
-        
-        # Sort security logs by timestamp in descending order
-        security_logs.sort(key=lambda x: x['timestamp'], reverse=True)
-        
-        # Limit the number of entries
-        security_logs = security_logs[:max_entries]
+        now = datetime.datetime.now()
         
-        return security_logs
+        def matches(entry):
+            # Filter by days
+            if (now - entry['timestamp']).days > days:
+                return False
+            
+            # Filter by search term
+            if search_term and search_term.lower() not in (
+                entry['description'].lower() + 
+                entry['event_type'].lower() + 
+                entry['user'].lower() + 
+                (entry['ip_address'] or 'None').lower()
+            ):
+                return False
+            return True
+        
+        return store.query(
+            max_entries,
+            since=now - datetime.timedelta(days=days + 1),
+            level=level_filter,
+            predicate=matches
+        )
     except Exception as e:
         current_app.logger.error(f"Error getting security logs: {str(e)}")
         return []
@@ -639,12 +695,6 @@ def log_email_event(message_id, sender, recipients, subject, status, user=None,
         bounce_reason (str): Reason for bounce if status is 'BOUNCED'
     """
     try:
-        log_dir = get_log_directory()
-        email_log_path = os.path.join(log_dir, 'email.log')
-        
-        # Create the log directory if it doesn't exist
-        os.makedirs(log_dir, exist_ok=True)
-        
         # Format the timestamp
         timestamp = datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S')
         
@@ -668,8 +718,7 @@ def log_email_event(message_id, sender, recipients, subject, status, user=None,
         log_entry = f"{timestamp}|{message_id}|{status}|{user_info}|{sender}|{recipients_str}|{subject}|{open_count}|{click_count}|{bounce_reason or 'None'}"
         
         # Write to the log file
-        with open(email_log_path, 'a') as f:
-            f.write(log_entry + '\n')
+        open_log_store('email').append(log_entry)
     except Exception as e:
         current_app.logger.error(f"Error logging email event: {str(e)}")
 
@@ -685,83 +734,88 @@ def get_email_logs(max_entries=100, status_filter=None, search_term=None, days=3
         recipient (str): Filter logs by recipient email
         
     Returns:
-        list: List of email log entries
+        list: List of email log entries, newest first
     """
     try:
-        log_dir = get_log_directory()
-        email_log_path = os.path.join(log_dir, 'email.log')
+        store = open_log_store('email')
         
-        # Check if log file exists
-        if not os.path.exists(email_log_path):
+        # Check if the log has ever been written
+        if not store.exists():
             return []
         
-        # Calculate the cutoff date for filtering by days
-        cutoff_date = datetime.datetime.now() - datetime.timedelta(days=days)
-        
-        # Read and parse the log file
-        email_logs = []
-        with open(email_log_path, 'r') as f:
-            for line in f:
-                try:
-                    # Parse the log entry
-                    parts = line.strip().split('|')
-                    if len(parts) < 10:  # Ensure we have all required fields
-                        continue
-                    
-                    timestamp_str, message_id, status, user, sender_email, recipients, subject, open_count, click_count, bounce_reason = parts
-                    
-                    # Parse timestamp
-                    timestamp = datetime.datetime.strptime(timestamp_str, '%Y-%m-%d %H:%M:%S')
-                    
-                    # Skip entries older than the cutoff date
-                    if timestamp < cutoff_date:
-                        continue
-                    
-                    # Apply filters
-                    if status_filter and status.upper() != status_filter.upper():
-                        continue
-                    
-                    if search_term and search_term.lower() not in subject.lower():
-                        continue
-                    
-                    if sender and sender.lower() not in sender_email.lower():
-                        continue
-                    
-                    if recipient and recipient.lower() not in recipients.lower():
-                        continue
-                    
-                    # Add the log entry to the list
-                    email_logs.append({
-                        'id': message_id,
-                        'timestamp': timestamp,
-                        'status': status,
-                        'user': user,
-                        'sender': sender_email,
-                        'recipients': recipients,
-                        'subject': subject,
-                        'open_count': int(open_count) if open_count.isdigit() else 0,
-                        'click_count': int(click_count) if click_count.isdigit() else 0,
-                        'bounce_reason': None if bounce_reason == 'None' else bounce_reason
-                    })
-                except Exception as e:
-                    current_app.logger.error(f"Error parsing email log line: {str(e)}")
-                    continue
-        
-        # Sort email logs by timestamp in descending order
-        email_logs.sort(key=lambda x: x['timestamp'], reverse=True)
-        
-        # Limit the number of entries
-        email_logs = email_logs[:max_entries]
-        
-        return email_logs
+        def matches(entry):
+            if search_term and search_term.lower() not in entry['subject'].lower():
+                return False
+            
+            if sender and sender.lower() not in entry['sender'].lower():
+                return False
+            
+            if recipient and recipient.lower() not in entry['recipients'].lower():
+                return False
+            return True
+        
+        return store.query(
+            max_entries,
+            since=datetime.datetime.now() - datetime.timedelta(days=days),
+            level=status_filter,
+            predicate=matches
+        )
     except Exception as e:
         current_app.logger.error(f"Error getting email logs: {str(e)}")
         return []
 
 
+def format_database_log_entry(operation, table, status, duration, user=None, records_affected=0, query=None, timestamp=None):
+    """Format a database operation event as a line of the database log file.
+    
+    Args:
+        operation (str): The database operation (e.g., 'SELECT', 'INSERT', 'UPDATE', 'DELETE')
+        table (str): The database table being operated on
+        status (str): The status of the operation (e.g., 'SUCCESS', 'FAILED', 'SLOW')
+        duration (int): The duration of the operation in milliseconds
+        user (dict or str): User information who performed the operation (dict with 'name' and 'email' keys, or string)
+        records_affected (int): Number of records affected by the operation
+        query (str): The SQL query that was executed (optional)
+        timestamp (datetime): When the operation ran (defaults to now)
+        
+    Returns:
+        str: The log line, without a trailing newline
+    """
+    # Generate a unique ID for the database operation
+    operation_id = str(uuid.uuid4())
+    
+    # Format timestamp
+    timestamp = (timestamp or datetime.datetime.now()).strftime('%Y-%m-%d %H:%M:%S')
+    
+    # Format user information
+    if isinstance(user, dict) and 'name' in user and 'email' in user:
+        user_info = f"{user['name']} <{user['email']}>"
+    elif isinstance(user, dict) and 'name' in user:
+        user_info = user['name']
+    elif isinstance(user, dict) and 'email' in user:
+        user_info = user['email']
+    elif isinstance(user, str):
+        user_info = user
+    else:
+        user_info = 'System'
+    
+    # Truncate query if it's too long
+    query_str = 'None'
+    if query:
+        # Limit query to 500 characters to prevent log file bloat
+        query_str = query[:500] + '...' if len(query) > 500 else query
+        # Keep each entry on one line
+        query_str = query_str.replace('\n', ' ')
+    
+    return f"{timestamp}|{operation_id}|{operation}|{table}|{status}|{user_info}|{duration}|{records_affected}|{query_str}"
+
+
 def log_database_event(operation, table, status, duration, user=None, records_affected=0, query=None):
     """Log a database operation event to the database log file.
     
+    Writes synchronously; the per-statement query logger in db_logger
+    buffers entries and writes them from a background thread instead.
+    
     Args:
         operation (str): The database operation (e.g., 'SELECT', 'INSERT', 'UPDATE', 'DELETE')
         table (str): The database table being operated on
@@ -772,44 +826,10 @@ def log_database_event(operation, table, status, duration, user=None, records_af
         query (str): The SQL query that was executed (optional)
     """
     try:
-        log_dir = get_log_directory()
-        db_log_path = os.path.join(log_dir, 'database.log')
-        
-        # Create the log directory if it doesn't exist
-        os.makedirs(log_dir, exist_ok=True)
-        
-        # Generate a unique ID for the database operation
-        operation_id = str(uuid.uuid4())
-        
-        # Format timestamp
-        timestamp = datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-        
-        # Format user information
-        if isinstance(user, dict) and 'name' in user and 'email' in user:
-            user_info = f"{user['name']} <{user['email']}>"
-        elif isinstance(user, dict) and 'name' in user:
-            user_info = user['name']
-        elif isinstance(user, dict) and 'email' in user:
-            user_info = user['email']
-        elif isinstance(user, str):
-            user_info = user
-        else:
-            user_info = 'System'
-        
-        # Truncate query if it's too long
-        query_str = 'None'
-        if query:
-            # Limit query to 500 characters to prevent log file bloat
-            query_str = query[:500] + '...' if len(query) > 500 else query
-            # Replace any pipe characters that would break our log format
-            query_str = query_str.replace('|', '|')
-        
-        # Format the log entry
-        log_entry = f"{timestamp}|{operation_id}|{operation}|{table}|{status}|{user_info}|{duration}|{records_affected}|{query_str}"
+        log_entry = format_database_log_entry(operation, table, status, duration, user, records_affected, query)
         
         # Write to the log file
-        with open(db_log_path, 'a') as f:
-            f.write(log_entry + '\n')
+        open_log_store('database').append(log_entry)
     except Exception as e:
         current_app.logger.error(f"Error logging database event: {str(e)}")
 
@@ -826,74 +846,30 @@ def get_database_logs(max_entries=100, operation_filter=None, table_filter=None,
         days (int): Number of days to look back for logs
         
     Returns:
-        list: List of database log entries
+        list: List of database log entries, newest first
     """
     try:
-        log_dir = get_log_directory()
-        db_log_path = os.path.join(log_dir, 'database.log')
+        store = open_log_store('database')
         
-        # Check if log file exists
-        if not os.path.exists(db_log_path):
+        # Check if the log has ever been written
+        if not store.exists():
             return []
         
-        # Calculate the cutoff date for filtering by days
-        cutoff_date = datetime.datetime.now() - datetime.timedelta(days=days)
-        
-        # Read and parse the log file
-        db_logs = []
-        with open(db_log_path, 'r') as f:
-            for line in f:
-                try:
-                    # Parse the log entry
-                    parts = line.strip().split('|')
-                    if len(parts) < 9:  # Ensure we have all required fields
-                        continue
-                    
-                    timestamp_str, operation_id, operation, table, status, user, duration, records_affected, query = parts
-                    
-                    # Parse timestamp
-                    timestamp = datetime.datetime.strptime(timestamp_str, '%Y-%m-%d %H:%M:%S')
-                    
-                    # Skip entries older than the cutoff date
-                    if timestamp < cutoff_date:
-                        continue
-                    
-                    # Apply filters
-                    if operation_filter and operation.upper() != operation_filter.upper():
-                        continue
-                    
-                    if table_filter and table_filter.lower() != table.lower():
-                        continue
-                    
-                    if status_filter and status.upper() != status_filter.upper():
-                        continue
-                    
-                    if search_term and (query == 'None' or search_term.lower() not in query.lower()):
-                        continue
-                    
-                    # Add the log entry to the list
-                    db_logs.append({
-                        'id': operation_id,
-                        'timestamp': timestamp,
-                        'operation': operation,
-                        'table': table,
-                        'status': status,
-                        'user': user,
-                        'duration': int(duration) if duration.isdigit() else 0,
-                        'records_affected': int(records_affected) if records_affected.isdigit() else 0,
-                        'query': None if query == 'None' else query
-                    })
-                except Exception as e:
-                    current_app.logger.error(f"Error parsing database log line: {str(e)}")
-                    continue
-        
-        # Sort database logs by timestamp in descending order
-        db_logs.sort(key=lambda x: x['timestamp'], reverse=True)
-        
-        # Limit the number of entries
-        db_logs = db_logs[:max_entries]
-        
-        return db_logs
+        def matches(entry):
+            if operation_filter and entry['operation'].upper() != operation_filter.upper():
+                return False
+            
+            if search_term and (entry['query'] is None or search_term.lower() not in entry['query'].lower()):
+                return False
+            return True
+        
+        return store.query(
+            max_entries,
+            since=datetime.datetime.now() - datetime.timedelta(days=days),
+            level=status_filter,
+            subsystem=table_filter,
+            predicate=matches
+        )
     except Exception as e:
         current_app.logger.error(f"Error getting database logs: {str(e)}")
         return []
@@ -909,12 +885,6 @@ def log_security_event(level, event_type, description, user=None, ip_address=Non
         ip_address (str): The IP address associated with the event
     """
     try:
-        log_dir = get_log_directory()
-        security_log_path = os.path.join(log_dir, 'security.log')
-        
-        # Create the log directory if it doesn't exist
-        os.makedirs(log_dir, exist_ok=True)
-        
         # Format the timestamp
         timestamp = datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S')
         
@@ -932,8 +902,7 @@ def log_security_event(level, event_type, description, user=None, ip_address=Non
         log_entry = f"{timestamp}|{level}|{event_type}|{user_info}|{ip_address or 'None'}|{description}"
         
         # Write to the log file
-        with open(security_log_path, 'a') as f:
-            f.write(log_entry + '\n')
+        open_log_store('security').append(log_entry)
     except Exception as e:
         current_app.logger.error(f"Error logging security event: {str(e)}")
 
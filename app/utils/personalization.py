@@ -0,0 +1,165 @@
+"""
+Email personalization.
+
+Campaign subjects and bodies are parsed once into a list of segments:
+literal fragments, merge field slots and tracking id slots. Rendering a
+message for a recipient is then a lookup per slot and a join, instead of a
+string replace per variable, a regex over the whole body to drop unknown
+fields and another to rewrite every link (see replace_template_variables,
+insert_tracking_pixel and add_tracking_to_links in
+app.utils.email_service, which this reproduces).
+
+When compiled with a base URL, links are rewritten through the click
+tracking route and an open tracking pixel is added; everything around the
+per-recipient tracking id, including the encoded redirect URL, is computed
+at compile time. Only links whose URL contains a merge field are encoded
+per recipient.
+
+scripts/test_utils/personalization_benchmark.py compares both paths.
+"""
+
+import re
+from urllib.parse import urljoin, urlencode
+
+MERGE_FIELD_PATTERN = re.compile(r'\[(\w+)\]')
+LINK_PATTERN = re.compile(r'href="([^"]+)"')
+
+TRACKING_PATHS = {
+    'open': '/emails/track/open/',
+    'click': '/emails/track/click/'
+}
+
+# Slot kinds
+FIELD = 'field'
+TRACKING_ID = 'tracking_id'
+LINK = 'link'
+
+
+def merge_values(recipient):
+    """Return the merge field values for a recipient keyed by field name."""
+    values = {
+        'Name': f"{recipient.first_name} {recipient.last_name}",
+        'FirstName': recipient.first_name,
+        'LastName': recipient.last_name,
+        'Email': recipient.email,
+        'Phone': getattr(recipient, 'phone', None),
+        'Address': getattr(recipient, 'address', None)
+    }
+    return {name: value for name, value in values.items() if value}
+
+
+class CompiledTemplate:
+    """A subject or body parsed into literal fragments and slots.
+
+    Attributes:
+        segments: List of literal strings and (kind, value) slots, where kind is
+            FIELD (value is the field name), TRACKING_ID, or LINK (value is the
+            CompiledTemplate of a link URL that contains merge fields)
+    """
+
+    def __init__(self, source, base_url=None):
+        self.source = source or ''
+        self.segments = []
+        if base_url:
+            self._compile_tracked(base_url)
+        else:
+            self._add_text(self.source)
+
+    def _append(self, segment):
+        if isinstance(segment, str):
+            if not segment:
+                return
+            if self.segments and isinstance(self.segments[-1], str):
+                self.segments[-1] += segment
+                return
+        self.segments.append(segment)
+
+    def _add_text(self, text):
+        position = 0
+        for match in MERGE_FIELD_PATTERN.finditer(text):
+            self._append(text[position:match.start()])
+            self._append((FIELD, match.group(1)))
+            position = match.end()
+        self._append(text[position:])
+
+    def _add_tracked_text(self, text, pixel):
+        parts = text.split('</body>')
+        for index, part in enumerate(parts):
+            if index:
+                for segment in pixel + ['</body>']:
+                    self._append(segment)
+            self._add_text(part)
+
+    def _compile_tracked(self, base_url):
+        open_prefix = urljoin(base_url, TRACKING_PATHS['open'])
+        click_prefix = urljoin(base_url, TRACKING_PATHS['click'])
+        pixel = [f'<img src="{open_prefix}', (TRACKING_ID, None), '" width="1" height="1" alt="" />']
+        has_body = '</body>' in self.source
+
+        position = 0
+        for match in LINK_PATTERN.finditer(self.source):
+            self._add_tracked_text(self.source[position:match.start()], pixel)
+            url = match.group(1)
+            self._append(f'href="{click_prefix}')
+            self._append((TRACKING_ID, None))
+            if MERGE_FIELD_PATTERN.search(url):
+                self._append('?')
+                self._append((LINK, CompiledTemplate(url)))
+                self._append('"')
+            else:
+                self._append(f'?{urlencode({"redirect_url": url})}"')
+            position = match.end()
+        self._add_tracked_text(self.source[position:], pixel)
+
+        if not has_body:
+            for segment in pixel:
+                self._append(segment)
+
+    @property
+    def fields(self):
+        """Names of the merge fields used by the template."""
+        names = set()
+        for segment in self.segments:
+            if isinstance(segment, tuple):
+                if segment[0] == FIELD:
+                    names.add(segment[1])
+                elif segment[0] == LINK:
+                    names |= segment[1].fields
+        return names
+
+    def render(self, values, tracking_id=None):
+        """
+        Render the template for one recipient.
+
+        Args:
+            values: Merge field values (see merge_values); missing fields render empty
+            tracking_id: Tracking id for templates compiled with a base URL
+
+        Returns:
+            str: The personalized text
+        """
+        parts = []
+        for segment in self.segments:
+            if segment.__class__ is str:
+                parts.append(segment)
+            elif segment[0] == FIELD:
+                parts.append(values.get(segment[1], ''))
+            elif segment[0] == TRACKING_ID:
+                parts.append(tracking_id)
+            else:
+                parts.append(urlencode({'redirect_url': segment[1].render(values)}))
+        return ''.join(parts)
+
+
+def compile_template(source, base_url=None):
+    """
+    Parse a subject or body once for rendering many recipients.
+
+    Args:
+        source: Template text with [Field] merge fields
+        base_url: Add open and click tracking through the app at this URL
+
+    Returns:
+        CompiledTemplate
+    """
+    return CompiledTemplate(source, base_url=base_url)
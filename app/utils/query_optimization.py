@@ -3,7 +3,9 @@
 from functools import wraps
 from flask import current_app, request
 from app.extensions import cache
-from sqlalchemy import func
+from sqlalchemy import func, tuple_
+import base64
+import json
 import time
 
 def optimize_query(query, limit=None, offset=None):
@@ -61,6 +63,78 @@ def with_pagination(query, page=1, per_page=20):
     
     return items, pagination
 
+def encode_cursor(values):
+    """Encode the sort key of the last row on a page as an opaque cursor.
+
+    Args:
+        values: Sort key values, in the same order as the keyset columns
+
+    Returns:
+        URL-safe cursor string
+    """
+    raw = json.dumps(list(values), separators=(',', ':'), default=str)
+    return base64.urlsafe_b64encode(raw.encode('utf-8')).decode('ascii').rstrip('=')
+
+def decode_cursor(cursor, size):
+    """Decode a cursor made by encode_cursor.
+
+    Args:
+        cursor: Cursor string from the client
+        size: Number of keyset columns the cursor must hold
+
+    Returns:
+        List of sort key values, or None if the cursor is missing or malformed
+    """
+    if not cursor:
+        return None
+    try:
+        values = json.loads(base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4)))
+    except (ValueError, TypeError):
+        return None
+    if not isinstance(values, list) or len(values) != size:
+        return None
+    return values
+
+def with_keyset_pagination(query, columns, cursor=None, per_page=20):
+    """Apply keyset (seek) pagination to a SQLAlchemy query.
+
+    Rows are ordered by ``columns`` and each page starts after the sort key
+    of the previous page's last row, so any page costs the same as the first
+    and no COUNT(*) or OFFSET is needed. The last column must be unique
+    (usually the primary key) and none of the columns may be NULL.
+
+    Args:
+        query: The SQLAlchemy query to paginate, without an ORDER BY
+        columns: Ordered model attributes that make up the sort key
+        cursor: Cursor of the previous page (None for the first page)
+        per_page: Number of items per page
+
+    Returns:
+        Tuple of (items, pagination_info)
+    """
+    after = decode_cursor(cursor, len(columns))
+    if after is not None:
+        query = query.filter(tuple_(*columns) > tuple_(*after))
+
+    # Fetch one extra row to find out whether there is a next page
+    items = query.order_by(*columns).limit(per_page + 1).all()
+    has_next = len(items) > per_page
+    items = items[:per_page]
+
+    next_cursor = None
+    if has_next:
+        next_cursor = encode_cursor(getattr(items[-1], column.key) for column in columns)
+
+    pagination = {
+        'per_page': per_page,
+        'cursor': cursor if after is not None else None,
+        'next_cursor': next_cursor,
+        'has_next': has_next,
+        'has_prev': after is not None
+    }
+
+    return items, pagination
+
 def cached_query(timeout=300):
     """Decorator to cache the result of a view function.
     
@@ -125,97 +125,32 @@ def get_worker_processes():
         ]
 
 def get_api_stats():
-    """Get API endpoint statistics."""
+    """
+    Get per-endpoint request statistics from the in-process metrics registry.
+    
+    Returns:
+        list: One dict per endpoint, busiest first (see MetricsRegistry.endpoint_stats)
+    """
     try:
-        # In a real implementation, this would come from API logs or metrics
-        # For now, we'll use more realistic sample data
-        from app.utils.log_utils import get_activity_logs
-        
-        # Get API-related activity logs
-        logs = get_activity_logs(max_entries=1000, subsystem_filter='API')
-        
-        # Process logs to get API stats
-        api_endpoints = {}
-        
-        for log in logs:
-            # Extract API path from description
-            description = log.get('description', '')
-            if 'endpoint' in description.lower():
-                parts = description.split(' ')
-                path = next((p for p in parts if p.startswith('/api/')), None)
-                
-                if path:
-                    if path not in api_endpoints:
-                        api_endpoints[path] = {
-                            'count': 0,
-                            'response_times': [],
-                            'errors': 0
-                        }
-                    
-                    api_endpoints[path]['count'] += 1
-                    
-                    # Extract duration if available
-                    duration = log.get('duration')
-                    if duration and duration != 'None':
-                        try:
-                            api_endpoints[path]['response_times'].append(float(duration))
-                        except (ValueError, TypeError):
-                            pass
-                    
-                    # Count errors
-                    if log.get('status') != 'SUCCESS':
-                        api_endpoints[path]['errors'] += 1
-        
-        # Calculate statistics
-        result = []
-        for path, data in api_endpoints.items():
-            avg_response = 0
-            if data['response_times']:
-                avg_response = sum(data['response_times']) / len(data['response_times'])
-            
-            # Calculate requests per minute (assuming logs cover last 24 hours)
-            requests_per_min = data['count'] / (24 * 60) if data['count'] > 0 else 0
-            
-            # Calculate error rate
-            error_rate = (data['errors'] / data['count'] * 100) if data['count'] > 0 else 0
-            
-            result.append({
-                "path": path,
-                "avg_response": round(avg_response, 1),
-                "requests_per_min": round(requests_per_min, 2),
-                "error_rate": round(error_rate, 1)
-            })
-        
-        # Sort by requests per minute (descending)
-        result.sort(key=lambda x: x['requests_per_min'], reverse=True)
-        
-        # If no real data, return sample data
-        if not result:
-            result = [
-                {"path": "/api/contacts", "avg_response": 85, "requests_per_min": 0.5, "error_rate": 0.2},
-                {"path": "/api/churches", "avg_response": 92, "requests_per_min": 0.4, "error_rate": 0.5},
-                {"path": "/api/pipelines", "avg_response": 110, "requests_per_min": 0.3, "error_rate": 0.8},
-                {"path": "/api/tasks", "avg_response": 78, "requests_per_min": 0.2, "error_rate": 0.3},
-                {"path": "/api/events", "avg_response": 150, "requests_per_min": 0.1, "error_rate": 1.2}
-            ]
-        
-        return result
+        from app.monitoring.metrics import metrics
+        return metrics.endpoint_stats()
     except Exception as e:
         current_app.logger.error(f"Error getting API stats: {str(e)}")
-        # Return default values if there's an error
-        return [
-            {"path": "/api/contacts", "avg_response": 85, "requests_per_min": 0.5, "error_rate": 0.2},
-            {"path": "/api/churches", "avg_response": 92, "requests_per_min": 0.4, "error_rate": 0.5},
-            {"path": "/api/pipelines", "avg_response": 110, "requests_per_min": 0.3, "error_rate": 0.8}
-        ]
+        return []
 
 def get_database_stats():
     """Get database statistics."""
     try:
         from app.utils.db_utils import measure_query_performance
         
-        # Measure query performance
-        avg_query_time = measure_query_performance()
+        # Average query time of recorded requests, or a sampled measurement before any
+        from app.monitoring.metrics import metrics
+        stats = metrics.snapshot().values()
+        query_count = sum(item.db_queries for item in stats)
+        if query_count:
+            avg_query_time = round(sum(item.db_time for item in stats) * 1000 / query_count, 1)
+        else:
+            avg_query_time = measure_query_performance()
         
         # Get connection pool information
         connection_pool = "Unknown"
@@ -322,8 +257,19 @@ def get_system_events():
         ]
 
 def get_response_time():
-    """Measure average response time for a simple request."""
+    """Average request response time in milliseconds.
+    
+    Taken from the metrics registry; before any request has been recorded
+    the time of a simple query is returned instead.
+    """
     try:
+        from app.monitoring.metrics import metrics
+        
+        stats = metrics.snapshot().values()
+        count = sum(item.latency.count for item in stats)
+        if count:
+            return round(sum(item.latency.total for item in stats) / count / 1000, 1)
+        
         # Measure time to execute a simple query
         start_time = time.time()
         db.session.execute(text("SELECT 1"))
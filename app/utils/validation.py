@@ -1,9 +1,10 @@
 import re
 from email_validator import validate_email as validate_email_format, EmailNotValidError
 
-def validate_email(email):
+def validate_email(email, check_deliverability=True):
     """
     Validate an email address format.
+    Pass check_deliverability=False to skip the DNS lookup (e.g. bulk imports).
     Returns (is_valid, error_message)
     """
     if not email:
@@ -11,7 +12,7 @@ def validate_email(email):
     
     try:
         # Validate the email format
-        validate_email_format(email)
+        validate_email_format(email, check_deliverability=check_deliverability)
         return True, ""
     except EmailNotValidError as e:
         return False, str(e)
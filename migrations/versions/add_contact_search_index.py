@@ -0,0 +1,39 @@
+"""add contact search index (pg_trgm/tsvector on PostgreSQL, FTS5 on SQLite)
+
+Revision ID: add_contact_search_index
+Revises: add_jobs_table
+Create Date: 2026-10-18 13:00:00
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = 'add_contact_search_index'
+down_revision = 'add_jobs_table'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # The index DDL and its triggers live with the search service so that
+    # create_all based databases get exactly the same index
+    from app.services.search_service import install_search_index
+    install_search_index(op.get_bind())
+
+
+def downgrade():
+    bind = op.get_bind()
+    if bind.dialect.name == 'postgresql':
+        op.execute("DROP TRIGGER IF EXISTS contacts_search_refresh ON contacts")
+        op.execute("DROP TRIGGER IF EXISTS contacts_search_update ON contacts")
+        op.execute("DROP TRIGGER IF EXISTS churches_search_refresh ON churches")
+        op.execute("DROP TRIGGER IF EXISTS churches_search_update ON churches")
+        op.execute("DROP FUNCTION IF EXISTS refresh_contact_search()")
+        op.execute("DROP TABLE IF EXISTS contact_search")
+    elif bind.dialect.name == 'sqlite':
+        for trigger in ['contacts_search_ai', 'contacts_search_au', 'contacts_search_ad',
+                        'churches_search_ai', 'churches_search_au']:
+            op.execute(f"DROP TRIGGER IF EXISTS {trigger}")
+        op.execute("DROP TABLE IF EXISTS contacts_fts")
+        op.execute("DROP TABLE IF EXISTS contacts_prefix_fts")
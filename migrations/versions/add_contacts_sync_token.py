@@ -0,0 +1,30 @@
+"""add contacts_sync_token to google tokens for delta contact sync
+
+Revision ID: add_contacts_sync_token
+Revises: add_gmail_history_id
+Create Date: 2026-10-18 15:00:00
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy import inspect
+
+
+# revision identifiers, used by Alembic.
+revision = 'add_contacts_sync_token'
+down_revision = 'add_gmail_history_id'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    inspector = inspect(op.get_bind())
+    columns = [column['name'] for column in inspector.get_columns('google_tokens')]
+    if 'contacts_sync_token' not in columns:
+        with op.batch_alter_table('google_tokens', schema=None) as batch_op:
+            batch_op.add_column(sa.Column('contacts_sync_token', sa.String(), nullable=True))
+
+
+def downgrade():
+    with op.batch_alter_table('google_tokens', schema=None) as batch_op:
+        batch_op.drop_column('contacts_sync_token')
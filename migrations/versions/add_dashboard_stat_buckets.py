@@ -0,0 +1,42 @@
+"""add dashboard_stat_buckets rollup table
+
+Revision ID: add_dashboard_stat_buckets
+Revises: zz_add_sqlite_fixes
+Create Date: 2026-10-18 09:00:00
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy import inspect
+
+
+# revision identifiers, used by Alembic.
+revision = 'add_dashboard_stat_buckets'
+down_revision = 'zz_add_sqlite_fixes'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    inspector = inspect(op.get_bind())
+    if 'dashboard_stat_buckets' in inspector.get_table_names():
+        return
+
+    op.create_table(
+        'dashboard_stat_buckets',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('metric', sa.String(length=50), nullable=False),
+        sa.Column('scope_key', sa.String(length=100), nullable=False),
+        sa.Column('bucket', sa.Date(), nullable=False),
+        sa.Column('count', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('updated_at', sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('metric', 'scope_key', 'bucket', name='uq_dashboard_stat_bucket')
+    )
+    # The rollup is populated by `flask reconcile-dashboard-stats` or on first dashboard load
+
+
+def downgrade():
+    inspector = inspect(op.get_bind())
+    if 'dashboard_stat_buckets' in inspector.get_table_names():
+        op.drop_table('dashboard_stat_buckets')
@@ -0,0 +1,30 @@
+"""add indexes on email_tracking tracking_pixel and bulk_send_id
+
+Revision ID: add_email_tracking_indexes
+Revises: add_people_name_order_index
+Create Date: 2026-10-18 17:00:00
+
+"""
+from alembic import op
+from sqlalchemy import inspect
+
+
+# revision identifiers, used by Alembic.
+revision = 'add_email_tracking_indexes'
+down_revision = 'add_people_name_order_index'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    inspector = inspect(op.get_bind())
+    indexes = [index['name'] for index in inspector.get_indexes('email_tracking')]
+    if 'ix_email_tracking_tracking_pixel' not in indexes:
+        op.create_index('ix_email_tracking_tracking_pixel', 'email_tracking', ['tracking_pixel'])
+    if 'ix_email_tracking_bulk_send_id' not in indexes:
+        op.create_index('ix_email_tracking_bulk_send_id', 'email_tracking', ['bulk_send_id'])
+
+
+def downgrade():
+    op.drop_index('ix_email_tracking_bulk_send_id', table_name='email_tracking')
+    op.drop_index('ix_email_tracking_tracking_pixel', table_name='email_tracking')
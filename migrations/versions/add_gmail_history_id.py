@@ -0,0 +1,30 @@
+"""add gmail_history_id to google tokens for incremental Gmail sync
+
+Revision ID: add_gmail_history_id
+Revises: add_contact_search_index
+Create Date: 2026-10-18 14:00:00
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy import inspect
+
+
+# revision identifiers, used by Alembic.
+revision = 'add_gmail_history_id'
+down_revision = 'add_contact_search_index'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    inspector = inspect(op.get_bind())
+    columns = [column['name'] for column in inspector.get_columns('google_tokens')]
+    if 'gmail_history_id' not in columns:
+        with op.batch_alter_table('google_tokens', schema=None) as batch_op:
+            batch_op.add_column(sa.Column('gmail_history_id', sa.String(), nullable=True))
+
+
+def downgrade():
+    with op.batch_alter_table('google_tokens', schema=None) as batch_op:
+        batch_op.drop_column('gmail_history_id')
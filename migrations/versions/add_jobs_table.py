@@ -0,0 +1,56 @@
+"""add jobs table for background jobs
+
+Revision ID: add_jobs_table
+Revises: add_dashboard_stat_buckets
+Create Date: 2026-10-18 11:00:00
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy import inspect
+
+
+# revision identifiers, used by Alembic.
+revision = 'add_jobs_table'
+down_revision = 'add_dashboard_stat_buckets'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    inspector = inspect(op.get_bind())
+    if 'jobs' in inspector.get_table_names():
+        columns = [column['name'] for column in inspector.get_columns('jobs')]
+        if 'heartbeat_at' not in columns:
+            with op.batch_alter_table('jobs', schema=None) as batch_op:
+                batch_op.add_column(sa.Column('heartbeat_at', sa.DateTime(), nullable=True))
+        return
+
+    op.create_table(
+        'jobs',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('job_type', sa.String(length=50), nullable=False),
+        sa.Column('status', sa.String(length=20), nullable=False, server_default='queued'),
+        sa.Column('user_id', sa.Integer(), nullable=True),
+        sa.Column('office_id', sa.Integer(), nullable=True),
+        sa.Column('params', sa.Text(), nullable=True),
+        sa.Column('result', sa.Text(), nullable=True),
+        sa.Column('checkpoint', sa.Text(), nullable=True),
+        sa.Column('progress_current', sa.Integer(), nullable=True),
+        sa.Column('progress_total', sa.Integer(), nullable=True),
+        sa.Column('attempts', sa.Integer(), nullable=True),
+        sa.Column('error_message', sa.Text(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.Column('started_at', sa.DateTime(), nullable=True),
+        sa.Column('heartbeat_at', sa.DateTime(), nullable=True),
+        sa.Column('completed_at', sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id']),
+        sa.ForeignKeyConstraint(['office_id'], ['offices.id']),
+        sa.PrimaryKeyConstraint('id')
+    )
+
+
+def downgrade():
+    inspector = inspect(op.get_bind())
+    if 'jobs' in inspector.get_table_names():
+        op.drop_table('jobs')
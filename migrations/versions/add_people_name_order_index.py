@@ -0,0 +1,27 @@
+"""add (last_name, first_name, id) index for keyset pagination of people
+
+Revision ID: add_people_name_order_index
+Revises: add_contacts_sync_token
+Create Date: 2026-10-18 16:00:00
+
+"""
+from alembic import op
+from sqlalchemy import inspect
+
+
+# revision identifiers, used by Alembic.
+revision = 'add_people_name_order_index'
+down_revision = 'add_contacts_sync_token'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    inspector = inspect(op.get_bind())
+    indexes = [index['name'] for index in inspector.get_indexes('people')]
+    if 'ix_people_name_order' not in indexes:
+        op.create_index('ix_people_name_order', 'people', ['last_name', 'first_name', 'id'])
+
+
+def downgrade():
+    op.drop_index('ix_people_name_order', table_name='people')
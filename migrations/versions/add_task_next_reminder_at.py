@@ -0,0 +1,35 @@
+"""add indexed next_reminder_at to tasks for the reminder scheduler
+
+Revision ID: add_task_next_reminder_at
+Revises: add_email_tracking_indexes
+Create Date: 2026-10-18 19:00:00
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy import inspect
+
+
+# revision identifiers, used by Alembic.
+revision = 'add_task_next_reminder_at'
+down_revision = 'add_email_tracking_indexes'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Existing tasks are scheduled by the task_reminders step of `flask bootstrap`
+    inspector = inspect(op.get_bind())
+    columns = [column['name'] for column in inspector.get_columns('tasks')]
+    if 'next_reminder_at' not in columns:
+        with op.batch_alter_table('tasks', schema=None) as batch_op:
+            batch_op.add_column(sa.Column('next_reminder_at', sa.DateTime(), nullable=True))
+    indexes = [index['name'] for index in inspect(op.get_bind()).get_indexes('tasks')]
+    if 'ix_tasks_next_reminder_at' not in indexes:
+        op.create_index('ix_tasks_next_reminder_at', 'tasks', ['next_reminder_at'])
+
+
+def downgrade():
+    op.drop_index('ix_tasks_next_reminder_at', table_name='tasks')
+    with op.batch_alter_table('tasks', schema=None) as batch_op:
+        batch_op.drop_column('next_reminder_at')
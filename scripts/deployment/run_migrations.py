@@ -88,6 +88,13 @@ def apply_migration():
         "Applying migration"
     )
 
+def bootstrap_database():
+    """Create missing tables and set up the main pipelines once for this deploy."""
+    return run_command(
+        ["flask", "bootstrap"],
+        "Bootstrapping database"
+    )
+
 def verify_migration():
     """Verify that the migration was applied correctly."""
     print("\n=== Verifying migration ===")
@@ -121,6 +128,7 @@ def main():
         ("Generate migration script", generate_migration),
         ("Review migration script", review_migration),
         ("Apply migration", apply_migration),
+        ("Bootstrap database", bootstrap_database),
         ("Verify migration", verify_migration)
     ]
     
@@ -0,0 +1,114 @@
+#!/usr/bin/env python
+"""
+Personalization Benchmark Script
+Compares per-recipient rendering of a campaign body with the compiled
+personalization engine (app.utils.personalization) against the string
+replace and regex path (replace_template_variables, insert_tracking_pixel
+and add_tracking_to_links in app.utils.email_service).
+
+Usage:
+    python scripts/test_utils/personalization_benchmark.py --recipients 5000 --links 20
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import time
+import uuid
+from types import SimpleNamespace
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+from flask import Flask  # noqa: E402
+from app.utils.email_service import (  # noqa: E402
+    replace_template_variables, insert_tracking_pixel, add_tracking_to_links
+)
+from app.utils.personalization import compile_template, merge_values  # noqa: E402
+
+BASE_URL = 'https://crm.example.com'
+
+
+def build_body(paragraphs, links):
+    """Build a campaign body of roughly realistic size"""
+    parts = ['<html><body><p>Dear [Name],</p>']
+    for i in range(paragraphs):
+        parts.append(f'<p>Paragraph {i} for [FirstName] with some filler text to make the body longer. ' * 3 + '</p>')
+    for i in range(links):
+        parts.append(f'<p><a href="https://example.com/articles/{i}?utm_source=newsletter">Article {i}</a></p>')
+    parts.append('<p>Reply to [Email] or call [Phone].</p></body></html>')
+    return ''.join(parts)
+
+
+def build_recipients(count):
+    """Build recipient stand-ins with the attributes used by merge fields"""
+    return [
+        SimpleNamespace(first_name=f'First{i}', last_name=f'Last{i}', email=f'person{i}@example.com',
+                        phone=f'555-{i:04d}' if i % 2 else None, address=None)
+        for i in range(count)
+    ]
+
+
+def legacy_path(body, recipients, tracking_ids):
+    for recipient, tracking_id in zip(recipients, tracking_ids):
+        content = replace_template_variables(body, recipient)
+        content = insert_tracking_pixel(content, tracking_id)
+        add_tracking_to_links(content, tracking_id)
+
+
+def compiled_path(body, recipients, tracking_ids):
+    template = compile_template(body, base_url=BASE_URL)
+    for recipient, tracking_id in zip(recipients, tracking_ids):
+        template.render(merge_values(recipient), tracking_id)
+
+
+def measure(func, body, recipients, tracking_ids, repeat):
+    """Return the best and median wall time in seconds over several runs"""
+    timings = []
+    for _ in range(repeat):
+        start_time = time.perf_counter()
+        func(body, recipients, tracking_ids)
+        timings.append(time.perf_counter() - start_time)
+    return min(timings), statistics.median(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark email personalization')
+    parser.add_argument('--recipients', type=int, default=2000, help='Recipients per run')
+    parser.add_argument('--paragraphs', type=int, default=20, help='Paragraphs in the body')
+    parser.add_argument('--links', type=int, default=10, help='Links in the body')
+    parser.add_argument('--repeat', type=int, default=5, help='Runs per path')
+    args = parser.parse_args()
+
+    app = Flask(__name__)
+    app.config['BASE_URL'] = BASE_URL
+
+    body = build_body(args.paragraphs, args.links)
+    recipients = build_recipients(args.recipients)
+    tracking_ids = [str(uuid.uuid4()) for _ in recipients]
+
+    with app.app_context():
+        # Both paths must produce the same message
+        sample = recipients[1], tracking_ids[1]
+        expected = add_tracking_to_links(
+            insert_tracking_pixel(replace_template_variables(body, sample[0]), sample[1]), sample[1]
+        )
+        actual = compile_template(body, base_url=BASE_URL).render(merge_values(sample[0]), sample[1])
+        if actual != expected:
+            print("Compiled output differs from the legacy path")
+            return 1
+
+        print(f"Body: {len(body)} bytes, {args.links} links, {args.recipients} recipients, {args.repeat} runs")
+        results = {}
+        for name, func in [('legacy', legacy_path), ('compiled', compiled_path)]:
+            best, median = measure(func, body, recipients, tracking_ids, args.repeat)
+            results[name] = best
+            print(f"{name:>9}: best {best * 1000:8.1f} ms, median {median * 1000:8.1f} ms, "
+                  f"{best / args.recipients * 1e6:7.1f} us/recipient")
+
+    print(f"  speedup: {results['legacy'] / results['compiled']:.1f}x")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
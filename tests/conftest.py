@@ -17,7 +17,6 @@ from app.models.church import Church
 from app.models.office import Office
 from app.models.task import Task
 from app.models.communication import Communication
-from app.models.relationships import setup_relationships
 from app.models.email_signature import EmailSignature
 from app.models.google_token import GoogleToken
 from flask_jwt_extended import create_access_token
@@ -147,6 +146,12 @@ def mock_firebase(mocker):
     mocker.patch('app.auth.firebase.verify_firebase_token', side_effect=mock_verify_token)
     return mock_token
 
+@pytest.fixture(autouse=True, scope='session')
+def log_dir(tmp_path_factory):
+    """Write the application logs of the test run to a temporary directory, not instance/logs."""
+    TestingConfig.LOG_DIR = str(tmp_path_factory.mktemp('logs'))
+    return TestingConfig.LOG_DIR
+
 @pytest.fixture(autouse=True)
 def mock_firebase_app(mocker):
     """Mock Firebase app initialization."""
@@ -198,9 +203,6 @@ def app():
         # Drop and recreate all tables
         db.drop_all()
         db.create_all()
-        
-        # Set up relationships
-        setup_relationships()
     
     yield app
     
@@ -209,6 +211,12 @@ def app():
         db.session.remove()
         db.drop_all()
 
+@pytest.fixture
+def app_context(app):
+    """Run the test inside an application context of the app fixture."""
+    with app.app_context():
+        yield app
+
 @pytest.fixture
 def client(app):
     """Create a test client for the app."""
@@ -293,9 +301,6 @@ def db_session(app):
         db.drop_all()
         db.create_all()
         
-        # Set up relationships
-        setup_relationships()
-        
         # Print out the tables that were created
         print("Created tables:", inspect(db.engine).get_table_names())
         
@@ -0,0 +1,63 @@
+import pytest
+from sqlalchemy import event
+from app import db
+from app.models import Office, User, Person, Church
+from app.services import assignment_service
+
+
+pytestmark = pytest.mark.usefixtures('app_context')
+
+
+def _office(name):
+    office = Office(name=name)
+    db.session.add(office)
+    db.session.flush()
+    return office
+
+
+def test_people_are_assigned_in_chunked_updates_within_the_office(app):
+    """Only people of the office are assigned, with two UPDATEs per chunk."""
+    office = _office("Assign Office")
+    other_office = _office("Other Office")
+    people = [Person(first_name=f"P{i}", last_name="Office", office_id=office.id) for i in range(5)]
+    outsider = Person(first_name="Out", last_name="Sider", office_id=other_office.id)
+    db.session.add_all(people + [outsider])
+    db.session.commit()
+
+    updates = []
+
+    def count_updates(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith('UPDATE'):
+            updates.append(statement)
+
+    ids = [str(person.id) for person in people] + [str(outsider.id), str(people[0].id)]
+    event.listen(db.engine, 'before_cursor_execute', count_updates)
+    try:
+        count = assignment_service.assign_people(ids, 'staffer', office.id, chunk_size=4)
+    finally:
+        event.remove(db.engine, 'before_cursor_execute', count_updates)
+
+    assert count == 5
+    assert len(updates) == 4
+    db.session.expire_all()
+    assert {person.assigned_to for person in people} == {'staffer'}
+    assert outsider.assigned_to != 'staffer'
+
+
+def test_unassign_churches_clears_assignment_and_invalidates_cache_once(app, monkeypatch):
+    office = _office("Church Office")
+    owner = User(username="owner", email="owner@example.com", office_id=office.id)
+    db.session.add(owner)
+    db.session.flush()
+    churches = [Church(name=f"Church {i}", office_id=office.id, owner_id=owner.id, assigned_to='leaver')
+                for i in range(3)]
+    db.session.add_all(churches)
+    db.session.commit()
+
+    invalidated = []
+    monkeypatch.setitem(assignment_service._CACHE_INVALIDATORS, Church, invalidated.append)
+
+    assert assignment_service.unassign_churches([church.id for church in churches]) == 3
+    assert invalidated == [None]
+    db.session.expire_all()
+    assert [church.assigned_to for church in churches] == [None, None, None]
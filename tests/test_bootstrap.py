@@ -0,0 +1,44 @@
+import pytest
+from app import db
+from app.models import BootstrapStep, Pipeline
+from app.services import bootstrap
+
+
+@pytest.fixture(autouse=True)
+def empty_database(app_context):
+    """Start from a database without tables, as before the first bootstrap."""
+    db.drop_all()
+
+
+def test_bootstrap_runs_each_step_once(app):
+    """A fresh database runs every step; afterwards nothing is pending."""
+    assert bootstrap.pending_steps() == [name for name, _, _ in bootstrap.BOOTSTRAP_STEPS]
+
+    ran = bootstrap.run_bootstrap()
+    assert ran == [name for name, _, _ in bootstrap.BOOTSTRAP_STEPS]
+    assert Pipeline.query.filter_by(is_main_pipeline=True).count() == 2
+    assert bootstrap.pending_steps() == []
+    assert bootstrap.run_bootstrap() == []
+
+
+def test_raised_version_reruns_only_that_step(app, monkeypatch):
+    """Raising one step's version reruns that step and records the new version."""
+    bootstrap.run_bootstrap()
+    calls = []
+    monkeypatch.setattr(bootstrap, 'BOOTSTRAP_STEPS', [
+        (name, version + 1 if name == 'church_pipeline' else version, lambda name=name: calls.append(name))
+        for name, version, _ in bootstrap.BOOTSTRAP_STEPS
+    ])
+
+    assert bootstrap.run_bootstrap() == ['church_pipeline']
+    assert calls == ['church_pipeline']
+    assert db.session.get(BootstrapStep, 'church_pipeline').version == 2
+
+
+def test_startup_only_checks_when_bootstrap_on_start_is_off(app, caplog):
+    """Workers do not bootstrap themselves; they warn that `flask bootstrap` is due."""
+    app.config['BOOTSTRAP_ON_START'] = False
+    bootstrap.init_app(app)
+
+    assert 'flask bootstrap' in caplog.text
+    assert not db.inspect(db.engine).has_table('bootstrap_steps')
@@ -0,0 +1,76 @@
+import pytest
+from app import db
+from app.extensions import cache
+from app.models import Office, Person
+from app.utils.caching import (
+    PEOPLE_NAMESPACE, namespaced_key, invalidate_people_cache, register_cache_invalidation
+)
+
+
+@pytest.fixture(autouse=True)
+def empty_cache(app_context):
+    cache.clear()
+
+
+def _keys():
+    return {
+        'office_1': namespaced_key(PEOPLE_NAMESPACE, 'list', 1),
+        'office_2': namespaced_key(PEOPLE_NAMESPACE, 'list', 2),
+        'all': namespaced_key(PEOPLE_NAMESPACE, 'list'),
+    }
+
+
+def test_office_invalidation_is_scoped(app):
+    """Invalidating one office leaves other offices' keys alone but refreshes unscoped keys."""
+    before = _keys()
+    assert _keys() == before
+
+    invalidate_people_cache(1)
+    after = _keys()
+    assert after['office_1'] != before['office_1']
+    assert after['all'] != before['all']
+    assert after['office_2'] == before['office_2']
+
+    invalidate_people_cache()
+    assert all(_keys()[name] != after[name] for name in after)
+
+
+def test_lost_counter_never_reuses_a_generation(app):
+    """An evicted generation counter is reseeded rather than restarting from a used value."""
+    seen = {namespaced_key(PEOPLE_NAMESPACE, 'list', 1)}
+    for _ in range(3):
+        invalidate_people_cache(1)
+        seen.add(namespaced_key(PEOPLE_NAMESPACE, 'list', 1))
+        cache.clear()
+        seen.add(namespaced_key(PEOPLE_NAMESPACE, 'list', 1))
+    assert len(seen) == 7
+
+
+def test_writes_invalidate_once_per_commit(app, monkeypatch):
+    """ORM writes bump the affected office generation after commit, not per row or on rollback."""
+    from app.utils import caching
+
+    register_cache_invalidation(app)
+    office = Office(name="Cache Office")
+    db.session.add(office)
+    db.session.commit()
+
+    calls = []
+    real_invalidate = caching.invalidate_namespace
+    monkeypatch.setattr(caching, 'invalidate_namespace',
+                        lambda namespace, office_id=None: calls.append((namespace, office_id)) or
+                        real_invalidate(namespace, office_id))
+
+    key = namespaced_key(PEOPLE_NAMESPACE, 'list', office.id)
+    db.session.add_all([Person(first_name=f"P{i}", last_name="Cache", office_id=office.id) for i in range(5)])
+    db.session.flush()
+    assert calls == []
+    db.session.commit()
+    assert calls == [(PEOPLE_NAMESPACE, office.id)]
+    assert namespaced_key(PEOPLE_NAMESPACE, 'list', office.id) != key
+
+    calls.clear()
+    db.session.add(Person(first_name="Rolled", last_name="Back", office_id=office.id))
+    db.session.flush()
+    db.session.rollback()
+    assert calls == []
@@ -0,0 +1,136 @@
+import time
+import pytest
+from app import db
+from app.models import Office, User, Person
+from app.models.email_campaign import EmailCampaign
+from app.models.email_tracking import EmailTracking
+from app.services.campaign_delivery import RateLimiter, deliver_campaign
+from app.services.job_service import enqueue_job
+
+
+class RecordingMail:
+    """MailStub that keeps the messages it was asked to send."""
+
+    def __init__(self):
+        self.sent = []
+
+    def send(self, message):
+        self.sent.append(message)
+        return True
+
+
+pytestmark = pytest.mark.usefixtures('app_context')
+
+
+@pytest.fixture
+def app(app):
+    app.config.update(MAIL_SERVER='smtp.example.com', MAIL_DEFAULT_SENDER='campaigns@example.com',
+                      CAMPAIGN_SEND_CHUNK_SIZE=2, CAMPAIGN_SEND_WORKERS=3, CAMPAIGN_SEND_RATE=0)
+    app.mail = RecordingMail()
+    return app
+
+
+@pytest.fixture
+def campaign(app):
+    office = Office(name="Campaign Office")
+    db.session.add(office)
+    db.session.commit()
+    user = User(username="campaign_user", email="campaign@example.com", role="super_admin", office_id=office.id)
+    db.session.add(user)
+    db.session.commit()
+    db.session.add_all([
+        Person(first_name=f"First{i}", last_name="Recipient", email=f"p{i}@example.com" if i != 3 else None,
+               office_id=office.id)
+        for i in range(6)
+    ])
+    campaign = EmailCampaign(name="Autumn", subject="Hello [FirstName]",
+                             content='<p>Hi [Name] [Unknown]</p><a href="https://example.com/">Read</a>',
+                             created_by=user.id, office_id=office.id)
+    db.session.add(campaign)
+    db.session.commit()
+    return campaign
+
+
+def test_job_sends_campaign_in_chunks(app, campaign):
+    """The campaign job personalizes each message, records tracking rows and completes the campaign."""
+    campaign_id = campaign.id
+    job = enqueue_job('campaign_send', params={'campaign_id': campaign_id},
+                      user_id=campaign.created_by, office_id=campaign.office_id)
+
+    assert job.status == 'completed', job.error_message
+    assert job.get_result()['sent_count'] == 5
+    assert (job.progress_current, job.progress_total) == (6, 6)
+    assert job.get_checkpoint()['sent'] == 5
+
+    messages = {message.recipients[0]: message for message in app.mail.sent}
+    assert len(app.mail.sent) == 5
+    assert messages['p0@example.com'].subject == "Hello First0"
+    assert '<p>Hi First0 Recipient </p>' in messages['p0@example.com'].html
+    assert '/emails/track/open/' in messages['p0@example.com'].html
+    assert '/emails/track/click/' in messages['p0@example.com'].html
+
+    rows = EmailTracking.query.filter_by(bulk_send_id=str(campaign_id)).all()
+    assert len(rows) == 5 and {row.status for row in rows} == {'sent'}
+    campaign = db.session.get(EmailCampaign, campaign_id)
+    assert campaign.status == 'completed'
+    assert (campaign.recipient_count, campaign.sent_count) == (6, 5)
+
+
+def test_resume_does_not_resend_confirmed_recipients(app, campaign):
+    """A send that dies mid-way resumes from its checkpoint and only retries unconfirmed messages."""
+    campaign_id = campaign.id
+    checkpoints = []
+
+    def crash_on_second_chunk(recipients, checkpoint):
+        if checkpoints:
+            raise RuntimeError("worker died")
+        checkpoints.append(checkpoint)
+
+    with pytest.raises(RuntimeError):
+        deliver_campaign(campaign_id, on_chunk=crash_on_second_chunk)
+    db.session.rollback()
+    assert checkpoints == [{'last_person_id': checkpoints[0]['last_person_id'], 'sent': 2, 'failed': 0}]
+    statuses = sorted(row.status for row in EmailTracking.query.filter_by(bulk_send_id=str(campaign_id)))
+    assert statuses == ['sending', 'sent', 'sent']
+
+    app.mail.sent.clear()
+    totals = deliver_campaign(campaign_id, checkpoint=checkpoints[0])
+
+    assert totals == {'sent': 5, 'failed': 0}
+    assert sorted(message.recipients[0] for message in app.mail.sent) == [
+        'p2@example.com', 'p4@example.com', 'p5@example.com'
+    ]
+    rows = EmailTracking.query.filter_by(bulk_send_id=str(campaign_id)).all()
+    assert len(rows) == 5 and {row.status for row in rows} == {'sent'}
+
+
+def test_rate_limiter_spaces_sends():
+    """The token bucket lets a burst through and then throttles to the configured rate."""
+    limiter = RateLimiter(rate=50, burst=2)
+    started = time.monotonic()
+    for _ in range(7):
+        limiter.acquire()
+    assert time.monotonic() - started >= 0.09
+
+
+def test_send_failing_in_first_chunk_can_be_resumed(app, campaign):
+    """A send that fails before its first checkpoint is saved can still be resumed by its job."""
+    from app.utils.email_service import send_bulk_email
+    campaign_id = campaign.id
+
+    def crash_on_first_chunk(recipients, checkpoint):
+        raise RuntimeError("worker died")
+
+    success, message, _ = send_bulk_email(campaign_id, on_chunk=crash_on_first_chunk)
+    assert not success
+    assert db.session.get(EmailCampaign, campaign_id).status == 'failed'
+
+    job = enqueue_job('campaign_send', params={'campaign_id': campaign_id},
+                      user_id=campaign.created_by, office_id=campaign.office_id)
+
+    assert job.status == 'completed', job.error_message
+    assert job.get_result()['sent_count'] == 5
+    rows = EmailTracking.query.filter_by(bulk_send_id=str(campaign_id)).all()
+    assert len(rows) == 5 and {row.status for row in rows} == {'sent'}
+    campaign = db.session.get(EmailCampaign, campaign_id)
+    assert (campaign.status, campaign.recipient_count) == ('completed', 6)
@@ -0,0 +1,162 @@
+import pytest
+from datetime import datetime, timedelta
+from googleapiclient.errors import HttpError
+from app import db
+from app.models import Office, User, Person, GoogleToken
+from app.services.contact_sync import ContactSyncService
+from app.services.google_api import GoogleAPIService
+
+
+class FakeRequest:
+    def __init__(self, run):
+        self.run = run
+
+    def execute(self):
+        return self.run()
+
+
+class FakePeople:
+    """In-memory stand-in for people().connections().list() with sync tokens."""
+
+    def __init__(self):
+        self.contacts = {}
+        self.version = 0
+        self.changed = {}
+        self.expired = False
+        self.calls = []
+
+    def put(self, google_id, given, family, email=None, city=None, deleted=False):
+        self.version += 1
+        contact = {'resourceName': f"people/{google_id}",
+                   'names': [{'givenName': given, 'familyName': family}]}
+        if email:
+            contact['emailAddresses'] = [{'value': email}]
+        if city:
+            contact['addresses'] = [{'city': city}]
+        if deleted:
+            contact = {'resourceName': f"people/{google_id}", 'metadata': {'deleted': True}}
+        self.contacts[google_id] = contact
+        self.changed[google_id] = self.version
+
+    # googleapiclient resource chain
+    def people(self):
+        return self
+
+    def connections(self):
+        return self
+
+    def list(self, resourceName, pageSize, personFields, requestSyncToken, syncToken=None, pageToken=None):
+        self.calls.append(syncToken)
+
+        def run():
+            if syncToken and self.expired:
+                raise HttpError(type('Resp', (), {'status': 410, 'reason': 'Gone'})(), b'EXPIRED_SYNC_TOKEN')
+            since = int(syncToken) if syncToken else 0
+            connections = [contact for google_id, contact in self.contacts.items()
+                           if self.changed[google_id] > since
+                           and (syncToken or not contact.get('metadata', {}).get('deleted'))]
+            return {'connections': connections, 'nextSyncToken': str(self.version)}
+        return FakeRequest(run)
+
+
+pytestmark = pytest.mark.usefixtures('app_context')
+
+
+@pytest.fixture
+def people(app, monkeypatch):
+    office = Office(name="Sync Office")
+    db.session.add(office)
+    db.session.commit()
+    user = User(username="sync_user", email="sync@example.com", role="super_admin", office_id=office.id)
+    db.session.add(user)
+    db.session.commit()
+    db.session.add(GoogleToken(user_id=user.id, access_token="token", token_type="Bearer",
+                               expires_at=datetime.utcnow() + timedelta(hours=1)))
+    db.session.commit()
+
+    backend = FakePeople()
+    monkeypatch.setattr(GoogleAPIService, 'get_people_service', classmethod(lambda cls, token_info: backend))
+    return backend, user.id
+
+
+def _sync(user_id):
+    return ContactSyncService.sync_contacts(user_id, {'token': 'token'})
+
+
+def test_first_sync_creates_people_and_stores_token(people):
+    """A full sync inserts new people and records the People API sync token."""
+    backend, user_id = people
+    backend.put('c1', 'Ann', 'Able', email='ann@example.com')
+    backend.put('c2', 'Bob', 'Baker', city='Durham')
+
+    success, stats, error = _sync(user_id)
+    assert success, error
+    assert stats['items_created'] == 2
+    assert backend.calls == [None]
+
+    ann = Person.query.filter_by(google_contact_id='c1').one()
+    assert (ann.first_name, ann.email, ann.source, ann.user_id) == ('Ann', 'ann@example.com', 'google_import', user_id)
+    assert GoogleToken.query.filter_by(user_id=user_id).one().contacts_sync_token == '2'
+
+
+def test_delta_sync_applies_only_changes(people):
+    """Later syncs send the stored token and update, flag conflicts or skip per contact."""
+    backend, user_id = people
+    backend.put('c1', 'Ann', 'Able', email='ann@example.com')
+    backend.put('c2', 'Bob', 'Baker')
+    backend.put('c3', 'Cy', 'Cole')
+    _sync(user_id)
+
+    backend.put('c1', 'Ann', 'Able', email='ann@work.example.com')  # conflicts with the stored email
+    backend.put('c2', 'Bob', 'Baker', city='Durham')                # only fills an empty field
+    backend.put('c3', 'Cy', 'Cole', deleted=True)
+    backend.put('c4', 'Di', 'Dunn')
+
+    success, stats, error = _sync(user_id)
+    assert success, error
+    assert backend.calls[-1] == '3'
+    assert stats == {'items_processed': 4, 'items_created': 1, 'items_updated': 1,
+                     'items_skipped': 1, 'items_failed': 1}
+
+    ann = Person.query.filter_by(google_contact_id='c1').one()
+    assert ann.has_conflict and ann.email == 'ann@example.com'
+    assert ann.conflict_data['email'] == 'ann@work.example.com'
+    assert Person.query.filter_by(google_contact_id='c2').one().city == 'Durham'
+    assert Person.query.filter_by(google_contact_id='c3').count() == 1
+    assert Person.query.count() == 4
+
+    # Nothing changed since the last sync
+    success, stats, error = _sync(user_id)
+    assert stats['items_processed'] == 0
+
+
+def test_expired_sync_token_falls_back_to_full_sync(people):
+    """A 410 for the stored token triggers a full listing without duplicating people."""
+    backend, user_id = people
+    backend.put('c1', 'Ann', 'Able')
+    _sync(user_id)
+
+    backend.put('c2', 'Bob', 'Baker')
+    backend.expired = True
+    success, stats, error = _sync(user_id)
+    assert success, error
+    assert backend.calls[-2:] == ['1', None]
+    assert stats['items_created'] == 1 and stats['items_skipped'] == 1
+    assert Person.query.count() == 2
+
+
+def test_sync_invalidates_people_cache_once(people, monkeypatch):
+    """The office's people cache is invalidated once per sync that changed contacts."""
+    backend, user_id = people
+    calls = []
+    monkeypatch.setattr('app.services.contact_sync.invalidate_people_cache', calls.append)
+    monkeypatch.setattr('app.services.contact_sync.CONTACT_SYNC_BATCH_SIZE', 2)
+    for i in range(5):
+        backend.put(f'c{i}', f'First{i}', 'Last')
+
+    _sync(user_id)
+    assert calls == [db.session.get(User, user_id).office_id]
+
+    # A sync with nothing to apply leaves the cache alone
+    _sync(user_id)
+    assert len(calls) == 1
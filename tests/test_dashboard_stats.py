@@ -0,0 +1,159 @@
+import pytest
+from datetime import datetime, timedelta
+from app import db
+from app.models import Office, User, Person, Church, Task, Communication, DashboardStatBucket
+from app.models.task import TaskStatus
+from app.models.dashboard_stats import UNDATED_BUCKET
+from app.services.dashboard_stats import (
+    NO_OFFICE, apply_delta, get_rollup_stats, reconcile_dashboard_stats, rollup_key
+)
+
+
+pytestmark = pytest.mark.usefixtures('app_context')
+
+
+@pytest.fixture
+def office(app):
+    office = Office(name="Rollup Office", address="1 Test St", city="Test City",
+                    state="TS", country="Test Country", timezone="America/New_York")
+    db.session.add(office)
+    db.session.commit()
+    return office
+
+
+@pytest.fixture
+def user(office):
+    user = User(username="rollupuser", email="rollup@example.com", role="standard_user", office_id=office.id)
+    db.session.add(user)
+    db.session.commit()
+    return user
+
+
+def _stats(office, user):
+    return get_rollup_stats(office_id=office.id, assignee=str(user.id))
+
+
+def test_rollup_tracks_contact_writes(office, user):
+    """People and church counters follow inserts, office moves and deletes."""
+    people = [Person(first_name=f"P{i}", last_name="Test", office_id=office.id) for i in range(3)]
+    church = Church(name="Grace", office_id=office.id, owner_id=user.id)
+    db.session.add_all(people + [church])
+    db.session.commit()
+
+    stats = _stats(office, user)
+    assert stats['people_count'] == 3
+    assert stats['church_count'] == 1
+
+    other = Office(name="Other Office")
+    db.session.add(other)
+    db.session.commit()
+    people[0].office_id = other.id
+    db.session.delete(people[1])
+    db.session.commit()
+
+    assert _stats(office, user)['people_count'] == 1
+    assert get_rollup_stats(office_id=other.id)['people_count'] == 1
+    assert get_rollup_stats(all_offices=True)['people_count'] == 2
+
+
+def test_contacts_without_an_office_count_towards_all_office_totals(office, user):
+    """Super admins see every contact, as the COUNT queries the rollup replaced did."""
+    # contacts.office_id is NOT NULL in the models, but older databases still
+    # hold contacts without an office
+    key = rollup_key(Person(first_name="No", last_name="Office"))
+    assert key == ('people', NO_OFFICE, UNDATED_BUCKET)
+    db.session.add(Person(first_name="A", last_name="Test", office_id=office.id))
+    db.session.commit()
+    apply_delta(db.session.connection(), key, 1)
+    db.session.commit()
+
+    assert _stats(office, user)['people_count'] == 1
+    assert get_rollup_stats(all_offices=True)['people_count'] == 2
+
+
+def test_rollup_tracks_task_status_and_due_date(office, user):
+    """Pending and overdue counters follow task status and due date changes."""
+    overdue = Task(title="Late", assigned_to=str(user.id), office_id=office.id,
+                   due_date=datetime.now() - timedelta(days=2))
+    upcoming = Task(title="Soon", assigned_to=str(user.id), office_id=office.id,
+                    due_date=datetime.now() + timedelta(days=2))
+    undated = Task(title="Whenever", assigned_to=str(user.id), office_id=office.id)
+    db.session.add_all([overdue, upcoming, undated])
+    db.session.commit()
+
+    stats = _stats(office, user)
+    assert stats['pending_tasks'] == 3
+    assert stats['overdue_tasks'] == 1
+
+    upcoming.due_date = datetime.now() - timedelta(days=5)
+    overdue.status = TaskStatus.COMPLETED
+    db.session.commit()
+
+    stats = _stats(office, user)
+    assert stats['pending_tasks'] == 2
+    assert stats['overdue_tasks'] == 1
+
+
+def test_rollup_counts_recent_communications(office, user):
+    """Only communications inside the 30 day window are counted."""
+    db.session.add_all([
+        Communication(type="Email", message="recent", owner_id=user.id, office_id=office.id),
+        Communication(type="Email", message="old", owner_id=user.id, office_id=office.id,
+                      created_at=datetime.utcnow() - timedelta(days=60))
+    ])
+    db.session.commit()
+
+    assert _stats(office, user)['recent_communications'] == 1
+
+
+def test_deleting_an_old_communication_leaves_the_rollup_alone(office, user):
+    """Communications outside the window have no bucket to subtract from."""
+    old = Communication(type="Email", message="old", owner_id=user.id, office_id=office.id,
+                        created_at=datetime.utcnow() - timedelta(days=60))
+    db.session.add_all([old, Communication(type="Email", message="recent", owner_id=user.id, office_id=office.id)])
+    db.session.commit()
+    reconcile_dashboard_stats()
+
+    db.session.delete(old)
+    db.session.commit()
+
+    assert DashboardStatBucket.query.filter(DashboardStatBucket.count < 0).count() == 0
+    assert _stats(office, user)['recent_communications'] == 1
+
+
+def test_reconcile_matches_incremental_rollup(office, user):
+    """Reconciliation rebuilds the same counters and fixes drift."""
+    db.session.add_all([
+        Person(first_name="A", last_name="Test", office_id=office.id),
+        Task(title="Late", assigned_to=str(user.id), office_id=office.id,
+             due_date=datetime.now() - timedelta(days=1)),
+        Communication(type="Email", message="hi", owner_id=user.id, office_id=office.id)
+    ])
+    db.session.commit()
+    expected = _stats(office, user)
+
+    # Simulate drift from a write that bypassed the ORM hooks
+    DashboardStatBucket.query.filter_by(metric='people').update({'count': 42})
+    db.session.commit()
+    assert _stats(office, user)['people_count'] == 42
+
+    reconcile_dashboard_stats()
+    assert _stats(office, user) == expected
+
+
+def test_bootstrap_populates_rollup_for_existing_data(office, user):
+    """Rows written before the rollup existed are counted once 'flask bootstrap' has run."""
+    from app.models.bootstrap import BootstrapStep
+    from app.services.bootstrap import run_bootstrap
+
+    # A database bootstrapped before the dashboard_stats step existed
+    run_bootstrap()
+    db.session.add(Person(first_name="A", last_name="Test", office_id=office.id))
+    db.session.commit()
+    DashboardStatBucket.query.delete()
+    BootstrapStep.query.filter_by(name='dashboard_stats').delete()
+    db.session.commit()
+    assert _stats(office, user)['people_count'] == 0
+
+    assert run_bootstrap() == ['dashboard_stats']
+    assert _stats(office, user)['people_count'] == 1
@@ -0,0 +1,60 @@
+import pytest
+from sqlalchemy import create_engine, text
+from app.utils.db_logger import setup_db_logger, QueryLogBuffer
+
+
+@pytest.fixture
+def app(app, tmp_path):
+    app.config['LOG_DIR'] = str(tmp_path)
+    # Leave flushing to the tests
+    app.config['DB_LOG_FLUSH_INTERVAL'] = 60
+    return app
+
+
+def _run_queries(app, engine, count):
+    with engine.connect() as conn:
+        for i in range(count):
+            conn.execute(text("SELECT :value"), {"value": i})
+
+
+def test_sampled_queries_are_buffered_then_written(app, tmp_path):
+    """Logged statements are queued in memory and written in one batch on flush."""
+    app.config['DB_LOG_SAMPLE_RATE'] = 1.0
+    engine = create_engine('sqlite://')
+    buffer = setup_db_logger(app, engine)
+
+    _run_queries(app, engine, 5)
+    assert len(buffer.records) >= 5
+
+    buffer.flush()
+    lines = (tmp_path / 'database.log').read_text().splitlines()
+    assert len(lines) >= 5
+    fields = lines[-1].split('|')
+    assert fields[2] == 'SELECT' and fields[4] == 'success' and fields[-1] == 'SELECT ?'
+
+
+def test_fast_unsampled_queries_are_skipped(app, tmp_path):
+    """With sampling off only statements over the slow threshold are kept."""
+    app.config['DB_LOG_SAMPLE_RATE'] = 0
+    engine = create_engine('sqlite://')
+    buffer = setup_db_logger(app, engine)
+    buffer.flush()
+
+    _run_queries(app, engine, 5)
+    assert len(buffer.records) == 0
+
+    app.config['DB_LOG_SLOW_QUERY_MS'] = 0
+    engine = create_engine('sqlite://')
+    buffer = setup_db_logger(app, engine)
+    _run_queries(app, engine, 2)
+    buffer.flush()
+    assert (tmp_path / 'database.log').read_text().splitlines()[-1].split('|')[4] == 'slow'
+
+
+def test_full_buffer_drops_oldest(tmp_path):
+    """The buffer is bounded; overflow drops the oldest records and counts them."""
+    buffer = QueryLogBuffer(str(tmp_path / 'db.log'), max_size=3, batch_size=100, flush_interval=60)
+    for i in range(5):
+        buffer.append((None, f"SELECT {i}", 'success', 1, None, 0))
+    assert buffer.dropped == 2
+    assert [record[1] for record in buffer.records] == ["SELECT 2", "SELECT 3", "SELECT 4"]
@@ -0,0 +1,101 @@
+import pytest
+from datetime import datetime, timedelta
+from sqlalchemy import event
+from app import db
+from app.models import Office, User
+from app.models.email_campaign import EmailCampaign
+from app.models.email_tracking import EmailTracking
+from app.services.tracking_service import get_tracking_buffer, apply_tracking_events
+
+
+pytestmark = pytest.mark.usefixtures('app_context')
+
+
+@pytest.fixture
+def app(app):
+    # Leave flushing to the tests
+    app.config['TRACKING_FLUSH_INTERVAL'] = 60
+    return app
+
+
+@pytest.fixture
+def campaign(app):
+    office = Office(name="Tracking Office")
+    db.session.add(office)
+    db.session.commit()
+    user = User(username="tracking_user", email="tracking@example.com", role="super_admin", office_id=office.id)
+    db.session.add(user)
+    db.session.commit()
+    campaign = EmailCampaign(name="Spring", subject="Hello", content="<p>Hi</p>",
+                             created_by=user.id, office_id=office.id)
+    db.session.add(campaign)
+    db.session.commit()
+    db.session.add_all([
+        EmailTracking(email_subject="Hello", recipient_email=f"r{i}@example.com", tracking_pixel=f"pixel-{i}",
+                      sender_id=user.id, office_id=office.id, bulk_send_id=str(campaign.id))
+        for i in range(3)
+    ])
+    db.session.commit()
+    return campaign
+
+
+def test_hits_are_queued_then_applied_in_one_flush(app, campaign):
+    """Tracking routes only queue hits; a flush applies the counts and refreshes the campaign."""
+    campaign_id = campaign.id
+    client = app.test_client()
+    client.get('/emails/track/open/pixel-0')
+    client.get('/emails/track/open/pixel-0')
+    client.get('/emails/track/open/pixel-1')
+    response = client.get('/emails/track/click/pixel-1?redirect_url=https://example.com/')
+    assert response.status_code == 302
+    assert response.headers['Location'] == 'https://example.com/'
+    client.get('/emails/track/open/unknown-pixel')
+
+    assert EmailTracking.query.filter(EmailTracking.open_count > 0).count() == 0
+
+    buffer = get_tracking_buffer(app)
+    assert len(buffer.events) == 5
+    buffer.flush()
+    db.session.expire_all()
+
+    rows = {row.tracking_pixel: row for row in EmailTracking.query}
+    assert rows['pixel-0'].open_count == 2 and rows['pixel-0'].status == 'opened'
+    assert rows['pixel-0'].opened_at is not None
+    assert (rows['pixel-1'].open_count, rows['pixel-1'].click_count) == (1, 1)
+    assert rows['pixel-1'].status == 'clicked'
+    assert rows['pixel-2'].open_count == 0
+
+    campaign = db.session.get(EmailCampaign, campaign_id)
+    assert (campaign.sent_count, campaign.open_count, campaign.click_count) == (3, 2, 1)
+
+
+def test_counts_accumulate_across_flushes(app, campaign):
+    """Later flushes add to the stored counts and keep the first open time."""
+    first = datetime(2026, 1, 1, 9, 0)
+    apply_tracking_events([('pixel-2', 'open', first)])
+    apply_tracking_events([('pixel-2', 'open', first + timedelta(hours=1)),
+                           ('pixel-2', 'open', first + timedelta(hours=2))])
+
+    row = EmailTracking.query.filter_by(tracking_pixel='pixel-2').one()
+    assert row.open_count == 3
+    assert row.opened_at == first
+    assert row.last_opened_at == first + timedelta(hours=2)
+
+
+def test_update_stats_uses_one_aggregate(app, campaign):
+    """Campaign stats are computed in SQL rather than by loading every tracking row."""
+    apply_tracking_events([('pixel-0', 'click', datetime.utcnow())])
+    campaign = db.session.get(EmailCampaign, campaign.id)
+    statements = []
+
+    def record(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    event.listen(db.engine, 'before_cursor_execute', record)
+    try:
+        campaign.update_stats()
+    finally:
+        event.remove(db.engine, 'before_cursor_execute', record)
+
+    assert len(statements) == 1 and 'GROUP BY' in statements[0]
+    assert (campaign.sent_count, campaign.open_count, campaign.click_count, campaign.bounce_count) == (3, 0, 1, 0)
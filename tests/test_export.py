@@ -0,0 +1,66 @@
+import io
+import csv
+import zipfile
+import datetime
+import pytest
+from app import db
+from app.models import Office, Person
+from app.utils.export import iter_export_rows, stream_csv, stream_excel
+
+
+pytestmark = pytest.mark.usefixtures('app_context')
+
+
+def _rows(count):
+    for i in range(count):
+        yield {'id': i, 'name': f"Row {i}", 'created_at': datetime.date(2025, 1, 1), 'extra': 'ignored'}
+
+
+def test_stream_csv_yields_chunks(app):
+    """Large CSV exports are sent as several chunks with every row present."""
+    with app.test_request_context():
+        response = stream_csv(_rows(5000), ['id', 'name', 'created_at'], 'rows')
+        assert response.is_streamed
+        assert 'attachment; filename=rows.csv' in response.headers['Content-Disposition']
+        chunks = list(response.response)
+
+    assert len(chunks) > 1
+    reader = csv.DictReader(io.StringIO(b''.join(chunks).decode('utf-8')))
+    rows = list(reader)
+    assert reader.fieldnames == ['id', 'name', 'created_at']
+    assert len(rows) == 5000
+    assert rows[-1] == {'id': '4999', 'name': 'Row 4999', 'created_at': '2025-01-01'}
+
+
+def test_stream_excel_builds_workbook(app):
+    """Excel exports are written in constant memory mode and streamed from disk."""
+    with app.test_request_context():
+        response = stream_excel(_rows(100), ['id', 'name', 'created_at'], 'rows', sheet_name='Rows')
+        data = b''.join(response.response)
+
+    assert int(response.headers['Content-Length']) == len(data)
+    workbook = zipfile.ZipFile(io.BytesIO(data))
+    sheet = workbook.read('xl/worksheets/sheet1.xml').decode('utf-8')
+    assert 'Rows' in workbook.read('xl/workbook.xml').decode('utf-8')
+    assert '<row r="101"' in sheet
+
+
+def test_iter_export_rows_batches_query(app):
+    """Query results are converted row by row and skipped rows are dropped."""
+    office = Office(name="Export Office")
+    db.session.add(office)
+    db.session.commit()
+    db.session.add_all([
+        Person(first_name=f"First{i}", last_name=f"Last{i:02d}", office_id=office.id) for i in range(25)
+    ])
+    db.session.commit()
+
+    query = Person.query.filter_by(office_id=office.id).order_by(Person.last_name)
+    rows = list(iter_export_rows(
+        query,
+        lambda person: None if person.last_name == 'Last00' else {'name': person.last_name},
+        batch_size=10
+    ))
+
+    assert len(rows) == 24
+    assert rows[0] == {'name': 'Last01'}
@@ -0,0 +1,215 @@
+import pytest
+from datetime import datetime, timedelta
+from googleapiclient.errors import HttpError
+from app import db
+from app.models import Office, User, Person, Communication, GoogleToken
+from app.services.gmail_service import GmailService
+
+
+class FakeRequest:
+    def __init__(self, run):
+        self.run = run
+
+    def execute(self):
+        return self.run()
+
+
+class FakeBatch:
+    def __init__(self, backend, callback):
+        self.backend = backend
+        self.callback = callback
+        self.requests = []
+
+    def add(self, request, request_id=None):
+        self.requests.append((request_id, request))
+
+    def execute(self):
+        self.backend.batches.append(len(self.requests))
+        for request_id, request in self.requests:
+            try:
+                self.callback(request_id, request.execute(), None)
+            except HttpError as e:
+                self.callback(request_id, None, e)
+
+
+class FakeGmail:
+    """In-memory stand-in for the parts of the Gmail API used by sync_emails."""
+
+    def __init__(self):
+        self.mailbox = {}
+        self.added = []
+        self.history_id = 100
+        self.expired_before = 0
+        self.batches = []
+        self.calls = []
+        # message id -> HTTP statuses its next fetches fail with
+        self.failures = {}
+
+    def add_message(self, message_id, sender, to, subject, labels=('INBOX',)):
+        self.history_id += 1
+        self.mailbox[message_id] = {
+            'id': message_id,
+            'threadId': f"t-{message_id}",
+            'labelIds': list(labels),
+            'snippet': f"Snippet of {subject}",
+            'internalDate': str(int(datetime(2026, 10, 1).timestamp() * 1000)),
+            'payload': {'headers': [
+                {'name': 'From', 'value': sender},
+                {'name': 'To', 'value': to},
+                {'name': 'Subject', 'value': subject}
+            ]}
+        }
+        self.added.append((self.history_id, message_id))
+
+    def _error(self, status):
+        return HttpError(type('Resp', (), {'status': status, 'reason': 'error'})(), b'error')
+
+    # googleapiclient resource chain
+    def users(self):
+        return self
+
+    def messages(self):
+        return self
+
+    def history(self):
+        return self
+
+    def getProfile(self, userId):
+        return FakeRequest(lambda: {'historyId': str(self.history_id)})
+
+    def list(self, userId, q=None, maxResults=100, pageToken=None, startHistoryId=None, historyTypes=None):
+        if startHistoryId is not None:
+            self.calls.append(('history', startHistoryId))
+
+            def run():
+                if int(startHistoryId) < self.expired_before:
+                    raise self._error(404)
+                records = [{'id': str(h), 'messagesAdded': [{'message': {
+                    'id': m, 'labelIds': self.mailbox[m]['labelIds']}}]}
+                    for h, m in self.added if h > int(startHistoryId)]
+                return {'history': records, 'historyId': str(self.history_id)}
+            return FakeRequest(run)
+
+        self.calls.append(('list', q))
+        return FakeRequest(lambda: {'messages': [{'id': m} for m in self.mailbox]})
+
+    def get(self, userId, id, format='full', metadataHeaders=None):
+        assert format == 'metadata'
+
+        def run():
+            if self.failures.get(id):
+                raise self._error(self.failures[id].pop(0))
+            if id not in self.mailbox:
+                raise self._error(404)
+            return self.mailbox[id]
+        return FakeRequest(run)
+
+    def new_batch_http_request(self, callback=None):
+        return FakeBatch(self, callback)
+
+
+pytestmark = pytest.mark.usefixtures('app_context')
+
+
+@pytest.fixture
+def gmail(app, monkeypatch):
+    office = Office(name="Gmail Office")
+    db.session.add(office)
+    db.session.commit()
+    user = User(username="gmail_user", email="me@example.com", role="super_admin", office_id=office.id)
+    db.session.add(user)
+    db.session.commit()
+    db.session.add(GoogleToken(user_id=user.id, access_token="token", token_type="Bearer",
+                               expires_at=datetime.utcnow() + timedelta(hours=1), email="me@example.com"))
+    db.session.add(Person(first_name="Pat", last_name="Friend", email="pat@example.com", office_id=office.id))
+    db.session.commit()
+
+    backend = FakeGmail()
+    monkeypatch.setattr(GmailService, '_initialize_service',
+                        lambda self: setattr(self, 'service', backend))
+    return backend, user.id
+
+
+def test_first_sync_lists_recent_then_stores_history_id(gmail, monkeypatch):
+    """A full sync fetches metadata in batches, links people and records the history id."""
+    backend, user_id = gmail
+    monkeypatch.setattr('app.services.gmail_service.GMAIL_SYNC_BATCH_SIZE', 2)
+    backend.add_message('m1', 'Pat <pat@example.com>', 'me@example.com', 'Hello')
+    backend.add_message('m2', 'me@example.com', 'Pat <pat@example.com>', 'Reply', labels=('SENT',))
+    backend.add_message('m3', 'stranger@example.com', 'me@example.com', 'Offer')
+
+    assert GmailService(user_id).sync_emails() == 3
+    assert backend.batches == [2, 1]
+    assert backend.calls[0][0] == 'list'
+
+    person = Person.query.filter_by(email='pat@example.com').first()
+    rows = {c.gmail_message_id: c for c in Communication.query.all()}
+    assert rows['m1'].direction == 'inbound' and rows['m1'].person_id == person.id
+    assert rows['m2'].direction == 'outbound' and rows['m2'].person_id == person.id
+    assert rows['m3'].person_id is None
+    assert rows['m1'].message == 'Snippet of Hello'
+    assert GoogleToken.query.filter_by(user_id=user_id).first().gmail_history_id == str(backend.history_id)
+
+
+def test_incremental_sync_uses_history_and_skips_known(gmail):
+    """Later syncs only fetch messages added since the stored history id."""
+    backend, user_id = gmail
+    backend.add_message('m1', 'pat@example.com', 'me@example.com', 'Hello')
+    assert GmailService(user_id).sync_emails() == 1
+
+    backend.add_message('m2', 'pat@example.com', 'me@example.com', 'Again')
+    backend.calls.clear()
+    assert GmailService(user_id).sync_emails() == 1
+    assert [call[0] for call in backend.calls] == ['history']
+    assert Communication.query.count() == 2
+
+    # Nothing new: no fetches and nothing stored twice
+    backend.batches.clear()
+    assert GmailService(user_id).sync_emails() == 0
+    assert backend.batches == []
+
+
+def test_expired_history_falls_back_to_full_sync(gmail):
+    """A 404 from history().list triggers a full listing that skips stored messages."""
+    backend, user_id = gmail
+    backend.add_message('m1', 'pat@example.com', 'me@example.com', 'Hello')
+    assert GmailService(user_id).sync_emails() == 1
+
+    backend.add_message('m2', 'pat@example.com', 'me@example.com', 'Later')
+    backend.expired_before = backend.history_id + 1
+    backend.calls.clear()
+    assert GmailService(user_id).sync_emails() == 1
+    assert [call[0] for call in backend.calls] == ['history', 'list']
+    assert Communication.query.count() == 2
+
+
+def test_failed_fetch_is_retried_and_holds_the_history_id(gmail, monkeypatch):
+    """Rate-limited fetches are retried; if they still fail the sync point does not move."""
+    backend, user_id = gmail
+    monkeypatch.setattr('app.services.gmail_service.GMAIL_SYNC_RETRY_DELAY', 0)
+    backend.add_message('m1', 'pat@example.com', 'me@example.com', 'Hello')
+    assert GmailService(user_id).sync_emails() == 1
+    start_history_id = GoogleToken.query.filter_by(user_id=user_id).first().gmail_history_id
+
+    backend.add_message('m2', 'pat@example.com', 'me@example.com', 'Busy')
+    backend.add_message('m3', 'pat@example.com', 'me@example.com', 'Flaky')
+    backend.failures = {'m2': [429, 503], 'm3': [500]}
+    assert GmailService(user_id).sync_emails() == 1
+    assert GoogleToken.query.filter_by(user_id=user_id).first().gmail_history_id == start_history_id
+
+    # The next sync lists the same history again and picks up what was missed
+    assert GmailService(user_id).sync_emails() == 1
+    assert Communication.query.count() == 3
+    assert GoogleToken.query.filter_by(user_id=user_id).first().gmail_history_id == str(backend.history_id)
+
+
+def test_users_without_an_office_are_skipped(gmail):
+    """Nothing is fetched for a user whose communications would have no office."""
+    backend, user_id = gmail
+    backend.add_message('m1', 'pat@example.com', 'me@example.com', 'Hello')
+    User.query.filter_by(id=user_id).update({'office_id': None})
+    db.session.commit()
+
+    assert GmailService(user_id).sync_emails() == 0
+    assert backend.calls == []
+    assert Communication.query.count() == 0
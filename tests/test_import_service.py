@@ -0,0 +1,76 @@
+import io
+import pytest
+from app import db
+from app.models import Office, User, Person
+from app.services.dashboard_stats import get_rollup_stats
+from app.services.import_service import import_people_csv
+
+
+pytestmark = pytest.mark.usefixtures('app_context')
+
+
+@pytest.fixture
+def office(app):
+    office = Office(name="Import Office")
+    db.session.add(office)
+    db.session.commit()
+    return office
+
+
+@pytest.fixture
+def user(office):
+    user = User(username="importer", email="importer@example.com", role="office_admin", office_id=office.id)
+    db.session.add(user)
+    db.session.commit()
+    return user
+
+
+def test_import_people_in_chunks(office, user):
+    """Valid rows are bulk inserted across chunks; bad rows and duplicates are counted."""
+    db.session.add(Person(first_name="Existing", last_name="Person", email="taken@example.com", office_id=office.id))
+    db.session.commit()
+
+    lines = ["First Name,Last Name,Email,Phone,City"]
+    lines += [f"First{i},Last{i},person{i}@example.com,555-010-{i:04d},Town" for i in range(25)]
+    lines += [
+        ",,nobody@example.com,,",                   # no name
+        "Bad,Email,not-an-email,,",                  # invalid email
+        "Bad,Phone,phone@example.com,12,",           # invalid phone
+        "Dup,Existing,TAKEN@example.com,,",          # already in the office
+        "Dup,InFile,person3@example.com,,",          # repeated from earlier in the file
+        "No,Email,,,"
+    ]
+    stats = import_people_csv(io.StringIO("\n".join(lines)), office.id, user.id, chunk_size=10)
+
+    assert stats == {'created': 26, 'duplicates': 2, 'errors': 3, 'chunks': 4}
+    assert Person.query.filter_by(office_id=office.id).count() == 27
+
+    person = Person.query.filter_by(email="person7@example.com").one()
+    assert (person.first_name, person.last_name, person.city) == ("First7", "Last7", "Town")
+    assert person.type == 'person'
+    assert person.user_id == user.id
+    assert person.people_pipeline == 'INFORMATION'
+
+    assert get_rollup_stats(office_id=office.id)['people_count'] == 27
+
+
+def test_import_people_without_header(office, user):
+    """Files without a header row use the default column order and keep the first row."""
+    data = "Jane,Doe,jane@example.com,5550100200,1 Main St,Town,TX,75001,USA\n" \
+           "John,Doe,john@example.com,,,,,,\n"
+    stats = import_people_csv(io.StringIO(data), office.id, user.id, has_header=False)
+
+    assert stats['created'] == 2
+    jane = Person.query.filter_by(email="jane@example.com").one()
+    assert (jane.state, jane.zip_code, jane.country) == ("TX", "75001", "USA")
+
+
+def test_import_invalidates_people_cache_once(office, user, monkeypatch):
+    """The office's people cache is invalidated once for the whole import, not per chunk."""
+    calls = []
+    monkeypatch.setattr('app.services.import_service.invalidate_people_cache', calls.append)
+
+    data = "\n".join(["First Name,Last Name"] + [f"First{i},Last{i}" for i in range(25)])
+    import_people_csv(io.StringIO(data), office.id, user.id, chunk_size=10)
+
+    assert calls == [office.id]
@@ -0,0 +1,148 @@
+import os
+import pytest
+from app import db
+from app.models import Office, User, Person
+from app.services.job_service import JOB_HANDLERS, enqueue_job, resume_job, get_jobs_dir
+
+
+pytestmark = pytest.mark.usefixtures('app_context')
+
+
+@pytest.fixture
+def app(app, tmp_path):
+    app.config['JOBS_DIR'] = str(tmp_path)
+    app.config['WTF_CSRF_ENABLED'] = False
+    return app
+
+
+@pytest.fixture
+def user(app):
+    office = Office(name="Jobs Office")
+    db.session.add(office)
+    db.session.commit()
+    user = User(username="jobs_user", email="jobs@example.com", role="super_admin", office_id=office.id)
+    db.session.add(user)
+    db.session.commit()
+    return user
+
+
+def _write_people_csv(count):
+    path = os.path.join(get_jobs_dir('imports'), 'people.csv')
+    with open(path, 'w') as f:
+        f.write("First Name,Last Name,Email\n")
+        for i in range(count):
+            f.write(f"First{i},Last{i},job{i}@example.com\n")
+    return path
+
+
+def test_people_import_job_runs_eagerly(user):
+    """An import job records progress, a checkpoint and the import counts, then removes the upload."""
+    path = _write_people_csv(12)
+    job = enqueue_job('people_import', params={'path': path}, user_id=user.id, office_id=user.office_id)
+
+    assert job.status == 'completed'
+    assert job.attempts == 1
+    assert job.progress_current == 12
+    assert job.get_checkpoint()['chunk'] == 1
+    assert job.get_result() == {'created': 12, 'duplicates': 0, 'errors': 0, 'chunks': 1}
+    assert Person.query.filter_by(office_id=user.office_id).count() == 12
+    assert not os.path.exists(path)
+
+
+def test_failed_job_resumes_from_checkpoint(user, monkeypatch):
+    """A failed job keeps its checkpoint and resumes without redoing committed chunks."""
+    from app.services import import_service
+
+    path = _write_people_csv(25)
+    real_insert = import_service.insert_people
+    calls = {'count': 0}
+
+    def flaky_insert(df, office_id, user_id):
+        calls['count'] += 1
+        if calls['count'] == 2:
+            raise RuntimeError("database went away")
+        return real_insert(df, office_id, user_id)
+
+    monkeypatch.setattr(import_service, 'insert_people', flaky_insert)
+
+    job = enqueue_job('people_import', params={'path': path, 'chunk_size': 10},
+                      user_id=user.id, office_id=user.office_id)
+    assert job.status == 'failed'
+    assert 'database went away' in job.error_message
+    assert job.get_checkpoint()['chunk'] == 1
+    assert Person.query.filter_by(office_id=user.office_id).count() == 10
+
+    job = resume_job(job.id)
+    assert job.status == 'completed'
+    assert job.attempts == 2
+    assert job.get_result()['created'] == 25
+    assert Person.query.filter_by(office_id=user.office_id).count() == 25
+
+
+def test_unknown_job_type_fails(user):
+    """Jobs without a registered handler are marked failed."""
+    job = enqueue_job('no_such_job', user_id=user.id)
+    assert job.status == 'failed'
+    assert 'No handler registered' in job.error_message
+    assert 'no_such_job' not in JOB_HANDLERS
+
+
+def test_export_job_and_status_endpoint(app, user):
+    """Export jobs write a file that is reported by the status endpoint and downloadable."""
+    db.session.add_all([Person(first_name=f"P{i}", last_name="Export", office_id=user.office_id) for i in range(5)])
+    db.session.commit()
+
+    job = enqueue_job('export', params={'export': 'people', 'format': 'csv', 'office_id': user.office_id},
+                      user_id=user.id, office_id=user.office_id)
+    assert job.status == 'completed'
+    assert job.get_result()['rows'] == 5
+
+    user_id, job_id = user.id, job.id
+    client = app.test_client()
+    with client.session_transaction() as session:
+        session['_user_id'] = str(user_id)
+        session['_fresh'] = True
+
+    response = client.get(f'/jobs/{job_id}')
+    assert response.status_code == 200
+    data = response.get_json()
+    assert data['status'] == 'completed'
+    assert data['percent_complete'] == 100
+    assert set(data['result']) == {'filename', 'rows'}  # the server path is not exposed
+
+    response = client.get(data['download_url'])
+    assert response.status_code == 200
+    assert response.data.decode('utf-8').count('\n') == 6
+
+
+def test_only_failed_or_stalled_jobs_resume(app, user):
+    """Queued and live running jobs are not re-dispatched; a running job with a stale heartbeat is."""
+    from datetime import datetime, timedelta
+    from app.models.job import Job
+
+    queued = Job(job_type='no_such_job', status='queued')
+    live = Job(job_type='no_such_job', status='running', heartbeat_at=datetime.utcnow())
+    stalled = Job(job_type='no_such_job', status='running',
+                  heartbeat_at=datetime.utcnow() - timedelta(minutes=app.config['JOB_STALE_MINUTES'] + 1))
+    db.session.add_all([queued, live, stalled])
+    db.session.commit()
+
+    assert resume_job(queued.id) is None
+    assert resume_job(live.id) is None
+    assert db.session.get(Job, queued.id).status == 'queued'
+    assert db.session.get(Job, live.id).status == 'running'
+
+    # The stalled job is dispatched again (and fails, having no handler)
+    resumed = resume_job(stalled.id)
+    assert resumed.status == 'failed'
+    assert 'No handler registered' in resumed.error_message
+
+
+def test_jobs_dir_is_required_when_jobs_run_on_celery(app):
+    """Job files need shared storage unless jobs run in the request process."""
+    app.config['JOBS_DIR'] = None
+    assert get_jobs_dir('exports').startswith(app.instance_path)
+
+    app.config['JOBS_EAGER'] = False
+    with pytest.raises(RuntimeError, match='JOBS_DIR'):
+        get_jobs_dir('exports')
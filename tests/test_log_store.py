@@ -0,0 +1,96 @@
+import datetime
+import os
+import pytest
+from app.utils.log_store import LogStore
+from app.utils import log_utils
+
+
+pytestmark = pytest.mark.usefixtures('app_context')
+
+
+@pytest.fixture
+def app(app, tmp_path):
+    app.config['LOG_DIR'] = str(tmp_path)
+    return app
+
+
+def _security_line(timestamp, level, event_type, user='Anonymous'):
+    return f"{timestamp:%Y-%m-%d %H:%M:%S}|{level}|{event_type}|{user}|10.0.0.1|{event_type} detected"
+
+
+def _store(path, retention_days=None):
+    parse_line, index_fields = log_utils.LOG_FORMATS['security']
+    return LogStore(str(path), parse_line, index_fields, retention_days)
+
+
+def test_query_returns_newest_first_and_stops_at_max_entries(tmp_path):
+    """Entries come back newest first with indexed filters applied."""
+    store = _store(tmp_path / 'security.log')
+    now = datetime.datetime.now().replace(microsecond=0)
+    store.append_many([
+        _security_line(now - datetime.timedelta(minutes=i), 'CRITICAL' if i % 3 == 0 else 'INFO', f'EVENT_{i}')
+        for i in range(30)
+    ])
+
+    entries = store.query(max_entries=5)
+    assert [entry['event_type'] for entry in entries] == [f'EVENT_{i}' for i in range(5)]
+
+    critical = store.query(max_entries=100, level='critical')
+    assert [entry['event_type'] for entry in critical] == [f'EVENT_{i}' for i in range(0, 30, 3)]
+
+    recent = store.query(max_entries=100, since=now - datetime.timedelta(minutes=9, seconds=30))
+    assert len(recent) == 10
+
+
+def test_existing_log_is_indexed_and_rotated_by_day(tmp_path):
+    """A log written before the index is imported; a new day starts a new file."""
+    path = tmp_path / 'security.log'
+    yesterday = datetime.datetime.now() - datetime.timedelta(days=1)
+    path.write_text(_security_line(yesterday, 'WARNING', 'OLD_EVENT') + '\n')
+
+    store = _store(path)
+    assert [entry['event_type'] for entry in store.query()] == ['OLD_EVENT']
+
+    # Pretend the active file was started yesterday
+    conn = store._connection()
+    store._set_meta(conn, 'active_day', yesterday.date().isoformat())
+    store.append(_security_line(datetime.datetime.now(), 'INFO', 'NEW_EVENT'))
+
+    rotated = tmp_path / f'security.log.{yesterday.date().isoformat()}'
+    assert rotated.exists()
+    assert 'NEW_EVENT' not in rotated.read_text()
+    assert [entry['event_type'] for entry in store.query()] == ['NEW_EVENT', 'OLD_EVENT']
+
+
+def test_rotated_files_past_retention_are_removed(tmp_path):
+    """Rotation deletes rotated files older than the retention period."""
+    path = tmp_path / 'security.log'
+    old_day = (datetime.date.today() - datetime.timedelta(days=10)).isoformat()
+    (tmp_path / f'security.log.{old_day}').write_text('')
+    store = _store(path, retention_days=7)
+
+    conn = store._connection()
+    store._set_meta(conn, 'active_day', old_day)
+    store.append(_security_line(datetime.datetime.now(), 'INFO', 'EVENT'))
+
+    assert not os.path.exists(tmp_path / f'security.log.{old_day}')
+    assert len(store.query()) == 1
+
+
+def test_log_utils_read_back_through_the_store(app):
+    """The log_* writers and get_*_logs readers share the indexed store."""
+    log_utils.log_activity('Database', 'UPDATE', 'Person updated', user={'name': 'Ann', 'email': 'ann@example.com'})
+    log_utils.log_activity('API', 'READ', 'Listed people', status='FAILURE')
+    log_utils.log_database_event('SELECT', 'people', 'SLOW', 1200, query='SELECT * FROM people')
+    log_utils.log_database_event('INSERT', 'tasks', 'SUCCESS', 3)
+
+    activities = log_utils.get_activity_logs()
+    assert [a['description'] for a in activities] == ['Listed people', 'Person updated']
+    assert activities[1]['email'] == 'ann@example.com'
+    assert [a['operation'] for a in log_utils.get_activity_logs(level_filter='FAILURE')] == ['READ']
+    assert [a['operation'] for a in log_utils.get_activity_logs(search_term='ann@')] == ['UPDATE']
+
+    assert [e['table'] for e in log_utils.get_database_logs(table_filter='people')] == ['people']
+    assert [e['table'] for e in log_utils.get_database_logs(operation_filter='insert')] == ['tasks']
+    assert log_utils.get_database_logs(search_term='from people')[0]['duration'] == 1200
+    assert log_utils.get_email_logs() == []
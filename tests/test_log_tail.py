@@ -0,0 +1,66 @@
+import pytest
+from app.utils.log_utils import parse_log_file, reverse_lines
+
+
+pytestmark = pytest.mark.usefixtures('app_context')
+
+
+def _write_log(path, count):
+    lines = []
+    for i in range(count):
+        level = 'ERROR' if i % 4 == 0 else 'INFO'
+        lines.append(f'[2024-01-01 10:{i // 60:02d}:{i % 60:02d},000] {level}: message {i}')
+        if level == 'ERROR':
+            lines.append(f'Traceback for message {i}')
+    path.write_text('\n'.join(lines) + '\n')
+
+
+def test_reverse_lines_yields_offsets_from_the_end():
+    data = b'first\nsecond\r\nthird'
+    assert list(reverse_lines(data)) == [(14, b'third'), (6, b'second'), (0, b'first')]
+    assert list(reverse_lines(data, 6)) == [(0, b'first')]
+
+
+def test_newest_entries_come_first_with_continuation_lines(app, tmp_path):
+    """The tail of the file is returned, with trailing lines folded into their entry."""
+    path = tmp_path / 'app.log'
+    _write_log(path, 100)
+
+    entries = parse_log_file(str(path), max_entries=3)
+    assert [entry['message'] for entry in entries] == ['message 99', 'message 98', 'message 97']
+
+    errors = parse_log_file(str(path), max_entries=2, level_filter='ERROR')
+    assert [entry['message'] for entry in errors] == [
+        'message 96\nTraceback for message 96',
+        'message 92\nTraceback for message 92'
+    ]
+
+
+def test_offset_cursor_pages_backwards(app, tmp_path):
+    """Passing the last entry's offset as before returns the next, older page."""
+    path = tmp_path / 'app.log'
+    _write_log(path, 25)
+
+    seen = []
+    before = None
+    while True:
+        page = parse_log_file(str(path), max_entries=10, before=before)
+        seen.extend(entry['message'].split('\n')[0] for entry in page)
+        if len(page) < 10 or page[-1]['offset'] == 0:
+            break
+        before = page[-1]['offset']
+
+    assert seen == [f'message {i}' for i in reversed(range(25))]
+
+
+def test_all_log_formats_are_parsed(app, tmp_path):
+    path = tmp_path / 'app.log'
+    path.write_text(
+        '[2024-01-01 10:00:00 +0000] [INFO] [1234] Booting worker\n'
+        '2024-01-01 10:00:01,000 - WARNING - Flask warning\n'
+        '[2024-01-01 10:00:02,000] ERROR: Standard error\n'
+    )
+    entries = parse_log_file(str(path))
+    assert [(entry['level'], entry['message']) for entry in entries] == [
+        ('ERROR', 'Standard error'), ('WARNING', 'Flask warning'), ('INFO', 'Booting worker')
+    ]
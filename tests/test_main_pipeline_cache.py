@@ -0,0 +1,77 @@
+import pytest
+from sqlalchemy import event
+from app import db
+from app.extensions import cache
+from app.models import Pipeline
+from app.services.bootstrap import run_bootstrap
+from app.utils.caching import get_main_pipeline, MAIN_PIPELINES_VERSION_KEY
+
+
+pytestmark = pytest.mark.usefixtures('app_context')
+
+
+@pytest.fixture
+def main_pipeline(app):
+    # The app fixture recreates the tables, so set up the main pipelines again
+    run_bootstrap()
+    return Pipeline.query.filter_by(is_main_pipeline=True, pipeline_type='people').order_by(Pipeline.id).first()
+
+
+class QueryCounter:
+    def __init__(self):
+        self.count = 0
+
+    def __call__(self, *args, **kwargs):
+        self.count += 1
+
+    def __enter__(self):
+        event.listen(db.engine, 'before_cursor_execute', self)
+        return self
+
+    def __exit__(self, *exc):
+        event.remove(db.engine, 'before_cursor_execute', self)
+
+
+def test_main_pipeline_is_cached_until_changed(main_pipeline):
+    """Metadata is loaded once per process and reloaded after a committed change."""
+    stage_names = [stage.name for stage in main_pipeline.get_active_stages()]
+    pipeline = get_main_pipeline('people')
+    assert pipeline.id == main_pipeline.id
+    assert [stage['name'] for stage in pipeline.get_active_stages()] == stage_names
+
+    with QueryCounter() as counter:
+        get_main_pipeline('people')
+    assert counter.count == 0
+
+    stage = main_pipeline.get_first_stage()
+    stage.name = "Renamed Stage"
+    db.session.commit()
+    assert get_main_pipeline('people').stages[0]['name'] == "Renamed Stage"
+
+
+def test_version_bump_from_another_worker_reloads(main_pipeline):
+    """A new version in the shared cache makes this process reload."""
+    get_main_pipeline('people')
+    name = main_pipeline.name
+    db.session.execute(db.update(Pipeline).values(name="Renamed"))
+    db.session.commit()
+    assert get_main_pipeline('people').name == name
+
+    cache.set(MAIN_PIPELINES_VERSION_KEY, 'another-worker', timeout=0)
+    assert get_main_pipeline('people').name == "Renamed"
+
+
+def test_templates_only_query_when_pipeline_used(app, main_pipeline):
+    """The context processor injects lazy proxies."""
+    with app.test_request_context('/'):
+        with QueryCounter() as counter:
+            rendered = app.jinja_env.from_string("{{ 'x' }}").render(
+                **{k: v for processor in app.template_context_processors[None] for k, v in processor().items()
+                   if k.endswith('main_pipeline')}
+            )
+        assert rendered == 'x' and counter.count == 0
+
+        from flask import render_template_string
+        assert render_template_string(
+            "{% if people_main_pipeline %}{{ people_main_pipeline.id }}{% endif %}"
+        ) == str(main_pipeline.id)
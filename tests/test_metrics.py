@@ -0,0 +1,113 @@
+import pytest
+from flask import jsonify
+from app.models import Office
+from app.monitoring.metrics import LatencyHistogram, MetricsRegistry, bucket_index, bucket_bounds, metrics
+from app.utils.system_monitor import get_api_stats
+
+
+pytestmark = pytest.mark.usefixtures('app_context')
+
+
+@pytest.fixture
+def app(app):
+
+    @app.route('/metrics-test/offices/<int:count>')
+    def metrics_test_offices(count):
+        for _ in range(count):
+            Office.query.count()
+        return jsonify({'ok': True})
+
+    metrics.reset()
+    return app
+
+
+def test_histogram_buckets_and_quantiles():
+    """Buckets tile the value range and quantiles stay within the bucket error."""
+    previous = -1
+    for value in range(0, 5000):
+        index = bucket_index(value)
+        lowest, highest = bucket_bounds(index)
+        assert lowest <= value <= highest
+        assert index >= previous
+        previous = index
+
+    histogram = LatencyHistogram()
+    for micros in range(1000, 101000, 1000):
+        histogram.record(micros)
+    assert abs(histogram.quantile(0.5) - 50000) / 50000 < 0.05
+    assert abs(histogram.quantile(0.99) - 99000) / 99000 < 0.05
+    assert histogram.quantile(1.0) == 100000
+
+
+def test_requests_are_recorded_per_route_with_db_queries(app):
+    """Requests are grouped by route rule and carry their query counts."""
+    client = app.test_client()
+    client.get('/metrics-test/offices/3')
+    client.get('/metrics-test/offices/1')
+
+    stats = {item['path']: item for item in get_api_stats()}
+    route = stats['/metrics-test/offices/<int:count>']
+    assert route['count'] == 2
+    assert route['avg_db_queries'] == 2.0
+    assert route['error_rate'] == 0
+
+    response = client.get('/api/metrics')
+    body = response.get_data(as_text=True)
+    assert response.status_code == 200
+    assert ('mobilize_request_duration_seconds_count{endpoint="/metrics-test/offices/<int:count>",'
+            'method="GET",status="200"} 2') in body
+    assert ('mobilize_request_db_queries_total{endpoint="/metrics-test/offices/<int:count>",'
+            'method="GET",status="200"} 4') in body
+
+
+def test_metrics_endpoint_requires_token_when_configured(app):
+    """A configured METRICS_TOKEN protects the scrape endpoint."""
+    app.config['METRICS_TOKEN'] = 'scrape-secret'
+    client = app.test_client()
+    assert client.get('/api/metrics').status_code == 401
+    assert client.get('/api/metrics', headers={'Authorization': 'Bearer scrape-secret'}).status_code == 200
+
+
+def test_metrics_endpoint_is_not_public_without_token_outside_debug(app):
+    """Without a METRICS_TOKEN the endpoint is only served in debug."""
+    app.debug = False
+    assert app.test_client().get('/api/metrics').status_code == 404
+
+
+def test_registry_merges_thread_shards():
+    """Each thread records into its own shard and snapshots merge them."""
+    import threading
+
+    registry = MetricsRegistry()
+
+    def work():
+        for _ in range(100):
+            registry.observe_request('/people', 'GET', 200, 0.01, db_queries=2, db_time=0.001)
+
+    threads = [threading.Thread(target=work) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    stats = registry.snapshot()[('/people', 'GET', 200)]
+    assert (stats.latency.count, stats.db_queries) == (400, 800)
+
+
+def test_registry_folds_shards_of_exited_threads():
+    """Shards of finished threads are merged into the base instead of piling up."""
+    import threading
+
+    registry = MetricsRegistry()
+
+    def work():
+        registry.observe_request('/people', 'GET', 200, 0.01, db_queries=1)
+
+    for _ in range(50):
+        thread = threading.Thread(target=work)
+        thread.start()
+        thread.join()
+
+    stats = registry.snapshot()[('/people', 'GET', 200)]
+    assert (stats.latency.count, stats.db_queries) == (50, 50)
+    assert len(registry._shards) == 0
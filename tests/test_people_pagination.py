@@ -0,0 +1,91 @@
+import pytest
+from sqlalchemy import event
+from app import db
+from app.models import Office, User, Person
+from app.utils.caching import PEOPLE_LIST_ORDER, _get_people_data
+from app.utils.query_optimization import with_keyset_pagination, encode_cursor
+
+
+pytestmark = pytest.mark.usefixtures('app_context')
+
+
+@pytest.fixture
+def office(app):
+    office = Office(name="Paging Office")
+    db.session.add(office)
+    db.session.commit()
+    # Repeated last names so the first name and id break ties
+    names = [("Ann", "Smith"), ("Bob", "Smith"), ("Bob", "Smith"), ("Cy", "Adams"),
+             ("Di", "Young"), ("Ed", "Brown"), ("Flo", "Smith")]
+    db.session.add_all([Person(first_name=first, last_name=last, office_id=office.id) for first, last in names])
+    db.session.commit()
+    return office
+
+
+def _expected_order(office):
+    return [person.id for person in Person.query.filter_by(office_id=office.id).order_by(*PEOPLE_LIST_ORDER)]
+
+
+def test_keyset_pages_cover_every_row_once(office):
+    """Walking the cursors visits every person once in name order without counting rows."""
+    statements = []
+
+    def record(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    event.listen(db.engine, 'before_cursor_execute', record)
+    seen, cursor = [], None
+    try:
+        while True:
+            people, pagination = with_keyset_pagination(
+                Person.query.filter_by(office_id=office.id), PEOPLE_LIST_ORDER, cursor, per_page=3
+            )
+            seen.extend(person.id for person in people)
+            if not pagination['has_next']:
+                break
+            cursor = pagination['next_cursor']
+    finally:
+        event.remove(db.engine, 'before_cursor_execute', record)
+
+    assert seen == _expected_order(office)
+    assert not any('count(' in statement.lower() for statement in statements)
+
+
+def test_bad_cursor_starts_from_first_page(office):
+    """A malformed or mismatched cursor is ignored rather than raising."""
+    first_page = _expected_order(office)[:2]
+    for cursor in ['not-a-cursor', encode_cursor(['Smith'])]:
+        people, pagination = with_keyset_pagination(Person.query, PEOPLE_LIST_ORDER, cursor, per_page=2)
+        assert [person.id for person in people] == first_page
+        assert pagination['has_prev'] is False
+
+
+def test_people_data_and_list_page_use_cursor(app, office):
+    """The cached people data and the JSON listing both serve one keyset page at a time."""
+    order = _expected_order(office)
+    data = _get_people_data(office.id, per_page=4)
+    assert [person.id for person in data['people']] == order[:4]
+    assert set(data['pipeline_stages']) == set(order[:4])
+
+    data = _get_people_data(office.id, data['pagination']['next_cursor'], per_page=4)
+    assert [person.id for person in data['people']] == order[4:]
+    assert data['pagination']['has_next'] is False
+
+    user = User(username="paging_user", email="paging@example.com", role="super_admin", office_id=office.id)
+    db.session.add(user)
+    db.session.commit()
+
+    user_id = user.id
+    client = app.test_client()
+    with client.session_transaction() as session:
+        session['_user_id'] = str(user_id)
+        session['_fresh'] = True
+
+    response = client.get('/people/search?per_page=5')
+    assert response.status_code == 200
+    assert [person['id'] for person in response.get_json()] == order[:5]
+    cursor = response.headers['X-Next-Cursor']
+
+    response = client.get(f'/people/search?per_page=5&cursor={cursor}')
+    assert [person['id'] for person in response.get_json()] == order[5:]
+    assert 'X-Next-Cursor' not in response.headers
@@ -0,0 +1,46 @@
+from types import SimpleNamespace
+import pytest
+from flask import Flask
+from app.utils.email_service import replace_template_variables, insert_tracking_pixel, add_tracking_to_links
+from app.utils.personalization import compile_template, merge_values, FIELD, TRACKING_ID
+
+BODY = ('<html><body><p>Dear [Name],</p><p>[Unknown]Call [Phone].</p>'
+        '<a href="https://example.com/a?x=1&y=2">A</a> <a href="https://example.com/u/[Email]">Me</a>'
+        '</body></html>')
+
+
+@pytest.fixture
+def app():
+    app = Flask(__name__)
+    app.config['BASE_URL'] = 'https://crm.example.com'
+    with app.app_context():
+        yield app
+
+
+def recipient(**overrides):
+    fields = dict(first_name='Ada', last_name='Lovelace', email='ada@example.com', phone=None, address='1 Main St')
+    fields.update(overrides)
+    return SimpleNamespace(**fields)
+
+
+def legacy_render(content, person, tracking_id):
+    content = replace_template_variables(content, person)
+    return add_tracking_to_links(insert_tracking_pixel(content, tracking_id), tracking_id)
+
+
+@pytest.mark.parametrize('content', [BODY, BODY.replace('</body></html>', ''), 'Hi [FirstName] [LastName]'])
+def test_compiled_render_matches_legacy_path(app, content):
+    """The compiled template produces exactly what the replace/regex path produced."""
+    template = compile_template(content, base_url=app.config['BASE_URL'])
+    for person, tracking_id in [(recipient(), 'track-1'), (recipient(first_name='Bo', phone='555'), 'track-2')]:
+        assert template.render(merge_values(person), tracking_id) == legacy_render(content, person, tracking_id)
+
+
+def test_template_is_parsed_once_into_slots():
+    """Literal text is merged into fragments around field and tracking id slots."""
+    template = compile_template('Hi [FirstName]<a href="https://example.com/">x</a>', base_url='https://crm.example.com')
+    assert template.segments[:3] == ['Hi ', (FIELD, 'FirstName'),
+                                     '<a href="https://crm.example.com/emails/track/click/']
+    assert template.segments[3] == (TRACKING_ID, None)
+    assert template.fields == {'FirstName'}
+    assert compile_template('Hello [Name]').render({}) == 'Hello '
@@ -0,0 +1,77 @@
+import pytest
+from datetime import datetime, timedelta
+from app import db
+from app.models import Office, Person, Pipeline, PipelineStage, PipelineContact, PipelineStageHistory
+from app.services.pipeline_automation import process_automatic_movements
+
+
+pytestmark = pytest.mark.usefixtures('app_context')
+
+
+@pytest.fixture
+def pipeline(app):
+    office = Office(name="Automation Office")
+    db.session.add(office)
+    db.session.commit()
+    pipeline = Pipeline(name="Follow Up", pipeline_type='person', office_id=office.id)
+    db.session.add(pipeline)
+    db.session.commit()
+    stages = [
+        PipelineStage(name="New", order=1, pipeline_id=pipeline.id, auto_move_days=7),
+        PipelineStage(name="Contacted", order=2, pipeline_id=pipeline.id, auto_move_days=3),
+        PipelineStage(name="Done", order=3, pipeline_id=pipeline.id, auto_move_days=1)
+    ]
+    db.session.add_all(stages)
+    db.session.commit()
+    return pipeline, stages
+
+
+def _add_contact(pipeline, stage, days_ago, name):
+    person = Person(first_name=name, last_name="Auto", office_id=pipeline.office_id)
+    db.session.add(person)
+    db.session.commit()
+    pipeline_contact = PipelineContact(contact_id=person.id, pipeline_id=pipeline.id, current_stage_id=stage.id)
+    db.session.add(pipeline_contact)
+    db.session.commit()
+    # Set after the insert so the onupdate default does not overwrite it
+    db.session.execute(db.update(PipelineContact).where(PipelineContact.id == pipeline_contact.id)
+                       .values(last_updated=datetime.utcnow() - timedelta(days=days_ago)))
+    db.session.commit()
+    return pipeline_contact.id
+
+
+def test_due_contacts_move_to_next_stage_with_history(pipeline):
+    """Overdue contacts move one stage on, with history and the person's stage name updated."""
+    pipeline, (new, contacted, done) = pipeline
+    overdue_new = _add_contact(pipeline, new, 10, "A")
+    recent_new = _add_contact(pipeline, new, 2, "B")
+    overdue_contacted = _add_contact(pipeline, contacted, 5, "C")
+    last_stage = _add_contact(pipeline, done, 30, "D")
+
+    assert process_automatic_movements() == 2
+
+    stages = {pc.id: pc.current_stage_id for pc in PipelineContact.query}
+    assert stages == {overdue_new: contacted.id, recent_new: new.id,
+                      overdue_contacted: done.id, last_stage: done.id}
+
+    history = {h.pipeline_contact_id: h for h in PipelineStageHistory.query}
+    assert set(history) == {overdue_new, overdue_contacted}
+    assert (history[overdue_new].from_stage_id, history[overdue_new].to_stage_id) == (new.id, contacted.id)
+    assert history[overdue_new].notes == "Automatically moved after 7 days in stage"
+
+    moved = db.session.get(PipelineContact, overdue_new)
+    assert db.session.get(Person, moved.contact_id).pipeline_stage == "Contacted"
+
+    # A moved contact starts its wait in the new stage again
+    assert process_automatic_movements() == 0
+
+
+def test_dry_run_reports_without_changes(pipeline):
+    """A dry run counts due contacts and leaves the pipeline untouched."""
+    pipeline, (new, contacted, done) = pipeline
+    _add_contact(pipeline, new, 10, "A")
+    _add_contact(pipeline, new, 8, "B")
+
+    assert process_automatic_movements(dry_run=True) == 2
+    assert PipelineContact.query.filter_by(current_stage_id=new.id).count() == 2
+    assert PipelineStageHistory.query.count() == 0
@@ -0,0 +1,99 @@
+import pytest
+from sqlalchemy import event
+from app import db
+from app.models import Office, User, Person, Church, Pipeline, PipelineStage, PipelineContact
+from app.models.constants import PEOPLE_PIPELINE_CHOICES, CHURCH_PIPELINE_CHOICES
+from app.utils.migrate_contacts_to_main_pipeline import migrate_contacts_to_main_pipeline
+from app.utils.ensure_church_pipeline import ensure_churches_in_pipeline
+
+
+# The app fixture recreates the tables, so tests start without the main
+# pipelines the startup bootstrap creates
+pytestmark = pytest.mark.usefixtures('app_context')
+
+
+def _pipeline(office, pipeline_type, choices):
+    pipeline = Pipeline(name=f"Main {pipeline_type}", pipeline_type=pipeline_type,
+                        is_main_pipeline=True, office_id=office.id)
+    db.session.add(pipeline)
+    db.session.flush()
+    stages = {}
+    for order, (name, _) in enumerate(choices, start=1):
+        stages[name] = PipelineStage(name=name, order=order, pipeline_id=pipeline.id)
+        db.session.add(stages[name])
+    db.session.flush()
+    return pipeline, stages
+
+
+def _owner(office):
+    user = User(username=f"owner{office.id}", email=f"owner{office.id}@example.com", office_id=office.id)
+    db.session.add(user)
+    db.session.flush()
+    return user
+
+
+def _stage_of(pipeline, contact):
+    membership = PipelineContact.query.filter_by(pipeline_id=pipeline.id, contact_id=contact.id).first()
+    return membership.current_stage.name if membership else None
+
+
+def test_missing_contacts_are_added_in_one_statement_per_type(app):
+    """Each office's missing people and churches are inserted set-based, in their mapped stage."""
+    office = Office(name="Reconcile Office")
+    other_office = Office(name="Other Office")
+    db.session.add_all([office, other_office])
+    db.session.flush()
+    pipeline, stages = _pipeline(office, 'person', PEOPLE_PIPELINE_CHOICES)
+
+    invited = Person(first_name="Ivy", last_name="Invited", office_id=office.id, people_pipeline='invitation')
+    unknown = Person(first_name="Una", last_name="Unknown", office_id=office.id, people_pipeline='SOMETHING ELSE')
+    member = Person(first_name="Mem", last_name="Ber", office_id=office.id, people_pipeline='PROMOTION')
+    elsewhere = Person(first_name="Else", last_name="Where", office_id=other_office.id)
+    church = Church(name="Grace Church", office_id=office.id, owner_id=_owner(office).id)
+    db.session.add_all([invited, unknown, member, elsewhere, church])
+    db.session.flush()
+    db.session.add(PipelineContact(pipeline_id=pipeline.id, contact_id=member.id,
+                                   current_stage_id=stages['CONFIRMATION'].id))
+    db.session.commit()
+
+    inserts = []
+
+    def count_inserts(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith('INSERT INTO PIPELINE_CONTACTS'):
+            inserts.append(statement)
+
+    event.listen(db.engine, 'before_cursor_execute', count_inserts)
+    try:
+        result = migrate_contacts_to_main_pipeline()
+    finally:
+        event.remove(db.engine, 'before_cursor_execute', count_inserts)
+
+    assert result == {'people': 2, 'churches': 1}
+    assert len(inserts) == 2
+    assert _stage_of(pipeline, invited) == 'INVITATION'
+    assert _stage_of(pipeline, unknown) == 'INFORMATION'
+    assert _stage_of(pipeline, member) == 'CONFIRMATION'
+    assert _stage_of(pipeline, church) == 'INFORMATION'
+    assert _stage_of(pipeline, elsewhere) is None
+
+    # Nothing left to add
+    assert migrate_contacts_to_main_pipeline() == {'people': 0, 'churches': 0}
+
+
+def test_churches_are_added_to_the_main_church_pipeline(app):
+    """Churches missing from the main church pipeline are added in its INFORMATION stage."""
+    office = Office(name="Main Office")
+    db.session.add(office)
+    db.session.flush()
+    pipeline, stages = _pipeline(office, 'church', CHURCH_PIPELINE_CHOICES)
+    owner = _owner(office)
+    churches = [Church(name=f"Church {i}", office_id=office.id, owner_id=owner.id) for i in range(3)]
+    db.session.add_all(churches)
+    db.session.flush()
+    db.session.add(PipelineContact(pipeline_id=pipeline.id, contact_id=churches[0].id,
+                                   current_stage_id=stages['EN42'].id))
+    db.session.commit()
+
+    assert ensure_churches_in_pipeline() == 2
+    assert [_stage_of(pipeline, church) for church in churches] == ['EN42', 'INFORMATION', 'INFORMATION']
+    assert ensure_churches_in_pipeline() == 0
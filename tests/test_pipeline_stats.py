@@ -0,0 +1,91 @@
+import pytest
+from sqlalchemy import event
+from app import db
+from app.extensions import cache
+from app.models import Office, Person, Pipeline, PipelineStage, PipelineContact
+from app.services.pipeline_stats import get_stage_counts, get_pipeline_counts
+
+
+@pytest.fixture(autouse=True)
+def empty_cache(app_context):
+    cache.clear()
+
+
+@pytest.fixture
+def pipeline(app):
+    offices = [Office(name="Stats Office A"), Office(name="Stats Office B")]
+    db.session.add_all(offices)
+    db.session.commit()
+    pipeline = Pipeline(name="Stats", pipeline_type='person', office_id=offices[0].id)
+    db.session.add(pipeline)
+    db.session.commit()
+    stages = [PipelineStage(name=name, order=order, pipeline_id=pipeline.id)
+              for order, name in enumerate(["New", "Met", "Joined"], start=1)]
+    db.session.add_all(stages)
+    db.session.commit()
+
+    # New: 2 in office A (one assigned to "sam"), 1 in office B; Met: 1 in office A
+    for stage, office, assigned_to in [(stages[0], offices[0], "sam"), (stages[0], offices[0], None),
+                                       (stages[0], offices[1], "sam"), (stages[1], offices[0], None)]:
+        person = Person(first_name="Stat", last_name="Person", office_id=office.id, assigned_to=assigned_to)
+        db.session.add(person)
+        db.session.flush()
+        db.session.add(PipelineContact(contact_id=person.id, pipeline_id=pipeline.id, current_stage_id=stage.id))
+    db.session.commit()
+    return pipeline, stages, offices
+
+
+class QueryCounter:
+    def __init__(self):
+        self.count = 0
+
+    def __call__(self, *args, **kwargs):
+        self.count += 1
+
+    def __enter__(self):
+        event.listen(db.engine, 'before_cursor_execute', self)
+        return self
+
+    def __exit__(self, *exc):
+        event.remove(db.engine, 'before_cursor_execute', self)
+
+
+def test_stage_counts_in_one_query_with_filters(pipeline):
+    """All stage counts come from one grouped query and honour office and assignee filters."""
+    pipeline, (new, met, joined), (office_a, office_b) = pipeline
+    pipeline_id, expected = pipeline.id, {new.id: 3, met.id: 1}
+    with QueryCounter() as counter:
+        assert get_stage_counts(pipeline_id) == expected
+    assert counter.count == 1
+
+    assert get_stage_counts(pipeline.id, office_id=office_a.id) == {new.id: 2, met.id: 1}
+    assert get_stage_counts(pipeline.id, assigned_to="sam") == {new.id: 2}
+    assert get_stage_counts(pipeline.id, office_id=office_b.id, assigned_to="sam") == {new.id: 1}
+    assert get_pipeline_counts([pipeline.id, 999]) == {pipeline.id: 4, 999: 0}
+
+
+def test_counts_are_cached_until_memberships_change(pipeline):
+    """Counts are served from the cache and refreshed after a PipelineContact write."""
+    pipeline, (new, met, joined), offices = pipeline
+    pipeline_id, expected = pipeline.id, {new.id: 3, met.id: 1}
+    get_stage_counts(pipeline_id)
+    with QueryCounter() as counter:
+        assert get_stage_counts(pipeline_id) == expected
+    assert counter.count == 0
+
+    membership = PipelineContact.query.filter_by(current_stage_id=met.id).first()
+    membership.current_stage_id = joined.id
+    db.session.commit()
+    assert get_stage_counts(pipeline.id) == {new.id: 3, joined.id: 1}
+    assert pipeline.count_contacts() == 4
+
+
+def test_stage_to_dict_shares_one_count_query(pipeline):
+    """Serialising every stage of a pipeline costs a single count query."""
+    pipeline, stages, offices = pipeline
+    for stage in stages:
+        db.session.refresh(stage)
+    with QueryCounter() as counter:
+        counts = [stage.to_dict()['contact_count'] for stage in stages]
+    assert counts == [3, 1, 0]
+    assert counter.count == 1
@@ -0,0 +1,77 @@
+import logging
+import pytest
+from flask import jsonify
+from app import db
+from app.models import Office, User, Person
+from app.monitoring.query_budget import QueryBudgetExceeded, normalize_statement
+
+
+@pytest.fixture
+def app(app):
+
+    @app.route('/budget-test/people')
+    def budget_test_people():
+        # One query for the ids, then one query per person
+        ids = [person.id for person in Person.query.with_entities(Person.id)]
+        return jsonify([db.session.get(Person, person_id).first_name for person_id in ids])
+
+    return app
+
+
+@pytest.fixture(autouse=True)
+def people(app_context):
+    office = Office(name="Budget Office")
+    db.session.add(office)
+    db.session.commit()
+    db.session.add_all([Person(first_name=f"P{i}", last_name="Budget", office_id=office.id) for i in range(6)])
+    db.session.commit()
+
+
+def test_statements_with_different_values_share_a_shape():
+    """Literals, bound parameters and IN lists do not distinguish query shapes."""
+    assert normalize_statement("SELECT * FROM people WHERE id = ?") == \
+        normalize_statement("SELECT *\n  FROM people WHERE id = 42")
+    assert normalize_statement("SELECT * FROM people WHERE id IN (?, ?, ?)") == \
+        normalize_statement("SELECT * FROM people WHERE id IN (?)")
+    assert normalize_statement("SELECT * FROM people WHERE name = 'Ann'") == \
+        normalize_statement("SELECT * FROM people WHERE name = %(name_1)s")
+    assert normalize_statement("SELECT * FROM people") != normalize_statement("SELECT * FROM churches")
+
+
+def test_repeated_shapes_are_reported_as_n_plus_one(app, caplog):
+    """A query repeated once per row is logged and the count is exposed in a header."""
+    # The view's 7 queries plus the connection check on checkout
+    with caplog.at_level(logging.WARNING, logger='app.monitoring.query_budget'):
+        response = app.test_client().get('/budget-test/people')
+    assert response.status_code == 200
+    assert response.headers['X-Query-Count'] == '8'
+    assert any('Likely N+1' in record.message and '6 x SELECT' in record.message for record in caplog.records)
+
+
+def test_exceeding_the_budget_fails_the_request(app):
+    """In strict mode a request over its endpoint budget raises."""
+    app.config['QUERY_BUDGETS'] = {'budget_test_people': 3}
+    with pytest.raises(QueryBudgetExceeded, match='ran 8 queries, budget is 3'):
+        app.test_client().get('/budget-test/people')
+
+    app.config['QUERY_BUDGETS'] = {'/budget-test/people': 8}
+    assert app.test_client().get('/budget-test/people').status_code == 200
+
+
+def test_people_search_query_count_is_locked_in(app):
+    """The people JSON listing stays within a fixed number of queries."""
+    office_id = Office.query.first().id
+    user = User(username="budget_user", email="budget@example.com", role="super_admin", office_id=office_id)
+    db.session.add(user)
+    db.session.commit()
+
+    user_id = user.id
+    client = app.test_client()
+    with client.session_transaction() as session:
+        session['_user_id'] = str(user_id)
+        session['_fresh'] = True
+
+    # TestingConfig.QUERY_BUDGETS holds the budget for people.search
+    for query_string in ['per_page=5', 'per_page=50']:
+        response = client.get(f'/people/search?{query_string}')
+        assert response.status_code == 200
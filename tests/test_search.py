@@ -0,0 +1,133 @@
+import pytest
+from app import db
+from app.models import Office, User, Person, Church
+from app.services.search_service import apply_search, has_search_index, rebuild_search_index
+
+
+pytestmark = pytest.mark.usefixtures('app_context')
+
+
+@pytest.fixture
+def office(app):
+    office = Office(name="Search Office")
+    db.session.add(office)
+    db.session.commit()
+    owner = User(username="search_owner", email="owner@example.com", role="office_admin", office_id=office.id)
+    db.session.add(owner)
+    db.session.commit()
+    office.owner_id = owner.id
+    return office
+
+
+def _names(query):
+    return [person.last_name for person in query]
+
+
+def test_search_index_created_with_tables(office):
+    """create_all installs the FTS index, and triggers keep it in step with writes."""
+    assert has_search_index()
+
+    person = Person(first_name="Ada", last_name="Lovelace", email="ada@example.com", office_id=office.id)
+    db.session.add(person)
+    db.session.commit()
+    assert _names(apply_search(Person.query, Person, "lovel")) == ["Lovelace"]
+
+    person.last_name = "Byron"
+    db.session.commit()
+    assert _names(apply_search(Person.query, Person, "lovel")) == []
+    assert _names(apply_search(Person.query, Person, "byron")) == ["Byron"]
+
+    db.session.delete(person)
+    db.session.commit()
+    assert _names(apply_search(Person.query, Person, "byron")) == []
+
+
+def test_search_matches_every_term_and_ranks(office):
+    """All terms must match (substrings, short terms as word prefixes); better matches come first."""
+    db.session.add_all([
+        Person(first_name="Mary", last_name="Smith", email="mary@example.com", phone="555-0100", office_id=office.id),
+        Person(first_name="Smith", last_name="Smithson", email="smith@smith.org", office_id=office.id),
+        Person(first_name="John", last_name="Jones", email="jj@example.com", city="Smithville", office_id=office.id),
+        Person(first_name="Mo", last_name="Smithers", email="mo@example.com", office_id=office.id)
+    ])
+    db.session.commit()
+
+    results = _names(apply_search(Person.query, Person, "smith"))
+    assert set(results) == {"Smith", "Smithson", "Jones", "Smithers"}
+    assert results[0] == "Smithson"
+
+    assert _names(apply_search(Person.query, Person, "mary 0100")) == ["Smith"]
+    assert _names(apply_search(Person.query, Person, "mo smith")) == ["Smithers"]
+    assert set(_names(apply_search(Person.query, Person, "jo"))) == {"Jones"}
+    assert _names(apply_search(Person.query, Person, "100%")) == []
+    assert apply_search(Person.query, Person, "  ").count() == 4
+
+
+def test_search_churches_and_rebuild(office):
+    """Church names and details are indexed, and a rebuild restores the index."""
+    church = Church(name="Grace Fellowship", denomination="Baptist", city="Raleigh",
+                    office_id=office.id, owner_id=office.owner_id)
+    db.session.add(church)
+    db.session.add(Person(first_name="Grace", last_name="Hopper", office_id=office.id))
+    db.session.commit()
+
+    churches = apply_search(Church.query, Church, "grace bapt").all()
+    assert [c.name for c in churches] == ["Grace Fellowship"]
+    assert _names(apply_search(Person.query, Person, "grace")) == ["Hopper"]
+
+    db.session.execute(db.text("DELETE FROM contacts_fts"))
+    db.session.execute(db.text("DELETE FROM contacts_prefix_fts"))
+    assert apply_search(Church.query, Church, "grace").count() == 0
+    assert rebuild_search_index() == 2
+    assert apply_search(Church.query, Church, "raleigh").count() == 1
+
+
+def test_bootstrap_installs_index_on_existing_database(office):
+    """Databases created before the index get it from the search_index bootstrap step."""
+    from app.models.bootstrap import BootstrapStep
+    from app.services.bootstrap import run_bootstrap
+    from app.services.search_service import drop_search_index
+
+    run_bootstrap()
+    db.session.add(Person(first_name="Ada", last_name="Lovelace", office_id=office.id))
+    db.session.commit()
+    drop_search_index(db.session.connection())
+    BootstrapStep.query.filter_by(name='search_index').delete()
+    db.session.commit()
+    assert not has_search_index()
+
+    assert run_bootstrap() == ['search_index']
+    assert has_search_index()
+    assert _names(apply_search(Person.query, Person, "lovel")) == ["Lovelace"]
+
+
+def test_updates_of_unindexed_columns_leave_the_index_alone(office):
+    """Only changes to the searched columns refresh a contact's search documents."""
+    church = Church(name="Grace Fellowship", office_id=office.id, owner_id=office.owner_id)
+    db.session.add_all([church, Person(first_name="Ada", last_name="Lovelace", office_id=office.id)])
+    db.session.commit()
+    sqlite = db.session.connection().connection.driver_connection
+
+    before = sqlite.total_changes
+    db.session.execute(db.text("UPDATE contacts SET updated_at = CURRENT_TIMESTAMP"))
+    db.session.execute(db.text("UPDATE churches SET assigned_to = 'UNASSIGNED', name = name"))
+    assert sqlite.total_changes - before == 3
+
+    db.session.execute(db.text("UPDATE churches SET name = 'Hope Chapel'"))
+    db.session.commit()
+    assert [c.name for c in apply_search(Church.query, Church, "hope")] == ["Hope Chapel"]
+    assert apply_search(Church.query, Church, "grace").count() == 0
+
+
+def test_cached_church_list_uses_the_search_index(office):
+    """The cached church listing searches through apply_search."""
+    from app.utils.church_caching import _get_churches_data
+
+    db.session.add_all([
+        Church(name="Grace Fellowship", denomination="Baptist", office_id=office.id, owner_id=office.owner_id),
+        Church(name="Hope Chapel", office_id=office.id, owner_id=office.owner_id)
+    ])
+    db.session.commit()
+
+    result = _get_churches_data(office_id=office.id, search_query="bapt")
+    assert [church.name for church in result['churches']] == ["Grace Fellowship"]
@@ -0,0 +1,105 @@
+import pytest
+from datetime import date, datetime, timedelta
+from sqlalchemy import event
+from app import db
+from app.models import Office, User
+from app.models.task import Task, TaskStatus
+from app.services import task_reminders
+
+
+pytestmark = pytest.mark.usefixtures('app_context')
+
+
+@pytest.fixture
+def users(app):
+    office = Office(name="Reminder Office")
+    db.session.add(office)
+    db.session.flush()
+    users = []
+    for name in ('owner', 'assignee', 'quiet'):
+        user = User(username=name, email=f"{name}@example.com", office_id=office.id,
+                    notification_settings={'notify_tasks': name != 'quiet'})
+        db.session.add(user)
+        users.append(user)
+    db.session.commit()
+    return users
+
+
+def _task(title, due, reminder_option='1_hour', **kwargs):
+    task = Task(title=title, due_date=due, due_time=due.strftime('%H:%M'), reminder_option=reminder_option, **kwargs)
+    db.session.add(task)
+    return task
+
+
+def test_next_reminder_at_is_kept_up_to_date_on_write(users):
+    due = datetime.combine(date.today() + timedelta(days=2), datetime.min.time()).replace(hour=9, minute=30)
+    task = _task("Call", due, owner_id=users[0].id)
+    db.session.commit()
+    assert task.next_reminder_at == due - timedelta(hours=1)
+
+    task.reminder_option = '1_day'
+    db.session.commit()
+    assert task.next_reminder_at == due - timedelta(days=1)
+
+    task.status = TaskStatus.COMPLETED
+    db.session.commit()
+    assert task.next_reminder_at is None
+
+
+def test_due_reminders_are_sent_in_batches_and_marked_sent(users):
+    owner, assignee, quiet = users
+    now = datetime.now().replace(microsecond=0)
+    soon = now + timedelta(minutes=30)
+    due = [
+        _task("Owner only", soon, owner_id=owner.id),
+        _task("Owner and assignee", soon, owner_id=owner.id, assigned_to=str(assignee.id)),
+        _task("Quiet owner", soon, owner_id=quiet.id),
+    ]
+    later = _task("Later", now + timedelta(days=3), owner_id=owner.id)
+    missed = _task("Missed", now - timedelta(hours=3), reminder_option='15_min', owner_id=owner.id)
+    db.session.commit()
+    task_ids = [task.id for task in due]
+    later_id, missed_id = later.id, missed.id
+    owner_id, assignee_id = owner.id, assignee.id
+
+    sent = []
+    user_selects = []
+
+    def count_user_selects(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith('SELECT') and 'FROM users' in statement:
+            user_selects.append(statement)
+
+    event.listen(db.engine, 'before_cursor_execute', count_user_selects)
+    try:
+        reminded = task_reminders.send_due_reminders(
+            now=now, batch_size=2, notify=lambda task, user: sent.append((task.title, user.id))
+        )
+    finally:
+        event.remove(db.engine, 'before_cursor_execute', count_user_selects)
+
+    assert reminded == 3
+    assert len(user_selects) == 2
+    assert sorted(sent) == sorted([
+        ("Owner only", owner_id), ("Owner and assignee", owner_id), ("Owner and assignee", assignee_id)
+    ])
+    for task_id in task_ids:
+        task = db.session.get(Task, task_id)
+        assert task.last_synced_at == now
+        assert task.next_reminder_at is None
+    assert db.session.get(Task, later_id).next_reminder_at is not None
+    assert db.session.get(Task, missed_id).next_reminder_at is None
+
+    # Nothing is sent twice
+    assert task_reminders.send_due_reminders(now=now, notify=lambda task, user: sent.append(task)) == 0
+
+
+def test_existing_tasks_are_backfilled(users):
+    due = datetime.now() + timedelta(days=1)
+    task = _task("Old task", due, reminder_option='2_hours', owner_id=users[0].id)
+    db.session.commit()
+    db.session.execute(Task.__table__.update().values(next_reminder_at=None))
+    db.session.commit()
+
+    assert task_reminders.schedule_existing_reminders(batch_size=1) == 1
+    db.session.commit()
+    assert db.session.get(Task, task.id).next_reminder_at == due.replace(second=0, microsecond=0) - timedelta(hours=2)
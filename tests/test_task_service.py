@@ -0,0 +1,87 @@
+import pytest
+from datetime import date, datetime, timedelta
+from sqlalchemy import event
+from app import db
+from app.models import Office, User
+from app.models.task import Task, TaskStatus, TaskPriority
+from app.services.task_service import (
+    user_tasks_query, filter_tasks, get_task_page, get_task_counts, get_upcoming_tasks
+)
+
+
+pytestmark = pytest.mark.usefixtures('app_context')
+
+
+@pytest.fixture
+def user(app):
+    office = Office(name="Task Office")
+    db.session.add(office)
+    db.session.flush()
+    user = User(username="tasker", email="tasker@example.com", office_id=office.id)
+    db.session.add(user)
+    db.session.flush()
+    return user
+
+
+def _add_tasks(user, today):
+    specs = [
+        (TaskStatus.PENDING, TaskPriority.HIGH, today - timedelta(days=2)),
+        (TaskStatus.PENDING, TaskPriority.LOW, today + timedelta(days=3)),
+        (TaskStatus.IN_PROGRESS, TaskPriority.HIGH, today - timedelta(days=1)),
+        (TaskStatus.COMPLETED, TaskPriority.MEDIUM, today - timedelta(days=5)),
+        (TaskStatus.PENDING, TaskPriority.MEDIUM, None),
+    ]
+    tasks = []
+    for index, (status, priority, due) in enumerate(specs):
+        tasks.append(Task(
+            title=f"Task {index}", status=status, priority=priority,
+            due_date=datetime.combine(due, datetime.min.time()) if due else None,
+            owner_id=user.id, created_by=user.id
+        ))
+    # Someone else's task is never counted
+    tasks.append(Task(title="Other", status=TaskStatus.PENDING, priority=TaskPriority.HIGH))
+    db.session.add_all(tasks)
+    db.session.commit()
+    return tasks
+
+
+def test_counts_come_from_one_grouped_query(user):
+    today = date.today()
+    _add_tasks(user, today)
+    user_id = user.id
+
+    selects = []
+
+    def count_selects(conn, cursor, statement, parameters, context, executemany):
+        selects.append(statement)
+
+    event.listen(db.engine, 'before_cursor_execute', count_selects)
+    try:
+        counts = get_task_counts(user_tasks_query(user_id), today=today)
+    finally:
+        event.remove(db.engine, 'before_cursor_execute', count_selects)
+
+    assert len(selects) == 1
+    assert counts['total'] == 5
+    assert counts['overdue'] == 2
+    assert counts['by_status'] == {'pending': 3, 'in_progress': 1, 'on_hold': 0, 'completed': 1, 'cancelled': 0}
+    assert counts['by_priority'] == {'low': 1, 'medium': 2, 'high': 2, 'urgent': 0}
+
+
+def test_filtered_page_and_upcoming_tasks(user):
+    today = date.today()
+    _add_tasks(user, today)
+    user_tasks = user_tasks_query(user.id)
+
+    page = get_task_page(filter_tasks(user_tasks, today=today), per_page=2)
+    assert page.total == 4
+    assert page.pages == 2
+    assert len(page.items) == 2
+
+    overdue = filter_tasks(user_tasks, status='overdue', today=today).all()
+    assert sorted(task.title for task in overdue) == ['Task 0', 'Task 2']
+
+    high = filter_tasks(user_tasks, priority='high', search_text='task', today=today).all()
+    assert sorted(task.title for task in high) == ['Task 0', 'Task 2']
+
+    assert [task.title for task in get_upcoming_tasks(user_tasks)] == ['Task 0', 'Task 2', 'Task 1']